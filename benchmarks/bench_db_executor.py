@@ -0,0 +1,132 @@
+"""
+Concurrent writers with and without the DB executor.
+
+Each thread repeatedly reads a count and then inserts a row, holding the write
+lock for --hold-ms before committing (the work a screen does between its first
+write and the commit). "direct" gives every thread its own session, as the GUI
+and the fingerprint/auth threads used to: they meet in SQLite's busy handler,
+which sleeps and retries, and fail with "database is locked" once a wait
+outlasts busy_timeout. "executor" submits the same work to DbExecutor's single
+writer thread and waits for the future.
+
+Prints throughput, failed writes, the slowest write as seen by its caller and
+(for the executor) its queue metrics.
+
+Usage:
+    python benchmarks/bench_db_executor.py [--threads 8] [--writes 100] [--hold-ms 0]
+        [--profile kiosk]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.database import Base, create_engine_for_profile  # noqa: E402
+from src.models.duty_point import DutyPoint  # noqa: E402
+from src.services.db_executor import DbExecutor  # noqa: E402
+
+
+def read_then_write(db, location: str, hold_ms: float = 0.0) -> int:
+    count = db.query(DutyPoint).count()
+    db.add(DutyPoint(location=location))
+    db.flush()
+    time.sleep(hold_ms / 1000)
+    db.commit()
+    return count
+
+
+def run_mode(mode: str, profile: str, threads: int, writes: int, hold_ms: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine_for_profile(
+            profile, url=f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        )
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        executor = DbExecutor(engine)
+        errors = [0] * threads
+        slowest = [0.0] * threads
+        barrier = threading.Barrier(threads)
+
+        def worker(index: int):
+            session = Session() if mode == "direct" else None
+            barrier.wait()
+            try:
+                for i in range(writes):
+                    location = f"T{index}-{i}"
+                    began = time.perf_counter()
+                    try:
+                        if session is not None:
+                            read_then_write(session, location, hold_ms)
+                        else:
+                            executor.write(read_then_write, location, hold_ms).result()
+                    except Exception:
+                        errors[index] += 1
+                        if session is not None:
+                            session.rollback()
+                    slowest[index] = max(slowest[index], time.perf_counter() - began)
+            finally:
+                if session is not None:
+                    session.close()
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        metrics = executor.metrics()
+        executor.shutdown()
+        db = Session()
+        rows = db.query(DutyPoint).count()
+        db.close()
+        engine.dispose()
+
+    return {
+        "mode": mode,
+        "writes_per_sec": rows / elapsed if elapsed else 0.0,
+        "rows": rows,
+        "errors": sum(errors),
+        "slowest_ms": max(slowest) * 1000,
+        "peak_queue": metrics.peak_queue_depth if mode == "executor" else "-",
+        "wait_ms": f"{metrics.mean_wait_ms:.2f}" if mode == "executor" else "-",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--hold-ms", type=float, default=0.0)
+    parser.add_argument("--profile", default="kiosk")
+    parser.add_argument("--modes", nargs="*", default=["direct", "executor"])
+    args = parser.parse_args()
+
+    header = (
+        f"{'mode':<12}{'writes/s':>10}{'rows':>8}{'errors':>8}{'slowest ms':>12}"
+        f"{'peak queue':>12}{'wait ms':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    failed = False
+    for mode in args.modes:
+        r = run_mode(mode, args.profile, args.threads, args.writes, args.hold_ms)
+        failed |= mode == "executor" and r["errors"] > 0
+        print(
+            f"{r['mode']:<12}{r['writes_per_sec']:>10.1f}{r['rows']:>8}{r['errors']:>8}"
+            f"{r['slowest_ms']:>12.1f}{r['peak_queue']:>12}{r['wait_ms']:>10}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Compare SQLite engine profiles on a throwaway database.
+
+For each profile a fresh database is seeded, then a writer thread books weapons
+through crud_booking while a reader thread runs dashboard-style queries.
+
+Usage:
+    python benchmarks/bench_engine_profiles.py [--bookings 500] [--profiles kiosk test]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.crud import crud_booking  # noqa: E402
+from src.database import ENGINE_PROFILES, Base, create_engine_for_profile  # noqa: E402
+from src.models.booking import Booking  # noqa: E402
+from src.models.duty_point import DutyPoint  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.models.weapon import Weapon  # noqa: E402
+
+
+def seed(Session, weapons: int):
+    db = Session()
+    try:
+        armorer = User(
+            service_number="BENCH-ARM",
+            name="Bench Armorer",
+            telephone="000",
+            role="armorer",
+            hashed_password="x",
+        )
+        officer = User(
+            service_number="BENCH-OFF",
+            name="Bench Officer",
+            telephone="000",
+            role="officer",
+            hashed_password="x",
+        )
+        dp = DutyPoint(location="Bench Post")
+        db.add_all([armorer, officer, dp])
+        db.add_all(
+            Weapon(serial_number=f"BW-{i:06d}", type="Rifle", condition="Good", status="AVAILABLE")
+            for i in range(weapons)
+        )
+        db.commit()
+        weapon_ids = [w_id for (w_id,) in db.query(Weapon.id).order_by(Weapon.id)]
+        return armorer.id, officer.id, dp.id, weapon_ids
+    finally:
+        db.close()
+
+
+def run_profile(profile_name: str, bookings: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine_for_profile(
+            profile_name, url=f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        )
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        armorer_id, officer_id, dp_id, weapon_ids = seed(Session, bookings)
+
+        done = threading.Event()
+        read_latencies: list[float] = []
+        read_errors = 0
+
+        def reader():
+            nonlocal read_errors
+            db = Session()
+            try:
+                while not done.is_set():
+                    start = time.perf_counter()
+                    try:
+                        db.query(func.count(Booking.id)).filter(Booking.status == "ISSUED").scalar()
+                        db.query(Booking).order_by(Booking.issued_at.desc()).limit(50).all()
+                        db.rollback()  # end the read transaction so WAL can checkpoint
+                    except Exception:
+                        read_errors += 1
+                        db.rollback()
+                    read_latencies.append(time.perf_counter() - start)
+            finally:
+                db.close()
+
+        reader_thread = threading.Thread(target=reader, daemon=True)
+        reader_thread.start()
+
+        write_errors = 0
+        db = Session()
+        start = time.perf_counter()
+        try:
+            for weapon_id in weapon_ids:
+                try:
+                    crud_booking.create_booking(
+                        db,
+                        officer_id=officer_id,
+                        weapon_id=weapon_id,
+                        duty_point_id=dp_id,
+                        armorer_id=armorer_id,
+                    )
+                except Exception:
+                    write_errors += 1
+                    db.rollback()
+        finally:
+            elapsed = time.perf_counter() - start
+            db.close()
+            done.set()
+            reader_thread.join()
+            engine.dispose()
+
+    latencies_ms = sorted(x * 1000 for x in read_latencies) or [0.0]
+    p95_index = max(0, int(len(latencies_ms) * 0.95) - 1)
+    return {
+        "profile": profile_name,
+        "bookings_per_sec": (len(weapon_ids) - write_errors) / elapsed if elapsed else 0.0,
+        "write_errors": write_errors,
+        "reads": len(read_latencies),
+        "read_errors": read_errors,
+        "read_p50_ms": statistics.median(latencies_ms),
+        "read_p95_ms": latencies_ms[p95_index],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=500)
+    parser.add_argument("--profiles", nargs="*", default=list(ENGINE_PROFILES))
+    args = parser.parse_args()
+
+    header = (
+        f"{'profile':<16}{'bookings/s':>12}{'w.err':>7}{'reads':>8}"
+        f"{'r.err':>7}{'read p50 ms':>13}{'read p95 ms':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name in args.profiles:
+        r = run_profile(name, args.bookings)
+        print(
+            f"{r['profile']:<16}{r['bookings_per_sec']:>12.1f}{r['write_errors']:>7}"
+            f"{r['reads']:>8}{r['read_errors']:>7}"
+            f"{r['read_p50_ms']:>13.2f}{r['read_p95_ms']:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
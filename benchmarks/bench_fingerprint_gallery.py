@@ -0,0 +1,134 @@
+"""
+Fingerprint identification cost as the enrolled population grows.
+
+For each gallery size a throwaway database is seeded with random templates, then
+one probe (the last enrolled template, worst case for scans) is identified with:
+
+  - linear:  the old verify_fingerprint (load every Fingerprint, compare in Python)
+  - digest:  ExactDigestMatcher, one seek on fingerprints.template_digest
+  - gallery: FingerprintGallery.identify, exact mode (no database access)
+  - scan:    FingerprintGallery.identify with a compare() callback walking the buffer
+
+Usage:
+    python benchmarks/bench_fingerprint_gallery.py [--sizes 1000 10000 50000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.database import Base, create_engine_for_profile  # noqa: E402
+from src.models.fingerprint import Fingerprint, template_digest  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.services.fingerprint_gallery import FingerprintGallery  # noqa: E402
+from src.services.fingerprint_matcher import ExactDigestMatcher  # noqa: E402
+
+TEMPLATE_SIZE = 512
+
+
+def seed(engine, size: int) -> bytes:
+    templates = [os.urandom(TEMPLATE_SIZE) for _ in range(size)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "id": i + 1,
+                    "service_number": f"FP-{i:06d}",
+                    "name": f"Officer {i}",
+                    "telephone": "000",
+                    "role": "officer",
+                    "hashed_password": "x",
+                }
+                for i in range(size)
+            ],
+        )
+        conn.execute(
+            insert(Fingerprint),
+            [
+                {"user_id": i + 1, "template": t, "template_digest": template_digest(t)}
+                for i, t in enumerate(templates)
+            ],
+        )
+    return templates[-1]
+
+
+def linear_scan(db, probe: bytes):
+    for f in db.query(Fingerprint).all():
+        if f.template == probe:
+            return f.user_id
+    return None
+
+
+def timed(fn, repeat: int) -> float:
+    """Mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run_size(size: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine_for_profile("test", url=f"sqlite:///{os.path.join(tmp, 'fp.db')}")
+        Base.metadata.create_all(engine)
+        probe = seed(engine, size)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = Session()
+        try:
+            linear_ms = timed(lambda: (linear_scan(db, probe), db.expunge_all()), repeat)
+            digest = ExactDigestMatcher()
+            digest_ms = timed(lambda: digest.identify(db, probe), repeat * 100)
+
+            gallery = FingerprintGallery()
+            start = time.perf_counter()
+            gallery.load(db)
+            load_ms = (time.perf_counter() - start) * 1000
+            assert gallery.identify(probe) == size
+            gallery_ms = timed(lambda: gallery.identify(probe), repeat * 1000)
+
+            gallery.compare = lambda stored, p: stored == p
+            scan_ms = timed(lambda: gallery.identify(probe), repeat)
+        finally:
+            db.close()
+            engine.dispose()
+    return {
+        "size": size,
+        "linear_ms": linear_ms,
+        "digest_ms": digest_ms,
+        "load_ms": load_ms,
+        "gallery_ms": gallery_ms,
+        "scan_ms": scan_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="*", type=int, default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    header = (
+        f"{'templates':>10}{'linear ms':>12}{'digest ms':>12}{'load ms':>10}"
+        f"{'gallery ms':>12}{'scan ms':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        r = run_size(size, args.repeat)
+        print(
+            f"{r['size']:>10}{r['linear_ms']:>12.2f}{r['digest_ms']:>12.4f}{r['load_ms']:>10.1f}"
+            f"{r['gallery_ms']:>12.4f}{r['scan_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Warm-start cost of the fingerprint gallery: ORM load vs. the memory-mapped file.
+
+For each gallery size a throwaway database is seeded with random templates and
+exported to a gallery file, then a fresh matcher is brought up and the last
+enrolled template identified with:
+
+  - orm:    FingerprintGallery.load (every template read through SQLite)
+  - mmap:   MappedGallery (open + index, templates stay in the page cache)
+  - sync:   GalleryFile.sync after re-enrolling 1% of users (incremental refresh)
+
+Usage:
+    python benchmarks/bench_gallery_warm_start.py [--sizes 1000 10000 50000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_fingerprint_gallery import TEMPLATE_SIZE, seed, timed  # noqa: E402
+from sqlalchemy import update  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.database import Base, create_engine_for_profile  # noqa: E402
+from src.models.fingerprint import Fingerprint, template_digest  # noqa: E402
+from src.services.fingerprint_gallery import FingerprintGallery  # noqa: E402
+from src.services.gallery_file import GalleryFile, MappedGallery  # noqa: E402
+
+
+def warm_orm(db, probe: bytes, expected: int):
+    gallery = FingerprintGallery()
+    gallery.load(db)
+    assert gallery.identify(probe) == expected
+
+
+def warm_mmap(path: str, probe: bytes, expected: int):
+    gallery = MappedGallery(path)
+    try:
+        assert gallery.identify(probe) == expected
+    finally:
+        gallery.close()
+
+
+def reenroll(db, size: int):
+    for user_id in range(1, size + 1, 100):
+        template = os.urandom(TEMPLATE_SIZE)
+        db.execute(
+            update(Fingerprint)
+            .where(Fingerprint.user_id == user_id)
+            .values(template=template, template_digest=template_digest(template))
+        )
+    db.commit()
+
+
+def run_size(size: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine_for_profile("test", url=f"sqlite:///{os.path.join(tmp, 'fp.db')}")
+        Base.metadata.create_all(engine)
+        probe = seed(engine, size)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = Session()
+        path = os.path.join(tmp, "fingerprints.gallery")
+        try:
+            gallery_file = GalleryFile(path)
+            start = time.perf_counter()
+            gallery_file.export(db)
+            export_ms = (time.perf_counter() - start) * 1000
+
+            orm_ms = timed(lambda: warm_orm(db, probe, size), repeat)
+            mmap_ms = timed(lambda: warm_mmap(path, probe, size), repeat)
+
+            reenroll(db, size)
+            start = time.perf_counter()
+            result = gallery_file.sync(db)
+            sync_ms = (time.perf_counter() - start) * 1000
+        finally:
+            db.close()
+            engine.dispose()
+    return {
+        "size": size,
+        "export_ms": export_ms,
+        "orm_ms": orm_ms,
+        "mmap_ms": mmap_ms,
+        "sync_ms": sync_ms,
+        "changed": result["changed"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="*", type=int, default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    header = (
+        f"{'templates':>10}{'export ms':>11}{'orm ms':>10}{'mmap ms':>10}"
+        f"{'sync ms':>10}{'changed':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        r = run_size(size, args.repeat)
+        print(
+            f"{r['size']:>10}{r['export_ms']:>11.1f}{r['orm_ms']:>10.1f}{r['mmap_ms']:>10.2f}"
+            f"{r['sync_ms']:>10.1f}{r['changed']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
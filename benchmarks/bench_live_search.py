@@ -0,0 +1,120 @@
+"""
+Latency of a live-search query (count + first page) on a large bookings table.
+
+Seeds a throwaway database, then for a few typed terms measures how long the
+search pool needs before the table can render. The Tk thread only pays for the
+hand-off; the query itself runs off-thread (src/gui/live_search.py).
+
+Usage:
+    python benchmarks/bench_live_search.py [--bookings 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.crud import crud_booking  # noqa: E402
+from src.database import Base, create_engine_for_profile  # noqa: E402
+from src.models.booking import Booking  # noqa: E402
+from src.models.duty_point import DutyPoint  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.models.weapon import Weapon  # noqa: E402
+
+TERMS = ["", "O", "Of", "Officer 12", "SN-00421", "Rifle", "no such thing"]
+
+
+def seed(engine, bookings: int, officers: int = 2000, weapons: int = 5000):
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "service_number": f"SN-{i:05d}",
+                    "name": f"Officer {i}",
+                    "telephone": "000",
+                    "role": "officer",
+                    "hashed_password": "x",
+                }
+                for i in range(officers)
+            ],
+        )
+        conn.execute(insert(DutyPoint), [{"location": "Main Gate"}])
+        conn.execute(
+            insert(Weapon),
+            [
+                {
+                    "serial_number": f"W-{i:06d}",
+                    "type": ("Rifle", "Pistol", "Shotgun")[i % 3],
+                    "condition": "Good",
+                    "status": "AVAILABLE",
+                }
+                for i in range(weapons)
+            ],
+        )
+        conn.execute(
+            insert(Booking),
+            [
+                {
+                    "officer_id": 1 + i % officers,
+                    "armorer_id": 1,
+                    "weapon_id": 1 + i % weapons,
+                    "duty_point_id": 1,
+                    "ammunition_count": 30,
+                    "status": "RETURNED",
+                    "issued_at": start + timedelta(minutes=i),
+                }
+                for i in range(bookings)
+            ],
+        )
+
+
+def live_query(db, term):
+    """What BookingManagement runs on the search pool for each settled keystroke."""
+    rows, _next_cursor = crud_booking.search_bookings(
+        db, term, limit=crud_booking.BOOKING_PAGE_SIZE
+    )
+    return crud_booking.count_search_bookings(db, term), rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine_for_profile("kiosk", url=f"sqlite:///{os.path.join(tmp, 'b.db')}")
+        Base.metadata.create_all(engine)
+        seed(engine, args.bookings)
+        Session = sessionmaker(bind=engine)
+
+        print(f"{args.bookings} bookings, median of {args.repeat} runs")
+        print(f"{'term':<16}{'matches':>10}{'query ms':>12}")
+        for term in TERMS:
+            timings = []
+            for _ in range(args.repeat):
+                db = Session()
+                try:
+                    start = time.perf_counter()
+                    count, _rows = live_query(db, term)
+                    timings.append((time.perf_counter() - start) * 1000)
+                finally:
+                    db.close()
+            print(f"{term!r:<16}{count:>10}{statistics.median(timings):>12.1f}")
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Keystroke latency of the booking form's officer index vs. the old linear filter.
+
+Builds an NgramIndex over synthetic officers ("SN-00042 — Grace Otieno 42"),
+then times the ranked search for a few typed queries next to the list
+comprehension filter_combobox used to run on every <KeyRelease>.
+
+Usage:
+    python benchmarks/bench_lookup_index.py [--officers 20000] [--repeat 200]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.lookup_index import NgramIndex  # noqa: E402
+
+FIRST = ["John", "Mary", "Peter", "Grace", "Samuel", "Ruth", "David", "Esther", "Joseph", "Alice"]
+LAST = ["Smith", "Otieno", "Kamau", "Wanjiru", "Mwangi", "Achieng", "Njoroge", "Chebet"]
+QUERIES = ["j", "jo", "SN-012", "SN-01234", "otie", "ieno", "kamau 1", "mi", "zzz"]
+
+
+def timed_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--officers", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    officers = [
+        (i, f"SN-{i:05d}", f"{rng.choice(FIRST)} {rng.choice(LAST)} {i}")
+        for i in range(args.officers)
+    ]
+    displays = [f"{sn} — {name}" for _, sn, name in officers]
+
+    start = time.perf_counter()
+    index = NgramIndex()
+    index.load((i, f"{sn} — {name}", [sn, name]) for i, sn, name in officers)
+    print(f"{args.officers} officers, index built in {time.perf_counter() - start:.2f} s")
+
+    print(f"{'query':<12}{'matches':>9}{'index us':>11}{'linear us':>11}")
+    for query in QUERIES:
+        q = query.lower()
+        matches = len(index.search(query))
+        indexed = timed_us(lambda: index.search(query), args.repeat)
+        linear = timed_us(
+            lambda: [v for v in displays if q in v.lower()], max(1, args.repeat // 20)
+        )
+        print(f"{query!r:<12}{matches:>9}{indexed:>11.0f}{linear:>11.0f}")
+
+    start = time.perf_counter()
+    index.add(-1, "SN-99999 — New Officer", ["SN-99999", "New Officer"])
+    index.remove(-1)
+    print(f"add + remove one officer: {(time.perf_counter() - start) * 1e6:.0f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
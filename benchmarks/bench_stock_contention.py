@@ -0,0 +1,142 @@
+"""
+Hammer one ammunition row from many threads and check the stock stays consistent.
+
+Each thread has its own session (like a separate terminal) and repeatedly takes a
+few rounds. "atomic" uses crud_ammunition.consume_stock (one conditional UPDATE);
+"read-modify-write" reproduces the old pattern of reading count, checking it in
+Python and writing the new value back.
+
+The final count must equal initial stock minus everything successfully taken.
+
+Usage:
+    python benchmarks/bench_stock_contention.py [--threads 8] [--attempts 200] [--stock 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.crud import crud_ammunition  # noqa: E402
+from src.database import Base, create_engine_for_profile  # noqa: E402
+from src.models.ammunition import Ammunition  # noqa: E402
+from src.models.weapon import Weapon  # noqa: E402
+
+
+def consume_atomic(db, ammo_id: int, qty: int) -> bool:
+    ok = crud_ammunition.consume_stock(db, ammo_id, qty)
+    db.commit()
+    return ok
+
+
+def consume_read_modify_write(db, ammo_id: int, qty: int) -> bool:
+    ammo = db.get(Ammunition, ammo_id)
+    if (ammo.count or 0) < qty:
+        db.rollback()
+        return False
+    ammo.count = ammo.count - qty
+    db.commit()
+    return True
+
+
+MODES = {"atomic": consume_atomic, "read-modify-write": consume_read_modify_write}
+
+
+def run_mode(mode: str, profile: str, threads: int, attempts: int, stock: int, qty: int) -> dict:
+    consume = MODES[mode]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine_for_profile(
+            profile, url=f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        )
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = Session()
+        weapon = Weapon(serial_number="BW-1", type="Rifle", condition="Good", status="AVAILABLE")
+        db.add(weapon)
+        db.flush()
+        ammo = Ammunition(weapon_id=weapon.id, platform="Bench", caliber="9mm", count=stock)
+        db.add(ammo)
+        db.commit()
+        ammo_id = ammo.id
+        db.close()
+
+        taken = [0] * threads
+        errors = [0] * threads
+        barrier = threading.Barrier(threads)
+
+        def worker(index: int):
+            session = Session()
+            barrier.wait()
+            try:
+                for _ in range(attempts):
+                    try:
+                        if consume(session, ammo_id, qty):
+                            taken[index] += qty
+                    except Exception:
+                        errors[index] += 1
+                        session.rollback()
+            finally:
+                session.close()
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        db = Session()
+        final = db.get(Ammunition, ammo_id).count
+        db.close()
+        engine.dispose()
+
+    expected = stock - sum(taken)
+    return {
+        "mode": mode,
+        "ops_per_sec": threads * attempts / elapsed if elapsed else 0.0,
+        "taken": sum(taken),
+        "errors": sum(errors),
+        "final": final,
+        "expected": expected,
+        "consistent": final == expected and final >= 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=200)
+    parser.add_argument("--stock", type=int, default=2000)
+    parser.add_argument("--qty", type=int, default=3)
+    parser.add_argument("--profile", default="multi-terminal")
+    parser.add_argument("--modes", nargs="*", default=list(MODES))
+    args = parser.parse_args()
+
+    header = (
+        f"{'mode':<20}{'ops/s':>10}{'taken':>8}{'errors':>8}"
+        f"{'final':>8}{'expected':>10}{'consistent':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    failed = False
+    for mode in args.modes:
+        r = run_mode(mode, args.profile, args.threads, args.attempts, args.stock, args.qty)
+        failed |= mode == "atomic" and not r["consistent"]
+        print(
+            f"{r['mode']:<20}{r['ops_per_sec']:>10.1f}{r['taken']:>8}{r['errors']:>8}"
+            f"{r['final']:>8}{r['expected']:>10}{str(r['consistent']):>12}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
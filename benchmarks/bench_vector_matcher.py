@@ -0,0 +1,85 @@
+"""
+Throughput of the NumPy VectorMatcher as the gallery grows and as cores are added.
+
+Galleries are synthetic (random unit vectors, no database), so the numbers isolate
+the scoring engine. workers=1 is the single-process blockwise path; workers>1 splits
+the gallery across a process pool over shared memory.
+
+Usage:
+    python benchmarks/bench_vector_matcher.py [--sizes 10000 100000 500000] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from src.services.vector_matcher import DEFAULT_DIM, VectorMatcher  # noqa: E402
+
+
+def random_gallery(size: int, dim: int, rng):
+    vectors = rng.standard_normal((size, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.arange(1, size + 1), vectors
+
+
+def run(size: int, workers: int, probes: int, rng) -> dict:
+    user_ids, vectors = random_gallery(size, DEFAULT_DIM, rng)
+    # Probes are raw templates whose "SDK" features are the enrolled row they name,
+    # so every search should hit
+    matcher = VectorMatcher(
+        extract=lambda template, dim: vectors[int.from_bytes(template, "little")],
+        workers=workers,
+        parallel_rows=0 if workers > 1 else size + 1,
+    )
+    matcher.load_vectors(user_ids, vectors)
+    targets = rng.integers(0, size, probes)
+    probe_templates = [int(t).to_bytes(8, "little") for t in targets]
+
+    try:
+        matcher.search(probe_templates[0])  # warm-up: pool start, shared-memory publish
+        start = time.perf_counter()
+        hits = sum(
+            matcher.search(p).user_id == user_ids[t] for p, t in zip(probe_templates, targets)
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        matcher.close()
+    return {
+        "size": size,
+        "workers": workers,
+        "matches_per_sec": probes / elapsed if elapsed else 0.0,
+        "ms_per_match": elapsed * 1000 / probes,
+        "hit_rate": hits / probes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="*", type=int, default=[10000, 100000, 500000])
+    parser.add_argument(
+        "--workers", nargs="*", type=int, default=sorted({1, 2, 4, os.cpu_count() or 1})
+    )
+    parser.add_argument("--probes", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    header = f"{'gallery':>10}{'workers':>9}{'matches/s':>12}{'ms/match':>10}{'hit rate':>10}"
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        for workers in args.workers:
+            r = run(size, workers, args.probes, rng)
+            print(
+                f"{r['size']:>10}{r['workers']:>9}{r['matches_per_sec']:>12.1f}"
+                f"{r['ms_per_match']:>10.2f}{r['hit_rate']:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
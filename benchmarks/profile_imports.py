@@ -0,0 +1,145 @@
+"""
+Import-time profile of the application's startup path.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters, parses
+the per-module self/cumulative microseconds CPython writes to stderr, and prints
+the slowest modules, the cost per top-level package and the total. Pass --json
+to save the profile and --baseline to diff against a saved one, so startup cost
+can be tracked module by module from release to release. With --budget-ms the
+exit status is 1 when the total exceeds the budget.
+
+Usage:
+    python benchmarks/profile_imports.py [src.gui.login] [--repeat 5] [--top 20]
+        [--json profile.json] [--baseline profile.json] [--budget-ms 300]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ["src.gui.login"]
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 = imported directly by the profiled statement
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """
+    Records from -X importtime output, in the order CPython reports them.
+
+        import time: self [us] | cumulative | imported package
+        import time:       292 |      90594 |     jwt
+    """
+    prefix = "import time:"
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith(prefix):
+            continue
+        fields = line.removeprefix(prefix).split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, int(fields[0]), int(fields[1]), depth))
+    return records
+
+
+def run_once(module: str) -> list[ImportRecord]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def profile(modules: list[str], repeat: int) -> dict[str, dict[str, float]]:
+    """module -> median self/cumulative ms over repeat cold interpreters."""
+    samples: dict[str, list[ImportRecord]] = {}
+    for _ in range(repeat):
+        statement = "; import ".join(modules)
+        for record in run_once(statement):
+            samples.setdefault(record.module, []).append(record)
+    return {
+        name: {
+            "self_ms": statistics.median(r.self_us for r in records) / 1000,
+            "cumulative_ms": statistics.median(r.cumulative_us for r in records) / 1000,
+        }
+        for name, records in samples.items()
+    }
+
+
+def by_package(result: dict[str, dict[str, float]]) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for name, timing in result.items():
+        package = name.split(".")[0]
+        if package == "src":
+            package = ".".join(name.split(".")[:2])
+        totals[package] = totals.get(package, 0.0) + timing["self_ms"]
+    return totals
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", help="write the profile here")
+    parser.add_argument("--baseline", help="a profile written earlier with --json")
+    parser.add_argument("--budget-ms", type=float)
+    args = parser.parse_args(argv)
+
+    result = profile(args.modules, args.repeat)
+    total = sum(t["self_ms"] for t in result.values())
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["modules"]
+
+    print(f"import {', '.join(args.modules)}: {total:.1f} ms, {len(result)} modules")
+    print(f"median of {args.repeat} cold interpreters\n")
+    print(f"{'module':<48}{'self ms':>9}{'cum ms':>9}{'delta':>9}")
+    slowest = sorted(result.items(), key=lambda item: item[1]["cumulative_ms"], reverse=True)
+    for name, timing in slowest[: args.top]:
+        delta = ""
+        if baseline:
+            before = baseline.get(name, {}).get("cumulative_ms", 0.0)
+            delta = f"{timing['cumulative_ms'] - before:+.1f}"
+        print(f"{name:<48}{timing['self_ms']:>9.1f}{timing['cumulative_ms']:>9.1f}{delta:>9}")
+
+    print(f"\n{'package':<48}{'self ms':>9}")
+    packages = sorted(by_package(result).items(), key=lambda item: item[1], reverse=True)
+    for package, ms in packages[: args.top]:
+        print(f"{package:<48}{ms:>9.1f}")
+
+    if baseline:
+        before = sum(t["self_ms"] for t in baseline.values())
+        now, then = set(by_package(result)), set(by_package(baseline))
+        print(f"\ntotal {before:.1f} -> {total:.1f} ms")
+        print(f"packages newly imported: {', '.join(sorted(now - then)) or '-'}")
+        print(f"packages no longer imported: {', '.join(sorted(then - now)) or '-'}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"statement": args.modules, "total_ms": total, "modules": result}, f)
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"\nover budget: {total:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Measure bcrypt on this host and store the work factor for new password hashes.
+
+Picks the highest cost whose verify time stays within the target (250 ms by
+default) and saves it as "bcrypt_rounds" in the settings file. Existing hashes
+are upgraded transparently the next time their owner logs in:
+
+    python src/calibrate_bcrypt.py [--target-ms 250] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import SETTINGS_PATH, get_bcrypt_rounds, save_settings  # noqa: E402
+from src.services.auth_worker import (  # noqa: E402
+    MAX_ROUNDS,
+    MIN_ROUNDS,
+    TARGET_VERIFY_MS,
+    calibrate_rounds,
+    time_verify,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target-ms", type=float, default=TARGET_VERIFY_MS)
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=MAX_ROUNDS)
+    parser.add_argument("--dry-run", action="store_true", help="measure only, do not save")
+    args = parser.parse_args(argv)
+
+    current = get_bcrypt_rounds()
+    rounds = calibrate_rounds(args.target_ms, args.min_rounds, args.max_rounds)
+    verify_ms = time_verify(rounds) * 1000
+    print(f"Current cost: {current}, calibrated cost: {rounds} ({verify_ms:.0f} ms per verify)")
+    if args.dry_run:
+        return 0
+    save_settings({"bcrypt_rounds": rounds})
+    print(f"✅ Saved bcrypt_rounds={rounds} to {SETTINGS_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
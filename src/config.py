@@ -0,0 +1,83 @@
+"""
+Host-specific settings that are measured or chosen at install time.
+
+Values live in a small JSON file next to the database (database/settings.json,
+or ARMORY_SETTINGS_PATH); an ARMORY_<NAME> environment variable overrides the
+file. Write them with save_settings(), e.g. from src/calibrate_bcrypt.py.
+
+The file is read once per process (save_settings() refreshes it); a value set by
+another process takes effect on restart. A malformed file or value is reported
+with a RuntimeWarning and the default is used, so settings can never block login.
+"""
+
+import json
+import os
+import threading
+import warnings
+from typing import Any, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETTINGS_PATH = os.environ.get(
+    "ARMORY_SETTINGS_PATH", os.path.join(BASE_DIR, "database", "settings.json")
+)
+
+DEFAULT_BCRYPT_ROUNDS = 12  # bcrypt.gensalt() default
+
+_cache: dict[str, dict] = {}  # settings file path -> its parsed contents
+_cache_lock = threading.Lock()
+
+
+def load_settings(path: Optional[str] = None) -> dict:
+    path = path or SETTINGS_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            settings = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:  # JSONDecodeError, or not UTF-8
+        warnings.warn(f"Ignoring malformed settings file {path}: {e}", RuntimeWarning)
+        return {}
+    if not isinstance(settings, dict):
+        warnings.warn(f"Ignoring settings file {path}: not a JSON object", RuntimeWarning)
+        return {}
+    return settings
+
+
+def _cached_settings(path: Optional[str] = None) -> dict:
+    path = path or SETTINGS_PATH
+    with _cache_lock:
+        if path not in _cache:
+            _cache[path] = load_settings(path)
+        return _cache[path]
+
+
+def save_settings(updates: dict, path: Optional[str] = None) -> dict:
+    """Merge updates into the settings file (written atomically); returns all settings."""
+    path = path or SETTINGS_PATH
+    settings = load_settings(path)
+    settings.update(updates)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    with _cache_lock:
+        _cache[path] = dict(settings)
+    return settings
+
+
+def get_setting(name: str, default: Any = None, cast=str, path: Optional[str] = None) -> Any:
+    env = os.environ.get(f"ARMORY_{name.upper()}")
+    value = env if env is not None else _cached_settings(path).get(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        source = f"ARMORY_{name.upper()}" if env is not None else path or SETTINGS_PATH
+        warnings.warn(f"Ignoring invalid {name}={value!r} from {source}", RuntimeWarning)
+        return default
+
+
+def get_bcrypt_rounds(path: Optional[str] = None) -> int:
+    """Work factor for new password hashes (see src/calibrate_bcrypt.py)."""
+    return get_setting("bcrypt_rounds", DEFAULT_BCRYPT_ROUNDS, int, path)
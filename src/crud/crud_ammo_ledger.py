@@ -0,0 +1,113 @@
+# src/crud/crud_ammo_ledger.py
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.models.ammo_movement import AmmoBalanceSnapshot, AmmoMovement
+from src.models.ammunition import Ammunition
+from src.models.enums import MovementKind
+
+# Snapshot an item's balance after this many movements, so balance_at() never sums
+# more than SNAPSHOT_EVERY ledger rows.
+SNAPSHOT_EVERY = 50
+
+
+def record_movement(
+    db: Session,
+    ammo_id: int,
+    kind: MovementKind,
+    quantity: int,
+    booking=None,
+    remarks: Optional[str] = None,
+) -> AmmoMovement:
+    """
+    Append a ledger entry for a stock change already applied to ammunitions.count.
+
+    Call it in the same transaction as the UPDATE (the write lock is held, so the
+    snapshot balance read here is exact). Does not commit.
+    """
+    movement = AmmoMovement(
+        ammunition_id=ammo_id,
+        kind=kind,
+        quantity=quantity,
+        booking=booking,
+        remarks=remarks,
+    )
+    db.add(movement)
+    db.flush()
+
+    last = _latest_snapshot(db, ammo_id)
+    pending = (
+        db.query(func.count(AmmoMovement.id))
+        .filter(
+            AmmoMovement.ammunition_id == ammo_id,
+            AmmoMovement.id > (last.last_movement_id if last else 0),
+        )
+        .scalar()
+    )
+    if pending >= SNAPSHOT_EVERY:
+        take_snapshot(db, ammo_id, movement)
+    return movement
+
+
+def take_snapshot(
+    db: Session, ammo_id: int, movement: Optional[AmmoMovement] = None
+) -> Optional[AmmoBalanceSnapshot]:
+    """Record the current balance as of `movement` (default: the latest one). No commit."""
+    if movement is None:
+        movement = (
+            db.query(AmmoMovement)
+            .filter(AmmoMovement.ammunition_id == ammo_id)
+            .order_by(AmmoMovement.id.desc())
+            .first()
+        )
+        if movement is None:
+            return None
+    balance = db.query(Ammunition.count).filter(Ammunition.id == ammo_id).scalar() or 0
+    snapshot = AmmoBalanceSnapshot(
+        ammunition_id=ammo_id,
+        last_movement_id=movement.id,
+        balance=balance,
+        taken_at=movement.created_at,
+    )
+    db.add(snapshot)
+    db.flush()
+    return snapshot
+
+
+def _latest_snapshot(db: Session, ammo_id: int, at: Optional[datetime] = None):
+    q = db.query(AmmoBalanceSnapshot).filter(AmmoBalanceSnapshot.ammunition_id == ammo_id)
+    if at is not None:
+        q = q.filter(AmmoBalanceSnapshot.taken_at <= at)
+    return q.order_by(AmmoBalanceSnapshot.taken_at.desc(), AmmoBalanceSnapshot.id.desc()).first()
+
+
+def balance_at(db: Session, ammo_id: int, at: datetime) -> int:
+    """
+    Stock balance of one ammunition item at a point in time (naive UTC, like the ledger).
+
+    Reads the nearest snapshot at or before `at`, then sums the short tail of
+    movements recorded after it.
+    """
+    snapshot = _latest_snapshot(db, ammo_id, at)
+    tail = db.query(func.coalesce(func.sum(AmmoMovement.quantity), 0)).filter(
+        AmmoMovement.ammunition_id == ammo_id,
+        AmmoMovement.created_at <= at,
+    )
+    if snapshot is None:
+        return tail.scalar()
+    tail = tail.filter(AmmoMovement.id > snapshot.last_movement_id)
+    return snapshot.balance + tail.scalar()
+
+
+def list_movements(db: Session, ammo_id: int, limit: int = 100) -> list[AmmoMovement]:
+    """Most recent ledger entries for one item, newest first."""
+    return (
+        db.query(AmmoMovement)
+        .filter(AmmoMovement.ammunition_id == ammo_id)
+        .order_by(AmmoMovement.id.desc())
+        .limit(limit)
+        .all()
+    )
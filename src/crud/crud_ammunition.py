@@ -1,25 +1,22 @@
 from typing import List, Optional
 
-from sqlalchemy import or_
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
+from src.crud.crud_ammo_ledger import record_movement
+from src.crud.crud_search import search_ids
+from src.models.ammo_movement import AmmoMovement
 from src.models.ammunition import Ammunition
+from src.models.enums import MovementKind
 
 
 def list_ammunition(
     db_session: Session, query_text: str = "", limit: int = 200, offset: int = 0
 ) -> List[Ammunition]:
     q = db_session.query(Ammunition)
-    if query_text:
-        like = f"%{query_text.strip()}%"
-        q = q.filter(
-            or_(
-                Ammunition.category.ilike(like),
-                Ammunition.platform.ilike(like),
-                Ammunition.caliber.ilike(like),
-                Ammunition.bin_location.ilike(like),
-            )
-        )
+    if query_text and query_text.strip():
+        # category/platform/caliber/bin_location are all in the FTS search_index
+        q = q.filter(Ammunition.id.in_(search_ids(db_session, query_text, "ammunition")))
     q = q.order_by(Ammunition.platform.asc(), Ammunition.caliber.asc())
     if limit:
         q = q.limit(limit)
@@ -56,6 +53,9 @@ def create_ammunition(
         bin_location=(bin_location or "").strip() or None,
     )
     db_session.add(ammo)
+    db_session.flush()
+    if ammo.count:
+        record_movement(db_session, ammo.id, MovementKind.OPENING, ammo.count)
     db_session.commit()
     db_session.refresh(ammo)
     return ammo
@@ -88,25 +88,90 @@ def update_ammunition(
     return ammo
 
 
+def has_ledger_history(db_session: Session, ammo_id: int) -> bool:
+    return (
+        db_session.query(AmmoMovement.id).filter(AmmoMovement.ammunition_id == ammo_id).first()
+        is not None
+    )
+
+
 def delete_ammunition(db_session: Session, ammo_id: int) -> bool:
+    """Delete a line that never moved stock; lines with ledger entries are kept (False)."""
     ammo = db_session.query(Ammunition).get(ammo_id)
-    if not ammo:
+    if not ammo or has_ledger_history(db_session, ammo_id):
         return False
     db_session.delete(ammo)
     db_session.commit()
     return True
 
 
-def adjust_stock(db_session: Session, ammo_id: int, delta: int) -> Optional[Ammunition]:
+def consume_stock(
+    db_session: Session,
+    ammo_id: int,
+    qty: int,
+    kind: MovementKind = MovementKind.ISSUE,
+    booking=None,
+    remarks: Optional[str] = None,
+) -> Optional[AmmoMovement]:
+    """
+    Take qty rounds out of stock in one conditional UPDATE and log it to the ledger.
+
+    Returns the ledger entry, or None if stock is short. The check and the decrement
+    are the same statement, so two terminals cannot both pass the check (SQLite
+    ignores SELECT ... FOR UPDATE). Does not commit: the caller's transaction decides.
+    """
+    result = db_session.execute(
+        update(Ammunition)
+        .where(Ammunition.id == ammo_id, func.coalesce(Ammunition.count, 0) >= qty)
+        .values(count=func.coalesce(Ammunition.count, 0) - qty)
+    )
+    if result.rowcount != 1:
+        return None
+    return record_movement(db_session, ammo_id, kind, -qty, booking=booking, remarks=remarks)
+
+
+def add_stock(
+    db_session: Session,
+    ammo_id: int,
+    qty: int,
+    kind: MovementKind = MovementKind.RETURN,
+    booking=None,
+    remarks: Optional[str] = None,
+) -> Optional[AmmoMovement]:
+    """Put qty rounds into stock in one UPDATE and log it; None if the row is gone. No commit."""
+    result = db_session.execute(
+        update(Ammunition)
+        .where(Ammunition.id == ammo_id)
+        .values(count=func.coalesce(Ammunition.count, 0) + qty)
+    )
+    if result.rowcount != 1:
+        return None
+    return record_movement(db_session, ammo_id, kind, qty, booking=booking, remarks=remarks)
+
+
+def adjust_stock(
+    db_session: Session, ammo_id: int, delta: int, remarks: Optional[str] = None
+) -> Optional[Ammunition]:
     """Positive delta = add; negative delta = consume (but not below zero)."""
-    ammo = db_session.query(Ammunition).get(ammo_id)
-    if not ammo:
+    delta = int(delta)
+    if delta == 0:
+        return db_session.get(Ammunition, ammo_id)
+    if delta > 0:
+        ok = add_stock(db_session, ammo_id, delta, MovementKind.ADJUSTMENT, remarks=remarks)
+    else:
+        ok = consume_stock(db_session, ammo_id, -delta, MovementKind.ADJUSTMENT, remarks=remarks)
+        if not ok:
+            # Short: the failed UPDATE already holds the write lock, so this read is exact
+            current = db_session.query(Ammunition.count).filter(Ammunition.id == ammo_id).scalar()
+            if current is not None:
+                ok = current == 0 or consume_stock(
+                    db_session, ammo_id, current, MovementKind.ADJUSTMENT, remarks=remarks
+                )
+    if not ok:
+        db_session.rollback()
         return None
-    new_count = int(ammo.count or 0) + int(delta)
-    if new_count < 0:
-        new_count = 0
-    ammo.count = new_count
     db_session.commit()
+    ammo = db_session.get(Ammunition, ammo_id)
     db_session.refresh(ammo)
     return ammo
 
@@ -2,8 +2,11 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import func, or_, select, tuple_
 from sqlalchemy.orm import Session, joinedload
 
+from src.crud import crud_ammunition
+from src.crud.crud_search import LIKE_ESCAPE, contains_pattern
 from src.models.ammunition import Ammunition
 from src.models.booking import Booking
 from src.models.duty_point import DutyPoint
@@ -26,6 +29,217 @@ def list_bookings(db):
     )
 
 
+BOOKING_PAGE_SIZE = 100
+
+
+def list_bookings_page(
+    db: Session,
+    limit: int = BOOKING_PAGE_SIZE,
+    cursor: Optional[tuple[datetime, int]] = None,
+) -> tuple[list[Booking], Optional[tuple[datetime, int]]]:
+    """
+    Return one page of bookings (newest first) and the cursor for the next page.
+
+    The cursor is the (issued_at, id) of the last row already shown; pass None for
+    the first page. The returned cursor is None when there are no more rows.
+    Paging seeks on ix_bookings_issued_at_id, so page N costs the same as page 1.
+    """
+    q = db.query(Booking).options(
+        joinedload(Booking.officer),
+        joinedload(Booking.weapon),
+        joinedload(Booking.duty_point),
+        joinedload(Booking.ammunition),
+    )
+    if cursor is not None:
+        q = q.filter(tuple_(Booking.issued_at, Booking.id) < tuple_(*cursor))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = q.order_by(Booking.issued_at.desc(), Booking.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1].issued_at, rows[-1].id)
+
+
+# Above this estimated share of matching bookings, walking ix_bookings_issued_at_id
+# newest-first and stopping at the page limit beats seeking every match and sorting.
+ORDERED_SCAN_SELECTIVITY = 0.05
+# A COUNT reads every match either way; scanning wins only once most rows match.
+COUNT_SCAN_SELECTIVITY = 0.5
+
+
+def _text_match_fraction(db: Session, text: str) -> float:
+    """Upper bound on the share of bookings a text search matches (tiny table scans)."""
+    like = contains_pattern(text)
+    officers, matched_officers = db.execute(
+        select(
+            func.count(User.id),
+            func.count(User.id).filter(
+                or_(
+                    User.name.like(like, escape=LIKE_ESCAPE),
+                    User.service_number.like(like, escape=LIKE_ESCAPE),
+                )
+            ),
+        )
+    ).one()
+    weapons, matched_weapons = db.execute(
+        select(
+            func.count(Weapon.id),
+            func.count(Weapon.id).filter(Weapon.type.like(like, escape=LIKE_ESCAPE)),
+        )
+    ).one()
+    fraction = (matched_officers / officers if officers else 0.0) + (
+        matched_weapons / weapons if weapons else 0.0
+    )
+    return min(1.0, fraction)
+
+
+def _ordered_scan(db: Session, text: str, threshold: float = ORDERED_SCAN_SELECTIVITY) -> bool:
+    text = (text or "").strip()
+    return bool(text) and _text_match_fraction(db, text) >= threshold
+
+
+def _booking_search_filters(
+    text: str = "",
+    status=None,
+    date_range: Optional[tuple[Optional[datetime], Optional[datetime]]] = None,
+    ordered_scan: bool = False,
+) -> list:
+    filters = []
+    text = (text or "").strip()
+    if text:
+        # SQLite LIKE is already case-insensitive for ASCII. Resolving the (small)
+        # officer/weapon tables first lets the bookings side seek on
+        # ix_bookings_officer_issued / ix_bookings_weapon_issued instead of scanning.
+        # For broad terms ("O") that seek returns most of the table; "+ 0" hides
+        # those indexes so SQLite walks issued_at order and stops at the LIMIT.
+        like = contains_pattern(text)
+        matching_officers = select(User.id).where(
+            or_(
+                User.name.like(like, escape=LIKE_ESCAPE),
+                User.service_number.like(like, escape=LIKE_ESCAPE),
+            )
+        )
+        matching_weapons = select(Weapon.id).where(Weapon.type.like(like, escape=LIKE_ESCAPE))
+        officer_id, weapon_id = Booking.officer_id, Booking.weapon_id
+        if ordered_scan:
+            officer_id, weapon_id = officer_id + 0, weapon_id + 0
+        filters.append(or_(officer_id.in_(matching_officers), weapon_id.in_(matching_weapons)))
+
+    if status:
+        filters.append(Booking.status == getattr(status, "name", status))
+
+    if date_range:
+        start, end = date_range
+        if start is not None:
+            filters.append(Booking.issued_at >= start)
+        if end is not None:
+            filters.append(Booking.issued_at < end)
+    return filters
+
+
+def search_bookings(
+    db: Session,
+    text: str = "",
+    status=None,
+    date_range: Optional[tuple[Optional[datetime], Optional[datetime]]] = None,
+    limit: int = BOOKING_PAGE_SIZE,
+    cursor: Optional[tuple[datetime, int]] = None,
+    offset: int = 0,
+):
+    """
+    Search bookings in SQL and return (rows, next_cursor), newest first.
+
+      - text matches officer name, officer service number or weapon type
+        (case-insensitive substring).
+      - status is a BookingStatus or its name, e.g. "ISSUED".
+      - date_range is (start, end) on issued_at; start inclusive, end exclusive,
+        either side may be None.
+      - cursor works like list_bookings_page(). offset skips rows after the cursor;
+        prefer the cursor, an OFFSET still walks every skipped row.
+
+    Rows are plain result rows (no ORM objects) with the columns the booking table
+    shows: id, service_number, officer_name, weapon_type, duty_point, caliber,
+    ammunition_count, status, issued_at, returned_at, plus the officer_id,
+    weapon_id, duty_point_id and ammunition_id they were joined on.
+    """
+    stmt = (
+        select(
+            Booking.id,
+            User.service_number,
+            User.name.label("officer_name"),
+            Weapon.type.label("weapon_type"),
+            DutyPoint.location.label("duty_point"),
+            Ammunition.caliber,
+            Booking.ammunition_count,
+            Booking.status,
+            Booking.issued_at,
+            Booking.returned_at,
+            Booking.officer_id,
+            Booking.weapon_id,
+            Booking.duty_point_id,
+            Booking.ammunition_id,
+        )
+        .select_from(Booking)
+        .outerjoin(User, User.id == Booking.officer_id)
+        .outerjoin(Weapon, Weapon.id == Booking.weapon_id)
+        .outerjoin(DutyPoint, DutyPoint.id == Booking.duty_point_id)
+        .outerjoin(Ammunition, Ammunition.id == Booking.ammunition_id)
+        .where(*_booking_search_filters(text, status, date_range, _ordered_scan(db, text)))
+    )
+
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Booking.issued_at, Booking.id) < tuple_(*cursor))
+
+    stmt = stmt.order_by(Booking.issued_at.desc(), Booking.id.desc()).limit(limit + 1)
+    if offset:
+        stmt = stmt.offset(offset)
+    rows = db.execute(stmt).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1].issued_at, rows[-1].id)
+
+
+def count_search_bookings(
+    db: Session,
+    text: str = "",
+    status=None,
+    date_range: Optional[tuple[Optional[datetime], Optional[datetime]]] = None,
+) -> int:
+    """Number of rows search_bookings() would page through for the same filters."""
+    ordered_scan = _ordered_scan(db, text, COUNT_SCAN_SELECTIVITY)
+    filters = _booking_search_filters(text, status, date_range, ordered_scan)
+    return db.execute(select(func.count(Booking.id)).where(*filters)).scalar()
+
+
+# Bookings that still hold a weapon; PENDING/CANCELLED never left the armory
+OPEN_STATUSES = ("ISSUED", "OVERDUE")
+
+
+def count_bookings(db: Session, status) -> int:
+    """Number of bookings in a status (BookingStatus or its name)."""
+    return (
+        db.query(func.count(Booking.id))
+        .filter(Booking.status == getattr(status, "name", status))
+        .scalar()
+    )
+
+
+def get_open_booking_for_weapon(db: Session, weapon_id: int) -> Optional[Booking]:
+    """The booking currently holding this weapon, if any (seeks ix_bookings_weapon_returned)."""
+    return (
+        db.query(Booking)
+        .filter(
+            Booking.weapon_id == weapon_id,
+            Booking.returned_at.is_(None),
+            Booking.status.in_(OPEN_STATUSES),
+        )
+        .order_by(Booking.id.desc())
+        .first()
+    )
+
+
 def _get_or_fail(db: Session, model, id_: int, label: str):
     obj = db.get(model, id_)
     if not obj:
@@ -46,9 +260,10 @@ def create_booking(
 ) -> Booking:
     """
     Create a booking:
-      - Validates officer/weapon/duty_point.
+      - Validates officer/weapon/duty_point and that the weapon has no open booking.
       - If ammunition_count>0 then ammunition_id is required and stock >= count.
-      - Deducts stock immediately.
+      - Deducts stock with one conditional UPDATE (no read-modify-write race) and
+        logs an ISSUE movement in the ammunition ledger.
       - Marks weapon status = 'ISSUED' (string status model).
       - Sets issued_at and status='ISSUED'.
     """
@@ -59,21 +274,27 @@ def create_booking(
 
     if weapon.status and weapon.status.upper() in {"ISSUED", "ASSIGNED", "UNAVAILABLE"}:
         raise ValueError(f"Weapon {weapon.serial_number} is not available")
+    # weapons.status is free text and has drifted before; the booking rows are authoritative
+    open_booking = get_open_booking_for_weapon(db, weapon.id)
+    if open_booking is not None:
+        raise ValueError(
+            f"Weapon {weapon.serial_number} is still out on booking #{open_booking.id}"
+        )
 
-    ammo_obj = None
+    ammo_obj = issue = None
     if ammunition_count and ammunition_count > 0:
         if ammunition_id is None:
             raise ValueError("Ammunition is required when ammunition_count > 0")
         ammo_obj = _get_or_fail(db, Ammunition, ammunition_id, "Ammunition")
-        if ammo_obj.count is None:
-            ammo_obj.count = 0
-        if ammo_obj.count < ammunition_count:
+        # Check and deduct in one statement so concurrent bookings cannot oversell
+        issue = crud_ammunition.consume_stock(db, ammo_obj.id, ammunition_count)
+        if issue is None:
+            db.rollback()
+            db.refresh(ammo_obj)
             raise ValueError(
                 f"Insufficient stock for {ammo_obj.platform} {ammo_obj.caliber}: "
-                f"have {ammo_obj.count}, need {ammunition_count}"
+                f"have {ammo_obj.count or 0}, need {ammunition_count}"
             )
-        # Deduct stock
-        ammo_obj.count -= ammunition_count
 
     # Create booking
     booking = Booking(
@@ -94,6 +315,8 @@ def create_booking(
 
     db.add(booking)
     db.flush()  # assign id
+    if issue is not None:
+        issue.booking_id = booking.id
     db.commit()
     db.refresh(booking)
     return booking
@@ -110,7 +333,7 @@ def return_booking(
     """
     Return a booking:
       - Must not already be returned.
-      - Restores ammunition stock (if booking had ammunition_id).
+      - Restores ammunition stock (if booking had ammunition_id) as a RETURN movement.
       - Remarks are optional.
       - Sets returned_at and status='RETURNED'.
     """
@@ -133,11 +356,12 @@ def return_booking(
     # Remarks are optional regardless of mismatch
 
     # Restore stock if applicable
-    if booking.ammunition_id:
-        ammo_obj = _get_or_fail(db, Ammunition, booking.ammunition_id, "Ammunition")
-        if ammo_obj.count is None:
-            ammo_obj.count = 0
-        ammo_obj.count += ammunition_returned
+    if booking.ammunition_id and ammunition_returned:
+        restored = crud_ammunition.add_stock(
+            db, booking.ammunition_id, ammunition_returned, booking=booking
+        )
+        if restored is None:
+            raise ValueError(f"Ammunition not found (id={booking.ammunition_id})")
 
     # Close booking
     booking.ammunition_returned = ammunition_returned
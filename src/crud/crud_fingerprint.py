@@ -1,18 +1,50 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from src.models.fingerprint import Fingerprint
+from src.models.fingerprint import Fingerprint, template_digest
+from src.services.fingerprint_gallery import get_gallery
+from src.services.fingerprint_matcher import get_matcher
+from src.services.gallery_file import update_shared_file
 
 
 def enroll_fingerprint(db: Session, user_id: int, template_data: bytes):
-    """Store a fingerprint template for a user."""
-    # Fingerprint model column is named `template`
-    fingerprint = Fingerprint(user_id=user_id, template=template_data)
-    db.add(fingerprint)
-    db.commit()
+    """
+    Store (or replace) a user's fingerprint template and update the gallery.
+
+    Raises ValueError if another user is already enrolled with the same template.
+    """
+    fingerprint = get_fingerprint_by_user(db, user_id)
+    if fingerprint is not None:
+        fingerprint.template = template_data
+    else:
+        # Fingerprint model column is named `template`
+        fingerprint = Fingerprint(user_id=user_id, template=template_data)
+        db.add(fingerprint)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        owner = find_template_owner(db, template_data)
+        if owner is not None and owner != user_id:
+            raise ValueError("This fingerprint is already enrolled for another user") from None
+        raise
     db.refresh(fingerprint)
+    # Write-through only after the commit succeeded
+    get_gallery().upsert(user_id, template_data)
+    update_shared_file({user_id: template_data})
+    get_matcher().on_enrolled(user_id, template_data)
     return fingerprint
 
 
+def find_template_owner(db: Session, template_data: bytes):
+    """user_id already enrolled with exactly this template, or None (one index seek)."""
+    return (
+        db.query(Fingerprint.user_id)
+        .filter(Fingerprint.template_digest == template_digest(template_data))
+        .scalar()
+    )
+
+
 def get_fingerprint_by_user(db: Session, user_id: int):
     """Retrieve a user's stored fingerprint."""
     return db.query(Fingerprint).filter(Fingerprint.user_id == user_id).first()
@@ -20,11 +52,10 @@ def get_fingerprint_by_user(db: Session, user_id: int):
 
 def verify_fingerprint(db: Session, scanned_template: bytes):
     """
-    Compare scanned fingerprint template with stored templates.
-    In production, use SDK’s matching function. This is a placeholder.
+    Identify the user a scanned template belongs to, or None.
+
+    Matching is delegated to the active FingerprintMatcher (see
+    src/services/fingerprint_matcher.py); the default is the GalleryMatcher over the
+    process-wide in-memory gallery, which falls back to the digest index on a miss.
     """
-    fingerprints = db.query(Fingerprint).all()
-    for f in fingerprints:
-        if f.template == scanned_template:  # Replace with actual match algorithm
-            return f.user_id
-    return None
+    return get_matcher().identify(db, scanned_template)
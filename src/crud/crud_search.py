@@ -0,0 +1,106 @@
+# src/crud/crud_search.py
+import re
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models.search_index import SEARCH_SOURCES, search_index_populate
+
+# Weights for bm25(): kind and ref_id are UNINDEXED, a title hit counts 10x a detail hit
+_RANK = "bm25(search_index, 0.0, 0.0, 10.0, 1.0)"
+
+# The trigram tokenizer cannot match terms shorter than this through MATCH
+_MIN_TERM = 3
+
+
+# Escape character for LIKE patterns built by contains_pattern()
+LIKE_ESCAPE = "\\"
+
+
+def contains_pattern(text: str) -> str:
+    """'%text%' for LIKE ... ESCAPE LIKE_ESCAPE, with % and _ in text matched literally."""
+    for char in (LIKE_ESCAPE, "%", "_"):
+        text = text.replace(char, LIKE_ESCAPE + char)
+    return f"%{text}%"
+
+
+class SearchHit(NamedTuple):
+    kind: str  # "user", "weapon", "duty_point" or "ammunition"
+    ref_id: int  # primary key in the source table
+    title: str
+    detail: str
+    score: float  # bm25 score, lower is better
+
+
+def _terms(query_text: str) -> list[str]:
+    return [t for t in re.split(r"\s+", (query_text or "").strip()) if t]
+
+
+def _fts_query(terms: list[str]) -> str:
+    # Quote every term so punctuation in serials ("7.62x39", "GP-12") is literal
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def global_search(
+    db: Session,
+    query_text: str,
+    kinds: Optional[Iterable[str]] = None,
+    limit: Optional[int] = 20,
+) -> list[SearchHit]:
+    """
+    Search officers, weapons, duty points and ammunition in one ranked query.
+
+    Every whitespace-separated term must appear (case-insensitive substring) in the
+    title or detail of a hit. Hits are ordered by bm25, best first. Terms shorter
+    than three characters fall back to a LIKE scan of the index.
+    """
+    terms = _terms(query_text)
+    if not terms:
+        return []
+
+    # LIMIT -1 is SQLite for "no limit"
+    params: dict = {"limit": -1 if limit is None else limit}
+    kind_filter = ""
+    if kinds is not None:
+        kinds = [k for k in kinds if k in SEARCH_SOURCES]
+        if not kinds:
+            return []
+        names = []
+        for i, kind in enumerate(kinds):
+            params[f"kind{i}"] = kind
+            names.append(f":kind{i}")
+        kind_filter = f" AND kind IN ({', '.join(names)})"
+
+    long_terms = [t for t in terms if len(t) >= _MIN_TERM]
+    short_terms = [t for t in terms if len(t) < _MIN_TERM]
+
+    where = []
+    if long_terms:
+        where.append("search_index MATCH :match")
+        params["match"] = _fts_query(long_terms)
+    for i, term in enumerate(short_terms):
+        where.append(
+            f"(title LIKE :short{i} ESCAPE '{LIKE_ESCAPE}' "
+            f"OR detail LIKE :short{i} ESCAPE '{LIKE_ESCAPE}')"
+        )
+        params[f"short{i}"] = contains_pattern(term)
+
+    rank = _RANK if long_terms else "0.0"
+    sql = (
+        f"SELECT kind, ref_id, title, detail, {rank} AS score FROM search_index "
+        f"WHERE {' AND '.join(where)}{kind_filter} ORDER BY score, rowid LIMIT :limit"
+    )
+    return [SearchHit(*row) for row in db.execute(text(sql), params)]
+
+
+def search_ids(db: Session, query_text: str, kind: str, limit: Optional[int] = None) -> list[int]:
+    """Ranked primary keys of one kind, for screens that load their own rows."""
+    return [hit.ref_id for hit in global_search(db, query_text, kinds=[kind], limit=limit)]
+
+
+def rebuild_search_index(db: Session) -> None:
+    """Repopulate search_index from the source tables (after bulk imports/restores)."""
+    for statement in search_index_populate():
+        db.execute(text(statement))
+    db.commit()
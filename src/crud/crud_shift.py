@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from src.models.shift import Shift
+
+
+def get_active_shift(db: Session, armorer_id: int) -> Shift | None:
+    return (
+        db.query(Shift)
+        .filter(Shift.armorer_id == armorer_id, Shift.active.is_(True))
+        .order_by(Shift.id.desc())
+        .first()
+    )
+
+
+def is_shift_active(db: Session, shift_id: int, armorer_id: int) -> bool:
+    """Column query, so it always reads the database rather than the identity map."""
+    row = (
+        db.query(Shift.active).filter(Shift.id == shift_id, Shift.armorer_id == armorer_id).first()
+    )
+    return bool(row and row.active)
+
+
+def start_shift(db: Session, armorer_id: int) -> Shift:
+    """Return the armorer's active shift, starting one if there is none."""
+    shift = get_active_shift(db, armorer_id)
+    if shift:
+        return shift
+    shift = Shift(armorer_id=armorer_id, active=True)
+    db.add(shift)
+    db.commit()
+    db.refresh(shift)
+    return shift
+
+
+def end_shift(db: Session, armorer_id: int) -> Shift | None:
+    shift = get_active_shift(db, armorer_id)
+    if not shift:
+        return None
+    shift.active = False
+    shift.ended_at = datetime.utcnow()
+    db.commit()
+    return shift
@@ -0,0 +1,21 @@
+# src/crud/crud_stats.py
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models.stats import REBUILD_STATS, STATS_ROW_ID, DashboardStats
+
+
+def get_dashboard_stats(db: Session) -> DashboardStats:
+    """The materialized counter row; rebuilt on the spot if it is missing."""
+    stats = db.get(DashboardStats, STATS_ROW_ID)
+    if stats is None:
+        stats = rebuild_stats(db)
+    return stats
+
+
+def rebuild_stats(db: Session) -> DashboardStats:
+    """Recompute every dashboard counter from the source tables."""
+    db.execute(text(REBUILD_STATS))
+    db.commit()
+    stats = db.get(DashboardStats, STATS_ROW_ID, populate_existing=True)
+    return stats
@@ -1,10 +1,16 @@
+from sqlalchemy import func, or_, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.crud.crud_search import LIKE_ESCAPE, contains_pattern
 from src.models.user import User
+from src.services.fingerprint_gallery import get_gallery
+from src.services.fingerprint_matcher import get_matcher
+from src.services.gallery_file import update_shared_file
 
 
-# Create a new user (hashes password with User.set_password)
+# Create a new user (hashes password with User.set_password unless a hash is given,
+# e.g. one computed off the UI thread by src.services.auth_worker)
 def create_user(
     db: Session,
     service_number: str,
@@ -12,8 +18,12 @@ def create_user(
     telephone: str,
     unit: str,
     role: str,
-    password: str,
+    password: str | None = None,
+    *,
+    hashed_password: str | None = None,
 ) -> bool:
+    if not password and not hashed_password:
+        raise ValueError("A password or hashed_password is required")
     user = User(
         service_number=service_number.strip(),
         name=name.strip(),
@@ -21,7 +31,10 @@ def create_user(
         unit=(unit or "").strip(),
         role=(role or "officer").strip().lower(),
     )
-    user.set_password(password)
+    if hashed_password:
+        user.hashed_password = hashed_password
+    else:
+        user.set_password(password)
 
     db.add(user)
     try:
@@ -41,6 +54,34 @@ def get_all_users(db: Session) -> list[User]:
     return db.query(User).order_by(User.id.desc()).all()
 
 
+def _user_search_filter(text: str):
+    like = contains_pattern(text.strip())
+    return or_(
+        User.name.like(like, escape=LIKE_ESCAPE),
+        User.service_number.like(like, escape=LIKE_ESCAPE),
+        User.telephone.like(like, escape=LIKE_ESCAPE),
+        User.role.like(like, escape=LIKE_ESCAPE),
+    )
+
+
+def search_users(db: Session, text: str = "", offset: int = 0, limit: int | None = None):
+    """
+    One window of the users table (newest first, like get_all_users) as plain rows
+    with the columns the user table shows: id, name, service_number, telephone, unit.
+    """
+    q = db.query(User.id, User.name, User.service_number, User.telephone, User.unit)
+    if (text or "").strip():
+        q = q.filter(_user_search_filter(text))
+    return q.order_by(User.id.desc()).offset(offset).limit(limit).all()
+
+
+def count_users(db: Session, text: str = "") -> int:
+    q = db.query(func.count(User.id))
+    if (text or "").strip():
+        q = q.filter(_user_search_filter(text))
+    return q.scalar()
+
+
 def update_user(
     db: Session,
     user_id: int,
@@ -77,10 +118,27 @@ def update_user_password(db: Session, user_id: int, new_password: str) -> bool:
     return True
 
 
+def replace_password_hash(db: Session, user_id: int, old_hash: str, new_hash: str) -> bool:
+    """
+    Swap in a rehashed password only if the stored hash is still old_hash, so a
+    password change that raced with the rehash is never overwritten.
+    """
+    result = db.execute(
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
 def delete_user(db: Session, user_id: int) -> bool:
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         return False
     db.delete(user)
     db.commit()
+    get_gallery().remove(user_id)
+    update_shared_file(removed=(user_id,))
+    get_matcher().on_removed(user_id)
     return True
@@ -1,5 +1,7 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from src.crud.crud_search import LIKE_ESCAPE, contains_pattern
 from src.models.weapon import Weapon
 
 
@@ -30,6 +32,33 @@ def get_all_weapons(db: Session):
     return db.query(Weapon).all()
 
 
+# One window of weapons for the (virtual) weapons table
+def search_weapons(db: Session, serial: str = "", offset: int = 0, limit: int | None = None):
+    """Weapons whose serial number contains `serial`, in id order, as plain rows."""
+    q = db.query(
+        Weapon.id,
+        Weapon.type,
+        Weapon.serial_number,
+        Weapon.status,
+        Weapon.condition,
+        Weapon.last_service,
+    )
+    if (serial or "").strip():
+        q = q.filter(
+            Weapon.serial_number.like(contains_pattern(serial.strip()), escape=LIKE_ESCAPE)
+        )
+    return q.order_by(Weapon.id).offset(offset).limit(limit).all()
+
+
+def count_weapons(db: Session, serial: str = "") -> int:
+    q = db.query(func.count(Weapon.id))
+    if (serial or "").strip():
+        q = q.filter(
+            Weapon.serial_number.like(contains_pattern(serial.strip()), escape=LIKE_ESCAPE)
+        )
+    return q.scalar()
+
+
 # Update a weapon
 def update_weapon(
     db: Session,
@@ -1,16 +1,116 @@
 import os
+from dataclasses import dataclass
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # Define the database file path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, "database", "sqlite.db")
+DB_URL = f"sqlite:///{DB_PATH}"
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """SQLite connection tuning applied through PRAGMAs on every new connection.
+
+    cache_size follows SQLite semantics: negative values are KiB, positive are pages.
+    """
+
+    name: str
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -16000
+    mmap_size: int = 0
+    busy_timeout: int = 5000
+    temp_store: str = "MEMORY"
+
+    def pragmas(self) -> list[tuple[str, object]]:
+        return [
+            ("journal_mode", self.journal_mode),
+            ("synchronous", self.synchronous),
+            ("cache_size", self.cache_size),
+            ("mmap_size", self.mmap_size),
+            ("busy_timeout", self.busy_timeout),
+            ("temp_store", self.temp_store),
+        ]
+
+
+ENGINE_PROFILES = {
+    # Single armory PC: WAL so the dashboard can read while a booking commits.
+    "kiosk": EngineProfile(
+        name="kiosk",
+        cache_size=-16000,  # 16 MiB
+        mmap_size=64 * 1024 * 1024,
+        busy_timeout=5000,
+    ),
+    # Several terminals/processes on the same host writing at shift change.
+    # WAL requires all writers on one machine (not a network share).
+    "multi-terminal": EngineProfile(
+        name="multi-terminal",
+        cache_size=-8000,  # 8 MiB per connection, there are more of them
+        mmap_size=32 * 1024 * 1024,
+        busy_timeout=15000,
+    ),
+    # Read-heavy report generation: big cache and mmap, patient with writers.
+    "reporting": EngineProfile(
+        name="reporting",
+        cache_size=-64000,  # 64 MiB
+        mmap_size=256 * 1024 * 1024,
+        busy_timeout=30000,
+    ),
+    # Throwaway databases for tests and benchmarks: no durability needed.
+    "test": EngineProfile(
+        name="test",
+        journal_mode="MEMORY",
+        synchronous="OFF",
+        cache_size=-8000,
+        mmap_size=0,
+        busy_timeout=1000,
+    ),
+}
+
+DEFAULT_PROFILE = os.environ.get("ARMORY_DB_PROFILE", "kiosk")
+
+
+def _apply_pragmas(dbapi_connection, profile: EngineProfile):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in profile.pragmas():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+def create_engine_for_profile(profile="kiosk", url: str | None = None, **engine_kwargs):
+    """Build a SQLite engine tuned by one of ENGINE_PROFILES (or an EngineProfile)."""
+    if isinstance(profile, str):
+        try:
+            profile = ENGINE_PROFILES[profile]
+        except KeyError:
+            raise ValueError(
+                f"Unknown engine profile '{profile}'. "
+                f"Choose one of: {', '.join(sorted(ENGINE_PROFILES))}"
+            ) from None
+
+    connect_args = engine_kwargs.pop("connect_args", {})
+    connect_args.setdefault("check_same_thread", False)
+    # busy_timeout is also enforced by the PRAGMA; this keeps pysqlite's own wait in line.
+    connect_args.setdefault("timeout", profile.busy_timeout / 1000)
+
+    new_engine = create_engine(url or DB_URL, connect_args=connect_args, **engine_kwargs)
+
+    @event.listens_for(new_engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record):
+        _apply_pragmas(dbapi_connection, profile)
+
+    return new_engine
+
 
 # Initialize SQLAlchemy ORM
 Base = declarative_base()
-engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
+engine = create_engine_for_profile(DEFAULT_PROFILE)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Ensure all models are registered with Base metadata
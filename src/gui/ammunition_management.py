@@ -9,10 +9,17 @@ from src.crud.crud_ammunition import (
     create_ammunition,
     delete_ammunition,
     get_ammunition_by_id,
+    has_ledger_history,
     list_ammunition,
     update_ammunition,
 )
-from src.database import SessionLocal
+from src.gui.live_search import LiveSearch
+from src.gui.live_updates import ChangeFollower
+from src.gui.table_sync import TableSync
+from src.models.ammunition import Ammunition
+from src.services.change_events import ChangeOp
+from src.services.reference_data import get_reference_data
+from src.session_scope import read_scope, write_scope
 
 LOW_STOCK_BG = "#3b2f2f"  # subtle dark-maroon highlight row if low stock
 
@@ -32,7 +39,6 @@ class AmmunitionManagement(ctk.CTkFrame):
         self.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
         self.parent = parent
-        self.db_session = SessionLocal()
         self.dialog_open = False
         self.search_var = tk.StringVar()
 
@@ -84,7 +90,14 @@ class AmmunitionManagement(ctk.CTkFrame):
         )
         search_entry.pack(side=tk.LEFT, padx=10, pady=10, fill=tk.X, expand=True)
 
-        ctk.CTkButton(actions, text="Search", width=100, command=self.refresh_table).pack(
+        self.live_search = LiveSearch(
+            self,
+            query=lambda db, text: list_ammunition(db, query_text=text, limit=500),
+            on_results=lambda _text, rows: self._show_rows(rows),
+        )
+        self.live_search.attach(search_entry, lambda: self.search_var.get().strip())
+
+        ctk.CTkButton(actions, text="Search", width=100, command=self.search_ammunition).pack(
             side=tk.LEFT, padx=10, pady=10
         )
         ctk.CTkButton(
@@ -93,7 +106,7 @@ class AmmunitionManagement(ctk.CTkFrame):
             width=100,
             fg_color="#4CAF50",
             hover_color="#388E3C",
-            command=lambda: (self.search_var.set(""), self.refresh_table()),
+            command=self.reload_table,
         ).pack(side=tk.LEFT, padx=10, pady=10)
 
         # Buttons row
@@ -197,10 +210,15 @@ class AmmunitionManagement(ctk.CTkFrame):
             self.tree.column(col, width=width, anchor=anchor)
 
         self.tree.tag_configure("low", background=LOW_STOCK_BG)
+        self.table_sync = TableSync(self.tree)
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.tree.bind("<Double-1>", lambda e: self.open_edit_dialog())
 
+        self._rows = []  # as last shown
         self.refresh_table()
+        # Stock moves with every booking and return; those writes (and the
+        # dialogs' own) come back as change events
+        self.follower = ChangeFollower(self, (Ammunition,), self._apply_changes)
 
     def _on_mousewheel(self, event):
         try:
@@ -211,7 +229,6 @@ class AmmunitionManagement(ctk.CTkFrame):
         return "break"
 
     def _on_dialog_saved(self):
-        self.refresh_table()
         try:
             CTkMessagebox(self, title="Saved", message="Ammunition saved.", icon="check")
         except Exception:
@@ -239,31 +256,58 @@ class AmmunitionManagement(ctk.CTkFrame):
         self.dialog_open = False
 
     def _on_destroy(self, _event=None):
-        try:
-            if self.db_session:
-                self.db_session.close()
-        except Exception:
-            pass
+        self.live_search.cancel()
 
     def _clear_search(self):
         self.search_var.set("")
         self.refresh_table()
 
-    def refresh_table(self):
-        for row_id in self.tree.get_children():
-            self.tree.delete(row_id)
+    def search_ammunition(self):
+        self.live_search.run_now(self.search_var.get().strip())
 
+    def refresh_table(self):
+        """Diff the table against the current query; selection and scroll survive."""
+        self.live_search.cancel()
         query_text = self.search_var.get().strip()
-        rows = list_ammunition(self.db_session, query_text=query_text, limit=500)
-
-        for ammo in rows:
-            tags = []
-            if ammo.reorder_level and ammo.count is not None and ammo.count <= ammo.reorder_level:
-                tags.append("low")
-            self.tree.insert(
-                "",
-                "end",
-                values=(
+        with read_scope("ammunition") as db:
+            if not query_text:
+                # The full list is the shared read model's, reloaded after stock writes
+                self._show_rows(get_reference_data().ammunition(db))
+            else:
+                self._show_rows(list_ammunition(db, query_text=query_text, limit=500))
+
+    def reload_table(self):
+        """Refresh button: re-read stock even if the write came from another terminal."""
+        get_reference_data().mark_stale(["ammunition"])
+        self.search_var.set("")
+        self.refresh_table()
+
+    def on_activate(self):
+        """Shown again from the screen cache: re-read only if stock changed meanwhile."""
+        self.follower.activate()
+
+    def _apply_changes(self, changes):
+        """Re-read just the updated lines; inserts and deletes re-read the list."""
+        if changes is None or any(c.op is not ChangeOp.UPDATE or c.id is None for c in changes):
+            self.refresh_table()
+            return
+        shown = {ammo.id for ammo in self._rows}
+        ids = {c.id for c in changes if c.id in shown}
+        if not ids:
+            return
+        with read_scope("ammunition") as db:
+            fresh = {i: get_ammunition_by_id(db, i) for i in ids}
+        if None in fresh.values():
+            self.refresh_table()  # deleted before we got to it
+            return
+        self._show_rows([fresh.get(ammo.id, ammo) for ammo in self._rows])
+
+    def _show_rows(self, rows):
+        self._rows = list(rows)
+        self.table_sync.apply(
+            (
+                ammo.id,
+                (
                     ammo.id,
                     ammo.category or "",
                     ammo.platform or "",
@@ -272,19 +316,24 @@ class AmmunitionManagement(ctk.CTkFrame):
                     ammo.reorder_level or 0,
                     ammo.bin_location or "",
                 ),
-                tags=tags,
+                ["low"] if self._is_low_stock(ammo) else [],
             )
+            for ammo in self._rows
+        )
+
+    @staticmethod
+    def _is_low_stock(ammo) -> bool:
+        if not ammo.reorder_level or ammo.count is None:
+            return False
+        return ammo.count <= ammo.reorder_level
 
     def _selected_ammo_id(self) -> int | None:
         selected = self.tree.selection()
         if not selected:
             return None
-        values = self.tree.item(selected[0], "values")
-        if not values:
-            return None
         try:
-            return int(values[0])
-        except Exception:
+            return int(selected[0])  # items are keyed by ammunition id
+        except ValueError:
             return None
 
     def delete_selected(self):
@@ -292,6 +341,17 @@ class AmmunitionManagement(ctk.CTkFrame):
         if not ammo_id:
             CTkMessagebox(self, title="Info", message="Select a row first.", icon="info")
             return
+        with read_scope("ammunition") as db:
+            has_history = has_ledger_history(db, ammo_id)
+        if has_history:
+            CTkMessagebox(
+                self,
+                title="Info",
+                message="This line has stock movements in the ledger and cannot be deleted. "
+                "Adjust its stock to zero instead.",
+                icon="info",
+            )
+            return
 
         confirm = CTkMessagebox(
             self,
@@ -304,15 +364,13 @@ class AmmunitionManagement(ctk.CTkFrame):
         if confirm.get() != "Delete":
             return
 
-        ok = delete_ammunition(self.db_session, ammo_id)
+        with write_scope("ammunition") as db:
+            ok = delete_ammunition(db, ammo_id)
         if ok:
-            self.refresh_table()
             CTkMessagebox(self, title="Deleted", message="Ammunition line removed.", icon="check")
         else:
             CTkMessagebox(self, title="Error", message="Delete failed.", icon="warning")
 
-        self.refresh_table()
-
 
 class AddEditAmmoDialog(ctk.CTkToplevel):
     def __init__(self, parent, mode: str, ammo_id: int | None = None, on_saved=None):
@@ -323,7 +381,6 @@ class AddEditAmmoDialog(ctk.CTkToplevel):
         self.parent = parent
         self.mode = mode
         self.on_saved = on_saved
-        self.db_session = parent.db_session
         self.ammo_id = ammo_id
 
         # layout
@@ -388,7 +445,8 @@ class AddEditAmmoDialog(ctk.CTkToplevel):
         self._center()
 
     def _load_ammo(self):
-        ammo = get_ammunition_by_id(self.db_session, self.ammo_id)
+        with read_scope("ammunition") as db:
+            ammo = get_ammunition_by_id(db, self.ammo_id)
         if not ammo:
             messagebox.showerror("Error", "Ammunition not found.")
             self.destroy()
@@ -423,34 +481,36 @@ class AddEditAmmoDialog(ctk.CTkToplevel):
             messagebox.showwarning("Invalid numbers", "Count and Reorder level must be integers.")
             return
 
-        if self.mode == "add":
-            create_ammunition(
-                self.db_session,
-                category=category,
-                platform=platform,
-                caliber=caliber,
-                count=desired_count,
-                reorder_level=reorder_level,
-                bin_location=bin_location,
-            )
-        else:
-            # Update meta fields first
-            updated = update_ammunition(
-                self.db_session,
-                ammo_id=self.ammo_id,
-                category=category,
-                platform=platform,
-                caliber=caliber,
-                reorder_level=reorder_level,
-                bin_location=bin_location,
-            )
-            if not updated:
-                messagebox.showerror("Error", "Update failed.")
-                return
-            # Normalize stock by delta if user changed the count
-            current = updated.count or 0
-            if desired_count != current:
-                adjust_stock(self.db_session, self.ammo_id, desired_count - current)
+        updated = None
+        with write_scope("ammunition") as db:
+            if self.mode == "add":
+                create_ammunition(
+                    db,
+                    category=category,
+                    platform=platform,
+                    caliber=caliber,
+                    count=desired_count,
+                    reorder_level=reorder_level,
+                    bin_location=bin_location,
+                )
+            else:
+                # Update meta fields first
+                updated = update_ammunition(
+                    db,
+                    ammo_id=self.ammo_id,
+                    category=category,
+                    platform=platform,
+                    caliber=caliber,
+                    reorder_level=reorder_level,
+                    bin_location=bin_location,
+                )
+                # Normalize stock by delta if user changed the count
+                if updated and desired_count != (updated.count or 0):
+                    adjust_stock(db, self.ammo_id, desired_count - (updated.count or 0))
+        if self.mode != "add" and updated is None:
+            # Outside the write scope: it holds the write lock
+            messagebox.showerror("Error", "Update failed.")
+            return
 
         # Notify parent & close
         if callable(self.on_saved):
@@ -6,6 +6,7 @@ Simulates fingerprint authentication with password fallback.
 import customtkinter as ctk
 
 from src.models.user import User
+from src.services.auth_worker import deliver, get_auth_worker
 
 
 class AuthDialog(ctk.CTkToplevel):
@@ -24,6 +25,7 @@ class AuthDialog(ctk.CTkToplevel):
         self.user_label = user_label
         self.callback_on_success = callback_on_success
         self.authenticated = False
+        self._checking = False
 
         self.title(f"Authenticate {user_label}")
         self.geometry("450x500")
@@ -126,6 +128,9 @@ class AuthDialog(ctk.CTkToplevel):
         )
         self.status_label.pack(pady=(0, 10))
 
+        # Shown while the password hash is checked in the background
+        self.progress = ctk.CTkProgressBar(main_frame, mode="indeterminate", width=300)
+
         # Cancel button
         cancel_btn = ctk.CTkButton(
             main_frame,
@@ -153,7 +158,30 @@ class AuthDialog(ctk.CTkToplevel):
             self.status_label.configure(text="Please enter a password", text_color="red")
             return
 
-        if self.user.verify_password(password):
+        if self._checking:
+            return
+
+        # bcrypt takes a few hundred ms: check it off the Tk thread
+        self._set_checking(True)
+        future = get_auth_worker().verify(password, self.user.hashed_password, user_id=self.user.id)
+        deliver(self, future, self._on_password_checked, self._on_password_error)
+
+    def _set_checking(self, checking: bool):
+        self._checking = checking
+        state = "disabled" if checking else "normal"
+        self.password_btn.configure(state=state)
+        self.fingerprint_btn.configure(state=state)
+        if checking:
+            self.status_label.configure(text="Verifying password...", text_color="gray")
+            self.progress.pack(pady=(0, 10), before=self.status_label)
+            self.progress.start()
+        else:
+            self.progress.stop()
+            self.progress.pack_forget()
+
+    def _on_password_checked(self, ok: bool):
+        self._set_checking(False)
+        if ok:
             self.status_label.configure(text="Password verified successfully!", text_color="green")
             self.authenticated = True
             self._on_success()
@@ -163,6 +191,10 @@ class AuthDialog(ctk.CTkToplevel):
             )
             self.password_entry.delete(0, "end")
 
+    def _on_password_error(self, exc: BaseException):
+        self._set_checking(False)
+        self.status_label.configure(text=f"Verification failed: {exc}", text_color="red")
+
     def _on_success(self):
         """Handle successful authentication."""
         # Store callback and user_id before destroying
@@ -5,10 +5,12 @@ from tkinter import ttk
 
 import customtkinter as ctk
 from CTkMessagebox import CTkMessagebox
-from sqlalchemy import func
 
 from src.crud import crud_booking
 from src.gui.auth_dialog import AuthDialog
+from src.gui.live_search import LiveSearch
+from src.gui.live_updates import ChangeFollower, update_table
+from src.gui.virtual_table import Column, KeysetPages, VirtualTable
 
 # from src.database import SessionLocal
 from src.models.ammunition import Ammunition
@@ -16,14 +18,41 @@ from src.models.booking import Booking
 from src.models.duty_point import DutyPoint
 from src.models.user import User
 from src.models.weapon import Weapon
+from src.services.auth_service import AuthService
+from src.services.auth_worker import deliver
+from src.services.db_executor import get_db_executor
+from src.services.lookup_index import NgramIndex, get_booking_lookups
+from src.services.reference_data import get_reference_data
+from src.session_scope import expunge, screen_session, write_scope
+
+# What a booking row shows of other tables, by the row field holding their id
+BOOKING_ROW_REFERENCES = {
+    User: "officer_id",
+    Weapon: "weapon_id",
+    DutyPoint: "duty_point_id",
+    Ammunition: "ammunition_id",
+}
 
 
 class BookingManagement(ctk.CTkFrame):
-    def __init__(self, master, db, armorer=None, *args, **kwargs):
+    def __init__(
+        self,
+        master,
+        db=None,
+        armorer=None,
+        shift_ticket=None,
+        on_ticket_issued=None,
+        *args,
+        **kwargs,
+    ):
         super().__init__(master, corner_radius=10, *args, **kwargs)
         self.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-        self.db = db
+        # The auth flows keep ORM objects across dialogs and callbacks, so the screen
+        # has a session of its own; it hands its connection back whenever Tk is idle
+        self.db = db if db is not None else screen_session(self, "booking")
         self.armorer = armorer  # Current logged-in armorer
+        self.shift_ticket = shift_ticket  # Signed at login; see AuthService.issue_shift_ticket
+        self.on_ticket_issued = on_ticket_issued
         self.parent = master  # parent reference for dialogs
 
         # === Top toolbar ===
@@ -61,19 +90,6 @@ class BookingManagement(ctk.CTkFrame):
         tree_frame = ctk.CTkFrame(self, fg_color="transparent")
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(5, 10))
 
-        columns = (
-            "id",
-            "service_no",
-            "officer_name",
-            "weapon",
-            "duty_point",
-            "ammunition",
-            "ammo_count",
-            "status",
-            "issued_at",
-            "returned_at",
-        )
-
         # Treeview styling
         style = ttk.Style()
         style.configure(
@@ -99,57 +115,51 @@ class BookingManagement(ctk.CTkFrame):
             foreground=[("selected", "white")],
         )
 
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=15)
-
-        # Headings
-        self.tree.heading("id", text="ID")
-        self.tree.heading("service_no", text="Service No")
-        self.tree.heading("officer_name", text="Officer Name")
-        self.tree.heading("weapon", text="Weapon")
-        self.tree.heading("duty_point", text="Duty Point")
-        self.tree.heading("ammunition", text="Ammunition")
-        self.tree.heading("ammo_count", text="Ammo Count")
-        self.tree.heading("status", text="Status")
-        self.tree.heading("issued_at", text="Issued At")
-        self.tree.heading("returned_at", text="Returned At")
-
-        # Column widths
-        self.tree.column("id", width=50, anchor="center")
-        self.tree.column("service_no", width=120, anchor="w")
-        self.tree.column("officer_name", width=180, anchor="w")
-        self.tree.column("weapon", width=150, anchor="w")
-        self.tree.column("duty_point", width=130, anchor="w")
-        self.tree.column("ammunition", width=150, anchor="w")
-        self.tree.column("ammo_count", width=100, anchor="center")
-        self.tree.column("status", width=100, anchor="center")
-        self.tree.column("issued_at", width=130, anchor="center")
-        self.tree.column("returned_at", width=130, anchor="center")
-
-        # Scrollbars
-        self.tree_scroll_y = ctk.CTkScrollbar(
+        # Only the visible rows exist as Treeview items; pages are fetched as the
+        # user scrolls, seeking on ix_bookings_issued_at_id page after page.
+        self._search_text = ""
+        self._pages = KeysetPages(self._fetch_page)
+        self.table = VirtualTable(
             tree_frame,
-            orientation="vertical",
-            command=self.tree.yview,
-            fg_color="#2b2b2b",
-            button_color="#1f6aa5",
-            button_hover_color="#2980b9",
+            columns=[
+                Column("id", "ID", 50, "center"),
+                Column("service_no", "Service No", 120),
+                Column("officer_name", "Officer Name", 180),
+                Column("weapon", "Weapon", 150),
+                Column("duty_point", "Duty Point", 130),
+                Column("ammunition", "Ammunition", 150),
+                Column("ammo_count", "Ammo Count", 100, "center"),
+                Column("status", "Status", 100, "center"),
+                Column("issued_at", "Issued At", 130, "center"),
+                Column("returned_at", "Returned At", 130, "center"),
+            ],
+            fetch_rows=self._pages,
+            count_rows=lambda: crud_booking.count_search_bookings(self.db, self._search_text),
+            row_key=lambda row: row.id,
+            row_values=lambda _index, row: self._booking_row_values(row),
+            empty_message="No bookings available yet",
+            page_size=crud_booking.BOOKING_PAGE_SIZE,
+            scrollbar_style={
+                "fg_color": "#2b2b2b",
+                "button_color": "#1f6aa5",
+                "button_hover_color": "#2980b9",
+            },
         )
-        self.tree_scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.tree_scroll_x = ctk.CTkScrollbar(
-            tree_frame,
-            orientation="horizontal",
-            command=self.tree.xview,
-            fg_color="#2b2b2b",
-            button_color="#1f6aa5",
-            button_hover_color="#2980b9",
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.table.tree
+
+        # Search as you type: count + first page run off the UI thread
+        self.live_search = LiveSearch(
+            self,
+            query=self._search_first_page,
+            on_results=self._show_search_results,
+            on_error=self._on_search_error,
         )
-        self.tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.live_search.attach(self.search_entry, lambda: (self.search_var.get() or "").strip())
+        self.bind("<Destroy>", self._on_destroy, add="+")
 
-        self.tree.configure(
-            yscrollcommand=self.tree_scroll_y.set, xscrollcommand=self.tree_scroll_x.set
-        )
-        self.tree.pack(fill=tk.BOTH, expand=True)
+        # Normally started at login already; covers other entry points
+        get_reference_data().warm()
 
         # === Bottom action buttons ===
         button_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -173,8 +183,12 @@ class BookingManagement(ctk.CTkFrame):
             command=self.return_weapon,
         ).pack(side=tk.LEFT)
 
-        # Initial table load
+        # Initial table load; bookings, returns and edits to what the rows show
+        # come back as change events, from this terminal or another one
         self.refresh_table()
+        self.follower = ChangeFollower(
+            self, (Booking, *BOOKING_ROW_REFERENCES), self._apply_changes
+        )
 
     # ---------------------------------------------------------------------
     # Table helpers
@@ -195,22 +209,40 @@ class BookingManagement(ctk.CTkFrame):
         except Exception:
             return "—"
 
-    def filter_combobox(self, combobox, full_values: list[str]):
-        """Filter CTkComboBox values based on current text (case-insensitive)."""
+    def filter_combobox(self, combobox, index: NgramIndex):
+        """Show the best matches for the current text (case-insensitive) from index."""
         try:
-            query = (combobox.get() or "").lower()
-            if not query:
-                combobox.configure(values=full_values)
-                return
-            filtered = [v for v in full_values if query in v.lower()]
-            combobox.configure(values=(filtered or full_values))
+            query = (combobox.get() or "").strip()
+            matches = index.search(query) if query else []
+            combobox.configure(values=matches or index.search("", limit=None))
         except Exception:
-            # Best-effort: reset to full list on any error
+            # Best-effort: reset to the unfiltered list on any error
             try:
-                combobox.configure(values=full_values)
+                combobox.configure(values=index.search("", limit=None))
             except Exception:
                 pass
 
+    def _authenticate_armorer(self, win, armorer, on_verified):
+        """
+        Re-authenticate the logged-in armorer: a valid shift ticket stands in for the
+        dialog (an HMAC check instead of bcrypt); otherwise run AuthDialog and renew
+        the ticket once it succeeds.
+        """
+        auth = AuthService(self.db)
+        if auth.verify_shift_ticket(self.shift_ticket, armorer.id):
+            on_verified(armorer.id)
+            return
+
+        def on_dialog_verified(user_id):
+            if user_id == armorer.id:
+                with write_scope("booking") as db:  # may start a shift: not on the screen session
+                    self.shift_ticket = AuthService(db).issue_shift_ticket(armorer.id)
+                if self.on_ticket_issued:
+                    self.on_ticket_issued(self.shift_ticket)
+            on_verified(user_id)
+
+        AuthDialog(win, armorer, "Armorer", on_dialog_verified)
+
     def _safe_messagebox(self, parent, **kwargs):
         """Show CTkMessagebox safely when a parent Toplevel has a grab set.
 
@@ -261,52 +293,40 @@ class BookingManagement(ctk.CTkFrame):
                     # Parent was destroyed or can't re-grab, that's okay
                     pass
 
+    def _booking_row_values(self, row) -> tuple:
+        """Format one crud_booking.search_bookings() row for the table."""
+        return (
+            row.id,
+            row.service_number or "N/A",
+            row.officer_name or "N/A",
+            row.weapon_type or "N/A",
+            row.duty_point or "N/A",
+            row.caliber or "—",
+            row.ammunition_count or 0,
+            self._format_status(row.status),
+            row.issued_at.strftime("%Y-%m-%d %H:%M") if row.issued_at else "—",
+            row.returned_at.strftime("%Y-%m-%d %H:%M") if row.returned_at else "—",
+        )
+
+    def _fetch_page(self, cursor, offset, limit):
+        """One page for the current view (full history or active search)."""
+        return crud_booking.search_bookings(
+            self.db, self._search_text, limit=limit, cursor=cursor, offset=offset
+        )
+
+    def _reload(self, empty_message: str, search_text: str):
+        # Same view (e.g. after a booking/return): keep scroll and selection and
+        # let the table diff the visible rows; a new filter starts from the top.
+        keep_position = search_text == self._search_text
+        self._search_text = search_text
+        self.table.empty_message = empty_message
+        self.table.refresh(keep_position=keep_position)
+
     def refresh_table(self):
-        """Reload all booking data."""
+        """Reload booking data; a changed view starts again from the first page."""
+        self.live_search.cancel()
         try:
-            for row in self.tree.get_children():
-                self.tree.delete(row)
-
-            bookings = crud_booking.list_bookings(self.db)
-            if not bookings:
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        "—",
-                        "—",
-                        "No bookings available yet",
-                        "—",
-                        "—",
-                        "—",
-                        "—",
-                        "—",
-                        "—",
-                        "—",
-                    ),
-                )
-                return
-
-            for b in bookings:
-                status_text = self._format_status(b.status)
-
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        b.id,
-                        getattr(b.officer, "service_number", "N/A") if b.officer else "N/A",
-                        getattr(b.officer, "name", "N/A") if b.officer else "N/A",
-                        getattr(b.weapon, "type", "N/A") if b.weapon else "N/A",
-                        getattr(b.duty_point, "location", "N/A") if b.duty_point else "N/A",
-                        getattr(b.ammunition, "caliber", "—") if b.ammunition else "—",
-                        b.ammunition_count or 0,
-                        status_text,
-                        b.issued_at.strftime("%Y-%m-%d %H:%M") if b.issued_at else "—",
-                        b.returned_at.strftime("%Y-%m-%d %H:%M") if b.returned_at else "—",
-                    ),
-                )
-
+            self._reload("No bookings available yet", "")
         except Exception as e:
             print(f"Error loading bookings: {e}")
             CTkMessagebox(
@@ -315,64 +335,44 @@ class BookingManagement(ctk.CTkFrame):
                 icon="warning",
             )
 
+    def on_activate(self):
+        """Shown again from the screen cache: re-read only if bookings changed meanwhile."""
+        expunge(self.db)
+        self.follower.activate()
+
+    def _apply_changes(self, changes):
+        """New bookings re-read the visible rows; updates re-fetch only their pages."""
+        update_table(self.table, changes, Booking, BOOKING_ROW_REFERENCES)
+
     def search_booking(self):
         """Search bookings by officer name, service number, or weapon."""
-        try:
-            query = (self.search_var.get() or "").strip().lower()
-            for row in self.tree.get_children():
-                self.tree.delete(row)
-
-            all_bookings = crud_booking.list_bookings(self.db)
-            results = []
-            for b in all_bookings:
-                officer_name = (getattr(b.officer, "name", "") or "").lower() if b.officer else ""
-                officer_service_number = (
-                    (getattr(b.officer, "service_number", "") or "").lower() if b.officer else ""
-                )
-                weapon_type = (getattr(b.weapon, "type", "") or "").lower() if b.weapon else ""
-                if query in officer_name or query in officer_service_number or query in weapon_type:
-                    results.append(b)
-
-            if not results:
-                self.tree.insert(
-                    "", "end", values=("—", "—", "No matching results", "", "", "", "", "", "", "")
-                )
-                return
-
-            for b in results:
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        b.id,
-                        getattr(b.officer, "service_number", "N/A") if b.officer else "N/A",
-                        getattr(b.officer, "name", "N/A") if b.officer else "N/A",
-                        getattr(b.weapon, "type", "N/A") if b.weapon else "N/A",
-                        getattr(b.duty_point, "location", "N/A") if b.duty_point else "N/A",
-                        getattr(b.ammunition, "caliber", "—") if b.ammunition else "—",
-                        b.ammunition_count or 0,
-                        self._format_status(b.status),
-                        b.issued_at.strftime("%Y-%m-%d %H:%M") if b.issued_at else "—",
-                        b.returned_at.strftime("%Y-%m-%d %H:%M") if b.returned_at else "—",
-                    ),
-                )
-        except Exception as e:
-            print(f"Error searching bookings: {e}")
-            CTkMessagebox(
-                title="Error", message=f"Error searching bookings: {str(e)}", icon="warning"
-            )
+        self.live_search.run_now((self.search_var.get() or "").strip())
+
+    def _search_first_page(self, db, text):
+        """Runs on the search pool with its own session."""
+        rows, _next_cursor = crud_booking.search_bookings(
+            db, text, limit=crud_booking.BOOKING_PAGE_SIZE
+        )
+        return crud_booking.count_search_bookings(db, text), rows
+
+    def _show_search_results(self, text, result):
+        count, rows = result
+        keep_position = text == self._search_text
+        self._search_text = text
+        self.table.empty_message = "No matching results" if text else "No bookings available yet"
+        self.table.show_results(count, rows, keep_position=keep_position)
+
+    def _on_search_error(self, e):
+        print(f"Error searching bookings: {e}")
+        CTkMessagebox(title="Error", message=f"Error searching bookings: {str(e)}", icon="warning")
+
+    def _on_destroy(self, event):
+        if event.widget == self:
+            self.live_search.cancel()
 
     def _selected_booking_id(self) -> int | None:
         """Return selected booking id from the tree (or None)."""
-        sel = self.tree.selection()
-        if not sel:
-            return None
-        values = self.tree.item(sel[0], "values")
-        try:
-            bid = int(values[0])
-            return bid
-        except (ValueError, IndexError):
-            return None
+        return self.table.selected_key()
 
     # ---------------------------------------------------------------------
     # Booking modal
@@ -387,29 +387,18 @@ class BookingManagement(ctk.CTkFrame):
         form_frame = ctk.CTkFrame(win)
         form_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
-        try:
-            self.db.expire_all()
-        except Exception:
-            pass
-
-        officers = self.db.query(User).order_by(User.name.asc()).all()
-        duty_points = self.db.query(DutyPoint).order_by(DutyPoint.location.asc()).all()
-        weapons = (
-            self.db.query(Weapon)
-            .filter(func.upper(Weapon.status) == "AVAILABLE")
-            .order_by(Weapon.serial_number.asc())
-            .all()
-        )
-        ammos = (
-            self.db.query(Ammunition)
-            .order_by(Ammunition.platform.asc(), Ammunition.caliber.asc())
-            .all()
-        )
+        expunge(self.db)
+
+        # Everything comes from the shared read model warmed at login: officers,
+        # duty points and available weapons from the indexes, ammo stock from a
+        # snapshot that is reloaded after every stock write.
+        lookups = get_booking_lookups(self.db)
+        ammos = get_reference_data().ammunition(self.db)
 
         # Display lists and mappings
-        officer_display = [f"{u.service_number} — {u.name}" for u in officers]
-        dp_display = [dp.location for dp in duty_points]
-        weapon_serials = [w.serial_number for w in weapons]
+        officer_display = lookups.officers.search("", limit=None)  # by name
+        dp_display = lookups.duty_points.search("", limit=None)
+        weapon_serials = lookups.weapons.search("", limit=None)
         ammo_display = [
             "None",
             *[f"{a.id} — {a.platform} ({a.caliber}) • stock={a.count}" for a in ammos],
@@ -421,7 +410,7 @@ class BookingManagement(ctk.CTkFrame):
         if officer_display:
             self.officer_combobox.set("")
         self.officer_combobox.bind(
-            "<KeyRelease>", lambda e: self.filter_combobox(self.officer_combobox, officer_display)
+            "<KeyRelease>", lambda e: self.filter_combobox(self.officer_combobox, lookups.officers)
         )
         self.officer_combobox.pack(fill=tk.X)
 
@@ -431,7 +420,7 @@ class BookingManagement(ctk.CTkFrame):
         if dp_display:
             self.duty_combobox.set("")
         self.duty_combobox.bind(
-            "<KeyRelease>", lambda e: self.filter_combobox(self.duty_combobox, dp_display)
+            "<KeyRelease>", lambda e: self.filter_combobox(self.duty_combobox, lookups.duty_points)
         )
         self.duty_combobox.pack(fill=tk.X)
 
@@ -441,7 +430,7 @@ class BookingManagement(ctk.CTkFrame):
         if weapon_serials:
             self.weapon_combobox.set("")
         self.weapon_combobox.bind(
-            "<KeyRelease>", lambda e: self.filter_combobox(self.weapon_combobox, weapon_serials)
+            "<KeyRelease>", lambda e: self.filter_combobox(self.weapon_combobox, lookups.weapons)
         )
         self.weapon_combobox.pack(fill=tk.X)
 
@@ -458,7 +447,9 @@ class BookingManagement(ctk.CTkFrame):
         def submit():
             # Validate selections
             try:
-                if not officers or not duty_points or not weapons:
+                if not (
+                    len(lookups.officers) and len(lookups.duty_points) and len(lookups.weapons)
+                ):
                     self._safe_messagebox(
                         win,
                         title="Error",
@@ -468,25 +459,20 @@ class BookingManagement(ctk.CTkFrame):
                     return
 
                 # Officer mapping
-                chosen_officer = self.officer_combobox.get().strip()
-                if chosen_officer not in officer_display:
+                officer_id = lookups.officers.key_for(self.officer_combobox.get().strip())
+                if officer_id is None:
                     raise ValueError("Please select a valid officer from the list")
-                o_index = officer_display.index(chosen_officer)
-                officer_id = officers[o_index].id
 
                 # Duty point mapping
-                chosen_dp = self.duty_combobox.get().strip()
-                if chosen_dp not in dp_display:
+                duty_point_id = lookups.duty_points.key_for(self.duty_combobox.get().strip())
+                if duty_point_id is None:
                     raise ValueError("Please select a valid duty point from the list")
-                dp_index = dp_display.index(chosen_dp)
-                duty_point_id = duty_points[dp_index].id
 
                 # Weapon mapping by serial number
                 chosen_serial = self.weapon_combobox.get().strip()
-                if chosen_serial not in weapon_serials:
+                weapon_id = lookups.weapons.key_for(chosen_serial)
+                if weapon_id is None:
                     raise ValueError("Please select a valid weapon serial from the list")
-                w_index = weapon_serials.index(chosen_serial)
-                weapon_id = weapons[w_index].id
 
                 # Ammo (optional)
                 ammo_choice = ammo_var.get()
@@ -521,7 +507,8 @@ class BookingManagement(ctk.CTkFrame):
                         )
                         return
 
-                    # Stock check, then deduct
+                    # Early stock check for a friendly message; create_booking deducts
+                    # atomically and has the final say
                     if (ammo_row.count or 0) < ammunition_count:
                         stock_msg = (
                             f"Only {ammo_row.count or 0} in stock for "
@@ -534,7 +521,6 @@ class BookingManagement(ctk.CTkFrame):
                             icon="warning",
                         )
                         return
-                    ammo_row.count = (ammo_row.count or 0) - ammunition_count
                     ammunition_id = ammo_row.id
 
                 # Get armorer (current logged-in user)
@@ -559,7 +545,7 @@ class BookingManagement(ctk.CTkFrame):
                     return
 
                 armorer_id = armorer.id
-                officer = officers[o_index]
+                officer = self.db.query(User).get(officer_id)
 
                 # Authentication flow: First authenticate armorer, then officer
                 def authenticate_armorer():
@@ -586,44 +572,29 @@ class BookingManagement(ctk.CTkFrame):
                                 )
                                 return
 
-                            # Both authenticated - create booking
-                            try:
-                                # Re-verify weapon is still available before creating booking
-                                weapon_check = self.db.query(Weapon).get(weapon_id)
-                                if not weapon_check or weapon_check.status.upper() != "AVAILABLE":
-                                    weapon_serial = weapon_serials[w_index]
-                                    error_msg = (
-                                        f"Weapon {weapon_serial} is no longer available. "
-                                        "Please select another weapon."
-                                    )
-                                    self._safe_messagebox(
-                                        win,
-                                        title="Error",
-                                        message=error_msg,
-                                        icon="warning",
-                                    )
-                                    return
-
-                                booking = crud_booking.create_booking(
-                                    self.db,
-                                    officer_id=officer_id,
-                                    armorer_id=armorer_id,
-                                    weapon_id=weapon_id,
-                                    duty_point_id=duty_point_id,
-                                    ammunition_id=ammunition_id,
-                                    ammunition_count=ammunition_count,
-                                )
+                            # Both authenticated - create booking on the DB writer thread.
+                            # create_booking re-checks there that the weapon is still
+                            # available, under the write lock.
+                            future = get_db_executor().write(
+                                crud_booking.create_booking,
+                                officer_id=officer_id,
+                                armorer_id=armorer_id,
+                                weapon_id=weapon_id,
+                                duty_point_id=duty_point_id,
+                                ammunition_id=ammunition_id,
+                                ammunition_count=ammunition_count,
+                            )
 
+                            def on_booked(booking):
                                 # Close booking form first
                                 try:
                                     win.destroy()
                                 except Exception:
                                     pass
 
-                                # Refresh table first (important: do this before showing message)
-                                self.refresh_table()
+                                # The new row arrives with the booking's change events
 
-                                # Show success message (wrap in try-except so refresh still happens)
+                                # Show success message
                                 try:
                                     self._safe_messagebox(
                                         self,
@@ -632,22 +603,21 @@ class BookingManagement(ctk.CTkFrame):
                                         icon="check",
                                     )
                                 except Exception as msg_error:
-                                    # If messagebox fails, at least log it but don't prevent refresh
+                                    # If messagebox fails, at least log it
                                     print(f"Error showing success message: {msg_error}")
-                            except Exception as e:
-                                try:
-                                    self.db.rollback()
-                                except Exception:
-                                    pass
+
+                            def on_failed(e):
                                 self._safe_messagebox(
                                     win, title="Error", message=str(e), icon="warning"
                                 )
 
+                            deliver(win, future, on_booked, on_failed)
+
                         # Authenticate officer
                         AuthDialog(win, officer, "Officer", on_officer_verified)
 
-                    # Authenticate armorer
-                    AuthDialog(win, armorer, "Armorer", on_armorer_verified)
+                    # Authenticate armorer (skipped while the shift ticket is valid)
+                    self._authenticate_armorer(win, armorer, on_armorer_verified)
 
                 # Start authentication flow
                 authenticate_armorer()
@@ -813,29 +783,25 @@ class BookingManagement(ctk.CTkFrame):
                                 )
                                 return
 
-                            # Both authenticated - process return
-                            try:
-                                from src.crud import crud_booking
-
-                                crud_booking.return_booking(
-                                    self.db,
-                                    booking_id=booking.id,
-                                    ammunition_returned=returned_cnt,
-                                    remarks=text_remarks,
-                                    weapon_status=status_var.get(),
-                                )
+                            # Both authenticated - process return on the DB writer thread
+                            future = get_db_executor().write(
+                                crud_booking.return_booking,
+                                booking_id=booking.id,
+                                ammunition_returned=returned_cnt,
+                                remarks=text_remarks,
+                                weapon_status=status_var.get(),
+                            )
 
+                            def on_returned(_booking):
                                 # Close return form first
                                 try:
                                     win.destroy()
                                 except Exception:
                                     pass
 
-                                # Refresh table first (important: do this before showing message)
-                                self.refresh_table()
+                                # The row updates with the return's change events
 
                                 # Show success message on main window
-                                # (wrap in try-except so refresh still happens)
                                 try:
                                     self._safe_messagebox(
                                         self,
@@ -844,22 +810,21 @@ class BookingManagement(ctk.CTkFrame):
                                         icon="check",
                                     )
                                 except Exception as msg_error:
-                                    # If messagebox fails, at least log it but don't prevent refresh
+                                    # If messagebox fails, at least log it
                                     print(f"Error showing success message: {msg_error}")
-                            except Exception as e:
-                                try:
-                                    self.db.rollback()
-                                except Exception:
-                                    pass
+
+                            def on_failed(e):
                                 self._safe_messagebox(
                                     win, title="Error", message=str(e), icon="warning"
                                 )
 
+                            deliver(win, future, on_returned, on_failed)
+
                         # Authenticate officer
                         AuthDialog(win, officer, "Officer", on_officer_verified)
 
-                    # Authenticate armorer
-                    AuthDialog(win, armorer, "Armorer", on_armorer_verified)
+                    # Authenticate armorer (skipped while the shift ticket is valid)
+                    self._authenticate_armorer(win, armorer, on_armorer_verified)
 
                 # Start authentication flow
                 authenticate_armorer()
@@ -1,13 +1,15 @@
 # src/gui/duty_point_management.py
 import customtkinter as ctk
 from tkinter import messagebox
-from src.database import SessionLocal
 from src.crud import crud_duty_point
+from src.gui.live_updates import ChangeFollower
+from src.models.duty_point import DutyPoint
+from src.services.change_events import ChangeOp
+from src.session_scope import read_scope, write_scope
 
 class DutyPointManagement(ctk.CTkFrame):
     def __init__(self, parent):
         super().__init__(parent)
-        self.db = SessionLocal()
 
         # Title
         ctk.CTkLabel(self, text="Duty Point Management",
@@ -46,7 +48,31 @@ class DutyPointManagement(ctk.CTkFrame):
         ctk.CTkLabel(header, text="Actions", anchor="w",
                      font=ctk.CTkFont(weight="bold")).grid(row=0, column=3, sticky="w", padx=(10,0))
 
+        self._rows = {}  # duty point id -> (location label, description label, edit button)
         self.refresh_list()
+        # Adds, edits and deletes (here or on another terminal) arrive as change events
+        self.follower = ChangeFollower(self, (DutyPoint,), self._apply_changes)
+
+    def on_activate(self):
+        """Shown again from the screen cache: re-read only if duty points changed meanwhile."""
+        self.follower.activate()
+
+    def _apply_changes(self, changes):
+        """Edits re-read just their rows; adds and deletes rebuild the list."""
+        if changes is None or any(c.op is not ChangeOp.UPDATE or c.id not in self._rows
+                                  for c in changes):
+            self.refresh_list()
+            return
+        with read_scope("duty_points") as db:
+            dps = [db.get(DutyPoint, dp_id) for dp_id in {c.id for c in changes}]
+        if None in dps:
+            self.refresh_list()
+            return
+        for dp in dps:
+            loc, desc, edit = self._rows[dp.id]
+            loc.configure(text=dp.location or "")
+            desc.configure(text=dp.description or "")
+            edit.configure(command=lambda d=dp: self.open_edit_dialog(d))
 
     # --- Actions ---
     def add_duty_point(self):
@@ -55,21 +81,24 @@ class DutyPointManagement(ctk.CTkFrame):
         if not location:
             messagebox.showerror("Error", "Location is required.")
             return
-        _, err = crud_duty_point.create_duty_point(self.db, location, description)
+        with write_scope("duty_points") as db:
+            _, err = crud_duty_point.create_duty_point(db, location, description)
         if err:
             messagebox.showerror("Error", err)
         else:
             self.location_entry.delete(0, "end")
             self.description_entry.delete(0, "end")
-            self.refresh_list()
 
     def refresh_list(self):
         # clear rows (keep header at row 0)
         for child in self.list_container.winfo_children():
             if isinstance(child, ctk.CTkFrame) and child.grid_info().get("row", 0) != 0:
                 child.destroy()
+        self._rows = {}
 
-        dps = crud_duty_point.get_all_duty_points(self.db)
+        # Rows keep their loaded columns after the scope closes (id, location, description)
+        with read_scope("duty_points") as db:
+            dps = crud_duty_point.get_all_duty_points(db)
         for i, dp in enumerate(dps, start=1):
             row = ctk.CTkFrame(self.list_container, fg_color="transparent")
             row.grid(row=i, column=0, sticky="ew", padx=6, pady=4)
@@ -85,17 +114,18 @@ class DutyPointManagement(ctk.CTkFrame):
             actions = ctk.CTkFrame(row, fg_color="transparent")
             actions.grid(row=0, column=3, sticky="w", padx=(10,0))
 
-            ctk.CTkButton(actions, text="Edit", width=60,
-                          command=lambda d=dp: self.open_edit_dialog(d)).pack(side="left", padx=(0, 6))
+            edit = ctk.CTkButton(actions, text="Edit", width=60,
+                                 command=lambda d=dp: self.open_edit_dialog(d))
+            edit.pack(side="left", padx=(0, 6))
             ctk.CTkButton(actions, text="Delete", width=70, fg_color="#c75450", hover_color="#b44743",
                           command=lambda d=dp: self._delete(d.id)).pack(side="left")
+            self._rows[dp.id] = (loc, desc, edit)
 
     def _delete(self, dp_id: int):
-        ok, err = crud_duty_point.delete_duty_point(self.db, dp_id)
+        with write_scope("duty_points") as db:
+            ok, err = crud_duty_point.delete_duty_point(db, dp_id)
         if err:
             messagebox.showerror("Error", err)
-        else:
-            self.refresh_list()
 
     # --- Simple inline edit dialog ---
     def open_edit_dialog(self, duty_point):
@@ -116,14 +146,12 @@ class DutyPointManagement(ctk.CTkFrame):
             # we will do a straightforward delete+create for simplicity or you can add an update in CRUD
             # Better: write an update method. Here's a quick inline version to avoid more files:
             try:
-                duty_point.location = (loc.get() or "").strip()
-                duty_point.description = (desc.get() or "").strip() or None
-                self.db.commit()
-                self.db.refresh(duty_point)
+                with write_scope("duty_points") as db:
+                    row = db.get(DutyPoint, duty_point.id)
+                    row.location = (loc.get() or "").strip()
+                    row.description = (desc.get() or "").strip() or None
                 dialog.destroy()
-                self.refresh_list()
             except Exception as e:
-                self.db.rollback()
                 messagebox.showerror("Error", str(e))
 
         ctk.CTkButton(dialog, text="Save Changes", command=save).pack(pady=12)
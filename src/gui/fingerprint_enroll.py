@@ -4,7 +4,7 @@ import customtkinter as ctk
 from CTkMessagebox import CTkMessagebox
 
 from src.crud import crud_fingerprint
-from src.database import SessionLocal
+from src.services.db_executor import get_db_executor
 from src.services.fingerprint_service import (
     FingerprintCaptureError,
     capture_fingerprint,
@@ -14,7 +14,6 @@ from src.services.fingerprint_service import (
 class FingerprintEnroll(ctk.CTkToplevel):
     def __init__(self, master, user_id):
         super().__init__(master)
-        self.db = SessionLocal()
         self.user_id = user_id
         self.title("Enroll Fingerprint")
         self.geometry("450x300")
@@ -96,46 +95,43 @@ class FingerprintEnroll(ctk.CTkToplevel):
         try:
             # This will attempt to use Windows Biometric Framework or available hardware
             template_data = capture_fingerprint()
-
-            # Update UI in main thread
-            self.after(0, self._enrollment_success, template_data)
-
         except FingerprintCaptureError as e:
             error_msg = str(e)
             self.after(0, self._enrollment_error, error_msg)
+            return
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
             self.after(0, self._enrollment_error, error_msg)
+            return
 
-    def _enrollment_success(self, template_data):
-        """Handle successful fingerprint capture."""
         try:
-            # Check if fingerprint already exists for this user
-            existing = crud_fingerprint.get_fingerprint_by_user(self.db, self.user_id)
-            if existing:
-                # Update existing fingerprint
-                existing.template = template_data
-                self.db.commit()
-                self.db.refresh(existing)
-            else:
-                # Create new fingerprint
-                crud_fingerprint.enroll_fingerprint(self.db, self.user_id, template_data)
-
-            self.status_label.configure(
-                text="✅ Fingerprint enrolled successfully", text_color="green"
-            )
-            self.progress_label.pack_forget()
-            self.capture_btn.configure(state="normal", text="Scan Fingerprint")
-
-            self._safe_messagebox(
-                title="Success", message="Fingerprint registered successfully!", icon="check"
-            )
-
-            # Close after short delay
-            self.after(1500, self.destroy)
-
+            # Creates or replaces the template and updates the in-memory gallery;
+            # the DB writer thread runs it, this thread just waits for the commit
+            get_db_executor().write(
+                crud_fingerprint.enroll_fingerprint, self.user_id, template_data
+            ).result()
+        except ValueError as e:  # already enrolled for another user
+            self.after(0, self._enrollment_error, str(e))
+            return
         except Exception as e:
-            self._enrollment_error(f"Database error: {str(e)}")
+            self.after(0, self._enrollment_error, f"Database error: {str(e)}")
+            return
+
+        # Update UI in main thread
+        self.after(0, self._enrollment_success)
+
+    def _enrollment_success(self):
+        """Handle a stored fingerprint."""
+        self.status_label.configure(text="✅ Fingerprint enrolled successfully", text_color="green")
+        self.progress_label.pack_forget()
+        self.capture_btn.configure(state="normal", text="Scan Fingerprint")
+
+        self._safe_messagebox(
+            title="Success", message="Fingerprint registered successfully!", icon="check"
+        )
+
+        # Close after short delay
+        self.after(1500, self.destroy)
 
     def _enrollment_error(self, error_msg):
         """Handle fingerprint capture error."""
@@ -4,7 +4,7 @@ import customtkinter as ctk
 from CTkMessagebox import CTkMessagebox
 
 from src.crud import crud_fingerprint
-from src.database import SessionLocal
+from src.services.db_executor import get_db_executor
 from src.services.fingerprint_service import (
     FingerprintCaptureError,
     capture_fingerprint,
@@ -14,7 +14,6 @@ from src.services.fingerprint_service import (
 class FingerprintVerify(ctk.CTkToplevel):
     def __init__(self, master, callback_on_success):
         super().__init__(master)
-        self.db = SessionLocal()
         self.callback_on_success = callback_on_success
         self.title("Verify Fingerprint")
         self.geometry("450x280")
@@ -97,7 +96,11 @@ class FingerprintVerify(ctk.CTkToplevel):
             scanned_template = capture_fingerprint()
 
             # Verify against stored templates
-            user_id = crud_fingerprint.verify_fingerprint(self.db, scanned_template)
+            user_id = (
+                get_db_executor()
+                .read(crud_fingerprint.verify_fingerprint, scanned_template)
+                .result()
+            )
 
             # Update UI in main thread
             if user_id:
@@ -0,0 +1,161 @@
+"""
+Debounced search-as-you-type.
+
+Typing in a search box schedules a query DEBOUNCE_MS after the last keystroke.
+The query runs on a small background pool with its own session, so the event
+loop keeps handling keys while SQLite works. Every query gets a generation
+number; when a newer one starts, the older one is interrupted
+(sqlite3.Connection.interrupt) and whatever it returns is dropped, so only the
+latest text ever reaches the table. Results are handed back to the Tk main
+thread through deliver() (widget.after polling).
+
+    self.live_search = LiveSearch(
+        self,
+        query=lambda db, text: (count_users(db, text), search_users(db, text, 0, 100)),
+        on_results=self._show_search_results,
+    )
+    self.live_search.attach(self.search_entry)
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from src.services.auth_worker import deliver
+
+DEBOUNCE_MS = 150
+POLL_MS = 15
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """The process-wide search pool, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search")
+        return _executor
+
+
+class QueryCancelled(Exception):
+    """A newer search superseded this one before it finished."""
+
+
+class LiveSearch:
+    """Runs query(db, text) off the main thread and reports only the newest result."""
+
+    def __init__(
+        self,
+        widget,
+        query: Callable,
+        on_results: Callable[[str, object], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        delay_ms: int = DEBOUNCE_MS,
+        session_factory: Optional[Callable] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.widget = widget
+        self.query = query
+        self.on_results = on_results
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self._session_factory = session_factory
+        self._executor = executor
+        self._generation = 0
+        self._pending_job = None
+        self._future: Optional[Future] = None
+        self._running: dict[int, object] = {}  # generation -> DBAPI connection
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def attach(self, entry, get_text: Optional[Callable[[], str]] = None):
+        """Search as the user types in entry; Enter searches at once."""
+        get_text = get_text or entry.get
+        entry.bind("<KeyRelease>", lambda e: self.schedule(get_text()), add="+")
+        entry.bind("<Return>", lambda e: self.run_now(get_text()), add="+")
+
+    def schedule(self, text: str):
+        """(Re)start the debounce timer for text."""
+        self._cancel_timer()
+        self._pending_job = self.widget.after(self.delay_ms, self._start, text)
+
+    def run_now(self, text: str) -> Future:
+        self._cancel_timer()
+        return self._start(text)
+
+    def cancel(self):
+        """Forget the pending and running searches (e.g. the screen is closing)."""
+        self._cancel_timer()
+        self._generation += 1
+        self._interrupt_older(self._generation)
+
+    def _cancel_timer(self):
+        if self._pending_job is not None:
+            try:
+                self.widget.after_cancel(self._pending_job)
+            except Exception:
+                pass  # widget already destroyed
+            self._pending_job = None
+
+    def _start(self, text: str) -> Future:
+        self._pending_job = None
+        self._generation += 1
+        generation = self._generation
+        if self._future is not None:
+            self._future.cancel()  # still queued: never runs
+        self._interrupt_older(generation)
+
+        executor = self._executor or get_search_executor()
+        self._future = executor.submit(self._run, generation, text)
+        deliver(
+            self.widget,
+            self._future,
+            lambda result: self._finish(generation, text, result),
+            lambda exc: self._fail(generation, exc),
+            poll_ms=POLL_MS,
+        )
+        return self._future
+
+    def _run(self, generation: int, text: str):
+        if self._session_factory is None:
+            from src.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        db = self._session_factory()
+        try:
+            with self._lock:
+                if generation != self._generation:
+                    raise QueryCancelled()
+                # Checked out now so a newer search can interrupt this one mid-query
+                self._running[generation] = db.connection().connection.dbapi_connection
+            return self.query(db, text)
+        finally:
+            with self._lock:
+                self._running.pop(generation, None)
+            db.close()
+
+    def _interrupt_older(self, generation: int):
+        with self._lock:
+            for older, connection in self._running.items():
+                if older < generation:
+                    try:
+                        connection.interrupt()
+                    except Exception:
+                        pass
+
+    def _finish(self, generation: int, text: str, result):
+        if generation == self._generation:
+            self.on_results(text, result)
+
+    def _fail(self, generation: int, exc: BaseException):
+        if generation != self._generation:
+            return  # superseded; interrupted queries end up here too
+        if self.on_error is not None:
+            self.on_error(exc)
+        else:
+            print(f"Error searching: {exc}")
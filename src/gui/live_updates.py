@@ -0,0 +1,87 @@
+"""
+Screens kept in step with committed changes (see src/services/change_events.py).
+
+    self.follower = ChangeFollower(self, (Booking, Weapon), self._apply_changes)
+
+    def on_activate(self):
+        self.follower.activate()    # catch up on what changed while hidden
+
+While the screen is packed, every batch of changes the bus delivers goes to
+apply(changes) on the Tk thread. While it is hidden in the screen cache the
+changes only mark it stale; activate() then re-reads once with apply(None) when
+it is shown again, and a screen nothing changed under comes back as it was left.
+
+update_table() is the usual apply for a VirtualTable: updated rows re-fetch just
+the cached pages holding them, inserts and deletes (which move rows and change
+the count) re-read the visible window.
+"""
+
+from typing import Callable, Iterable, Mapping, Optional
+
+from src.services.change_events import Change, ChangeOp, entity_name, get_change_bus
+
+
+class ChangeFollower:
+    """Delivers changes to a visible screen; marks a hidden one stale."""
+
+    def __init__(self, widget, entities: Iterable, apply: Callable, bus=None):
+        self.widget = widget
+        self.apply = apply
+        self.stale = False
+        self.bus = bus or get_change_bus()
+        self.subscription = self.bus.subscribe_widget(widget, entities, self._deliver)
+
+    def _deliver(self, changes: list[Change]):
+        if _shown(self.widget):
+            self.apply(changes)
+        else:
+            self.stale = True
+
+    def activate(self) -> bool:
+        """Re-read if changes arrived while the screen was hidden."""
+        if not self.stale:
+            return False
+        self.stale = False
+        self.apply(None)
+        return True
+
+    def close(self):
+        self.bus.unsubscribe(self.subscription)
+
+
+def _shown(widget) -> bool:
+    try:
+        return widget.winfo_manager() != ""  # "" once ScreenCache pack_forgets it
+    except Exception:
+        return False
+
+
+def update_table(table, changes: Optional[list[Change]], entity, related: Optional[Mapping] = None):
+    """
+    Apply changes to a VirtualTable whose rows are entity rows with an `id`.
+
+    related maps other entities the rows show to the row field holding their
+    id, e.g. {User: "officer_id"}; their updates and deletes re-fetch the pages
+    of the rows that refer to them, their inserts concern no shown row.
+    changes=None (stale) re-reads the visible window.
+    """
+    if changes is None:
+        table.refresh()
+        return
+    own = entity_name(entity)
+    fields = {own: "id"}
+    fields.update((entity_name(e), field) for e, field in (related or {}).items())
+    wanted: dict[str, set] = {}
+    for change in changes:
+        field = fields.get(change.entity)
+        if field is None:
+            continue
+        if change.id is None or (change.entity == own and change.op is not ChangeOp.UPDATE):
+            table.refresh()
+            return
+        if change.op is not ChangeOp.INSERT:
+            wanted.setdefault(field, set()).add(change.id)
+    if wanted:
+        table.reload_rows(
+            lambda row: any(getattr(row, field) in ids for field, ids in wanted.items())
+        )
@@ -1,11 +1,33 @@
+import importlib
+import threading
 from tkinter import messagebox
 
 import customtkinter as ctk
 
-from src.database import SessionLocal
-from src.gui.fingerprint_verify import FingerprintVerify
-from src.models.user import User
-from src.services.auth_service import AuthService
+from src.services.auth_worker import deliver, get_auth_worker
+
+# Only the window itself is imported up front. The database layer (SQLAlchemy
+# plus every model) and the auth service load on a background thread once the
+# window is on screen, usually well before the first Login click; the
+# management screens load when ArmoryApp first shows them.
+PRELOAD_MODULES = ("src.database", "src.services.auth_service")
+PRELOAD_DELAY_MS = 100
+
+
+def preload(modules=PRELOAD_MODULES) -> threading.Thread:
+    """Import modules on a daemon thread; a later import just waits for it."""
+
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception:  # surfaces again, with a traceback, on first real use
+                pass
+
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    return thread
+
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("dark")
@@ -51,6 +73,9 @@ class LoginApp(ctk.CTk):
         )
         self.error_label.pack(pady=(4, 0))
 
+        # ✅ Shown while the password hash is checked in the background
+        self.progress = ctk.CTkProgressBar(self.login_frame, mode="indeterminate", width=250)
+
         # ✅ Login Button
         self.login_button = ctk.CTkButton(
             self.login_frame,
@@ -72,7 +97,12 @@ class LoginApp(ctk.CTk):
         )
         self.footer_label.pack(pady=(10, 20))
 
+        self.after(PRELOAD_DELAY_MS, preload)
+
     def login(self):
+        if self.login_button.cget("state") == "disabled":
+            return  # a check is already running
+
         service_number = self.username_entry.get().strip()
         password = self.password_entry.get()
 
@@ -84,18 +114,39 @@ class LoginApp(ctk.CTk):
             return
 
         # ✅ Database Authentication
-        session = SessionLocal()
-        try:
-            user = session.query(User).filter_by(service_number=service_number).first()
-        finally:
-            session.close()
+        from src.models.user import User
+        from src.session_scope import read_scope
+
+        with read_scope("login") as db:
+            user = db.query(User).filter_by(service_number=service_number).first()
 
         if not user:
             self.error_label.configure(text="Invalid credentials")
             return
 
-        # Ensure your User model exposes verify_password() or change this to user.check_password()
-        if not user.verify_password(password):
+        # bcrypt takes a few hundred ms: check it off the Tk thread
+        self._set_busy(True)
+        future = get_auth_worker().verify(password, user.hashed_password, user_id=user.id)
+        deliver(
+            self,
+            future,
+            lambda ok: self._on_password_checked(user, ok),
+            self._on_password_error,
+        )
+
+    def _set_busy(self, busy: bool):
+        if busy:
+            self.login_button.configure(state="disabled", text="Verifying...")
+            self.progress.pack(pady=(4, 0), before=self.login_button)
+            self.progress.start()
+        else:
+            self.progress.stop()
+            self.progress.pack_forget()
+            self.login_button.configure(state="normal", text="Login")
+
+    def _on_password_checked(self, user, ok: bool):
+        self._set_busy(False)
+        if not ok:
             self.error_label.configure(text="Invalid credentials")
             return
 
@@ -106,15 +157,29 @@ class LoginApp(ctk.CTk):
             self.error_label.configure(text="Only Armorers can log in.")
             return
 
+        # The password was just checked: open a shift ticket so bookings this
+        # shift don't make the armorer re-enter it every time
+        from src.services.auth_service import AuthService
+        from src.session_scope import write_scope
+
+        with write_scope("login") as db:
+            shift_ticket = AuthService(db).issue_shift_ticket(user.id)
+
         # Route directly to dashboard without success popup
-        self._launch_main(user)
+        self._launch_main(user, shift_ticket)
+
+    def _on_password_error(self, exc: BaseException):
+        self._set_busy(False)
+        self.error_label.configure(text=f"Login failed: {exc}")
 
     def open_fingerprint_login(self):
-        db = SessionLocal()
-        auth = AuthService(db)
+        from src.gui.fingerprint_verify import FingerprintVerify
+        from src.services.auth_service import AuthService
+        from src.session_scope import read_scope
 
         def on_success(user_id):
-            user = auth.get_user_by_id(user_id)
+            with read_scope("login") as db:
+                user = AuthService(db).get_user_by_id(user_id)
             if user:
                 self.login_success(user)
             else:
@@ -122,7 +187,12 @@ class LoginApp(ctk.CTk):
 
         FingerprintVerify(self, callback_on_success=on_success)
 
-    def _launch_main(self, user):
+    def _launch_main(self, user, shift_ticket=None):
+        # Start loading the screens' reference data while the main window builds
+        from src.services.reference_data import get_reference_data
+
+        get_reference_data().warm()
+
         # Import here to avoid circular import at module import time
         from src.main import ArmoryApp
 
@@ -132,7 +202,7 @@ class LoginApp(ctk.CTk):
                 self.withdraw()
             except Exception:
                 pass
-            app = ArmoryApp(user)
+            app = ArmoryApp(user, shift_ticket=shift_ticket)
             app.mainloop()
         except Exception as e:
             import traceback
@@ -0,0 +1,146 @@
+"""
+Keep-alive cache for the main window's management screens.
+
+Rebuilding a screen on every sidebar click costs its widgets, styles, a new
+session and a full data load. ScreenCache builds each screen once, hides it
+with pack_forget when another one is shown and packs it back with the same
+options; on the way back the screen's on_activate() hook refreshes only what
+changed (the tables diff their rows by id, see table_sync.py):
+
+    screens = ScreenCache()
+    screens.show("weapons", lambda: WeaponManagement(content_frame))
+
+Hidden screens are evicted least recently used first once there are more than
+max_screens of them or their estimated footprint passes budget_bytes. The
+estimate counts Tk widgets and Treeview items under each screen and is taken
+when it is hidden, so a duty point list with a thousand rows goes before a
+virtualized table holding fifty.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Optional
+
+MAX_SCREENS = 4
+BUDGET_BYTES = 4 * 1024 * 1024
+WIDGET_BYTES = 2048  # a Tk widget plus its Tcl command, options and bindings
+ITEM_BYTES = 256  # one Treeview row
+
+
+def estimate_bytes(widget) -> int:
+    """Rough memory held by widget and everything below it."""
+    total = 0
+    stack = [widget]
+    while stack:
+        current = stack.pop()
+        total += WIDGET_BYTES
+        get_children = getattr(current, "get_children", None)  # ttk.Treeview rows
+        if get_children is not None:
+            total += ITEM_BYTES * len(get_children())
+        stack.extend(current.winfo_children())
+    return total
+
+
+class ScreenCache:
+    """Named screens that stay alive while hidden; LRU eviction past a budget."""
+
+    def __init__(
+        self,
+        max_screens: int = MAX_SCREENS,
+        budget_bytes: int = BUDGET_BYTES,
+        measure: Callable[[object], int] = estimate_bytes,
+    ):
+        self.max_screens = max_screens
+        self.budget_bytes = budget_bytes
+        self.measure = measure
+        self.active: Optional[str] = None
+        self._screens: OrderedDict[str, object] = OrderedDict()  # least recent first
+        self._pack: dict[str, dict] = {}  # name -> pack options to restore
+        self._sizes: dict[str, int] = {}  # name -> estimate when last hidden
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._screens
+
+    def __len__(self):
+        return len(self._screens)
+
+    def get(self, name: str):
+        return self._screens.get(name)
+
+    @property
+    def hidden_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def show(self, name: str, build: Callable[[], object], on_activate=None):
+        """
+        Show the cached screen called name, building it on first use.
+
+        build() must return a packed frame. A cached screen is packed again and
+        refreshed with on_activate(frame) if given, else frame.on_activate().
+        """
+        if self.active is not None and self.active != name:
+            self.hide()
+
+        frame = self._screens.get(name)
+        if frame is not None and not _exists(frame):
+            self._forget(name)  # destroyed behind our back (e.g. app teardown)
+            frame = None
+
+        if frame is None:
+            frame = build()
+            self._screens[name] = frame
+        else:
+            self._screens.move_to_end(name)
+            self._sizes.pop(name, None)
+            if name != self.active:
+                frame.pack_configure(**self._pack.get(name, {}))
+            hook = on_activate or getattr(type(frame), "on_activate", None)
+            if hook is not None:
+                hook(frame)
+        self.active = name
+        self._evict()
+        return frame
+
+    def hide(self):
+        """pack_forget the active screen, keeping it cached."""
+        name, self.active = self.active, None
+        frame = self._screens.get(name)
+        if frame is None or not _exists(frame):
+            return
+        info = dict(frame.pack_info())
+        # Kept as Tk reported them (already scaled); pack_configure bypasses
+        # CTk's scaling when they are restored.
+        self._pack[name] = info
+        self._sizes[name] = self.measure(frame)
+        frame.pack_forget()
+
+    def evict(self, name: str):
+        """Destroy one cached screen (its <Destroy> handlers close sessions)."""
+        frame = self._screens.get(name)
+        if name == self.active:
+            self.active = None
+        self._forget(name)
+        if frame is not None and _exists(frame):
+            frame.destroy()
+
+    def clear(self):
+        for name in list(self._screens):
+            self.evict(name)
+
+    def _forget(self, name: str):
+        self._screens.pop(name, None)
+        self._pack.pop(name, None)
+        self._sizes.pop(name, None)
+
+    def _evict(self):
+        for name in list(self._screens):
+            if len(self._screens) <= self.max_screens and self.hidden_bytes <= self.budget_bytes:
+                break
+            if name != self.active:
+                self.evict(name)
+
+
+def _exists(frame) -> bool:
+    try:
+        return bool(frame.winfo_exists())
+    except Exception:  # the Tcl interpreter is gone
+        return False
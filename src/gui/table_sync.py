@@ -0,0 +1,89 @@
+"""
+Diff-based Treeview refresh.
+
+Deleting every item and inserting the result set again throws away the
+selection and scroll position and costs one Tcl call per row even when a single
+booking changed. TableSync keys Treeview items by database id (the item iid),
+remembers what it last wrote, and applies only the difference:
+
+    sync = TableSync(tree)
+    sync.apply((ammo.id, values, tags) for ammo in rows)   # -> SyncResult
+
+Rows whose values, tags and position are unchanged cost no Tcl calls at all.
+"""
+
+from typing import Hashable, Iterable, NamedTuple, Sequence
+
+
+class SyncResult(NamedTuple):
+    inserted: int
+    updated: int
+    deleted: int
+    moved: int
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated + self.deleted + self.moved
+
+
+class TableSync:
+    """Keeps the top-level items of a ttk.Treeview in step with a list of rows."""
+
+    def __init__(self, tree, parent: str = ""):
+        self.tree = tree
+        self.parent = parent
+        self._order: list[str] = []
+        self._applied: dict[str, tuple] = {}  # iid -> (values, tags) last written
+
+    @staticmethod
+    def iid(key: Hashable) -> str:
+        return str(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.iid(key) in self._applied
+
+    def reset(self):
+        """Forget the tracked state and clear the tree (e.g. after external edits)."""
+        if self._order:
+            self.tree.delete(*self._order)
+        self._order = []
+        self._applied = {}
+
+    def apply(self, rows: Iterable[tuple[Hashable, Sequence, Sequence]]) -> SyncResult:
+        """Make the tree show rows, given as (key, values, tags), in this order."""
+        wanted = []
+        content = {}
+        for key, values, tags in rows:
+            iid = self.iid(key)
+            if iid in content:
+                continue  # a key can only appear once in a Treeview
+            wanted.append(iid)
+            content[iid] = (tuple(values), tuple(tags or ()))
+
+        stale = [iid for iid in self._order if iid not in content]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._applied[iid]
+        current = [iid for iid in self._order if iid in content]
+
+        inserted = updated = moved = 0
+        for index, iid in enumerate(wanted):
+            values, tags = content[iid]
+            if iid not in self._applied:
+                self.tree.insert(self.parent, index, iid=iid, values=values, tags=tags)
+                current.insert(index, iid)
+                inserted += 1
+            else:
+                if self._applied[iid] != (values, tags):
+                    self.tree.item(iid, values=values, tags=tags)
+                    updated += 1
+                if current[index] != iid:
+                    self.tree.move(iid, self.parent, index)
+                    current.remove(iid)
+                    current.insert(index, iid)
+                    moved += 1
+            self._applied[iid] = (values, tags)
+
+        self._order = wanted
+        return SyncResult(inserted, updated, len(stale), moved)
@@ -4,9 +4,21 @@ from tkinter import TclError, messagebox
 import customtkinter as ctk
 from sqlalchemy import text
 
-from src.crud.crud_user import create_user, delete_user, get_all_users, update_user
-from src.database import SessionLocal
+from src.crud.crud_user import (
+    count_users,
+    create_user,
+    delete_user,
+    get_user,
+    search_users,
+    update_user,
+)
 from src.gui.fingerprint_enroll import FingerprintEnroll
+from src.gui.live_search import LiveSearch
+from src.gui.live_updates import ChangeFollower, update_table
+from src.gui.virtual_table import Column, VirtualTable
+from src.models.user import User
+from src.services.auth_worker import deliver, get_auth_worker
+from src.session_scope import read_scope, write_scope
 
 # Set appearance mode and default color theme
 ctk.set_appearance_mode("System")  # Modes: "System" (standard), "Dark", "Light"
@@ -23,7 +35,6 @@ class UserManagement(ctk.CTkFrame):
         self.content_frame.pack(fill=tk.BOTH, expand=True)
 
         self.parent = parent  # Store the parent reference for modal dialogs
-        self.db = SessionLocal()  # Database session
 
         # Create a canvas with scrollbar for the main content - Add background color
         self.canvas = ctk.CTkCanvas(
@@ -147,58 +158,58 @@ class UserManagement(ctk.CTkFrame):
             foreground=[("selected", "white")],
         )
 
-        # Create scrollbars with matching colors
-        self.tree_scroll_y = ctk.CTkScrollbar(
+        # Only the visible rows exist as Treeview items; windows of users are
+        # fetched from the database as the table scrolls.
+        self._search_text = ""
+        self.table = VirtualTable(
             self.tree_frame,
-            orientation="vertical",
-            fg_color="#2b2b2b",
-            button_color="#1f6aa5",
-            button_hover_color="#2980b9",
-        )
-        self.tree_scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.tree_scroll_x = ctk.CTkScrollbar(
-            self.tree_frame,
-            orientation="horizontal",
+            columns=[
+                Column("ID", "ID", 50, "center"),
+                Column("Name", "Name", 150),
+                Column("Service No", "Service No", 100, "center"),
+                Column("Telephone", "Telephone", 120, "center"),
+                Column("Unit", "Unit", 100, "center"),
+            ],
+            fetch_rows=self._fetch_users,
+            count_rows=self._count_users,
+            row_key=lambda row: row.id,
+            # Sequential index for display; the user id stays the row key
+            row_values=lambda index, row: (
+                index + 1,
+                row.name,
+                row.service_number,
+                row.telephone,
+                row.unit,
+            ),
+            row_tags=lambda index, row: ("oddrow",) if index % 2 == 0 else (),
+            empty_message="No officers found",
+            scrollbar_style={
+                "fg_color": "#2b2b2b",
+                "button_color": "#1f6aa5",
+                "button_hover_color": "#2980b9",
+            },
             fg_color="#2b2b2b",
-            button_color="#1f6aa5",
-            button_hover_color="#2980b9",
         )
-        self.tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.table.tree
+        self.tree.tag_configure("oddrow", background="#333333")
 
-        # Create Treeview with scrollbars
-        self.tree = tk.ttk.Treeview(
-            self.tree_frame,
-            columns=("ID", "Name", "Service No", "Telephone", "Unit"),
-            show="headings",
-            yscrollcommand=self.tree_scroll_y.set,
-            xscrollcommand=self.tree_scroll_x.set,
+        self.live_search = LiveSearch(
+            self,
+            query=lambda db, text: (
+                count_users(db, text),
+                search_users(db, text, 0, self.table.source.page_size),
+            ),
+            on_results=self._show_search_results,
         )
+        self.live_search.attach(self.search_entry, lambda: self.search_entry.get().strip())
 
-        # Configure scrollbars
-        self.tree_scroll_y.configure(command=self.tree.yview)
-        self.tree_scroll_x.configure(command=self.tree.xview)
-
-        # Configure headings and columns
-        self.tree.heading("ID", text="ID")
-        self.tree.heading("Name", text="Name")
-        self.tree.heading("Service No", text="Service No")
-        self.tree.heading("Telephone", text="Telephone")
-        self.tree.heading("Unit", text="Unit")
-
-        self.tree.column("ID", width=50, anchor="center", minwidth=50)
-        self.tree.column("Name", width=150, minwidth=100)
-        self.tree.column("Service No", width=100, anchor="center", minwidth=100)
-        self.tree.column("Telephone", width=120, anchor="center", minwidth=100)
-        self.tree.column("Unit", width=100, anchor="center", minwidth=100)
-
-        self.tree.pack(fill=tk.BOTH, expand=True)
-
-        # After creating the Treeview, add this line:
-        self.tree.tag_configure("oddrow", background="#333333")
-
-        # Load initial data
+        # Load initial data; later writes (here, in dialogs or on another
+        # terminal) come back as change events
         self.load_users()
+        self.follower = ChangeFollower(
+            self, (User,), lambda changes: update_table(self.table, changes, User)
+        )
 
         # Action buttons frame
         self.button_frame = ctk.CTkFrame(
@@ -287,69 +298,38 @@ class UserManagement(ctk.CTkFrame):
     def _on_destroy(self, event):
         """Clean up bindings when widget is destroyed"""
         if event.widget == self:
+            self.live_search.cancel()
             self.canvas.unbind("<MouseWheel>")
             self.canvas.unbind_all("<MouseWheel>")
 
     def load_users(self):
-        """Load users into the table."""
-        # Clear existing data
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        # Get all users from database
-        users = get_all_users(self.db)
-
-        # Insert users into treeview with sequential index and alternating colors
-        for index, user in enumerate(users, start=1):
-            # Use index instead of user.id for display, but keep user.id in the values
-            tags = ("oddrow",) if index % 2 else ()
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    index,
-                    user.name,
-                    user.service_number,
-                    user.telephone,
-                    user.unit,
-                ),
-                tags=tags,
-            )
+        """(Re)load the users table; position and selection survive a plain refresh."""
+        self.live_search.cancel()
+        keep_position = self._search_text == ""
+        self._search_text = ""
+        self.table.refresh(keep_position=keep_position)
 
-    def search_users(self):
-        """Search for users based on search entry."""
-        search_text = self.search_entry.get().strip().lower()
+    def on_activate(self):
+        """Shown again from the screen cache: re-read only if users changed meanwhile."""
+        self.follower.activate()
 
-        # If search field is empty, reload all users
-        if not search_text:
-            self.load_users()
-            return
+    def _fetch_users(self, offset, limit):
+        with read_scope("users") as db:
+            return search_users(db, self._search_text, offset, limit)
 
-        # Clear existing data
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        # Get all users and filter
-        users = get_all_users(self.db)
-        for index, user in enumerate(users, start=1):
-            if (
-                search_text in user.name.lower()
-                or search_text in user.service_number.lower()
-                or search_text in user.telephone.lower()
-                or search_text in user.role.lower()
-            ):  # Search in role instead of unit
-
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        index,
-                        user.name,
-                        user.service_number,
-                        user.telephone,
-                        user.unit,
-                    ),
-                )
+    def _count_users(self):
+        with read_scope("users") as db:
+            return count_users(db, self._search_text)
+
+    def search_users(self):
+        """Search users by name, service number, telephone or role."""
+        self.live_search.run_now(self.search_entry.get().strip())
+
+    def _show_search_results(self, text, result):
+        count, rows = result
+        keep_position = text == self._search_text
+        self._search_text = text
+        self.table.show_results(count, rows, keep_position=keep_position)
 
     def add_user(self):
         """Open a dialog to add a new user."""
@@ -371,17 +351,7 @@ class UserManagement(ctk.CTkFrame):
 
     def get_selected_user_id(self):
         """Return the actual database user.id for the selected row, or None."""
-        selected_item = self.tree.selection()
-        if not selected_item:
-            return None
-        try:
-            display_values = self.tree.item(selected_item)["values"]
-            display_index = int(display_values[0])  # 1-based index used in the table
-            users = get_all_users(self.db)
-            # Convert table index back to the user's primary key
-            return users[display_index - 1].id if 0 < display_index <= len(users) else None
-        except Exception:
-            return None
+        return self.table.selected_key()
 
     def edit_user(self):
         """Open a dialog to edit a selected user."""
@@ -389,30 +359,25 @@ class UserManagement(ctk.CTkFrame):
         if self.dialog_open:
             return
 
-        selected_item = self.tree.selection()
-        if not selected_item:
+        user_id = self.get_selected_user_id()
+        user_data = self.table.selected_values()
+        if user_id is None or user_data is None:
             messagebox.showwarning("Warning", "Please select an officer to edit!")
             return
 
-        user_data = self.tree.item(selected_item)["values"]
         self.dialog_open = True
-        dialog = EditUserDialog(self.parent, self, user_data)  # Use parent window instead of self
+        # Use parent window instead of self
+        dialog = EditUserDialog(self.parent, self, user_data, user_id)
         self.parent.wait_window(dialog)  # Wait for dialog to close
         self.dialog_open = False
 
     def delete_user(self):
         """Delete the selected user."""
-        selected_item = self.tree.selection()
-        if not selected_item:
+        user_id = self.get_selected_user_id()
+        if user_id is None:
             messagebox.showwarning("Warning", "Please select an officer to delete!")
             return
 
-        # Get the actual user ID from the database (it's stored in the tree item values)
-        display_values = self.tree.item(selected_item)["values"]
-        # Find the corresponding user in the database
-        users = get_all_users(self.db)
-        user_id = users[display_values[0] - 1].id  # Convert display index back to user ID
-
         # Create a custom confirmation dialog
         confirm_dialog = CTkMessageBox(
             self.parent,
@@ -428,26 +393,23 @@ class UserManagement(ctk.CTkFrame):
 
         if confirm_dialog.get() == "Delete":
             try:
-                # First, delete associated fingerprints using text()
-                self.db.execute(
-                    text("DELETE FROM fingerprints WHERE user_id = :user_id"),
-                    {"user_id": user_id},
-                )
-
-                # Then delete the user
-                delete_user(self.db, user_id)
+                with write_scope("users") as db:
+                    # First, delete associated fingerprints using text()
+                    db.execute(
+                        text("DELETE FROM fingerprints WHERE user_id = :user_id"),
+                        {"user_id": user_id},
+                    )
 
-                # Commit any pending changes
-                self.db.commit()
+                    # Then delete the user
+                    delete_user(db, user_id)
 
-                self.load_users()  # This will refresh the list with new sequential numbers
+                # The table drops the row when the delete's change event arrives
                 messagebox.showinfo(
                     "Success", "Officer and associated records deleted successfully!"
                 )
 
             except Exception as e:
-                # If anything goes wrong, rollback the transaction
-                self.db.rollback()
+                # write_scope has rolled the transaction back
                 messagebox.showerror("Error", f"Failed to delete officer: {str(e)}")
 
 
@@ -629,29 +591,47 @@ class AddUserDialog(ctk.CTkToplevel):
             messagebox.showerror("Error", "Passwords do not match.")
             return
 
-        db = SessionLocal()
-
-        try:
-            created = create_user(db, service_number, name, telephone, unit, role, password)
-            # ^ make sure your CRUD signature supports role+password (see below)
-            if created:
-                self.destroy()
-                CTkMessageBox(
-                    self.master,
-                    title="Success",
-                    message="Officer added successfully!",
-                    icon="check",
-                )
-                self.controller.load_users()
-            else:
-                CTkMessageBox(
-                    self,
-                    title="Error",
-                    message="Failed to add officer. Please try again.",
-                    icon="warning",
-                )
-        finally:
-            db.close()
+        # Hash off the Tk thread; the dialog stays responsive meanwhile
+        self.save_button.configure(state="disabled", text="Saving...")
+        future = get_auth_worker().hash(password)
+        deliver(
+            self,
+            future,
+            lambda hashed: self._create_user(service_number, name, telephone, unit, role, hashed),
+            self._on_hash_error,
+        )
+
+    def _on_hash_error(self, exc: BaseException):
+        self.save_button.configure(state="normal", text="Save")
+        messagebox.showerror("Error", f"Could not hash the password: {exc}")
+
+    def _create_user(self, service_number, name, telephone, unit, role, hashed_password):
+        self.save_button.configure(state="normal", text="Save")
+        with write_scope("users") as db:
+            created = create_user(
+                db,
+                service_number,
+                name,
+                telephone,
+                unit,
+                role,
+                hashed_password=hashed_password,
+            )
+        if created:
+            self.destroy()
+            CTkMessageBox(
+                self.master,
+                title="Success",
+                message="Officer added successfully!",
+                icon="check",
+            )
+        else:
+            CTkMessageBox(
+                self,
+                title="Error",
+                message="Failed to add officer. Please try again.",
+                icon="warning",
+            )
 
     def _on_mousewheel(self, event):
         """Handle mousewheel scrolling"""
@@ -680,7 +660,7 @@ class AddUserDialog(ctk.CTkToplevel):
 class EditUserDialog(ctk.CTkToplevel):
     """Dialog for editing an existing officer or armorer."""
 
-    def __init__(self, parent, controller, user_data):
+    def __init__(self, parent, controller, user_data, user_id):
         super().__init__(parent)
         self.title("Edit Officer")
         self.geometry("400x450")
@@ -688,9 +668,7 @@ class EditUserDialog(ctk.CTkToplevel):
 
         # Store the controller reference to refresh data
         self.controller = controller
-        # Get the actual user ID from database (not the display index)
-        users = get_all_users(SessionLocal())
-        self.user_id = users[user_data[0] - 1].id  # Convert display index back to user ID
+        self.user_id = user_id  # Database id (user_data[0] is only the display index)
 
         # Update canvas background
         self.canvas = ctk.CTkCanvas(self, highlightthickness=0, bg="#2b2b2b")  # Dark background
@@ -740,9 +718,8 @@ class EditUserDialog(ctk.CTkToplevel):
         self.role_label.pack(padx=30, pady=(15, 5), anchor="w")
 
         # Get the actual user from database to get the correct role
-        users = get_all_users(SessionLocal())
-        user_id = users[user_data[0] - 1].id  # Convert display index back to user ID
-        actual_user = next((u for u in users if u.id == user_id), None)
+        with read_scope("users") as db:
+            actual_user = get_user(db, user_id)
         current_role = "armorer" if actual_user and actual_user.role == "armorer" else "officer"
         self.role_var = ctk.StringVar(value=current_role)
         self.role_combobox = ctk.CTkComboBox(
@@ -853,27 +830,23 @@ class EditUserDialog(ctk.CTkToplevel):
             )
             return
 
-        db = SessionLocal()
-        try:
+        with write_scope("users") as db:
             updated = update_user(db, self.user_id, name, service_number, telephone, role, unit)
-            if updated:
-                self.destroy()
-                CTkMessageBox(
-                    self.master,
-                    title="Success",
-                    message="Officer updated successfully!",
-                    icon="check",
-                )
-                self.controller.load_users()
-            else:
-                CTkMessageBox(
-                    self,
-                    title="Error",
-                    message="Failed to update officer. Please try again.",
-                    icon="warning",
-                )
-        finally:
-            db.close()
+        if updated:
+            self.destroy()
+            CTkMessageBox(
+                self.master,
+                title="Success",
+                message="Officer updated successfully!",
+                icon="check",
+            )
+        else:
+            CTkMessageBox(
+                self,
+                title="Error",
+                message="Failed to update officer. Please try again.",
+                icon="warning",
+            )
 
 
 class CTkMessageBox(ctk.CTkToplevel):
@@ -0,0 +1,368 @@
+"""
+Virtualized table widget.
+
+A ttk.Treeview holding one item per database row costs Tcl memory and seconds
+of insert time once tables reach tens of thousands of rows. VirtualTable keeps
+only as many Treeview items as fit on screen, keyed by row_key, and diffs them
+against the new window as the user scrolls (see TableSync). Rows come from a
+data-source callback, one page at a time, and a few pages are cached around the
+visible window.
+
+    table = VirtualTable(
+        parent,
+        columns=[Column("id", "ID", 50, "center"), Column("name", "Name", 180)],
+        fetch_rows=lambda offset, limit: crud_user.search_users(db, text, offset, limit),
+        count_rows=lambda: crud_user.count_users(db, text),
+        row_key=lambda row: row.id,
+        row_values=lambda index, row: (index + 1, row.name),
+    )
+    table.selected_key()   # database key of the selected row, not its position
+
+RowSource holds the paging/cache logic and has no Tk dependency.
+"""
+
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Callable, Hashable, NamedTuple, Optional, Sequence
+
+import customtkinter as ctk
+
+from src.gui.table_sync import TableSync
+
+DEFAULT_PAGE_SIZE = 100
+EMPTY_IID = "__empty__"
+
+
+class Column(NamedTuple):
+    name: str
+    heading: str
+    width: int = 100
+    anchor: str = "w"
+
+
+class RowSource:
+    """
+    Page cache in front of fetch_rows(offset, limit) / count_rows().
+
+    Pages are page_size rows aligned to multiples of page_size; at most
+    cache_pages of them are kept (least recently used are dropped).
+    """
+
+    def __init__(
+        self,
+        fetch_rows: Callable[[int, int], Sequence],
+        count_rows: Callable[[], int],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cache_pages: int = 8,
+    ):
+        self.fetch_rows = fetch_rows
+        self.count_rows = count_rows
+        self.page_size = page_size
+        self.cache_pages = max(2, cache_pages)
+        self._pages: "OrderedDict[int, list]" = OrderedDict()
+        self._count: Optional[int] = None
+
+    def count(self) -> int:
+        if self._count is None:
+            self._count = self.count_rows()
+        return self._count
+
+    def invalidate(self):
+        self._pages.clear()
+        self._count = None
+
+    def seed(self, count: int, first_rows: Sequence):
+        """Start over from rows [0, len(first_rows)) fetched elsewhere (live search)."""
+        self.invalidate()
+        self._count = count
+        for start in range(0, len(first_rows), self.page_size):
+            end = start + self.page_size
+            page = list(first_rows[start:end])
+            if len(page) == self.page_size or start + len(page) >= count:
+                self._pages[start // self.page_size] = page  # only complete pages
+
+    def drop_pages(self, matches: Callable[[object], bool]) -> int:
+        """Forget the cached pages holding a row for which matches(row) is true."""
+        stale = [page for page, rows in self._pages.items() if any(map(matches, rows))]
+        for page in stale:
+            del self._pages[page]
+        return len(stale)
+
+    def is_cached(self, index: int) -> bool:
+        return index // self.page_size in self._pages
+
+    def _page(self, page: int) -> list:
+        rows = self._pages.get(page)
+        if rows is None:
+            rows = list(self.fetch_rows(page * self.page_size, self.page_size))
+            self._pages[page] = rows
+            while len(self._pages) > self.cache_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page)
+        return rows
+
+    def rows(self, start: int, stop: int) -> list:
+        """Rows [start, stop), clamped to the row count."""
+        stop = min(stop, self.count())
+        if start >= stop:
+            return []
+        out = []
+        first, last = start // self.page_size, (stop - 1) // self.page_size
+        for page in range(first, last + 1):
+            base = page * self.page_size
+            lo, hi = max(start - base, 0), stop - base
+            out.extend(self._page(page)[lo:hi])
+        return out
+
+
+class KeysetPages:
+    """
+    Adapt a keyset-paged query to fetch_rows(offset, limit).
+
+    fetch_page(cursor, offset, limit) -> (rows, next_cursor) is called with the
+    cursor recorded at the end of the previous page when there is one (an index
+    seek), and with a plain OFFSET otherwise, e.g. after the scrollbar jumps.
+    """
+
+    def __init__(self, fetch_page: Callable):
+        self.fetch_page = fetch_page
+        self._cursors: dict[int, object] = {}
+
+    def reset(self):
+        self._cursors.clear()
+
+    def __call__(self, offset: int, limit: int) -> list:
+        cursor = self._cursors.get(offset)
+        if cursor is not None:
+            rows, next_cursor = self.fetch_page(cursor, 0, limit)
+        else:
+            rows, next_cursor = self.fetch_page(None, offset, limit)
+        if next_cursor is not None:
+            self._cursors[offset + len(rows)] = next_cursor
+        return rows
+
+
+class VirtualTable(ctk.CTkFrame):
+    """A Treeview that only materialises the visible rows of a large result set."""
+
+    def __init__(
+        self,
+        master,
+        columns: Sequence[Column],
+        fetch_rows: Callable[[int, int], Sequence],
+        count_rows: Callable[[], int],
+        row_key: Callable = lambda row: row[0],
+        row_values: Callable = lambda index, row: tuple(row),
+        row_tags: Optional[Callable] = None,
+        empty_message: str = "No data",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cache_pages: int = 8,
+        height: int = 15,
+        scrollbar_style: Optional[dict] = None,
+        **kwargs,
+    ):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+        self.columns = list(columns)
+        self.source = RowSource(fetch_rows, count_rows, page_size, cache_pages)
+        self.row_key = row_key
+        self.row_values = row_values
+        self.row_tags = row_tags
+        self.empty_message = empty_message
+
+        self._top = 0
+        self._visible = height
+        self._item_keys: dict[str, Hashable] = {}
+        self._selected: Optional[Hashable] = None
+        self._prefetch_job = None
+
+        scrollbar_style = scrollbar_style or {}
+        self.y_scrollbar = ctk.CTkScrollbar(
+            self, orientation="vertical", command=self._yview, **scrollbar_style
+        )
+        self.y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(
+            self,
+            columns=[c.name for c in self.columns],
+            show="headings",
+            selectmode="browse",
+            height=height,
+        )
+        self.x_scrollbar = ctk.CTkScrollbar(
+            self, orientation="horizontal", command=self.tree.xview, **scrollbar_style
+        )
+        self.x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.tree.configure(xscrollcommand=self.x_scrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        for c in self.columns:
+            self.tree.heading(c.name, text=c.heading, anchor=c.anchor)
+            self.tree.column(c.name, width=c.width, anchor=c.anchor)
+
+        self._sync = TableSync(self.tree)
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        self.tree.bind("<Configure>", self._on_resize, add="+")
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3) or "break")
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3) or "break")
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-self._visible) or "break")
+        self.tree.bind("<Next>", lambda e: self._scroll_by(self._visible) or "break")
+        self.tree.bind("<Home>", lambda e: self.scroll_to(0) or "break")
+        self.tree.bind("<End>", lambda e: self.scroll_to(self.source.count()) or "break")
+        self.tree.bind("<Up>", lambda e: self._step_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._step_selection(1))
+
+    # -- public API ------------------------------------------------------------
+
+    def refresh(self, keep_position: bool = True):
+        """Re-count and re-fetch (after edits, or when the data source's filter changed)."""
+        self.source.invalidate()
+        reset = getattr(self.source.fetch_rows, "reset", None)
+        if reset:
+            reset()
+        if not keep_position:
+            self._top = 0
+            self._selected = None
+        self._render()
+
+    def reload_rows(self, matches: Callable[[object], bool]) -> bool:
+        """
+        Re-fetch only the cached pages holding a row for which matches(row) is
+        true (after those rows were updated); the count and the other pages stay.
+        """
+        if not self.source.drop_pages(matches):
+            return False
+        self._render()
+        return True
+
+    def show_results(self, count: int, first_rows: Sequence, keep_position: bool = False):
+        """Render a result set whose count and first rows were fetched off-thread."""
+        reset = getattr(self.source.fetch_rows, "reset", None)
+        if reset:
+            reset()
+        self.source.seed(count, first_rows)
+        if not keep_position:
+            self._top = 0
+            self._selected = None
+        self._render()
+
+    def scroll_to(self, index: int):
+        self._top = index
+        self._render()
+
+    def selected_key(self) -> Optional[Hashable]:
+        """Key (row_key) of the selected row; survives scrolling it out of view."""
+        return self._selected
+
+    def selected_values(self) -> Optional[tuple]:
+        """Displayed values of the selected row if it is on screen."""
+        for iid, key in self._item_keys.items():
+            if key == self._selected:
+                return tuple(self.tree.item(iid, "values"))
+        return None
+
+    # -- rendering -------------------------------------------------------------
+
+    def _render(self):
+        count = self.source.count()
+        self._top = max(0, min(self._top, count - self._visible))
+        rows = self.source.rows(self._top, self._top + self._visible)
+
+        if rows:
+            wanted = [
+                (
+                    self.row_key(row),
+                    self.row_values(self._top + i, row),
+                    self.row_tags(self._top + i, row) if self.row_tags else (),
+                )
+                for i, row in enumerate(rows)
+            ]
+        else:
+            placeholder = ["—"] * len(self.columns)
+            placeholder[min(1, len(placeholder) - 1)] = self.empty_message
+            wanted = [(EMPTY_IID, tuple(placeholder), ())]
+        # Items are keyed by row_key: scrolling one row or refreshing after an edit
+        # only touches the rows that entered, left or changed.
+        self._sync.apply(wanted)
+        self._item_keys = {
+            TableSync.iid(key): key for key, _values, _tags in wanted if key != EMPTY_IID
+        }
+        if self._selected is not None and self._selected in self._sync:
+            selected_iid = TableSync.iid(self._selected)
+            if self.tree.selection() != (selected_iid,):
+                self.tree.selection_set(selected_iid)
+        elif self.tree.selection():
+            self.tree.selection_set(())
+
+        if count:
+            self.y_scrollbar.set(self._top / count, min(1.0, (self._top + len(rows)) / count))
+        else:
+            self.y_scrollbar.set(0.0, 1.0)
+        self._schedule_prefetch()
+
+    def _schedule_prefetch(self):
+        """Warm the page after the visible window while the UI is idle."""
+        if self._prefetch_job is not None:
+            return
+        ahead = self._top + 2 * self._visible
+        if ahead >= self.source.count() or self.source.is_cached(ahead):
+            return
+
+        def prefetch():
+            self._prefetch_job = None
+            try:
+                self.source.rows(ahead, ahead + 1)
+            except Exception as e:
+                print(f"Error prefetching rows: {e}")
+
+        self._prefetch_job = self.after_idle(prefetch)
+
+    # -- events ----------------------------------------------------------------
+
+    def _yview(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * self.source.count()))
+        elif action == "scroll":
+            step = int(value)
+            self._scroll_by(step * self._visible if unit == "pages" else step)
+
+    def _scroll_by(self, rows: int):
+        self.scroll_to(self._top + rows)
+
+    def _on_wheel(self, event):
+        self._scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_select(self, _event):
+        selection = self.tree.selection()
+        if selection:
+            self._selected = self._item_keys.get(selection[0])
+        elif self._selected is not None and self._selected in self._sync:
+            self._selected = None  # deselected on screen, not just scrolled out of view
+
+    def _step_selection(self, step: int):
+        """Arrow keys: scroll when the selection would leave the window."""
+        items = self.tree.get_children()
+        selection = self.tree.selection()
+        if not items or not selection:
+            return None
+        position = items.index(selection[0]) + step
+        if 0 <= position < len(items):
+            return None  # Treeview moves the selection itself
+        self._scroll_by(step)
+        items = self.tree.get_children()
+        iid = items[0] if step < 0 else items[-1]
+        self._selected = self._item_keys.get(iid)
+        self.tree.selection_set(iid)
+        self.tree.focus(iid)
+        return "break"
+
+    def _on_resize(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, (event.height - rowheight) // rowheight)  # minus the heading row
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
@@ -4,12 +4,18 @@ from tkinter import messagebox, ttk
 import customtkinter as ctk
 
 from src.crud.crud_weapon import (
+    count_weapons,
     create_weapon,
     delete_weapon,
-    get_all_weapons,
+    search_weapons,
     update_weapon,
 )
-from src.database import SessionLocal
+from src.gui.live_search import LiveSearch
+from src.gui.live_updates import ChangeFollower, update_table
+from src.gui.virtual_table import Column, VirtualTable
+from src.models.weapon import Weapon
+from src.services.reference_data import get_reference_data
+from src.session_scope import read_scope, write_scope
 
 
 class WeaponManagement(ctk.CTkFrame):
@@ -26,7 +32,6 @@ class WeaponManagement(ctk.CTkFrame):
         self.content_frame.pack(fill=tk.BOTH, expand=True)
 
         self.parent = parent
-        self.db = SessionLocal()
 
         # Create a canvas with scrollbar
         self.canvas = ctk.CTkCanvas(self.content_frame, highlightthickness=0, bg="#2b2b2b")
@@ -140,46 +145,38 @@ class WeaponManagement(ctk.CTkFrame):
             foreground=[("selected", "white")],
         )
 
-        # Create Treeview
-        self.tree = ttk.Treeview(
+        # Only the visible rows exist as Treeview items; windows of weapons are
+        # fetched from the database as the table scrolls.
+        self._search_term = ""
+        self.table = VirtualTable(
             self.tree_frame,
-            columns=("ID", "Type", "Serial No", "Status", "Condition", "Last Service"),
-            show="headings",
-            height=15,
+            columns=[
+                Column("ID", "ID", 50),
+                Column("Type", "Weapon Type", 150),
+                Column("Serial No", "Serial Number", 150),
+                Column("Status", "Status", 100),
+                Column("Condition", "Condition", 100),
+                Column("Last Service", "Last Service", 150),
+            ],
+            fetch_rows=self._fetch_weapons,
+            count_rows=self._count_weapons,
+            row_key=lambda row: row.id,
+            # Sequential index for display; the weapon id stays the row key
+            row_values=lambda index, row: (
+                index + 1,
+                row.type,
+                row.serial_number,
+                row.status,
+                row.condition,
+                (row.last_service.strftime("%Y-%m-%d") if row.last_service else "N/A"),
+            ),
+            row_tags=lambda index, row: ("oddrow",) if index % 2 == 0 else (),
+            empty_message="No weapons found",
+            fg_color="#2b2b2b",
         )
-
-        # Configure columns
-        self.tree.heading("ID", text="ID", anchor="w")
-        self.tree.heading("Type", text="Weapon Type", anchor="w")
-        self.tree.heading("Serial No", text="Serial Number", anchor="w")
-        self.tree.heading("Status", text="Status", anchor="w")
-        self.tree.heading("Condition", text="Condition", anchor="w")
-        self.tree.heading("Last Service", text="Last Service", anchor="w")
-
-        # Set column widths
-        self.tree.column("ID", width=50)
-        self.tree.column("Type", width=150)
-        self.tree.column("Serial No", width=150)
-        self.tree.column("Status", width=100)
-        self.tree.column("Condition", width=100)
-        self.tree.column("Last Service", width=150)
-
-        # Create scrollbars
-        self.y_scrollbar = ctk.CTkScrollbar(
-            self.tree_frame, orientation="vertical", command=self.tree.yview
-        )
-        self.x_scrollbar = ctk.CTkScrollbar(
-            self.tree_frame, orientation="horizontal", command=self.tree.xview
-        )
-
-        self.tree.configure(
-            yscrollcommand=self.y_scrollbar.set, xscrollcommand=self.x_scrollbar.set
-        )
-
-        # Pack scrollbars and tree
-        self.y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.table.tree
+        self.tree.tag_configure("oddrow", background="#333333")
 
         # Action buttons frame
         self.button_frame = ctk.CTkFrame(
@@ -229,63 +226,55 @@ class WeaponManagement(ctk.CTkFrame):
         self.canvas.bind("<MouseWheel>", self._on_mousewheel)
         self.bind("<Destroy>", self._on_destroy)
 
-        # Load initial data
+        self.live_search = LiveSearch(
+            self,
+            query=lambda db, term: (
+                count_weapons(db, term),
+                search_weapons(db, term, 0, self.table.source.page_size),
+            ),
+            on_results=self._show_search_results,
+        )
+        self.live_search.attach(self.search_entry, lambda: self.search_entry.get().strip())
+
+        # Load initial data; later writes (dialogs, bookings, other terminals)
+        # come back as change events
         self.load_weapons()
+        self.follower = ChangeFollower(
+            self, (Weapon,), lambda changes: update_table(self.table, changes, Weapon)
+        )
 
     def load_weapons(self):
-        """Load weapons into the treeview"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Get weapons from database
-        weapons = get_all_weapons(self.db)
-
-        # Insert weapons into treeview
-        for idx, weapon in enumerate(weapons, start=1):
-            values = (
-                idx,
-                weapon.type,
-                weapon.serial_number,
-                weapon.status,
-                weapon.condition,
-                (weapon.last_service.strftime("%Y-%m-%d") if weapon.last_service else "N/A"),
-            )
-            tags = ("oddrow",) if idx % 2 else ()
-            self.tree.insert("", "end", values=values, tags=tags)
-
-        # Configure row colors
-        self.tree.tag_configure("oddrow", background="#333333")
+        """(Re)load the weapons table; position and selection survive a plain refresh."""
+        self.live_search.cancel()
+        keep_position = self._search_term == ""
+        self._search_term = ""
+        # Count and first page come from the shared read model (warmed at login,
+        # reloaded after weapon writes); later pages are fetched as usual.
+        with read_scope("weapons") as db:
+            count, rows = get_reference_data().weapon_page(db)
+        self.table.show_results(count, rows, keep_position=keep_position)
+
+    def on_activate(self):
+        """Shown again from the screen cache: re-read only if weapons changed meanwhile."""
+        self.follower.activate()
+
+    def _fetch_weapons(self, offset, limit):
+        with read_scope("weapons") as db:
+            return search_weapons(db, self._search_term, offset, limit)
+
+    def _count_weapons(self):
+        with read_scope("weapons") as db:
+            return count_weapons(db, self._search_term)
 
     def search_weapons(self):
         """Search weapons by serial number"""
-        search_term = self.search_entry.get().strip().lower()
+        self.live_search.run_now(self.search_entry.get().strip())
 
-        # Clear current display
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # If search term is empty, reload all weapons
-        if not search_term:
-            self.load_weapons()
-            return
-
-        # Get all weapons and filter
-        weapons = get_all_weapons(self.db)
-        filtered_weapons = [w for w in weapons if search_term in w.serial_number.lower()]
-
-        # Display filtered results
-        for idx, weapon in enumerate(filtered_weapons, start=1):
-            values = (
-                idx,
-                weapon.type,
-                weapon.serial_number,
-                weapon.status,
-                weapon.condition,
-                (weapon.last_service.strftime("%Y-%m-%d") if weapon.last_service else "N/A"),
-            )
-            tags = ("oddrow",) if idx % 2 else ()
-            self.tree.insert("", "end", values=values, tags=tags)
+    def _show_search_results(self, term, result):
+        count, rows = result
+        keep_position = term == self._search_term
+        self._search_term = term
+        self.table.show_results(count, rows, keep_position=keep_position)
 
     def add_weapon(self):
         """Open dialog to add a new weapon"""
@@ -302,29 +291,24 @@ class WeaponManagement(ctk.CTkFrame):
         if self.dialog_open:
             return
 
-        selected_item = self.tree.selection()
-        if not selected_item:
+        weapon_id = self.table.selected_key()
+        weapon_data = self.table.selected_values()
+        if weapon_id is None or weapon_data is None:
             messagebox.showwarning("Warning", "Please select a weapon to edit!")
             return
 
-        weapon_data = self.tree.item(selected_item)["values"]
         self.dialog_open = True
-        dialog = EditWeaponDialog(self.parent, self, weapon_data)
+        dialog = EditWeaponDialog(self.parent, self, weapon_data, weapon_id)
         self.wait_window(dialog)
         self.dialog_open = False
 
     def delete_weapon(self):
         """Delete selected weapon"""
-        selected_item = self.tree.selection()
-        if not selected_item:
+        weapon_id = self.table.selected_key()
+        if weapon_id is None:
             messagebox.showwarning("Warning", "Please select a weapon to delete!")
             return
 
-        # Get the weapon data
-        display_values = self.tree.item(selected_item)["values"]
-        weapons = get_all_weapons(self.db)
-        weapon_id = weapons[display_values[0] - 1].id
-
         # Show confirmation dialog
         confirm = messagebox.askyesno(
             "Confirm Deletion", "Are you sure you want to delete this weapon?"
@@ -332,8 +316,8 @@ class WeaponManagement(ctk.CTkFrame):
 
         if confirm:
             try:
-                delete_weapon(self.db, weapon_id)
-                self.load_weapons()
+                with write_scope("weapons") as db:
+                    delete_weapon(db, weapon_id)
                 messagebox.showinfo("Success", "Weapon deleted successfully!")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete weapon: {str(e)}")
@@ -353,6 +337,7 @@ class WeaponManagement(ctk.CTkFrame):
     def _on_destroy(self, event):
         """Clean up bindings when widget is destroyed"""
         if event.widget == self:
+            self.live_search.cancel()
             try:
                 self.canvas.unbind("<MouseWheel>")
                 self.canvas.unbind_all("<MouseWheel>")
@@ -495,10 +480,10 @@ class AddWeaponDialog(ctk.CTkToplevel):
             return
 
         try:
-            create_weapon(self.controller.db, weapon_type, serial_number, status, condition)
+            with write_scope("weapons") as db:
+                create_weapon(db, weapon_type, serial_number, status, condition)
             self.destroy()
             messagebox.showinfo("Success", "Weapon added successfully!")
-            self.controller.load_weapons()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add weapon: {str(e)}")
 
@@ -521,11 +506,12 @@ class AddWeaponDialog(ctk.CTkToplevel):
 
 
 class EditWeaponDialog(AddWeaponDialog):
-    def __init__(self, parent, controller, weapon_data):
+    def __init__(self, parent, controller, weapon_data, weapon_id):
         super().__init__(parent, controller)
 
         self.title("Edit Weapon")
         self.weapon_data = weapon_data
+        self.weapon_id = weapon_id
 
         # Update title
         self.title_label.configure(text="Edit Weapon")
@@ -556,29 +542,16 @@ class EditWeaponDialog(AddWeaponDialog):
             return
 
         try:
-            # Get the actual weapon ID from the database using serial number
-            # This is more reliable than using display index
-            weapons = get_all_weapons(self.controller.db)
-            weapon_id = None
-            for weapon in weapons:
-                if weapon.serial_number == self.weapon_data[2]:  # serial_number is at index 2
-                    weapon_id = weapon.id
-                    break
-
-            if weapon_id is None:
-                messagebox.showerror("Error", "Weapon not found in database!")
-                return
-
-            update_weapon(
-                self.controller.db,
-                weapon_id,
-                weapon_type,
-                serial_number,
-                status,
-                condition,
-            )
+            with write_scope("weapons") as db:
+                update_weapon(
+                    db,
+                    self.weapon_id,
+                    weapon_type,
+                    serial_number,
+                    status,
+                    condition,
+                )
             self.destroy()
             messagebox.showinfo("Success", "Weapon updated successfully!")
-            self.controller.load_weapons()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update weapon: {str(e)}")
@@ -1,19 +1,25 @@
-from datetime import datetime
-from zoneinfo import ZoneInfo
+import traceback
 
 import customtkinter as ctk
 
-from src.database import SessionLocal
-from src.gui.ammunition_management import AmmunitionManagement
-from src.gui.booking_management import BookingManagement
-from src.gui.duty_point_management import DutyPointManagement
-from src.gui.user_management import UserManagement
-from src.gui.weapon_management import WeaponManagement
+from src.crud import crud_stats
+from src.gui.live_updates import ChangeFollower
+from src.gui.screen_cache import ScreenCache
+from src.models.ammunition import Ammunition
 from src.models.booking import Booking
 from src.models.weapon import Weapon
+from src.services.change_events import get_change_bus
+from src.session_scope import LEAK_AGE, read_scope, report_open_sessions, write_scope
+
+# The management screens are imported the first time they are shown (see the
+# _build_* methods), so signing in only pays for the dashboard.
 
 # from sqlalchemy import func
 
+LEAK_CHECK_MS = 60_000  # how often sessions still holding a connection are reported
+CHANGE_PUMP_MS = 100  # how often committed changes are handed to the screens
+EXTERNAL_POLL_MS = 2_000  # how often commits from other terminals are looked for
+
 
 # Set appearance mode and default color theme
 ctk.set_appearance_mode("dark")
@@ -21,10 +27,11 @@ ctk.set_default_color_theme("dark-blue")
 
 
 class ArmoryApp(ctk.CTk):
-    def __init__(self, user):
+    def __init__(self, user, shift_ticket=None):
         super().__init__()
 
         self.user = user  # Store the logged-in user
+        self.shift_ticket = shift_ticket  # Stands in for armorer re-authentication
 
         self.title("Armory Management System")
         self.geometry("900x600")
@@ -107,13 +114,21 @@ class ArmoryApp(ctk.CTk):
         self.content_frame = ctk.CTkFrame(self, corner_radius=10)
         self.content_frame.grid(row=0, column=1, padx=20, pady=20, sticky="nsew")
 
+        # Screens are built once, then hidden/shown and refreshed in place
+        self.screens = ScreenCache()
+
+        # Screens follow committed changes instead of reloading by hand
+        self.changes = get_change_bus()
+        self._dashboard_follower = None
+        self._watch_other_terminals()
+
         # Show Default Dashboard
         self.show_dashboard()
+        self.after(LEAK_CHECK_MS, self._check_sessions)
+        self.after(CHANGE_PUMP_MS, self._pump_changes)
 
     def show_frame(self, frame_name):
         """Switch between application frames."""
-        self.clear_content()
-
         routes = {
             "dashboard": self.show_dashboard,
             "users": self.show_users,
@@ -128,11 +143,29 @@ class ArmoryApp(ctk.CTk):
 
     def show_dashboard(self):
         """Displays the main dashboard with an overview and statistics."""
-        self.clear_content()
+        self.screens.show(
+            "dashboard",
+            self._build_dashboard,
+            on_activate=lambda _frame: self._dashboard_follower.activate(),
+        )
+
+    def _build_dashboard(self):
+        frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        frame.pack(fill="both", expand=True)
+        self._fill_dashboard(frame)
+        self._dashboard_follower = ChangeFollower(
+            frame, (Weapon, Booking, Ammunition), lambda _changes: self._fill_dashboard(frame)
+        )
+        return frame
+
+    def _fill_dashboard(self, frame):
+        """(Re)draw the stat boxes; cheap enough to redo after every relevant commit."""
+        for widget in frame.winfo_children():
+            widget.destroy()
 
         # Dashboard Title
         welcome_label = ctk.CTkLabel(
-            self.content_frame,
+            frame,
             text="Welcome to Armory Management System",
             font=ctk.CTkFont(size=24, weight="bold"),
             text_color="white",
@@ -140,53 +173,28 @@ class ArmoryApp(ctk.CTk):
         welcome_label.pack(pady=(20, 10))
 
         # Quick Stats Grid
-        stats_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        stats_frame = ctk.CTkFrame(frame, fg_color="transparent")
         stats_frame.pack(fill="both", expand=True, padx=20, pady=20)
         stats_frame.grid_columnconfigure((0, 1, 2), weight=1)
 
-        # Fetch Data from the Database
-        session = SessionLocal()
+        # One row fetch: the counters are maintained by triggers on every write
         try:
-            total_weapons = session.query(Weapon).count()
-            booked_out = session.query(Booking).filter(Booking.status == "Booked Out").count()
-            due_return = session.query(Booking).filter(Booking.status == "Due Return").count()
-
-            # Handle timezone safely (Accra timezone or fallback to UTC)
-            from datetime import timezone
-
-            try:
-                accra_tz = ZoneInfo("Africa/Accra")  # ✅ Correct timezone format
-            except Exception:
-                accra_tz = timezone.utc  # fallback if zoneinfo not available
-
-            # Define start date in Accra time zone (or UTC fallback)
-            start_date = datetime(2025, 3, 1, tzinfo=accra_tz)
-
-            # Compute recent bookings if the attribute exists
-            if hasattr(Booking, "requested_at"):
-                recent_bookings = (
-                    session.query(Booking).filter(Booking.requested_at >= start_date).count()
-                )
-            else:
-                recent_bookings = 0
-
-            # TODO: wire to real ammo table once implemented
-            total_ammunition = 5000
-
+            with read_scope("dashboard") as session:
+                stats = crud_stats.get_dashboard_stats(session)
+            total_weapons = stats.weapons_total
+            booked_out = stats.bookings_issued + stats.bookings_overdue
+            due_return = stats.bookings_overdue
+            total_bookings = stats.bookings_total
+            total_ammunition = stats.ammo_rounds
         except Exception as e:
-            import traceback
-
             traceback.print_exc()
             ctk.CTkLabel(
-                self.content_frame,
+                frame,
                 text=f"Dashboard error: {e}",
                 font=ctk.CTkFont(size=16, weight="bold"),
                 text_color="#ffcccc",
             ).pack(pady=20)
-            session.close()
             return
-        finally:
-            session.close()
 
         # Display Statistics
         self.create_stat_box(
@@ -199,17 +207,39 @@ class ArmoryApp(ctk.CTk):
             stats_frame, 0, 2, "Weapons Due Return", str(due_return), "#e69138"
         )  # Orange
         self.create_stat_box(
-            stats_frame,
-            1,
-            0,
-            "Recently Booked (since Mar 1, 2025)",
-            str(recent_bookings),
-            "#3d85c6",
+            stats_frame, 1, 0, "Total Bookings", str(total_bookings), "#3d85c6"
         )  # Blue
         self.create_stat_box(
             stats_frame, 1, 1, "Ammunition Count", str(total_ammunition), "#674ea7"
         )  # Purple
 
+    def _pump_changes(self):
+        """Hand committed changes to the screens following them (on the Tk thread)."""
+        self.changes.pump()
+        self.after(CHANGE_PUMP_MS, self._pump_changes)
+
+    def _watch_other_terminals(self):
+        from src.database import engine
+
+        try:
+            self.changes.watch(engine)
+        except Exception:
+            traceback.print_exc()  # screens still follow this terminal's commits
+            return
+        self.after(EXTERNAL_POLL_MS, self._poll_other_terminals)
+
+    def _poll_other_terminals(self):
+        try:
+            self.changes.poll_external()
+        except Exception:
+            traceback.print_exc()
+        self.after(EXTERNAL_POLL_MS, self._poll_other_terminals)
+
+    def _check_sessions(self):
+        """Report sessions that have held a connection longer than LEAK_AGE."""
+        report_open_sessions(LEAK_AGE)
+        self.after(LEAK_CHECK_MS, self._check_sessions)
+
     def create_stat_box(self, parent, row, column, title, value, color):
         """Helper function to create a stat box."""
         frame = ctk.CTkFrame(parent, fg_color=color, corner_radius=10)
@@ -224,28 +254,57 @@ class ArmoryApp(ctk.CTk):
 
     def show_users(self):
         """Displays the User Management section."""
-        self.clear_content()
-        UserManagement(self.content_frame)
+        self.screens.show("users", self._build_users)
+
+    def _build_users(self):
+        from src.gui.user_management import UserManagement
+
+        return UserManagement(self.content_frame)
 
     def show_weapons(self):
         """Displays the Weapons Management section."""
-        self.clear_content()
-        WeaponManagement(self.content_frame)
+        self.screens.show("weapons", self._build_weapons)
+
+    def _build_weapons(self):
+        from src.gui.weapon_management import WeaponManagement
+
+        return WeaponManagement(self.content_frame)
 
     def show_duty_points(self):
         """Display Duty Point Management."""
-        self.clear_content()
-        DutyPointManagement(self.content_frame).pack(fill="both", expand=True, padx=6, pady=6)
+        self.screens.show("duty_points", self._build_duty_points)
+
+    def _build_duty_points(self):
+        from src.gui.duty_point_management import DutyPointManagement
+
+        screen = DutyPointManagement(self.content_frame)
+        screen.pack(fill="both", expand=True, padx=6, pady=6)
+        return screen
 
     def show_ammunition(self):
-        self.clear_content()
-        AmmunitionManagement(self.content_frame)
+        self.screens.show("ammunition", self._build_ammunition)
+
+    def _build_ammunition(self):
+        from src.gui.ammunition_management import AmmunitionManagement
+
+        return AmmunitionManagement(self.content_frame)
 
     def show_booking(self):
         """Display the Booking & Return Management screen."""
-        self.clear_content()
-        db = SessionLocal()
-        BookingManagement(self.content_frame, db, armorer=self.user)
+        self.screens.show("booking", self._build_booking)
+
+    def _build_booking(self):
+        from src.gui.booking_management import BookingManagement
+
+        return BookingManagement(
+            self.content_frame,
+            armorer=self.user,
+            shift_ticket=self.shift_ticket,
+            on_ticket_issued=self._set_shift_ticket,
+        )
+
+    def _set_shift_ticket(self, ticket):
+        self.shift_ticket = ticket
 
     def show_ammunitions(self, text: str):
         """Temporary placeholder for unfinished modules."""
@@ -256,11 +315,23 @@ class ArmoryApp(ctk.CTk):
 
     def clear_content(self):
         """Clears the content area before displaying new content."""
+        self.screens.clear()
         for widget in self.content_frame.winfo_children():
             widget.destroy()
 
     def sign_out(self):
         """Handle sign-out functionality."""
+        from src.services.auth_service import AuthService
+
+        AuthService.revoke_shift_ticket(self.shift_ticket)
+        self.shift_ticket = None
+        if self.user is not None:
+            try:
+                with write_scope("sign_out") as db:
+                    AuthService(db).end_shift(self.user.id)
+            except Exception:
+                traceback.print_exc()  # still sign out; the ticket is already revoked
+        self.changes.stop_watching()
         self.destroy()
         from src.gui.login import LoginApp
 
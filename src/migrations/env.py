@@ -17,6 +17,14 @@ fileConfig(config.config_file_name)
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    """Skip the FTS5 search index and its shadow tables: autogenerate can't model them,
+    so it would otherwise emit drop_table for them (see the search index migration)."""
+    if type_ == "table" and name.startswith("search_index"):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -26,6 +34,7 @@ def run_migrations_offline():
         literal_binds=True,
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -42,6 +51,7 @@ def run_migrations_online():
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
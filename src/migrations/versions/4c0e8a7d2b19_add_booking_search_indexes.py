@@ -0,0 +1,33 @@
+"""add booking search indexes
+
+Revision ID: 4c0e8a7d2b19
+Revises: dfce35fae9ae
+Create Date: 2026-10-18 10:03:17.221904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4c0e8a7d2b19"
+down_revision: Union[str, Sequence[str], None] = "dfce35fae9ae"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_bookings_officer_issued", "bookings", ["officer_id", "issued_at"], unique=False
+    )
+    op.create_index(
+        "ix_bookings_weapon_issued", "bookings", ["weapon_id", "issued_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_bookings_weapon_issued", table_name="bookings")
+    op.drop_index("ix_bookings_officer_issued", table_name="bookings")
@@ -0,0 +1,86 @@
+"""add search index
+
+Revision ID: 8e3b51f0c6a4
+Revises: 4c0e8a7d2b19
+Create Date: 2026-10-18 11:26:40.518733
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e3b51f0c6a4"
+down_revision: Union[str, Sequence[str], None] = "4c0e8a7d2b19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of src/models/search_index.py at this revision.
+SOURCES = {
+    "user": (
+        0,
+        "users",
+        "{r}.name",
+        "{r}.service_number || ' ' || coalesce({r}.unit, '') || ' ' || {r}.role",
+    ),
+    "weapon": (
+        1,
+        "weapons",
+        "{r}.serial_number",
+        "{r}.type || ' ' || coalesce({r}.location, '') || ' ' || {r}.status",
+    ),
+    "duty_point": (2, "duty_points", "{r}.location", "coalesce({r}.description, '')"),
+    "ammunition": (
+        3,
+        "ammunitions",
+        "{r}.platform || ' ' || {r}.caliber",
+        "coalesce({r}.category, '') || ' ' || coalesce({r}.bin_location, '')",
+    ),
+}
+
+
+def _insert(kind: str, row: str) -> str:
+    code, _table, title, detail = SOURCES[kind]
+    return (
+        "INSERT INTO search_index(rowid, kind, ref_id, title, detail) VALUES ("
+        f"{row}.id * 4 + {code}, '{kind}', {row}.id, "
+        f"{title.format(r=row)}, {detail.format(r=row)});"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "kind UNINDEXED, ref_id UNINDEXED, title, detail, "
+        "tokenize = 'trigram case_sensitive 0')"
+    )
+    for kind, (code, table, title, detail) in SOURCES.items():
+        op.execute(
+            "INSERT INTO search_index(rowid, kind, ref_id, title, detail) "
+            f"SELECT id * 4 + {code}, '{kind}', id, {title.format(r=table)}, "
+            f"{detail.format(r=table)} FROM {table}"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} "
+            f"BEGIN {_insert(kind, 'new')} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE ON {table} "
+            f"BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + {code}; "
+            f"{_insert(kind, 'new')} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} "
+            f"BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + {code}; END"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for _kind, (_code, table, _title, _detail) in SOURCES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_ad")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_au")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_ai")
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,39 @@
+"""add booking hot path indexes
+
+Revision ID: a61f0d93c2e7
+Revises: 8e3b51f0c6a4
+Create Date: 2026-10-18 12:14:05.873120
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a61f0d93c2e7"
+down_revision: Union[str, Sequence[str], None] = "8e3b51f0c6a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_bookings_status_issued", "bookings", ["status", "issued_at"], unique=False)
+    op.create_index(
+        "ix_bookings_weapon_returned", "bookings", ["weapon_id", "returned_at"], unique=False
+    )
+    op.create_index(
+        "ix_bookings_duty_point_issued", "bookings", ["duty_point_id", "issued_at"], unique=False
+    )
+    op.create_index(
+        "ix_bookings_armorer_issued", "bookings", ["armorer_id", "issued_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_bookings_armorer_issued", table_name="bookings")
+    op.drop_index("ix_bookings_duty_point_issued", table_name="bookings")
+    op.drop_index("ix_bookings_weapon_returned", table_name="bookings")
+    op.drop_index("ix_bookings_status_issued", table_name="bookings")
@@ -0,0 +1,94 @@
+"""add dashboard stats
+
+Revision ID: c3d8e51b7f20
+Revises: a61f0d93c2e7
+Create Date: 2026-10-18 12:52:31.406218
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d8e51b7f20"
+down_revision: Union[str, Sequence[str], None] = "a61f0d93c2e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of src/models/stats.py at this revision.
+_BUMP = "UPDATE stats SET {}, updated_at = CURRENT_TIMESTAMP WHERE id = 1;"
+TRIGGERS = {
+    "weapons_stats_ai": ("AFTER INSERT ON weapons", "weapons_total = weapons_total + 1"),
+    "weapons_stats_ad": ("AFTER DELETE ON weapons", "weapons_total = weapons_total - 1"),
+    "bookings_stats_ai": (
+        "AFTER INSERT ON bookings",
+        "bookings_total = bookings_total + 1, "
+        "bookings_issued = bookings_issued + (new.status = 'ISSUED'), "
+        "bookings_overdue = bookings_overdue + (new.status = 'OVERDUE')",
+    ),
+    "bookings_stats_au": (
+        "AFTER UPDATE OF status ON bookings",
+        "bookings_issued = bookings_issued + (new.status = 'ISSUED') - (old.status = 'ISSUED'), "
+        "bookings_overdue = bookings_overdue"
+        " + (new.status = 'OVERDUE') - (old.status = 'OVERDUE')",
+    ),
+    "bookings_stats_ad": (
+        "AFTER DELETE ON bookings",
+        "bookings_total = bookings_total - 1, "
+        "bookings_issued = bookings_issued - (old.status = 'ISSUED'), "
+        "bookings_overdue = bookings_overdue - (old.status = 'OVERDUE')",
+    ),
+    "ammunitions_stats_ai": (
+        "AFTER INSERT ON ammunitions",
+        "ammo_rounds = ammo_rounds + coalesce(new.count, 0)",
+    ),
+    "ammunitions_stats_au": (
+        "AFTER UPDATE OF count ON ammunitions",
+        "ammo_rounds = ammo_rounds + coalesce(new.count, 0) - coalesce(old.count, 0)",
+    ),
+    "ammunitions_stats_ad": (
+        "AFTER DELETE ON ammunitions",
+        "ammo_rounds = ammo_rounds - coalesce(old.count, 0)",
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("weapons_total", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("bookings_total", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("bookings_issued", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("bookings_overdue", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("ammo_rounds", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for name, (when, assignments) in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {when} BEGIN {_BUMP.format(assignments)} END")
+    op.execute(
+        "INSERT INTO stats "
+        "(id, weapons_total, bookings_total, bookings_issued, bookings_overdue, ammo_rounds) "
+        "SELECT 1, "
+        "(SELECT count(*) FROM weapons), "
+        "(SELECT count(*) FROM bookings), "
+        "(SELECT count(*) FROM bookings WHERE status = 'ISSUED'), "
+        "(SELECT count(*) FROM bookings WHERE status = 'OVERDUE'), "
+        "(SELECT coalesce(sum(count), 0) FROM ammunitions)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("stats")
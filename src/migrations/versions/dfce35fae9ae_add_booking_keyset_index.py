@@ -0,0 +1,27 @@
+"""add booking keyset index
+
+Revision ID: dfce35fae9ae
+Revises: 11fc9138a147
+Create Date: 2026-10-18 09:12:41.503218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "dfce35fae9ae"
+down_revision: Union[str, Sequence[str], None] = "11fc9138a147"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_bookings_issued_at_id", "bookings", ["issued_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_bookings_issued_at_id", table_name="bookings")
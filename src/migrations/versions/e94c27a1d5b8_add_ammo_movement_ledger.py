@@ -0,0 +1,78 @@
+"""add ammo movement ledger
+
+Revision ID: e94c27a1d5b8
+Revises: c3d8e51b7f20
+Create Date: 2026-10-18 13:40:12.655019
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e94c27a1d5b8"
+down_revision: Union[str, Sequence[str], None] = "c3d8e51b7f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ammo_movements",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("ammunition_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "kind",
+            sa.Enum("OPENING", "ISSUE", "RETURN", "ADJUSTMENT", "REORDER", name="movementkind"),
+            nullable=False,
+        ),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("booking_id", sa.Integer(), nullable=True),
+        sa.Column("remarks", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["ammunition_id"], ["ammunitions.id"], ondelete="RESTRICT"),
+        sa.ForeignKeyConstraint(["booking_id"], ["bookings.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_ammo_movements_ammo_id", "ammo_movements", ["ammunition_id", "id"], unique=False
+    )
+    op.create_table(
+        "ammo_balance_snapshots",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("ammunition_id", sa.Integer(), nullable=False),
+        sa.Column("last_movement_id", sa.Integer(), nullable=False),
+        sa.Column("balance", sa.Integer(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["ammunition_id"], ["ammunitions.id"], ondelete="RESTRICT"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_ammo_snapshots_ammo_taken",
+        "ammo_balance_snapshots",
+        ["ammunition_id", "taken_at"],
+        unique=False,
+    )
+
+    # Open the ledger with the stock on hand today, and snapshot it
+    op.execute(
+        "INSERT INTO ammo_movements (ammunition_id, kind, quantity, remarks, created_at) "
+        "SELECT id, 'OPENING', coalesce(count, 0), 'Ledger opened', CURRENT_TIMESTAMP "
+        "FROM ammunitions"
+    )
+    op.execute(
+        "INSERT INTO ammo_balance_snapshots "
+        "(ammunition_id, last_movement_id, balance, taken_at) "
+        "SELECT ammunition_id, id, quantity, created_at FROM ammo_movements"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ammo_snapshots_ammo_taken", table_name="ammo_balance_snapshots")
+    op.drop_table("ammo_balance_snapshots")
+    op.drop_index("ix_ammo_movements_ammo_id", table_name="ammo_movements")
+    op.drop_table("ammo_movements")
@@ -0,0 +1,44 @@
+"""add fingerprint template digest
+
+Revision ID: f27a9c4e1b63
+Revises: e94c27a1d5b8
+Create Date: 2026-10-18 14:21:48.093517
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f27a9c4e1b63"
+down_revision: Union[str, Sequence[str], None] = "e94c27a1d5b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("fingerprints", sa.Column("template_digest", sa.String(length=64), nullable=True))
+
+    # SQLite has no SHA-256 function: backfill from Python
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, template FROM fingerprints")).all()
+    for fp_id, template in rows:
+        bind.execute(
+            sa.text("UPDATE fingerprints SET template_digest = :digest WHERE id = :id"),
+            {"digest": hashlib.sha256(template).hexdigest(), "id": fp_id},
+        )
+
+    op.create_index(
+        "ix_fingerprints_template_digest", "fingerprints", ["template_digest"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_fingerprints_template_digest", table_name="fingerprints")
+    with op.batch_alter_table("fingerprints") as batch_op:
+        batch_op.drop_column("template_digest")
@@ -1,10 +1,13 @@
 from src.database import Base
+from src.models.ammo_movement import AmmoBalanceSnapshot, AmmoMovement
 from src.models.ammunition import Ammunition
 from src.models.booking import Booking
 from src.models.duty_point import DutyPoint
 from src.models.fingerprint import Fingerprint
 from src.models.record import Record
+from src.models.search_index import SEARCH_SOURCES
 from src.models.shift import Shift
+from src.models.stats import DashboardStats
 from src.models.user import User
 from src.models.weapon import Weapon
 
@@ -13,9 +16,13 @@ __all__ = [
     "User",
     "Weapon",
     "Ammunition",
+    "AmmoMovement",
+    "AmmoBalanceSnapshot",
     "Booking",
     "DutyPoint",
     "Fingerprint",
     "Record",
     "Shift",
+    "DashboardStats",
+    "SEARCH_SOURCES",
 ]
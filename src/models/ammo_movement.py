@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+from src.database import Base
+from src.models.enums import MovementKind
+
+
+class AmmoMovement(Base):
+    """One append-only entry in the ammunition ledger; quantity is the signed stock change."""
+
+    __tablename__ = "ammo_movements"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ammunition_id = Column(
+        Integer, ForeignKey("ammunitions.id", ondelete="RESTRICT"), nullable=False
+    )
+    kind = Column(Enum(MovementKind), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    booking_id = Column(Integer, ForeignKey("bookings.id"), nullable=True)
+    remarks = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    ammunition = relationship("Ammunition", back_populates="movements")
+    booking = relationship("Booking")
+
+    __table_args__ = (
+        # Tail of movements after a snapshot (ammunition_id = ? AND id > ?) and
+        # per-item history, newest first. ids grow with created_at.
+        Index("ix_ammo_movements_ammo_id", "ammunition_id", "id"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<AmmoMovement id={self.id} ammo={self.ammunition_id} "
+            f"kind={self.kind.name if self.kind else None} qty={self.quantity}>"
+        )
+
+
+class AmmoBalanceSnapshot(Base):
+    """Stock balance of one ammunition item right after movement last_movement_id."""
+
+    __tablename__ = "ammo_balance_snapshots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ammunition_id = Column(
+        Integer, ForeignKey("ammunitions.id", ondelete="RESTRICT"), nullable=False
+    )
+    last_movement_id = Column(Integer, nullable=False)
+    balance = Column(Integer, nullable=False)
+    taken_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    ammunition = relationship("Ammunition", back_populates="snapshots")
+
+    __table_args__ = (Index("ix_ammo_snapshots_ammo_taken", "ammunition_id", "taken_at"),)
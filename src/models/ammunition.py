@@ -25,6 +25,12 @@ class Ammunition(Base):
 
     weapon = relationship("Weapon", back_populates="ammunition")
     bookings = relationship("Booking", back_populates="ammunition", cascade="all, delete-orphan")
+    # The ledger is append-only: deleting a line never touches its movements or
+    # snapshots (crud_ammunition.delete_ammunition refuses lines that have any)
+    movements = relationship("AmmoMovement", back_populates="ammunition", passive_deletes="all")
+    snapshots = relationship(
+        "AmmoBalanceSnapshot", back_populates="ammunition", passive_deletes="all"
+    )
 
     reorder_level = Column(Integer, nullable=False, default=0)
     bin_location = Column(String)
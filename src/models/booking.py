@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, func
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from src.database import Base
@@ -37,6 +37,21 @@ class Booking(Base):
     duty_point = relationship("DutyPoint", back_populates="bookings")
     ammunition = relationship("Ammunition", back_populates="bookings")
 
+    __table_args__ = (
+        # Keyset pagination of the booking history: ORDER BY issued_at DESC, id DESC
+        Index("ix_bookings_issued_at_id", "issued_at", "id"),
+        # search_bookings(): officer / weapon matches, newest first
+        Index("ix_bookings_officer_issued", "officer_id", "issued_at"),
+        Index("ix_bookings_weapon_issued", "weapon_id", "issued_at"),
+        # Dashboard counters and status filters
+        Index("ix_bookings_status_issued", "status", "issued_at"),
+        # Open-booking lookup for a weapon (returned_at IS NULL)
+        Index("ix_bookings_weapon_returned", "weapon_id", "returned_at"),
+        # Relationship loads when a duty point / armorer is deleted or inspected
+        Index("ix_bookings_duty_point_issued", "duty_point_id", "issued_at"),
+        Index("ix_bookings_armorer_issued", "armorer_id", "issued_at"),
+    )
+
     def __repr__(self):
         def __repr__(self):
             return (
@@ -12,6 +12,17 @@ class BookingStatus(PyEnum):
     CANCELLED = "CANCELLED"  # Cancelled before issuance
 
 
+# Ammunition ledger movement types
+
+
+class MovementKind(PyEnum):
+    OPENING = "OPENING"  # Stock on hand when the ledger started / item created
+    ISSUE = "ISSUE"  # Rounds handed out with a booking
+    RETURN = "RETURN"  # Rounds handed back when a booking closes
+    ADJUSTMENT = "ADJUSTMENT"  # Manual correction (stock take, edit dialog)
+    REORDER = "REORDER"  # Delivery / restock
+
+
 #  Weapon Status
 
 
@@ -1,14 +1,23 @@
-from sqlalchemy import Column, ForeignKey, Integer, LargeBinary
-from sqlalchemy.orm import relationship
+import hashlib
+
+from sqlalchemy import Column, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import relationship, validates
 
 from src.database import Base
 
 
+def template_digest(template: bytes) -> str:
+    """SHA-256 hex digest used for exact-match lookups of a template."""
+    return hashlib.sha256(template).hexdigest()
+
+
 class Fingerprint(Base):
     __tablename__ = "fingerprints"  # Define table name
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     template = Column(LargeBinary, nullable=False)  # Store fingerprint data as binary
+    # Kept in step with `template` by the validator below; unique index for exact matching
+    template_digest = Column(String(64), nullable=True, unique=True, index=True)
     user_id = Column(
         Integer, ForeignKey("users.id"), unique=True, nullable=False
     )  # Each user has one fingerprint
@@ -16,6 +25,11 @@ class Fingerprint(Base):
     # Relationship with User model
     user = relationship("User", back_populates="fingerprint", foreign_keys=[user_id])
 
+    @validates("template")
+    def _set_digest(self, _key, template):
+        self.template_digest = template_digest(template) if template is not None else None
+        return template
+
     def __repr__(self):
         return f"Fingerprint(id={self.id}, user_id={self.user_id})"
 
@@ -0,0 +1,107 @@
+"""
+SQLite FTS5 shadow index used by the global search (src/crud/crud_search.py).
+
+search_index is not an ORM model: it is a virtual table kept in sync with users,
+weapons, duty_points and ammunitions by triggers, so every write path (ORM, raw
+SQL, seed scripts) updates it in the same transaction.
+
+Rows are keyed by rowid = ref_id * 4 + kind code, which lets the UPDATE/DELETE
+triggers hit a single row by rowid instead of scanning the index.
+"""
+
+from sqlalchemy import DDL, event
+
+from src.database import Base
+
+# kind -> (code, source table, title expression, detail expression)
+SEARCH_SOURCES = {
+    "user": (
+        0,
+        "users",
+        "{r}.name",
+        "{r}.service_number || ' ' || coalesce({r}.unit, '') || ' ' || {r}.role",
+    ),
+    "weapon": (
+        1,
+        "weapons",
+        "{r}.serial_number",
+        "{r}.type || ' ' || coalesce({r}.location, '') || ' ' || {r}.status",
+    ),
+    "duty_point": (
+        2,
+        "duty_points",
+        "{r}.location",
+        "coalesce({r}.description, '')",
+    ),
+    "ammunition": (
+        3,
+        "ammunitions",
+        "{r}.platform || ' ' || {r}.caliber",
+        "coalesce({r}.category, '') || ' ' || coalesce({r}.bin_location, '')",
+    ),
+}
+
+# trigram tokenizer: case-insensitive substring matching for terms of 3+ characters,
+# the same semantics the screens had with LIKE '%text%'.
+CREATE_SEARCH_INDEX = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "kind UNINDEXED, ref_id UNINDEXED, title, detail, "
+    "tokenize = 'trigram case_sensitive 0')"
+)
+
+
+def _insert_sql(kind: str, row: str) -> str:
+    code, _table, title, detail = SEARCH_SOURCES[kind]
+    return (
+        "INSERT INTO search_index(rowid, kind, ref_id, title, detail) VALUES ("
+        f"{row}.id * 4 + {code}, '{kind}', {row}.id, "
+        f"{title.format(r=row)}, {detail.format(r=row)});"
+    )
+
+
+def search_index_ddl() -> list[str]:
+    """CREATE statements for the FTS table and its sync triggers."""
+    statements = [CREATE_SEARCH_INDEX]
+    for kind, (code, table, _title, _detail) in SEARCH_SOURCES.items():
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} "
+            f"BEGIN {_insert_sql(kind, 'new')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE ON {table} "
+            f"BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + {code}; "
+            f"{_insert_sql(kind, 'new')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} "
+            f"BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + {code}; END",
+        ]
+    return statements
+
+
+def search_index_populate() -> list[str]:
+    """Statements that (re)fill search_index from the source tables."""
+    statements = ["DELETE FROM search_index"]
+    for kind, (code, table, title, detail) in SEARCH_SOURCES.items():
+        statements.append(
+            "INSERT INTO search_index(rowid, kind, ref_id, title, detail) "
+            f"SELECT id * 4 + {code}, '{kind}', id, {title.format(r=table)}, "
+            f"{detail.format(r=table)} FROM {table}"
+        )
+    return statements
+
+
+def search_index_drop() -> list[str]:
+    statements = []
+    for table in (source[1] for source in SEARCH_SOURCES.values()):
+        statements += [
+            f"DROP TRIGGER IF EXISTS {table}_search_ai",
+            f"DROP TRIGGER IF EXISTS {table}_search_au",
+            f"DROP TRIGGER IF EXISTS {table}_search_ad",
+        ]
+    statements.append("DROP TABLE IF EXISTS search_index")
+    return statements
+
+
+# Keep Base.metadata.create_all()/drop_all() (tests, fresh installs) in step with
+# the Alembic migration that creates the same objects.
+for _statement in search_index_ddl():
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in search_index_drop():
+    event.listen(Base.metadata, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,122 @@
+"""
+Materialized dashboard counters.
+
+stats holds a single row (id = 1). Triggers on weapons, bookings and ammunitions
+adjust it inside the same transaction as the write, so the dashboard reads one row
+instead of running count()/sum() queries. crud_stats.rebuild_stats() recomputes the
+row from the source tables if it ever drifts (restores, manual SQL with triggers off).
+"""
+
+from sqlalchemy import DDL, Column, DateTime, Integer, event, text
+from sqlalchemy.sql import func
+
+from src.database import Base
+
+STATS_ROW_ID = 1
+
+
+class DashboardStats(Base):
+    __tablename__ = "stats"
+
+    id = Column(Integer, primary_key=True)
+    weapons_total = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    bookings_total = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    bookings_issued = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    bookings_overdue = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    ammo_rounds = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    updated_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<DashboardStats weapons={self.weapons_total} bookings={self.bookings_total} "
+            f"issued={self.bookings_issued} overdue={self.bookings_overdue} "
+            f"rounds={self.ammo_rounds}>"
+        )
+
+
+def _bump(assignments: str) -> str:
+    return f"UPDATE stats SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = 1;"
+
+
+# Booking.status is stored as the BookingStatus name
+STATS_TRIGGERS = {
+    "weapons_stats_ai": (
+        "AFTER INSERT ON weapons",
+        _bump("weapons_total = weapons_total + 1"),
+    ),
+    "weapons_stats_ad": (
+        "AFTER DELETE ON weapons",
+        _bump("weapons_total = weapons_total - 1"),
+    ),
+    "bookings_stats_ai": (
+        "AFTER INSERT ON bookings",
+        _bump(
+            "bookings_total = bookings_total + 1, "
+            "bookings_issued = bookings_issued + (new.status = 'ISSUED'), "
+            "bookings_overdue = bookings_overdue + (new.status = 'OVERDUE')"
+        ),
+    ),
+    "bookings_stats_au": (
+        "AFTER UPDATE OF status ON bookings",
+        _bump(
+            "bookings_issued = bookings_issued"
+            " + (new.status = 'ISSUED') - (old.status = 'ISSUED'), "
+            "bookings_overdue = bookings_overdue"
+            " + (new.status = 'OVERDUE') - (old.status = 'OVERDUE')"
+        ),
+    ),
+    "bookings_stats_ad": (
+        "AFTER DELETE ON bookings",
+        _bump(
+            "bookings_total = bookings_total - 1, "
+            "bookings_issued = bookings_issued - (old.status = 'ISSUED'), "
+            "bookings_overdue = bookings_overdue - (old.status = 'OVERDUE')"
+        ),
+    ),
+    "ammunitions_stats_ai": (
+        "AFTER INSERT ON ammunitions",
+        _bump("ammo_rounds = ammo_rounds + coalesce(new.count, 0)"),
+    ),
+    "ammunitions_stats_au": (
+        "AFTER UPDATE OF count ON ammunitions",
+        _bump("ammo_rounds = ammo_rounds + coalesce(new.count, 0) - coalesce(old.count, 0)"),
+    ),
+    "ammunitions_stats_ad": (
+        "AFTER DELETE ON ammunitions",
+        _bump("ammo_rounds = ammo_rounds - coalesce(old.count, 0)"),
+    ),
+}
+
+# Recompute every counter from the source tables (and create the row if missing)
+REBUILD_STATS = (
+    "INSERT OR REPLACE INTO stats "
+    "(id, weapons_total, bookings_total, bookings_issued, bookings_overdue, ammo_rounds, "
+    "updated_at) SELECT 1, "
+    "(SELECT count(*) FROM weapons), "
+    "(SELECT count(*) FROM bookings), "
+    "(SELECT count(*) FROM bookings WHERE status = 'ISSUED'), "
+    "(SELECT count(*) FROM bookings WHERE status = 'OVERDUE'), "
+    "(SELECT coalesce(sum(count), 0) FROM ammunitions), "
+    "CURRENT_TIMESTAMP"
+)
+
+
+def stats_ddl() -> list[str]:
+    statements = [
+        f"CREATE TRIGGER IF NOT EXISTS {name} {when} BEGIN {body} END"
+        for name, (when, body) in STATS_TRIGGERS.items()
+    ]
+    statements.append(REBUILD_STATS)
+    return statements
+
+
+# Triggers reference weapons/bookings/ammunitions, so create them once the whole
+# schema exists rather than on the stats table alone.
+for _statement in stats_ddl():
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _name in STATS_TRIGGERS:
+    event.listen(
+        Base.metadata,
+        "before_drop",
+        DDL(f"DROP TRIGGER IF EXISTS {_name}").execute_if(dialect="sqlite"),
+    )
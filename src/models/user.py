@@ -1,8 +1,8 @@
-import bcrypt
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
 
 from src.database import Base
+from src.services.auth_worker import check_password, hash_password
 
 
 class User(Base):
@@ -17,7 +17,11 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
 
     fingerprint = relationship(
-        "Fingerprint", back_populates="user", uselist=False, foreign_keys="[Fingerprint.user_id]"
+        "Fingerprint",
+        back_populates="user",
+        uselist=False,
+        foreign_keys="[Fingerprint.user_id]",
+        cascade="all, delete-orphan",
     )
     records = relationship("Record", back_populates="officer", cascade="all, delete-orphan")
     bookings_as_officer = relationship(
@@ -55,9 +59,8 @@ class User(Base):
 
     def set_password(self, password: str):
         """Hash and set user password using bcrypt."""
-        salt = bcrypt.gensalt()
-        self.hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+        self.hashed_password = hash_password(password)
 
     def verify_password(self, password: str) -> bool:
         """Check the given password against stored hash."""
-        return bcrypt.checkpw(password.encode("utf-8"), self.hashed_password.encode("utf-8"))
+        return check_password(password, self.hashed_password)
@@ -0,0 +1,35 @@
+"""
+Recompute the dashboard counters (stats table) from scratch.
+
+The counters are kept current by triggers; run this after restoring a backup or
+editing tables with triggers disabled:
+
+    python src/rebuild_stats.py
+"""
+
+import os
+import sys
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.crud.crud_stats import rebuild_stats  # noqa: E402
+from src.database import SessionLocal  # noqa: E402
+
+
+def main() -> int:
+    session = SessionLocal()
+    try:
+        stats = rebuild_stats(session)
+        print(
+            f"✅ Stats rebuilt: {stats.weapons_total} weapons, {stats.bookings_total} bookings "
+            f"({stats.bookings_issued} issued, {stats.bookings_overdue} overdue), "
+            f"{stats.ammo_rounds} rounds"
+        )
+        return 0
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Bring the memory-mapped fingerprint gallery file in line with the database.
+
+Only templates whose digest changed are read from SQLite; pass --rebuild to
+rewrite the whole file (e.g. after restoring a backup):
+
+    python src/refresh_gallery.py [--rebuild]
+"""
+
+import os
+import sys
+
+if __package__ is None and not hasattr(sys, "frozen"):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import SessionLocal  # noqa: E402
+from src.services.gallery_file import GALLERY_PATH, GalleryFile  # noqa: E402
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    gallery_file = GalleryFile(GALLERY_PATH)
+    session = SessionLocal()
+    try:
+        if "--rebuild" in argv:
+            count = gallery_file.export(session)
+            print(f"✅ Gallery rebuilt: {count} templates -> {GALLERY_PATH}")
+        else:
+            result = gallery_file.sync(session)
+            mode = "rebuilt" if result["rebuilt"] else "patched"
+            print(
+                f"✅ Gallery {mode}: {result['changed']} changed, "
+                f"{result['removed']} removed -> {GALLERY_PATH}"
+            )
+        return 0
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 
+from src.crud import crud_ammunition
 from src.models.ammunition import Ammunition
+from src.models.enums import MovementKind
 
 
 class AmmoService:
@@ -42,14 +44,8 @@ class AmmoService:
         if qty <= 0:
             return self.current_stock(platform, caliber)
 
-        ammo = (
-            self.db.query(Ammunition)
-            .filter(Ammunition.platform == platform, Ammunition.caliber == caliber)
-            .with_for_update(nowait=False)
-            .first()
-        )
-
-        if not ammo:
+        ammo_id = self._find_id(platform, caliber)
+        if ammo_id is None:
             # Automatically create new ammo record if missing
             ammo = Ammunition(
                 category=category or self.infer_category(caliber),
@@ -59,27 +55,29 @@ class AmmoService:
             )
             self.db.add(ammo)
             self.db.commit()
-            self.db.refresh(ammo)
+            ammo_id = ammo.id
 
-        ammo.count += qty
+        crud_ammunition.add_stock(self.db, ammo_id, qty, MovementKind.REORDER)
         self.db.commit()
-        self.db.refresh(ammo)
-        return ammo.count
+        return self.current_stock(platform, caliber)
 
     def consume_stock(self, platform: str, caliber: str, qty: int) -> int:
         if qty <= 0:
             return self.current_stock(platform, caliber)
-        ammo = (
-            self.db.query(Ammunition)
-            .filter(Ammunition.platform == platform, Ammunition.caliber == caliber)
-            .with_for_update(nowait=False)
-            .first()
-        )
-        if not ammo or ammo.count < qty:
+        ammo_id = self._find_id(platform, caliber)
+        # Conditional UPDATE: with_for_update() is a no-op on SQLite
+        if ammo_id is None or not crud_ammunition.consume_stock(self.db, ammo_id, qty):
+            self.db.rollback()
             raise ValueError("Insufficient ammunition")
-        ammo.count -= qty
         self.db.commit()
-        return ammo.count
+        return self.current_stock(platform, caliber)
+
+    def _find_id(self, platform: str, caliber: str) -> int | None:
+        return (
+            self.db.query(Ammunition.id)
+            .filter(Ammunition.platform == platform, Ammunition.caliber == caliber)
+            .scalar()
+        )
 
     def current_stock(self, platform: str, caliber: str) -> int:
         ammo = (
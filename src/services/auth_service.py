@@ -1,21 +1,47 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
+from functools import cached_property
 from typing import Optional
 
 import bcrypt
-import jwt
-from cryptography.fernet import Fernet
 from sqlalchemy.orm import Session
 
-from src.models.fingerprint import Fingerprint
+from src.crud import crud_shift
 from src.models.user import User
 
+# jwt, cryptography and the NumPy matcher are imported where they are used: the
+# login window and shift tickets need none of them, and they cost a noticeable
+# share of cold start on the armory PCs.
+
+SHIFT_TICKET_TTL = 30 * 60  # seconds; a full password/fingerprint check renews it
+
+# Shift tickets never leave the process, so the signing key need not either:
+# restarting the application invalidates every outstanding ticket.
+_TICKET_KEY = secrets.token_bytes(32)
+_revoked_tickets: dict[str, float] = {}  # nonce -> expiry, pruned as they lapse
+_revoked_lock = threading.Lock()
+
 
 class AuthService:
     def __init__(self, db_session: Session):
         self.db = db_session
+
+    @cached_property
+    def key(self) -> bytes:
         # Initialize encryption key (in production, this should be in env variables)
-        self.key = Fernet.generate_key()
-        self.cipher_suite = Fernet(self.key)
+        from cryptography.fernet import Fernet
+
+        return Fernet.generate_key()
+
+    @cached_property
+    def cipher_suite(self):
+        from cryptography.fernet import Fernet
+
+        return Fernet(self.key)
 
     def register_user(
         self,
@@ -31,6 +57,11 @@ class AuthService:
 
         if existing_user:
             raise ValueError("User with this service number already exists")
+        if fingerprint_template:
+            from src.crud import crud_fingerprint
+
+            if crud_fingerprint.find_template_owner(self.db, fingerprint_template) is not None:
+                raise ValueError("This fingerprint is already enrolled for another user")
 
         # Create new user
         new_user = User(service_number=service_number, name=name, telephone=telephone, role=role)
@@ -38,11 +69,11 @@ class AuthService:
         self.db.add(new_user)
         self.db.commit()
 
-        # If fingerprint provided, store it
+        # If fingerprint provided, store it (and update the in-memory gallery)
         if fingerprint_template:
-            fingerprint = Fingerprint(template=fingerprint_template, user_id=new_user.id)
-            self.db.add(fingerprint)
-            self.db.commit()
+            from src.crud import crud_fingerprint
+
+            crud_fingerprint.enroll_fingerprint(self.db, new_user.id, fingerprint_template)
 
         return new_user
 
@@ -52,23 +83,22 @@ class AuthService:
         if not user or not user.fingerprint:
             return False
 
-        def _compare_fingerprints(self, template1: bytes, template2: bytes) -> bool:
-            """Compare fingerprint templates. Replace this with your SDK logic."""
-            return template1 == template2
-
         stored_template = user.fingerprint.template
         return self._compare_fingerprints(stored_template, fingerprint_template)
 
     def _compare_fingerprints(self, template1: bytes, template2: bytes) -> bool:
         """
-        Placeholder for actual fingerprint comparison logic
-        You'll need to implement this using your chosen fingerprint SDK
+        1:1 comparison by the active matcher: exact equality of the whole
+        templates unless it was configured with an SDK's comparison.
         """
-        # TODO: Implement actual fingerprint comparison
-        return True  # Placeholder return
+        from src.services.fingerprint_matcher import get_matcher
+
+        return get_matcher().compare(template1, template2)
 
     def create_session(self, user_id: int) -> str:
         """Create a session token for authenticated user"""
+        import jwt
+
         payload = {
             "user_id": user_id,
             "exp": datetime.utcnow() + timedelta(hours=8),  # Token expires in 8 hours
@@ -77,6 +107,8 @@ class AuthService:
 
     def verify_session(self, token: str) -> Optional[int]:
         """Verify session token and return user_id if valid"""
+        import jwt
+
         try:
             payload = jwt.decode(token, str(self.key), algorithms=["HS256"])
             return payload["user_id"]
@@ -96,3 +128,65 @@ class AuthService:
     def check_password(password: str, hashed: str) -> bool:
         """Verify a password against its hash."""
         return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+    # -- shift tickets ---------------------------------------------------------
+
+    def issue_shift_ticket(self, armorer_id: int, ttl: int = SHIFT_TICKET_TTL) -> str:
+        """
+        Sign a ticket for the armorer's active shift (starting one if needed) that
+        stands in for armorer re-authentication until it expires, the shift ends
+        or it is revoked.
+        """
+        shift = crud_shift.start_shift(self.db, armorer_id)
+        payload = f"{shift.id}.{armorer_id}.{int(time.time()) + ttl}.{secrets.token_hex(8)}"
+        return f"{payload}.{_sign_ticket(payload)}"
+
+    def verify_shift_ticket(self, ticket: Optional[str], armorer_id: int) -> bool:
+        """Constant-time HMAC check plus a lookup that the shift is still active."""
+        fields = _parse_ticket(ticket)
+        if fields is None:
+            return False
+        shift_id, ticket_armorer_id, expires, nonce = fields
+        if ticket_armorer_id != armorer_id or expires < time.time():
+            return False
+        with _revoked_lock:
+            if nonce in _revoked_tickets:
+                return False
+        return crud_shift.is_shift_active(self.db, shift_id, armorer_id)
+
+    @staticmethod
+    def revoke_shift_ticket(ticket: Optional[str]):
+        """
+        Invalidate a ticket (in memory, no session needed). Ending the shift
+        invalidates all of its tickets, on every terminal.
+        """
+        fields = _parse_ticket(ticket)
+        if fields is None:
+            return
+        now = time.time()
+        with _revoked_lock:
+            for nonce, expires in list(_revoked_tickets.items()):
+                if expires < now:
+                    del _revoked_tickets[nonce]
+            _revoked_tickets[fields[3]] = fields[2]
+
+    def end_shift(self, armorer_id: int) -> bool:
+        return crud_shift.end_shift(self.db, armorer_id) is not None
+
+
+def _sign_ticket(payload: str) -> str:
+    return hmac.new(_TICKET_KEY, payload.encode("ascii"), hashlib.sha256).hexdigest()
+
+
+def _parse_ticket(ticket: Optional[str]) -> Optional[tuple[int, int, int, str]]:
+    """(shift_id, armorer_id, expires, nonce) of a correctly signed ticket, else None."""
+    if not ticket:
+        return None
+    payload, _, signature = ticket.rpartition(".")
+    try:
+        if not hmac.compare_digest(_sign_ticket(payload), signature):
+            return None
+        shift_id, armorer_id, expires, nonce = payload.split(".")
+        return int(shift_id), int(armorer_id), int(expires), nonce
+    except (TypeError, ValueError):
+        return None  # not ASCII, or not a ticket at all
@@ -0,0 +1,177 @@
+"""
+Background bcrypt hashing/verification for the Tk UI.
+
+bcrypt is deliberately slow (hundreds of milliseconds per call) and releases the
+GIL while it works, so running it on a small thread pool keeps the event loop
+responsive. Tk widgets must only be touched from the main thread: results are
+handed back with deliver(), which polls the future through widget.after().
+
+    future = get_auth_worker().verify(password, user.hashed_password, user_id=user.id)
+    deliver(self, future, on_result, on_error)
+
+New hashes use the host's calibrated work factor (src.config.get_bcrypt_rounds,
+measured by calibrate_rounds()). When verify() is given a user_id, a correct
+password whose stored hash uses another cost is rehashed on the pool afterwards.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import bcrypt
+
+from src.config import get_bcrypt_rounds
+
+POLL_MS = 25
+MIN_ROUNDS = 10  # never calibrate below this, however slow the host
+MAX_ROUNDS = 16
+TARGET_VERIFY_MS = 250
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    salt = bcrypt.gensalt(rounds or get_bcrypt_rounds())
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def hash_rounds(hashed: Optional[str]) -> Optional[int]:
+    """Cost factor of a "$2b$12$..." hash, or None if it is not a bcrypt hash."""
+    parts = (hashed or "").split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed: Optional[str], rounds: Optional[int] = None) -> bool:
+    current = hash_rounds(hashed)
+    return current is not None and current != (rounds or get_bcrypt_rounds())
+
+
+def calibrate_rounds(
+    target_ms: float = TARGET_VERIFY_MS,
+    min_rounds: int = MIN_ROUNDS,
+    max_rounds: int = MAX_ROUNDS,
+    measure: Optional[Callable[[int], float]] = None,
+) -> int:
+    """
+    Highest cost whose verify time on this host stays within target_ms.
+
+    Each extra round doubles the work, so one timing at min_rounds (best of three,
+    to ignore scheduler noise) predicts the rest.
+    """
+    measure = measure or time_verify
+    elapsed_ms = min(measure(min_rounds) for _ in range(3)) * 1000
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+def time_verify(rounds: int) -> float:
+    """Seconds for one bcrypt verify at the given cost."""
+    hashed = bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds))
+    start = time.perf_counter()
+    bcrypt.checkpw(b"calibration", hashed)
+    return time.perf_counter() - start
+
+
+def check_password(password: str, hashed: Optional[str]) -> bool:
+    if not password or not hashed:
+        return False
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:
+        return False  # malformed hash in the database
+
+
+class AuthWorker:
+    """A small thread pool for password hashing; every call returns a Future."""
+
+    def __init__(self, max_workers: int = 2, session_factory: Optional[Callable] = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auth")
+        self._session_factory = session_factory
+        self.rehashed: Optional[Future] = None  # last background rehash, for callers/tests
+
+    def hash(self, password: str) -> "Future[str]":
+        return self._executor.submit(hash_password, password)
+
+    def verify(
+        self, password: str, hashed: Optional[str], user_id: Optional[int] = None
+    ) -> "Future[bool]":
+        """Check a password; with user_id, also upgrade an outdated hash in the background."""
+        return self._executor.submit(self._verify, password, hashed, user_id)
+
+    def _verify(self, password, hashed, user_id) -> bool:
+        ok = check_password(password, hashed)
+        if ok and user_id is not None and needs_rehash(hashed):
+            # Queued, not awaited: the caller gets its answer at the old cost
+            self.rehashed = self._executor.submit(self._rehash, user_id, password, hashed)
+        return ok
+
+    def _rehash(self, user_id: int, password: str, old_hash: str) -> bool:
+        from src.crud.crud_user import replace_password_hash
+
+        new_hash = hash_password(password)
+        if self._session_factory is None:
+            from src.services.db_executor import get_db_executor
+
+            # Hashed here; the UPDATE waits its turn on the DB writer thread
+            future = get_db_executor().write(replace_password_hash, user_id, old_hash, new_hash)
+            return future.result()
+        db = self._session_factory()
+        try:
+            return replace_password_hash(db, user_id, old_hash, new_hash)
+        finally:
+            db.close()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_worker: Optional[AuthWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_auth_worker() -> AuthWorker:
+    """The process-wide worker, created on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = AuthWorker()
+        return _worker
+
+
+def deliver(
+    widget,
+    future: Future,
+    on_result: Callable,
+    on_error: Optional[Callable[[BaseException], None]] = None,
+    poll_ms: int = POLL_MS,
+):
+    """
+    Call on_result(value) or on_error(exc) on the Tk main thread once the future
+    finishes. Nothing is called if the widget was destroyed in the meantime.
+    """
+
+    def poll():
+        try:
+            if not widget.winfo_exists():
+                return
+        except Exception:
+            return  # widget (or the whole app) is gone
+        if not future.done():
+            widget.after(poll_ms, poll)
+            return
+        exc = future.exception()
+        if exc is None:
+            on_result(future.result())
+        elif on_error is not None:
+            on_error(exc)
+        else:
+            raise exc
+
+    widget.after(poll_ms, poll)
@@ -0,0 +1,247 @@
+"""
+Committed data changes, published to whoever displays or caches the data.
+
+Screens used to refresh by hand after their own dialogs and never heard about
+writes made elsewhere. Every ORM write is now reported once it commits, as typed
+(entity, id, op) events:
+
+    bus = get_change_bus()
+    bus.subscribe((Ammunition,), on_changes)                  # on the committing thread
+    bus.subscribe_widget(self, (Booking, Weapon), on_changes)  # on the Tk thread, via pump()
+
+    def on_changes(changes):           # [Change("bookings", 42, ChangeOp.INSERT), ...]
+        ...
+
+Changes are collected in after_flush (inserted, modified and deleted objects)
+and do_orm_execute (ORM-enabled UPDATE/DELETE statements such as the
+conditional stock updates; the id is read from an `id == value` condition when
+there is one, otherwise it is None), published in after_commit and discarded on
+rollback. Widget subscribers receive them in batches when the Tk thread calls
+pump(); direct subscribers are called from after_commit and must be quick and
+thread-safe. Raw SQL bypasses the events.
+
+Commits from other processes (a second terminal) are noticed through SQLite's
+data_version: poll_external() publishes Change(entity, None, UPDATE) for every
+subscribed entity when the database changed without a local commit. A foreign
+commit that lands in the same interval as a local one is only seen with the
+next foreign commit; screens still re-read when they are shown again.
+"""
+
+import enum
+import threading
+import traceback
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+
+
+class ChangeOp(str, enum.Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class Change(NamedTuple):
+    entity: str  # table name, e.g. "bookings"
+    id: Optional[int]  # None: unknown rows (bulk statements, other terminals)
+    op: ChangeOp
+
+
+def entity_name(entity) -> str:
+    """Table name of a model class (or a name, returned as is)."""
+    return entity if isinstance(entity, str) else entity.__table__.name
+
+
+class Subscription:
+    def __init__(self, entities: Iterable, callback: Callable, widget=None):
+        self.entities = frozenset(entity_name(e) for e in entities)
+        self.callback = callback
+        self.widget = widget
+        self.pending: list[Change] = []  # widget subscriptions only, until pump()
+
+
+class ChangeBus:
+    """Fan-out of committed changes to subscribers, filtered by entity."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: list[Subscription] = []
+        self._local_commit = False  # since the last poll_external()
+        self._watch = None  # DBAPI connection reading data_version
+        self._data_version = None
+
+    def subscribe(self, entities: Iterable, callback: Callable) -> Subscription:
+        """Call callback(changes) from the committing thread, right after each commit."""
+        return self._add(Subscription(entities, callback))
+
+    def subscribe_widget(self, widget, entities: Iterable, callback: Callable) -> Subscription:
+        """Call callback(changes) on the Tk thread from pump(); dropped with the widget."""
+        return self._add(Subscription(entities, callback, widget))
+
+    def _add(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, changes: Iterable[Change], local: bool = True):
+        changes = list(dict.fromkeys(changes))  # drop repeats, keep order
+        direct = []
+        with self._lock:
+            self._local_commit |= local
+            for subscription in self._subscriptions:
+                matching = [c for c in changes if c.entity in subscription.entities]
+                if not matching:
+                    continue
+                if subscription.widget is None:
+                    direct.append((subscription, matching))
+                else:
+                    subscription.pending.extend(matching)
+        for subscription, matching in direct:
+            try:
+                subscription.callback(matching)
+            except Exception:
+                traceback.print_exc()  # a subscriber must not fail the commit
+
+    def pump(self) -> int:
+        """Deliver queued changes to widget subscribers; call on the Tk thread."""
+        ready = []
+        with self._lock:
+            for subscription in list(self._subscriptions):
+                if subscription.widget is None or not subscription.pending:
+                    continue
+                if not _alive(subscription.widget):
+                    self._subscriptions.remove(subscription)
+                    continue
+                batch = list(dict.fromkeys(subscription.pending))
+                subscription.pending = []
+                ready.append((subscription, batch))
+        for subscription, batch in ready:
+            try:
+                subscription.callback(batch)
+            except Exception:
+                traceback.print_exc()
+        return len(ready)
+
+    def watch(self, engine):
+        """Start noticing commits made by other processes to engine's database."""
+        self.stop_watching()
+        self._watch = engine.raw_connection()
+        self._data_version = self._read_data_version()
+        self._local_commit = False
+
+    def stop_watching(self):
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+    def _read_data_version(self) -> int:
+        cursor = self._watch.cursor()
+        try:
+            return cursor.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            cursor.close()
+
+    def poll_external(self) -> bool:
+        """Publish an UPDATE of every subscribed entity if another process committed."""
+        if self._watch is None:
+            return False
+        version = self._read_data_version()
+        with self._lock:
+            changed = version != self._data_version and not self._local_commit
+            self._data_version = version
+            self._local_commit = False
+            entities = sorted(set().union(*(s.entities for s in self._subscriptions)))
+        if changed:
+            self.publish([Change(e, None, ChangeOp.UPDATE) for e in entities], local=False)
+        return changed
+
+
+def _alive(widget) -> bool:
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False  # widget (or the whole app) is gone
+
+
+def _identity(obj) -> Optional[int]:
+    # Primary key values, not identity: new objects get their identity after the flush
+    key = inspect(obj).mapper.primary_key_from_instance(obj)
+    return key[0] if len(key) == 1 else None
+
+
+def _statement_ids(statement, mapper) -> Optional[list]:
+    """Ids an UPDATE/DELETE is limited to by `pk == value` or `pk IN (...)`, if any."""
+    where = statement.whereclause
+    if where is None or len(mapper.primary_key) != 1:
+        return None
+    pk = mapper.primary_key[0]
+    terms = [where]
+    if isinstance(where, BooleanClauseList) and where.operator is operators.and_:
+        terms = where.clauses
+    for term in terms:
+        if not isinstance(term, BinaryExpression) or not isinstance(term.right, BindParameter):
+            continue
+        if not pk.shares_lineage(term.left):
+            continue
+        if term.operator is operators.eq:
+            return [term.right.effective_value]
+        if term.operator is operators.in_op:
+            return list(term.right.effective_value)
+    return None
+
+
+_PENDING = "change_events"
+
+
+def _record(session, changes):
+    session.info.setdefault(_PENDING, []).extend(changes)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, _flush_context):
+    changes = []
+    for op, objects in ((ChangeOp.INSERT, session.new), (ChangeOp.DELETE, session.deleted)):
+        changes.extend(Change(entity_name(type(obj)), _identity(obj), op) for obj in objects)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            changes.append(Change(entity_name(type(obj)), _identity(obj), ChangeOp.UPDATE))
+    if changes:
+        _record(session, changes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statements(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    op = ChangeOp.UPDATE if orm_execute_state.is_update else ChangeOp.DELETE
+    for mapper in orm_execute_state.all_mappers:
+        ids = _statement_ids(orm_execute_state.statement, mapper) or [None]
+        _record(orm_execute_state.session, [Change(mapper.local_table.name, i, op) for i in ids])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session):
+    changes = session.info.pop(_PENDING, None)
+    if changes:
+        _bus.publish(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_PENDING, None)
+
+
+_bus = ChangeBus()
+
+
+def get_change_bus() -> ChangeBus:
+    """The process-wide bus."""
+    return _bus
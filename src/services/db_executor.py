@@ -0,0 +1,235 @@
+"""
+One writer thread for the database, plus a small reader pool.
+
+SQLite allows a single writer at a time. With the Tk thread, the fingerprint
+threads and the auth pool all writing through their own sessions, writers met
+in SQLite's busy handler, which sleeps and retries; a wait longer than
+busy_timeout failed with "database is locked". DbExecutor gives writes one
+owner and turns the contention into a FIFO queue
+(benchmarks/bench_db_executor.py compares the two):
+
+    executor = get_db_executor()
+    future = executor.write(crud_fingerprint.enroll_fingerprint, user_id, template)
+    deliver(self, future, on_saved, on_error)          # back on the Tk thread
+
+    user_id = executor.read(crud_fingerprint.verify_fingerprint, template).result()
+
+write(fn, *args, **kwargs) queues fn(db, *args, **kwargs) for the writer
+thread, which runs it on its own connection inside BEGIN IMMEDIATE (the write
+lock is taken before fn reads anything, so its checks and its writes see the
+same state even with other terminals writing) and commits unless fn raised.
+Writes run in submission order, one transaction each. A write submitted with
+coalesce_key replaces a queued, not yet started write with the same key; both
+callers get the result of the one that runs.
+
+read(fn, *args, **kwargs) runs fn(db, ...) on the reader pool in a read_scope.
+
+Write scopes on the Tk thread (src.session_scope.write_scope) take the same
+in-process write lock and BEGIN IMMEDIATE, so they queue behind the writer
+rather than colliding with it. metrics() reports throughput and queue depth.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from src.session_scope import OWNER, begin_immediate, read_scope, write_lock
+
+READERS = 2
+
+
+class DbExecutorMetrics(NamedTuple):
+    writes: int  # completed, including failed ones
+    failed: int
+    coalesced: int  # writes absorbed by a queued write with the same key
+    reads: int
+    queue_depth: int  # writes waiting for the writer
+    peak_queue_depth: int
+    writes_per_second: float  # since the writer started
+    mean_wait_ms: float  # queued until started
+    mean_write_ms: float  # started until committed
+
+
+class _Write:
+    __slots__ = ("fn", "args", "kwargs", "key", "future", "queued_at")
+
+    def __init__(self, fn, args, kwargs, key):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.future = Future()
+        self.queued_at = time.perf_counter()
+
+
+class DbExecutor:
+    """Serialises writes on one thread; reads go to a small pool."""
+
+    def __init__(self, engine=None, readers: int = READERS):
+        self._engine = engine
+        self._readers = readers
+        self._reader_pool: Optional[ThreadPoolExecutor] = None
+        self._cond = threading.Condition()
+        self._queue: deque[_Write] = deque()
+        self._keyed: dict[object, _Write] = {}
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        # Metrics, guarded by _cond
+        self._started_at: Optional[float] = None
+        self._writes = self._failed = self._coalesced = self._reads = 0
+        self._peak_depth = 0
+        self._wait_seconds = self._write_seconds = 0.0
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from src.database import engine
+
+            self._engine = engine
+        return self._engine
+
+    def write(self, fn: Callable, *args, coalesce_key=None, **kwargs) -> Future:
+        """Queue fn(db, *args, **kwargs) for the writer thread; the future holds its result."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DbExecutor is shut down")
+            if coalesce_key is not None:
+                queued = self._keyed.get(coalesce_key)
+                if queued is not None:
+                    queued.fn, queued.args, queued.kwargs = fn, args, kwargs  # latest wins
+                    self._coalesced += 1
+                    return queued.future
+            item = _Write(fn, args, kwargs, coalesce_key)
+            self._queue.append(item)
+            if coalesce_key is not None:
+                self._keyed[coalesce_key] = item
+            self._peak_depth = max(self._peak_depth, len(self._queue))
+            if self._writer is None:
+                self._started_at = time.perf_counter()
+                self._writer = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._writer.start()
+            self._cond.notify()
+            return item.future
+
+    def read(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run fn(db, *args, **kwargs) on the reader pool."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DbExecutor is shut down")
+            if self._reader_pool is None:
+                self._reader_pool = ThreadPoolExecutor(
+                    max_workers=self._readers, thread_name_prefix="db-reader"
+                )
+            return self._reader_pool.submit(self._read, fn, args, kwargs)
+
+    def _read(self, fn, args, kwargs):
+        try:
+            with read_scope(f"db-reader {fn.__name__}", self._session_factory) as db:
+                return fn(db, *args, **kwargs)
+        finally:
+            with self._cond:
+                self._reads += 1
+
+    def _session_factory(self):
+        return Session(bind=self.engine, autoflush=False)
+
+    def _run(self):
+        conn = None
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    break
+                item = self._queue.popleft()
+                if self._keyed.get(item.key) is item:
+                    del self._keyed[item.key]
+            if not item.future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            try:
+                if conn is None or conn.invalidated:
+                    conn = self.engine.connect()
+                result = self._write(conn, item)
+            except BaseException as e:
+                item.future.set_exception(e)
+                failed = 1
+            else:
+                item.future.set_result(result)
+                failed = 0
+            with self._cond:
+                self._writes += 1
+                self._failed += failed
+                self._wait_seconds += started - item.queued_at
+                self._write_seconds += time.perf_counter() - started
+        if conn is not None:
+            conn.close()
+
+    def _write(self, conn, item: _Write):
+        # Objects handed back to other threads keep their loaded values
+        db = Session(
+            bind=conn,
+            join_transaction_mode="control_fully",
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        db.info[OWNER] = f"db-writer {item.fn.__name__}"
+        with write_lock:
+            try:
+                begin_immediate(db)
+                result = item.fn(db, *item.args, **item.kwargs)
+                db.commit()
+                return result
+            except BaseException:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+    def metrics(self) -> DbExecutorMetrics:
+        with self._cond:
+            elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+            writes = self._writes
+            return DbExecutorMetrics(
+                writes=writes,
+                failed=self._failed,
+                coalesced=self._coalesced,
+                reads=self._reads,
+                queue_depth=len(self._queue),
+                peak_queue_depth=self._peak_depth,
+                writes_per_second=writes / elapsed if elapsed else 0.0,
+                mean_wait_ms=self._wait_seconds * 1000 / writes if writes else 0.0,
+                mean_write_ms=self._write_seconds * 1000 / writes if writes else 0.0,
+            )
+
+    def shutdown(self, wait: bool = True):
+        """Finish the queued writes (when wait) and stop both threads."""
+        with self._cond:
+            self._closed = True
+            if not wait:
+                while self._queue:
+                    self._queue.popleft().future.cancel()
+                self._keyed.clear()
+            self._cond.notify_all()
+            writer, pool = self._writer, self._reader_pool
+        if writer is not None and wait:
+            writer.join()
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_executor: Optional[DbExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> DbExecutor:
+    """The process-wide executor, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DbExecutor()
+        return _executor
@@ -0,0 +1,221 @@
+"""
+Process-wide in-memory fingerprint gallery.
+
+Templates are loaded from the database once and kept in one contiguous bytearray
+with parallel offset/length/user-id arrays, so identification never touches SQLite
+and a scan walks a single buffer instead of thousands of Python bytes objects.
+
+crud_fingerprint.enroll_fingerprint() and crud_user.delete_user() write through to
+the gallery after their commit. GalleryMatcher (the default matcher) falls back to
+the digest index on an exact-mode miss, which also picks up enrollments made by
+another process.
+
+Templates replaced or deleted elsewhere (another terminal, or an ORM edit outside
+the CRUD helpers) are caught through the change bus: any committed `fingerprints`
+change, including the data_version poll's Change("fingerprints", None, UPDATE),
+marks every live gallery (this one and ScanningMatcher's) stale, and the next
+lookup syncs it by comparing template digests and reading only the templates
+that differ.
+"""
+
+import threading
+import weakref
+from array import array
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from src.models.fingerprint import Fingerprint, template_digest
+from src.services.change_events import get_change_bus
+from src.services.fingerprint_matcher import ExactDigestMatcher, FingerprintMatcher
+
+# Compact the buffer once this fraction of it belongs to removed/replaced templates
+_COMPACT_RATIO = 0.5
+
+_galleries: "weakref.WeakSet[FingerprintGallery]" = weakref.WeakSet()
+
+
+class FingerprintGallery:
+    def __init__(self, compare: Optional[Callable[[bytes, bytes], bool]] = None):
+        # compare(stored, probe) -> bool for fuzzy SDK matching; None means exact bytes
+        self.compare = compare
+        self._lock = threading.RLock()
+        self._clear()
+        _galleries.add(self)
+
+    def _clear(self):
+        self._buffer = bytearray()
+        self._offsets = array("Q")
+        self._lengths = array("I")
+        self._user_ids = array("q")  # -1 marks a removed slot
+        self._slot_digests: list[Optional[str]] = []
+        self._slots: dict[int, int] = {}  # user_id -> slot
+        self._digests: dict[str, int] = {}  # template digest -> user_id
+        self._garbage = 0  # bytes held by removed slots
+        self.loaded = False
+        self.stale = False  # templates may have changed underneath: sync() before use
+
+    def __len__(self):
+        return len(self._slots)
+
+    def load(self, db: Session, batch_size: int = 1000) -> int:
+        """(Re)load every enrolled template; returns the gallery size."""
+        rows = (
+            db.query(Fingerprint.user_id, Fingerprint.template)
+            .order_by(Fingerprint.id)
+            .execution_options(yield_per=batch_size)
+        )
+        with self._lock:
+            self._clear()
+            for user_id, template in rows:
+                self._append(user_id, template)
+            self.loaded = True
+            return len(self._slots)
+
+    def sync(self, db: Session, chunk_size: int = 500) -> dict:
+        """Bring a loaded gallery in line with the fingerprints table, reading only what changed."""
+        wanted = dict(db.query(Fingerprint.user_id, Fingerprint.template_digest))
+        with self._lock:
+            self.stale = False
+            cached = {user_id: self._slot_digests[slot] for user_id, slot in self._slots.items()}
+            removed = cached.keys() - wanted.keys()
+            changed = [
+                user_id for user_id, digest in wanted.items() if cached.get(user_id) != digest
+            ]
+            for user_id in removed:
+                self._remove(user_id)
+            for start in range(0, len(changed), chunk_size):
+                end = start + chunk_size
+                rows = db.query(Fingerprint.user_id, Fingerprint.template).filter(
+                    Fingerprint.user_id.in_(changed[start:end])
+                )
+                for user_id, template in rows:
+                    self._remove(user_id)
+                    self._append(user_id, template)
+            self._maybe_compact()
+        return {"changed": len(changed), "removed": len(removed)}
+
+    def mark_stale(self):
+        """Templates changed outside the write-through hooks: sync on the next lookup."""
+        with self._lock:
+            self.stale = self.loaded
+
+    def invalidate(self):
+        """Drop everything; the next GalleryMatcher lookup reloads from the database."""
+        with self._lock:
+            self._clear()
+
+    def upsert(self, user_id: int, template: bytes):
+        with self._lock:
+            if not self.loaded:
+                return  # nothing cached yet; the first load will read it
+            self._remove(user_id)
+            self._append(user_id, template)
+            self._maybe_compact()
+
+    def remove(self, user_id: int) -> bool:
+        with self._lock:
+            if not self.loaded:
+                return False
+            removed = self._remove(user_id)
+            self._maybe_compact()
+            return removed
+
+    def identify(self, template: bytes) -> Optional[int]:
+        """Return the user_id whose template matches, or None. Thread-safe."""
+        if not template:
+            return None
+        with self._lock:
+            if self.compare is None:
+                return self._digests.get(template_digest(template))
+            view = memoryview(self._buffer)
+            try:
+                for user_id, start, length in zip(self._user_ids, self._offsets, self._lengths):
+                    if user_id < 0:
+                        continue
+                    end = start + length
+                    if self.compare(view[start:end], template):
+                        return user_id
+                return None
+            finally:
+                view.release()
+
+    def _append(self, user_id: int, template: bytes):
+        self._slots[user_id] = len(self._user_ids)
+        self._offsets.append(len(self._buffer))
+        self._lengths.append(len(template))
+        self._user_ids.append(user_id)
+        self._buffer += template
+        digest = template_digest(template)
+        self._slot_digests.append(digest)
+        self._digests[digest] = user_id
+
+    def _remove(self, user_id: int) -> bool:
+        slot = self._slots.pop(user_id, None)
+        if slot is None:
+            return False
+        self._digests.pop(self._slot_digests[slot], None)
+        self._slot_digests[slot] = None
+        self._user_ids[slot] = -1
+        self._garbage += self._lengths[slot]
+        return True
+
+    def _maybe_compact(self):
+        if not self._buffer or self._garbage / len(self._buffer) < _COMPACT_RATIO:
+            return
+        ends = (start + length for start, length in zip(self._offsets, self._lengths))
+        entries = [
+            (user_id, bytes(self._buffer[start:end]))
+            for user_id, start, end in zip(self._user_ids, self._offsets, ends)
+            if user_id >= 0
+        ]
+        stale = self.stale  # a pending resync survives the rebuild
+        self._clear()
+        for user_id, template in entries:
+            self._append(user_id, template)
+        self.loaded = True
+        self.stale = stale
+
+
+class GalleryMatcher(FingerprintMatcher):
+    """Identify from the in-memory gallery, loading it on first use."""
+
+    name = "gallery"
+
+    def __init__(self, gallery: FingerprintGallery):
+        self.gallery = gallery
+        self._fallback = ExactDigestMatcher()
+
+    def identify(self, db: Session, probe: bytes) -> Optional[int]:
+        if not self.gallery.loaded:
+            self.gallery.load(db)
+        elif self.gallery.stale:
+            self.gallery.sync(db)
+        user_id = self.gallery.identify(probe)
+        if user_id is None and self.gallery.compare is None:
+            # Enrolled by another process since we loaded: one index seek, then cache it
+            user_id = self._fallback.identify(db, probe)
+            if user_id is not None:
+                self.gallery.upsert(user_id, probe)
+        return user_id
+
+    def compare(self, stored: bytes, probe: bytes) -> bool:
+        if self.gallery.compare is None:
+            return super().compare(stored, probe)
+        return bool(stored and probe) and self.gallery.compare(stored, probe)
+
+
+_gallery = FingerprintGallery()
+
+
+def get_gallery() -> FingerprintGallery:
+    """The process-wide gallery shared by the default matcher and the write-through hooks."""
+    return _gallery
+
+
+def _on_fingerprint_changes(_changes):
+    for gallery in list(_galleries):
+        gallery.mark_stale()
+
+
+get_change_bus().subscribe((Fingerprint,), _on_fingerprint_changes)
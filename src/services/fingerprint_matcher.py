@@ -0,0 +1,142 @@
+"""
+Pluggable 1:N fingerprint identification.
+
+crud_fingerprint.verify_fingerprint() delegates to the active matcher:
+
+  - GalleryMatcher (default, src/services/fingerprint_gallery.py): matches against
+    the process-wide in-memory gallery without touching the database.
+  - MappedGalleryMatcher (src/services/gallery_file.py): mmaps a shared on-disk
+    gallery file so every process starts warm; enrollments patch it in place.
+  - ExactDigestMatcher: the scanner returns byte-identical templates for
+    the same finger (the Windows Hello identifier workaround, test fixtures), so the
+    lookup is a single seek on the unique fingerprints.template_digest index.
+  - VectorMatcher (src/services/vector_matcher.py, needs NumPy): scores feature
+    vectors against the whole gallery at once and returns top-k candidates.
+  - ScanningMatcher: wraps an SDK compare(stored, probe) -> bool function for fuzzy
+    templates. An exact template is one digest-index seek; otherwise the probe is
+    compared against a private in-memory gallery, loaded once in batches and kept
+    current like the default one, instead of streaming the table on every scan.
+
+The backend is chosen by the `fingerprint_matcher` setting (database/settings.json
+or ARMORY_FINGERPRINT_MATCHER): "gallery" (default), "mapped-gallery", "vector"
+or "exact-digest". Tests and SDK integrations install one directly with set_matcher().
+"""
+
+import hmac
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from src.models.fingerprint import Fingerprint, template_digest
+
+
+class FingerprintMatcher(ABC):
+    """Base class: identify a probe template and return the matching user_id, or None."""
+
+    name = "base"
+
+    @abstractmethod
+    def identify(self, db: Session, probe: bytes) -> Optional[int]:
+        """1:N search; must return None for an empty probe."""
+
+    def compare(self, stored: bytes, probe: bytes) -> bool:
+        """1:1 decision (AuthService.verify_fingerprint): constant-time exact equality."""
+        if not stored or not probe:
+            return False
+        return hmac.compare_digest(bytes(stored), bytes(probe))
+
+    def on_enrolled(self, user_id: int, template: bytes):
+        """Called after an enrollment commits; matchers with their own cache update it."""
+
+    def on_removed(self, user_id: int):
+        """Called after a user's fingerprint is deleted."""
+
+
+class ExactDigestMatcher(FingerprintMatcher):
+    name = "exact-digest"
+
+    def identify(self, db: Session, probe: bytes) -> Optional[int]:
+        if not probe:
+            return None
+        return (
+            db.query(Fingerprint.user_id)
+            .filter(Fingerprint.template_digest == template_digest(probe))
+            .scalar()
+        )
+
+
+class ScanningMatcher(FingerprintMatcher):
+    """Fuzzy matching through an SDK comparison function over an in-memory gallery."""
+
+    name = "scanning"
+
+    def __init__(self, compare: Callable[[bytes, bytes], bool], batch_size: int = 500):
+        # Imported here: the gallery module builds on the classes above
+        from src.services.fingerprint_gallery import FingerprintGallery
+
+        self.compare = compare
+        self.batch_size = batch_size
+        # The gallery hands out views into its buffer; SDK functions get bytes
+        self.gallery = FingerprintGallery(lambda stored, probe: compare(bytes(stored), probe))
+        self._exact = ExactDigestMatcher()
+
+    def identify(self, db: Session, probe: bytes) -> Optional[int]:
+        if not probe:
+            return None
+        user_id = self._exact.identify(db, probe)
+        if user_id is not None:
+            return user_id
+        if not self.gallery.loaded:
+            self.gallery.load(db, self.batch_size)
+        elif self.gallery.stale:
+            self.gallery.sync(db)
+        return self.gallery.identify(probe)
+
+    def on_enrolled(self, user_id: int, template: bytes):
+        self.gallery.upsert(user_id, template)
+
+    def on_removed(self, user_id: int):
+        self.gallery.remove(user_id)
+
+
+_matcher: Optional[FingerprintMatcher] = None
+
+
+def build_matcher(name: str) -> FingerprintMatcher:
+    """The matcher for a `fingerprint_matcher` setting value."""
+    # Imported here: the gallery modules build on the classes above
+    if name == "mapped-gallery":
+        from src.services.gallery_file import MappedGalleryMatcher
+
+        return MappedGalleryMatcher()
+    if name == "exact-digest":
+        return ExactDigestMatcher()
+    if name == "vector":
+        from src.services.vector_matcher import VectorMatcher
+
+        try:
+            return VectorMatcher()
+        except RuntimeError as e:  # NumPy missing from this install
+            print(f"{e}; using the in-memory gallery")
+    elif name != "gallery":
+        print(f"Unknown fingerprint_matcher {name!r}; using the in-memory gallery")
+    from src.services.fingerprint_gallery import GalleryMatcher, get_gallery
+
+    return GalleryMatcher(get_gallery())
+
+
+def get_matcher() -> FingerprintMatcher:
+    global _matcher
+    if _matcher is None:
+        from src.config import get_setting
+
+        _matcher = build_matcher(get_setting("fingerprint_matcher", "gallery"))
+    return _matcher
+
+
+def set_matcher(matcher: Optional[FingerprintMatcher]) -> Optional[FingerprintMatcher]:
+    """Install the matcher used by verify_fingerprint() (None = default); returns the old one."""
+    global _matcher
+    previous, _matcher = _matcher, matcher
+    return previous
@@ -0,0 +1,485 @@
+"""
+Memory-mapped on-disk fingerprint gallery.
+
+One binary file, shared through the OS page cache by every process that matches
+fingerprints (GUI, kiosk, batch jobs). Readers mmap it and look templates up in
+place: nothing is deserialised through the ORM at start-up.
+
+Layout (little-endian):
+
+    header   64 bytes   magic, version, stride, count, capacity, generation
+    index    capacity x 48 bytes: user_id (i64), length (u32), sha256 digest (32 bytes)
+    data     capacity x stride bytes, one template per slot (zero padded)
+
+Slots 0..count-1 are live; removing a user moves the last slot into the hole.
+Writers bump `generation` to an odd value before touching the file and to the next
+even value afterwards (a seqlock), so readers retry instead of seeing a torn slot.
+Writers serialise on a `<file>.lock` sidecar created with O_EXCL, which works on
+Windows and POSIX alike. The sidecar holds the writer's pid; it is only broken
+when that process is gone, however long a live writer takes.
+
+GalleryFile.sync(db) rebuilds incrementally from the fingerprints table by
+comparing template digests; only changed templates are read from SQLite. A full
+rewrite (temp file + os.replace) happens only when the file is missing or must grow.
+
+Once the file exists, enrollments and user deletions patch it whichever matcher
+the process runs (update_shared_file, called from the CRUD layer), so terminals
+using the mapped gallery never fall behind one that does not.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from src.database import BASE_DIR
+from src.models.fingerprint import Fingerprint
+from src.services.fingerprint_matcher import ExactDigestMatcher, FingerprintMatcher
+
+GALLERY_PATH = os.environ.get(
+    "ARMORY_GALLERY_PATH", os.path.join(BASE_DIR, "database", "fingerprints.gallery")
+)
+
+MAGIC = b"ARMGAL1\0"
+VERSION = 1
+DEFAULT_STRIDE = 1024  # bytes reserved per template; longer templates force a rebuild
+
+_HEADER = struct.Struct("<8sIIQQQ")  # magic, version, stride, count, capacity, generation
+_HEADER_SIZE = 64
+_ENTRY = struct.Struct("<qI32s4x")  # user_id, length, sha256 digest
+_LOCK_STALE_SECONDS = 30  # only for a lock file without a readable pid
+
+
+class GalleryFileError(Exception):
+    """The gallery file is missing, corrupt or from another format version."""
+
+
+def _data_offset(capacity: int) -> int:
+    end = _HEADER_SIZE + capacity * _ENTRY.size
+    return (end + 63) // 64 * 64
+
+
+def _file_size(capacity: int, stride: int) -> int:
+    return _data_offset(capacity) + capacity * stride
+
+
+def _read_header(buf) -> tuple:
+    magic, version, stride, count, capacity, generation = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise GalleryFileError("Not a fingerprint gallery file (or unsupported version)")
+    return stride, count, capacity, generation
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def _lock_owner(lock_path: str) -> Optional[int]:
+    try:
+        with open(lock_path, encoding="ascii") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _lock_is_stale(lock_path: str) -> bool:
+    owner = _lock_owner(lock_path)
+    if owner is not None:
+        return not _pid_alive(owner)
+    # Just created (pid not written yet) or unreadable: only its age tells
+    return time.time() - os.path.getmtime(lock_path) > _LOCK_STALE_SECONDS
+
+
+@contextmanager
+def _writer_lock(path: str, timeout: float = 10.0):
+    lock_path = path + ".lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if _lock_is_stale(lock_path):
+                    os.remove(lock_path)  # writer exited or crashed while holding it
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Gallery file is locked: {lock_path}")
+            time.sleep(0.02)
+    try:
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+
+class GalleryFile:
+    """Writer side: create, patch and sync the gallery file."""
+
+    def __init__(self, path: str = GALLERY_PATH, stride: int = DEFAULT_STRIDE):
+        self.path = path
+        self.stride = stride
+
+    # -- full rewrite ------------------------------------------------------------
+
+    def create(self, entries: Iterable[tuple[int, bytes]], capacity: Optional[int] = None) -> int:
+        """Write a fresh file from (user_id, template) pairs; returns the count."""
+        with _writer_lock(self.path):
+            return self._create(list(entries), capacity)
+
+    def _create(self, entries: list, capacity: Optional[int] = None) -> int:
+        stride = max([self.stride] + [len(t) for _, t in entries])
+        capacity = max(capacity or 0, 1024, len(entries) * 2)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.truncate(_file_size(capacity, stride))
+            f.write(_HEADER.pack(MAGIC, VERSION, stride, len(entries), capacity, 0))
+            data = _data_offset(capacity)
+            for slot, (user_id, template) in enumerate(entries):
+                f.seek(_entry_offset(slot))
+                f.write(_ENTRY.pack(user_id, len(template), hashlib.sha256(template).digest()))
+                f.seek(data + slot * stride)
+                f.write(template)
+        os.replace(tmp_path, self.path)
+        self.stride = stride
+        return len(entries)
+
+    def export(self, db: Session) -> int:
+        """Full rebuild from the fingerprints table."""
+        rows = db.query(Fingerprint.user_id, Fingerprint.template).order_by(Fingerprint.id)
+        return self.create((user_id, template) for user_id, template in rows)
+
+    # -- incremental -------------------------------------------------------------
+
+    def upsert(self, user_id: int, template: bytes):
+        self.apply({user_id: template}, ())
+
+    def remove(self, user_id: int):
+        self.apply({}, (user_id,))
+
+    def apply(self, changed: dict, removed: Iterable[int]) -> bool:
+        """
+        Patch the file in place; returns False if it had to be rewritten instead
+        (missing, full, or a template longer than the stride).
+        """
+        with _writer_lock(self.path):
+            return self._apply(changed, set(removed))
+
+    def _apply(self, changed: dict, removed: set) -> bool:
+        if not os.path.exists(self.path):
+            self._create(list(changed.items()))
+            return False
+        with open(self.path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+            stride, count, capacity, generation = _read_header(mm)
+            slots = {_read_entry(mm, slot)[0]: slot for slot in range(count)}
+            removed = (removed & slots.keys()) - changed.keys()
+            new = [u for u in changed if u not in slots]
+            fits = count - len(removed) + len(new) <= capacity and all(
+                len(t) <= stride for t in changed.values()
+            )
+            if fits:
+                data = _data_offset(capacity)
+                self._write_header(mm, stride, count, capacity, generation + 1)  # odd: busy
+                for user_id in removed:
+                    count = self._drop(mm, slots, user_id, count, stride, data)
+                for user_id, template in changed.items():
+                    slot = slots.get(user_id)
+                    if slot is None:
+                        slot = slots[user_id] = count
+                        count += 1
+                    self._put(mm, slot, user_id, template, stride, data)
+                self._write_header(mm, stride, count, capacity, generation + 2)
+                mm.flush()
+                return True
+            kept = [
+                entry
+                for entry in _live_entries(mm, stride, count, capacity)
+                if entry[0] not in removed and entry[0] not in changed
+            ]
+        # Full or a template outgrew the stride: rewrite with room to spare
+        self._create(kept + list(changed.items()))
+        return False
+
+    def sync(self, db: Session) -> dict:
+        """Bring the file in line with the fingerprints table, reading only what changed."""
+        wanted = {
+            user_id: digest
+            for user_id, digest in db.query(Fingerprint.user_id, Fingerprint.template_digest)
+        }
+        with _writer_lock(self.path):
+            if not os.path.exists(self.path):
+                rows = db.query(Fingerprint.user_id, Fingerprint.template).order_by(Fingerprint.id)
+                count = self._create([(u, t) for u, t in rows])
+                return {"rebuilt": True, "changed": count, "removed": 0}
+            with open(self.path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm:
+                count = _read_header(mm)[1]
+                on_disk = {}
+                for slot in range(count):
+                    user_id, _length, digest = _read_entry(mm, slot)
+                    on_disk[user_id] = digest.hex()
+            removed = on_disk.keys() - wanted.keys()
+            stale = [u for u, digest in wanted.items() if on_disk.get(u) != digest]
+            changed = {}
+            for start in range(0, len(stale), 500):
+                end = start + 500
+                chunk = stale[start:end]
+                changed.update(
+                    db.query(Fingerprint.user_id, Fingerprint.template)
+                    .filter(Fingerprint.user_id.in_(chunk))
+                    .all()
+                )
+            rebuilt = False
+            if changed or removed:
+                rebuilt = not self._apply(changed, set(removed))
+        return {"rebuilt": rebuilt, "changed": len(changed), "removed": len(removed)}
+
+    # -- slot helpers ------------------------------------------------------------
+
+    @staticmethod
+    def _write_header(mm, stride, count, capacity, generation):
+        _HEADER.pack_into(mm, 0, MAGIC, VERSION, stride, count, capacity, generation)
+
+    @staticmethod
+    def _put(mm, slot, user_id, template, stride, data):
+        digest = hashlib.sha256(template).digest()
+        _ENTRY.pack_into(mm, _entry_offset(slot), user_id, len(template), digest)
+        start = data + slot * stride
+        end = start + stride
+        mm[start:end] = template.ljust(stride, b"\0")
+
+    @staticmethod
+    def _drop(mm, slots, user_id, count, stride, data) -> int:
+        """Remove a slot by moving the last live slot into it; returns the new count."""
+        slot = slots.pop(user_id)
+        last = count - 1
+        if slot != last:
+            dst, src = _entry_offset(slot), _entry_offset(last)
+            dst_end, src_end = dst + _ENTRY.size, src + _ENTRY.size
+            mm[dst:dst_end] = mm[src:src_end]
+            dst, src = data + slot * stride, data + last * stride
+            dst_end, src_end = dst + stride, src + stride
+            mm[dst:dst_end] = mm[src:src_end]
+            slots[_read_entry(mm, slot)[0]] = slot
+        return last
+
+
+def _entry_offset(slot: int) -> int:
+    return _HEADER_SIZE + slot * _ENTRY.size
+
+
+def _read_entry(buf, slot: int) -> tuple:
+    """(user_id, length, digest bytes) of one index entry."""
+    return _ENTRY.unpack_from(buf, _entry_offset(slot))
+
+
+def _live_entries(buf, stride: int, count: int, capacity: int) -> list:
+    data = _data_offset(capacity)
+    entries = []
+    for slot in range(count):
+        user_id, length, _digest = _read_entry(buf, slot)
+        start = data + slot * stride
+        end = start + length
+        entries.append((user_id, bytes(buf[start:end])))
+    return entries
+
+
+def update_shared_file(
+    changed: Optional[dict] = None, removed: Iterable[int] = (), path: Optional[str] = None
+) -> bool:
+    """
+    Patch the gallery file after an enrollment or deletion committed; returns False
+    if there is no file yet (the first MappedGalleryMatcher builds it with sync) or
+    it could not be written, in which case the next sync catches up.
+    """
+    path = path or GALLERY_PATH
+    if not os.path.exists(path):
+        return False
+    try:
+        GalleryFile(path).apply(changed or {}, removed)
+    except (OSError, GalleryFileError) as e:  # TimeoutError is an OSError
+        print(f"Could not update the gallery file {path}: {e}")
+        return False
+    return True
+
+
+class MappedGallery:
+    """
+    Reader side: an mmap of the gallery file plus a digest -> user_id map built
+    from the index. Templates stay in the page cache; nothing is copied to match.
+    """
+
+    def __init__(self, path: str = GALLERY_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._file = None
+        self._mm = None
+        self._stat = None
+        self._generation = None
+        self._digests: dict[bytes, int] = {}
+        self._open()
+
+    def _open(self):
+        self.close()
+        if not os.path.exists(self.path):
+            raise GalleryFileError(f"Gallery file not found: {self.path}")
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._stat = os.fstat(self._file.fileno())
+        self._generation = None
+        self._load_index()
+
+    def _stable_read(self, read: Callable):
+        """Run read(stride, count, capacity) between two equal, even generations."""
+        while True:
+            stride, count, capacity, generation = _read_header(self._mm)
+            if generation % 2:
+                time.sleep(0.001)  # a writer is mid-update
+                continue
+            result = read(stride, count, capacity)
+            if _read_header(self._mm)[3] == generation:
+                return generation, result
+
+    def _load_index(self):
+        def read(_stride, count, _capacity):
+            digests = {}
+            for slot in range(count):
+                user_id, _length, digest = _read_entry(self._mm, slot)
+                digests[digest] = user_id
+            return digests
+
+        self._generation, self._digests = self._stable_read(read)
+
+    def refresh(self):
+        """Pick up writes from other processes (in-place patches or a full rewrite)."""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return
+            if (stat.st_ino, stat.st_size) != (self._stat.st_ino, self._stat.st_size):
+                self._open()
+            elif _read_header(self._mm)[3] != self._generation:
+                self._load_index()
+
+    def __len__(self):
+        return len(self._digests)
+
+    def identify(self, template: bytes) -> Optional[int]:
+        """Exact match through the index digests."""
+        if not template:
+            return None
+        with self._lock:
+            self.refresh()
+            return self._digests.get(hashlib.sha256(template).digest())
+
+    def scan(self, probe: bytes, compare: Callable) -> Optional[int]:
+        """Fuzzy match: compare(stored_view, probe) over every slot, in place."""
+        with self._lock:
+            self.refresh()
+
+            def read(stride, count, capacity):
+                data = _data_offset(capacity)
+                view = memoryview(self._mm)
+                try:
+                    for slot in range(count):
+                        user_id, length, _digest = _read_entry(self._mm, slot)
+                        start = data + slot * stride
+                        end = start + length
+                        if compare(view[start:end], probe):
+                            return user_id
+                    return None
+                finally:
+                    view.release()
+
+            return self._stable_read(read)[1]
+
+    def close(self):
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class MappedGalleryMatcher(FingerprintMatcher):
+    """
+    Match against the shared gallery file. Enrollment hooks patch the file in
+    place; an exact-mode miss checks the digest index in SQLite and syncs the file.
+    """
+
+    name = "mapped-gallery"
+
+    def __init__(self, path: str = GALLERY_PATH, compare: Optional[Callable] = None):
+        self.file = GalleryFile(path)
+        self.sdk_compare = compare  # fuzzy compare(stored, probe); None = exact digests
+        self.gallery: Optional[MappedGallery] = None
+        self._fallback = ExactDigestMatcher()
+
+    def _ensure(self, db: Session) -> MappedGallery:
+        if self.gallery is None:
+            if not os.path.exists(self.file.path):
+                self.file.sync(db)
+            self.gallery = MappedGallery(self.file.path)
+        return self.gallery
+
+    def identify(self, db: Session, probe: bytes) -> Optional[int]:
+        if not probe:
+            return None
+        gallery = self._ensure(db)
+        if self.sdk_compare is not None:
+            return gallery.scan(probe, self.sdk_compare)
+        user_id = gallery.identify(probe)
+        if user_id is None:
+            user_id = self._fallback.identify(db, probe)
+            if user_id is not None:
+                self.file.sync(db)  # another process enrolled without patching the file
+        return user_id
+
+    def compare(self, stored: bytes, probe: bytes) -> bool:
+        if self.sdk_compare is None:
+            return super().compare(stored, probe)
+        return bool(stored and probe) and self.sdk_compare(stored, probe)
+
+    def _is_shared(self) -> bool:
+        return os.path.abspath(self.file.path) == os.path.abspath(GALLERY_PATH)
+
+    # The shared file is already patched by the CRUD layer; only a private one is left
+    def on_enrolled(self, user_id: int, template: bytes):
+        if not self._is_shared():
+            update_shared_file({user_id: template}, path=self.file.path)
+
+    def on_removed(self, user_id: int):
+        if not self._is_shared():
+            update_shared_file(removed=(user_id,), path=self.file.path)
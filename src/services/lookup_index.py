@@ -0,0 +1,344 @@
+"""
+In-memory lookup indexes for the booking form's comboboxes.
+
+The officer, duty point and weapon pickers filter on every keystroke. Scanning a
+list of display strings with `in` is linear in the number of officers, and
+loading the lists took three queries each time the form opened. NgramIndex keeps
+a sorted word/field prefix list (bisect) plus 2/3-gram posting lists, so a
+keystroke only touches the entries that can match:
+
+    lookups = get_booking_lookups(db)     # loaded once per process
+    lookups.officers.search("smi")        # ranked display strings
+    lookups.officers.key_for(display)     # -> user id
+
+Ranking: exact field/word match, then field/word prefix, then any substring. The
+indexes follow the change bus (change_events): when a commit touches users, duty
+points or weapons (including weapon status changes from bookings) the changed
+rows are re-read by id, so rolled back work never shows up. Changes without an
+id, from bulk statements or other terminals, reload the indexes on next use. Raw
+SQL bypasses the events; call invalidate() after it.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from typing import Hashable, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.models.duty_point import DutyPoint
+from src.models.user import User
+from src.models.weapon import Weapon
+from src.services.change_events import Change, entity_name, get_change_bus
+
+GRAM = 3
+DEFAULT_LIMIT = 50
+
+
+def _grams(text: str, n: int = GRAM) -> set[str]:
+    """Every 1..n character substring of text."""
+    grams = set()
+    for size in range(1, n + 1):
+        for start in range(len(text) - size + 1):
+            end = start + size
+            grams.add(text[start:end])
+    return grams
+
+
+class NgramIndex:
+    """
+    Substring/prefix search over a few text fields per key.
+
+    Prefix hits are read in order straight off a sorted token list, so the common
+    case (typing the start of a name, word or serial) costs O(log n + limit).
+    Other substrings walk the rarest n-gram posting list, which is kept in display
+    order, and stop once enough candidates verified.
+    """
+
+    def __init__(self, n: int = GRAM):
+        self.n = n
+        self._lock = threading.RLock()
+        self._entries: dict[Hashable, tuple[str, tuple[str, ...]]] = {}  # key -> display, fields
+        self._keys: dict[str, Hashable] = {}  # display -> key
+        self._sort_keys: dict[Hashable, str] = {}  # key -> lowered order text (default display)
+        self._order: list[tuple[str, Hashable]] = []  # (sort key, key), sorted
+        self._prefixes: list[tuple[str, str, Hashable]] = []  # (token, sort key, key)
+        self._postings: dict[str, list] = {}  # gram -> keys in list order
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def _tokens(fields: tuple[str, ...]) -> set[str]:
+        tokens = set(fields)
+        for field in fields:
+            tokens.update(field.split())
+        return tokens
+
+    def _grams_of(self, fields: tuple[str, ...]) -> set[str]:
+        grams = set()
+        for field in fields:
+            grams |= _grams(field, self.n)
+        return grams
+
+    def load(self, items: Iterable[tuple]):
+        """
+        Replace the contents with (key, display, fields[, order]) items, sorting once.
+
+        order is the text entries are listed by; it defaults to the display string.
+        """
+        with self._lock:
+            self.clear()
+            for key, display, fields, *order in items:
+                fields = tuple(f.lower() for f in fields if f)
+                self._entries[key] = (display, fields)
+                self._keys.setdefault(display, key)
+                sort_key = (order[0] if order else display).lower()
+                self._sort_keys[key] = sort_key
+                self._order.append((sort_key, key))
+                self._prefixes.extend((t, sort_key, key) for t in self._tokens(fields))
+            self._order.sort()
+            self._prefixes.sort()
+            for _sort_key, key in self._order:
+                for gram in self._grams_of(self._entries[key][1]):
+                    self._postings.setdefault(gram, []).append(key)
+
+    def add(self, key: Hashable, display: str, fields: Iterable[str], order: Optional[str] = None):
+        """Insert or replace key; fields are the texts a query may match, order sorts it."""
+        fields = tuple(f.lower() for f in fields if f)
+        sort_key = (order or display).lower()
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                if old == (display, fields) and self._sort_keys[key] == sort_key:
+                    return
+                self.remove(key)
+            self._entries[key] = (display, fields)
+            self._keys.setdefault(display, key)
+            self._sort_keys[key] = sort_key
+            insort(self._order, (sort_key, key))
+            for token in self._tokens(fields):
+                insort(self._prefixes, (token, sort_key, key))
+            for gram in self._grams_of(fields):
+                insort(self._postings.setdefault(gram, []), key, key=self._sort_key)
+
+    def _sort_key(self, key: Hashable) -> str:
+        return self._sort_keys[key]
+
+    def remove(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            display, fields = entry
+            if self._keys.get(display) == key:
+                del self._keys[display]
+            sort_key = self._sort_keys[key]
+            self._delete_sorted(self._order, (sort_key, key))
+            for token in self._tokens(fields):
+                self._delete_sorted(self._prefixes, (token, sort_key, key))
+            for gram in self._grams_of(fields):
+                posting = self._postings[gram]
+                # Postings are in list order: bisect, then step over equal sort keys
+                index = bisect_left(posting, sort_key, key=self._sort_key)
+                while posting[index] != key:
+                    index += 1
+                del posting[index]
+                if not posting:
+                    del self._postings[gram]
+            del self._entries[key]
+            del self._sort_keys[key]
+
+    @staticmethod
+    def _delete_sorted(items: list, item):
+        index = bisect_left(items, item)
+        if index < len(items) and items[index] == item:
+            del items[index]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+            self._sort_keys.clear()
+            self._order.clear()
+            self._prefixes.clear()
+            self._postings.clear()
+
+    def key_for(self, display: str) -> Optional[Hashable]:
+        return self._keys.get(display)
+
+    def display_for(self, key: Hashable) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def search(self, query: str, limit: Optional[int] = DEFAULT_LIMIT) -> list[str]:
+        """
+        Display strings matching query, best first; an empty query lists in order.
+
+        Ranking: a field or word equal to the query, then fields/words starting
+        with it (in order of that word), then any other substring (list order).
+        limit=None returns every match, e.g. to fill an unfiltered dropdown.
+        """
+        q = (query or "").strip().lower()
+        limit = limit or len(self._entries)
+        with self._lock:
+            if not q:
+                return [self._entries[key][0] for _, key in self._order[:limit]]
+
+            # A token equal to q sorts before every longer token starting with q,
+            # so one walk from the bisect point yields exact hits, then prefixes.
+            found: dict[Hashable, None] = {}  # insertion-ordered set
+            for index in range(bisect_left(self._prefixes, (q,)), len(self._prefixes)):
+                token, _sort_key, key = self._prefixes[index]
+                if len(found) >= limit or not token.startswith(q):
+                    break
+                found.setdefault(key)
+
+            if len(found) < limit:
+                for key in self._substring_matches(q, found, limit - len(found)):
+                    found.setdefault(key)
+            return [self._entries[key][0] for key in list(found)[:limit]]
+
+    def _substring_matches(self, q: str, exclude, wanted: int) -> list:
+        size = min(len(q), self.n)
+        rarest = None
+        for start in range(len(q) - size + 1):
+            end = start + size
+            posting = self._postings.get(q[start:end])
+            if not posting:
+                return []
+            if rarest is None or len(posting) < len(rarest):
+                rarest = posting
+        out = []
+        for key in rarest:
+            if key not in exclude and any(q in field for field in self._entries[key][1]):
+                out.append(key)
+                if len(out) >= wanted:
+                    break
+        return out
+
+
+def officer_display(user) -> str:
+    return f"{user.service_number} — {user.name}"
+
+
+def _is_available(weapon) -> bool:
+    return (weapon.status or "").upper() == "AVAILABLE"
+
+
+def _officer_item(user) -> tuple:
+    return user.id, officer_display(user), [user.service_number, user.name], user.name
+
+
+def _duty_point_item(duty_point) -> tuple:
+    return duty_point.id, duty_point.location, [duty_point.location]
+
+
+def _weapon_item(weapon) -> Optional[tuple]:
+    """None for weapons the booking form cannot offer."""
+    if not _is_available(weapon):
+        return None
+    return weapon.id, weapon.serial_number, [weapon.serial_number]
+
+
+class BookingLookups:
+    """The three booking-form indexes, kept in step with committed changes."""
+
+    def __init__(self):
+        self.officers = NgramIndex()
+        self.duty_points = NgramIndex()
+        self.weapons = NgramIndex()  # AVAILABLE weapons only
+        self.loaded = False
+        self._engine = None  # where changed rows are re-read
+        self._lock = threading.RLock()
+
+    def _queries(self, db: Session) -> tuple:
+        return (
+            (self.officers, User, db.query(User.id, User.service_number, User.name), _officer_item),
+            (
+                self.duty_points,
+                DutyPoint,
+                db.query(DutyPoint.id, DutyPoint.location),
+                _duty_point_item,
+            ),
+            (
+                self.weapons,
+                Weapon,
+                db.query(Weapon.id, Weapon.serial_number, Weapon.status),
+                _weapon_item,
+            ),
+        )
+
+    def load(self, db: Session):
+        with self._lock:
+            # The engine, never a Connection: a DbExecutor session's stays with its thread
+            self._engine = db.get_bind().engine
+            for index, model, query, item in self._queries(db):
+                if model is Weapon:
+                    query = query.filter(func.upper(Weapon.status) == "AVAILABLE")
+                index.load(item(row) for row in query)
+            self.loaded = True
+
+    def ensure_loaded(self, db: Session) -> "BookingLookups":
+        if not self.loaded:
+            with self._lock:
+                if not self.loaded:  # a background warm-up may have finished meanwhile
+                    self.load(db)
+        return self
+
+    def invalidate(self):
+        """Reload on next use (after bulk writes the change events did not see)."""
+        self.loaded = False
+
+    def apply(self, changes: Iterable[Change]):
+        """
+        Re-read the rows committed changes name; a change without an id (a bulk
+        statement, another terminal) reloads everything on next use instead.
+        """
+        ids: dict[str, set] = {}
+        for change in changes:
+            if change.id is None:
+                self.invalidate()
+                return
+            ids.setdefault(change.entity, set()).add(change.id)
+        with self._lock:
+            if not self.loaded:
+                return  # the first load will read the committed state anyway
+            db = Session(bind=self._engine)
+            try:
+                for index, model, query, item in self._queries(db):
+                    changed = ids.get(entity_name(model))
+                    if changed:
+                        self._follow(index, changed, query.filter(model.id.in_(changed)), item)
+            except Exception:
+                self.invalidate()  # half applied: start over on next use
+                raise
+            finally:
+                db.close()
+
+    @staticmethod
+    def _follow(index: NgramIndex, ids: set, rows, item):
+        missing = set(ids)
+        for row in rows:
+            missing.discard(row.id)
+            entry = item(row)
+            if entry is None:
+                index.remove(row.id)
+            else:
+                index.add(*entry)
+        for key in missing:  # deleted
+            index.remove(key)
+
+
+_lookups = BookingLookups()
+get_change_bus().subscribe((User, DutyPoint, Weapon), _lookups.apply)
+
+
+def get_booking_lookups(db: Optional[Session] = None) -> BookingLookups:
+    """The process-wide indexes; loaded from db on first use."""
+    if db is not None:
+        _lookups.ensure_loaded(db)
+    return _lookups
@@ -0,0 +1,208 @@
+"""
+Shared read model of the reference data the armory screens open with.
+
+The booking form used to run four queries on the Tk thread before its modal
+appeared; the weapon and ammunition screens each ran their own first load.
+ReferenceData keeps that data in memory for all of them:
+
+    reference = get_reference_data()
+    reference.warm()                       # right after login, on its own thread
+    reference.ammunition(db)               # AmmoRow snapshots, platform/caliber order
+    reference.weapon_page(db)              # (count, first rows) of the weapons table
+    reference.lookups.officers.search("")  # the booking form's indexes (lookup_index)
+
+Datasets go stale when the change bus (change_events) reports a committed write
+that touches them: ORM flushes of Ammunition/AmmoMovement/Weapon rows, ORM-enabled
+UPDATE/DELETE statements (the conditional stock updates in crud_ammunition) and
+commits from other terminals. The stale sets are then reloaded on the worker
+thread with a new session on the engine they were loaded from (never a
+Connection: a DbExecutor write is bound to the writer thread's connection, which
+must not be used from another thread); a reader that gets there first with a
+session reloads inline, so nobody is handed stale stock. Rolled back work
+changes nothing. Raw SQL bypasses the events; call invalidate() after it.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from src.crud.crud_ammunition import list_ammunition
+from src.crud.crud_weapon import count_weapons, search_weapons
+from src.models.ammo_movement import AmmoMovement
+from src.models.ammunition import Ammunition
+from src.models.weapon import Weapon
+from src.services.change_events import Change, entity_name, get_change_bus
+from src.services.lookup_index import BookingLookups, get_booking_lookups
+
+WEAPON_PAGE_ROWS = 100  # the weapons table's first page (VirtualTable page size)
+AMMUNITION_LIMIT = 500  # same cap as the ammunition screen's own list
+
+
+class AmmoRow(NamedTuple):
+    id: int
+    category: Optional[str]
+    platform: Optional[str]
+    caliber: Optional[str]
+    count: Optional[int]
+    reorder_level: Optional[int]
+    bin_location: Optional[str]
+
+
+def _load_ammunition(db: Session) -> list[AmmoRow]:
+    return [
+        AmmoRow(a.id, a.category, a.platform, a.caliber, a.count, a.reorder_level, a.bin_location)
+        for a in list_ammunition(db, limit=AMMUNITION_LIMIT)
+    ]
+
+
+def _load_weapon_page(db: Session) -> tuple[int, list]:
+    return count_weapons(db), search_weapons(db, limit=WEAPON_PAGE_ROWS)
+
+
+LOADERS: dict[str, Callable[[Session], object]] = {
+    "ammunition": _load_ammunition,
+    "weapons": _load_weapon_page,
+}
+
+# Which datasets a write to each model invalidates
+DEPENDS = {
+    Ammunition: ("ammunition",),
+    AmmoMovement: ("ammunition",),  # every stock change is logged to the ledger
+    Weapon: ("weapons",),
+}
+_DEPENDS_BY_ENTITY = {entity_name(model): names for model, names in DEPENDS.items()}
+
+
+class ReferenceData:
+    """Loaded once per process; each dataset is reloaded after writes touch it."""
+
+    def __init__(self, lookups: BookingLookups):
+        self.lookups = lookups
+        self._lock = threading.RLock()
+        self._data: dict[str, object] = {}
+        self._stale: set[str] = set(LOADERS)
+        self._versions = dict.fromkeys(LOADERS, 0)  # bumped by every write event
+        self._engine = None  # stale datasets are reloaded on it
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._warming: Optional[Future] = None
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._data)
+
+    def ammunition(self, db: Session) -> list[AmmoRow]:
+        return self._get("ammunition", db)
+
+    def weapon_page(self, db: Session) -> tuple[int, list]:
+        return self._get("weapons", db)
+
+    def is_fresh(self, name: str) -> bool:
+        return name in self._data and name not in self._stale
+
+    def _get(self, name: str, db: Session):
+        with self._lock:
+            if self.is_fresh(name):
+                return self._data[name]
+        return self._load(name, db)
+
+    def _load(self, name: str, db: Session):
+        self._engine = db.get_bind().engine
+        version = self._versions[name]
+        value = LOADERS[name](db)
+        with self._lock:
+            # A write committed while we read: keep the value but stay stale
+            if self._versions[name] == version:
+                self._data[name] = value
+                self._stale.discard(name)
+            elif name not in self._data:
+                self._data[name] = value
+        return value
+
+    def load(self, db: Session, names=None):
+        """Load names (default: all datasets plus the booking indexes) with db."""
+        if names is None:
+            self.lookups.ensure_loaded(db)
+            names = LOADERS
+        for name in names:
+            self._load(name, db)
+
+    def mark_stale(self, names):
+        with self._lock:
+            for name in names:
+                self._versions[name] += 1
+                self._stale.add(name)
+
+    def apply(self, changes: Iterable[Change]):
+        """Mark the datasets committed changes touch stale and reload them."""
+        names = set()
+        for change in changes:
+            names.update(_DEPENDS_BY_ENTITY.get(change.entity, ()))
+        if names:
+            # Marked even mid warm-up, so a load that raced this commit stays stale
+            self.mark_stale(names)
+            if self.loaded:
+                self.refresh()
+
+    def invalidate(self):
+        """Forget everything (after raw SQL writes the events did not see)."""
+        with self._lock:
+            self._data.clear()
+            self.mark_stale(LOADERS)
+            self._warming = None
+        self.lookups.invalidate()
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="reference-data"
+                )
+            return self._executor.submit(fn, *args)
+
+    def warm(self, session_factory=None) -> Future:
+        """Load everything on the worker thread; repeat calls share one load."""
+        with self._lock:
+            if self._warming is None:
+                self._warming = self._submit(self._warm, session_factory)
+            return self._warming
+
+    def _warm(self, session_factory):
+        if session_factory is None:
+            from src.database import SessionLocal
+
+            session_factory = SessionLocal
+        db = session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+    def refresh(self, bind=None) -> Future:
+        """
+        Reload the stale datasets on the worker thread with a session on bind's
+        engine (a Connection is only used for its engine; it stays with its thread),
+        by default the engine they were loaded from.
+        """
+        return self._submit(self._refresh, bind.engine if bind is not None else self._engine)
+
+    def _refresh(self, bind):
+        with self._lock:
+            names = [name for name in LOADERS if name in self._data and name in self._stale]
+        if not names:
+            return
+        db = Session(bind=bind)
+        try:
+            self.load(db, names)
+        finally:
+            db.close()
+
+
+_reference = ReferenceData(get_booking_lookups())
+get_change_bus().subscribe(DEPENDS, _reference.apply)
+
+
+def get_reference_data() -> ReferenceData:
+    """The process-wide read model."""
+    return _reference
@@ -0,0 +1,336 @@
+"""
+Vectorized 1:N fingerprint matching with NumPy.
+
+Every template is reduced to a fixed-length, L2-normalised float32 feature vector
+and stored as one row of a matrix. Scoring a probe against the whole gallery is a
+single matrix-vector product (cosine similarity), done in row blocks so memory
+stays bounded; the top-k candidates come from argpartition rather than a sort.
+
+Galleries larger than `parallel_rows` are split across a process pool. The matrix
+is published once in shared memory, so each query ships only the probe vector and
+a row range to the workers.
+
+Similarity decisions need a real feature extractor: an SDK passes an `extract`
+callable returning a minutiae/embedding vector of length `dim`. Without one the
+matcher still ranks candidates on the raw template bytes (folded over the whole
+template, see default_features), but a match is only accepted on an exact
+template digest: byte cosine similarity says nothing about whether two scans are
+the same finger, and would accept a template that merely shares a prefix or
+differs by a constant bit pattern.
+
+Select it with fingerprint_matcher = "vector" (see fingerprint_matcher.py). NumPy
+is in requirements.txt; an install without it cannot construct VectorMatcher and
+that setting falls back to the in-memory gallery.
+"""
+
+import hmac
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from src.models.fingerprint import Fingerprint, template_digest
+from src.services.fingerprint_matcher import FingerprintMatcher
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - installs without the requirements
+    np = None
+
+DEFAULT_DIM = 256
+DEFAULT_THRESHOLD = 0.9
+# Rows scored per block: bounds the temporary score array for very large galleries
+BLOCK_ROWS = 65536
+
+
+class MatchCandidate(NamedTuple):
+    user_id: int
+    score: float  # cosine similarity, 1.0 = identical features
+
+
+class MatchResult(NamedTuple):
+    candidates: list[MatchCandidate]  # best first, at most top_k
+    user_id: Optional[int]  # the match: exact digest, or best score over the threshold
+
+
+def default_features(template: bytes, dim: int = DEFAULT_DIM):
+    """
+    Template bytes -> zero-centred, L2-normalised float32 vector of length dim.
+
+    Every byte counts: the template is cut into dim-sized chunks that are summed,
+    so templates longer than dim are not truncated. Good enough to rank
+    candidates, not to decide a match (see the module docstring).
+    """
+    raw = np.frombuffer(bytes(template), dtype=np.uint8).astype(np.float32) - 127.5
+    folded = np.zeros(max(1, -(-raw.size // dim)) * dim, dtype=np.float32)
+    folded[: raw.size] = raw
+    vector = folded.reshape(-1, dim).sum(axis=0)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def compare_templates(
+    template1: bytes,
+    template2: bytes,
+    extract: Optional[Callable] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    dim: int = DEFAULT_DIM,
+) -> bool:
+    """
+    1:1 decision for two templates: feature similarity when an SDK extractor is
+    given, otherwise constant-time exact equality of the whole templates.
+    """
+    if not template1 or not template2:
+        return False
+    if extract is None:
+        return hmac.compare_digest(bytes(template1), bytes(template2))
+    score = float(extract(template1, dim) @ extract(template2, dim))
+    return score >= threshold
+
+
+def _top_k(scores, k: int):
+    """Indices of the k highest scores, best first."""
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(scores, -k)[-k:]
+    return part[np.argsort(scores[part])[::-1]]
+
+
+def _score_rows(matrix, probe, k: int, offset: int = 0):
+    """Blockwise cosine scores of probe against matrix rows -> (row indices, scores)."""
+    best_rows, best_scores = [], []
+    for start in range(0, matrix.shape[0], BLOCK_ROWS):
+        stop = start + BLOCK_ROWS
+        scores = matrix[start:stop] @ probe
+        top = _top_k(scores, k)
+        best_rows.append(top + start + offset)
+        best_scores.append(scores[top])
+    if not best_rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    rows, scores = np.concatenate(best_rows), np.concatenate(best_scores)
+    top = _top_k(scores, k)
+    return rows[top], scores[top]
+
+
+def _score_shared(shm_name: str, shape: tuple, start: int, end: int, probe, k: int):
+    """Process-pool worker: score one row range of the shared-memory matrix."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        rows, scores = _score_rows(matrix[start:end], probe, k, offset=start)
+        del matrix  # release the buffer export before closing the mapping
+        return rows, scores
+    finally:
+        shm.close()
+
+
+class VectorMatcher(FingerprintMatcher):
+    name = "vector"
+
+    def __init__(
+        self,
+        dim: int = DEFAULT_DIM,
+        threshold: float = DEFAULT_THRESHOLD,
+        top_k: int = 5,
+        extract: Optional[Callable[[bytes, int], "np.ndarray"]] = None,
+        workers: Optional[int] = None,
+        parallel_rows: int = 200_000,
+    ):
+        if np is None:
+            raise RuntimeError("VectorMatcher requires NumPy (pip install numpy)")
+        self.dim = dim
+        self.threshold = threshold
+        self.top_k = top_k
+        # Without an SDK extractor, scores only rank candidates; matches are exact
+        self.exact = extract is None
+        self.extract = extract or default_features
+        self.workers = workers
+        self.parallel_rows = parallel_rows
+        self.loaded = False
+        self._lock = threading.RLock()
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._user_ids = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self._rows: dict[int, int] = {}  # user_id -> row
+        self._digests: dict[str, int] = {}  # template digest -> user_id (exact mode)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm = None
+        self._shm_version = -1
+        self._version = 0
+
+    def __len__(self):
+        return self._size
+
+    # -- gallery maintenance -------------------------------------------------
+
+    def load(self, db: Session, batch_size: int = 1000) -> int:
+        rows = (
+            db.query(Fingerprint.user_id, Fingerprint.template)
+            .order_by(Fingerprint.id)
+            .execution_options(yield_per=batch_size)
+        )
+        with self._lock:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+            self._user_ids = np.zeros(0, dtype=np.int64)
+            self._size = 0
+            self._rows.clear()
+            self._digests.clear()
+            for user_id, template in rows:
+                self._append(user_id, template)
+            self.loaded = True
+            self._version += 1
+            return self._size
+
+    def load_vectors(self, user_ids, vectors) -> int:
+        """
+        Replace the gallery with precomputed feature vectors (rows of `vectors`).
+        There are no templates to compare, so exact mode matches none of them.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected an (n, {self.dim}) array, got {vectors.shape}")
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        with self._lock:
+            self._matrix = vectors.copy()
+            self._user_ids = user_ids.copy()
+            self._size = len(user_ids)
+            self._rows = {int(u): row for row, u in enumerate(user_ids)}
+            self._digests.clear()
+            self.loaded = True
+            self._version += 1
+            return self._size
+
+    def add(self, user_id: int, template: bytes):
+        with self._lock:
+            self._remove(user_id)
+            self._append(user_id, template)
+            self._version += 1
+
+    def remove(self, user_id: int) -> bool:
+        with self._lock:
+            removed = self._remove(user_id)
+            self._version += 1
+            return removed
+
+    def _append(self, user_id: int, template: bytes):
+        if self._size == self._matrix.shape[0]:
+            capacity = max(1024, self._size * 2)
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            matrix[: self._size] = self._matrix[: self._size]
+            user_ids = np.full(capacity, -1, dtype=np.int64)
+            user_ids[: self._size] = self._user_ids[: self._size]
+            self._matrix, self._user_ids = matrix, user_ids
+        self._matrix[self._size] = self.extract(template, self.dim)
+        self._user_ids[self._size] = user_id
+        self._rows[user_id] = self._size
+        self._size += 1
+        if self.exact:
+            self._digests[template_digest(template)] = user_id
+
+    def _remove(self, user_id: int) -> bool:
+        row = self._rows.pop(user_id, None)
+        if row is None:
+            return False
+        for digest in [d for d, u in self._digests.items() if u == user_id]:
+            del self._digests[digest]
+        # Keep rows contiguous: move the last row into the hole
+        last = self._size - 1
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            moved = int(self._user_ids[last])
+            self._user_ids[row] = moved
+            self._rows[moved] = row
+        self._user_ids[last] = -1
+        self._size = last
+        return True
+
+    def on_enrolled(self, user_id: int, template: bytes):
+        if self.loaded:
+            self.add(user_id, template)
+
+    def on_removed(self, user_id: int):
+        if self.loaded:
+            self.remove(user_id)
+
+    # -- matching --------------------------------------------------------------
+
+    def search(self, probe: bytes, top_k: Optional[int] = None) -> MatchResult:
+        """Top-k candidates for a probe template plus the match decision."""
+        k = top_k or self.top_k
+        vector = self.extract(probe, self.dim)
+        with self._lock:
+            size = self._size
+            if size >= self.parallel_rows and (self.workers or 0) != 1:
+                rows, scores = self._search_parallel(vector, k, size)
+            else:
+                rows, scores = _score_rows(self._matrix[:size], vector, k)
+            user_ids = self._user_ids[rows]
+            exact_match = self._digests.get(template_digest(probe)) if self.exact else None
+        candidates = [MatchCandidate(int(u), float(s)) for u, s in zip(user_ids, scores)]
+        if self.exact:
+            matched = exact_match
+        elif candidates and candidates[0].score >= self.threshold:
+            matched = candidates[0].user_id
+        else:
+            matched = None
+        return MatchResult(candidates, matched)
+
+    def compare(self, stored: bytes, probe: bytes) -> bool:
+        if self.exact:
+            return super().compare(stored, probe)
+        return compare_templates(stored, probe, self.extract, self.threshold, self.dim)
+
+    def identify(self, db: Session, probe: bytes) -> Optional[int]:
+        if not probe:
+            return None
+        if not self.loaded:
+            self.load(db)
+        return self.search(probe).user_id
+
+    def _search_parallel(self, vector, k: int, size: int):
+        chunks = self.workers or os.cpu_count() or 1
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=chunks)
+        if self._shm_version != self._version:
+            self._publish(size)
+        bounds = np.linspace(0, size, chunks + 1, dtype=np.int64)
+        futures = [
+            self._pool.submit(
+                _score_shared, self._shm.name, (size, self.dim), int(lo), int(hi), vector, k
+            )
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+            if hi > lo
+        ]
+        parts = [f.result() for f in futures]
+        rows = np.concatenate([p[0] for p in parts])
+        scores = np.concatenate([p[1] for p in parts])
+        top = _top_k(scores, k)
+        return rows[top], scores[top]
+
+    def _publish(self, size: int):
+        """Copy the live rows into a fresh shared-memory block for the workers."""
+        self._release_shared()
+        nbytes = max(1, size * self.dim * 4)
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        shared = np.ndarray((size, self.dim), dtype=np.float32, buffer=self._shm.buf)
+        shared[:] = self._matrix[:size]
+        del shared
+        self._shm_version = self._version
+
+    def _release_shared(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self):
+        """Shut down the worker pool and free shared memory."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            self._release_shared()
@@ -0,0 +1,247 @@
+"""
+Short-lived session scopes and an open-session tracker.
+
+Screens used to open one SessionLocal() each and keep it for the whole shift:
+the identity map grew with every row ever shown and the session held a pooled
+connection between clicks. Database work now happens in explicit scopes:
+
+    with read_scope("users") as db:        # closed (and rolled back) on exit
+        rows = search_users(db, text, offset, limit)
+
+    with write_scope("weapons") as db:     # committed on success, rolled back on error
+        delete_weapon(db, weapon_id)
+
+Write scopes take the process-wide write_lock and start with BEGIN IMMEDIATE,
+so they queue behind other writers in this process (including the DB
+executor's writer thread) rather than meeting them in SQLite's busy handler.
+Keep them short.
+
+Objects loaded in a scope are detached when it ends; their loaded columns stay
+readable, so use plain rows or ids across scopes and re-fetch to modify.
+
+Flows that must keep ORM objects across dialogs and callbacks (the booking
+form's multi-step authentication) use screen_session(widget): a tracked session
+that returns its connection as soon as Tk goes idle and that the screen expunges
+whenever it is shown again, so its identity map only ever holds one visit.
+
+Every session transaction is tracked from begin to end. open_sessions() lists
+the ones still holding a connection (owner, age, identity map size), and
+report_open_sessions() prints those older than LEAK_AGE; a session garbage
+collected while still open counts as leaked and raises a ResourceWarning.
+"""
+
+import os
+import sys
+import threading
+import time
+import warnings
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+LEAK_AGE = 60.0  # seconds; scopes and idle-released screen sessions never get close
+OWNER = "owner"  # session.info key naming whoever opened the session
+_FLUSHED = "flushed"  # session.info key: the open transaction has written rows
+
+# Held by every write scope and by the DB executor's writer thread
+# (src.services.db_executor), so this process never has two writers at once
+write_lock = threading.RLock()
+
+
+def _factory(session_factory):
+    if session_factory is None:
+        from src.database import SessionLocal
+
+        session_factory = SessionLocal
+    return session_factory
+
+
+@contextmanager
+def read_scope(owner: str = "read", session_factory=None) -> Iterator[Session]:
+    """A session for reads only; anything left pending is discarded on exit."""
+    db = _factory(session_factory)()
+    db.info[OWNER] = owner
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def begin_immediate(db: Session):
+    """
+    Start db's transaction with BEGIN IMMEDIATE, taking SQLite's write lock now.
+
+    pysqlite only begins a transaction at the first INSERT/UPDATE/DELETE, so the
+    reads before it (stock levels, weapon status) ran outside any transaction
+    and another terminal could change them before the write. Taking the lock
+    first makes the whole scope one consistent unit of work.
+    """
+    db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+
+
+@contextmanager
+def write_scope(owner: str = "write", session_factory=None) -> Iterator[Session]:
+    """A unit of work: commit when the block succeeds, roll back if it raises."""
+    db = _factory(session_factory)()
+    db.info[OWNER] = owner
+    with write_lock:
+        try:
+            begin_immediate(db)
+            yield db
+            db.commit()
+        except BaseException:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def screen_session(widget, owner: str, session_factory=None) -> Session:
+    """
+    A session for a screen's multi-step flows, released whenever Tk goes idle.
+
+    Closed when widget is destroyed. Call expunge() when the screen is shown
+    again (nothing of the last visit is referenced any more).
+    """
+    db = _factory(session_factory)()
+    db.info[OWNER] = owner
+    db.info["release"] = lambda: widget.after_idle(release, db)
+    widget.bind("<Destroy>", lambda e: db.close() if e.widget is widget else None, add="+")
+    return db
+
+
+def _has_work(db: Session) -> bool:
+    """Changes not yet flushed, or flushed but not yet committed."""
+    return bool(db.new or db.dirty or db.deleted or db.info.get(_FLUSHED))
+
+
+def release(db: Session):
+    """End db's transaction (returning its connection) unless work is pending."""
+    if _has_work(db):
+        return  # the flow commits or rolls back itself; the tracker reports it if not
+    if db.in_transaction():
+        db.rollback()
+
+
+def expunge(db: Session):
+    """
+    Forget every object db has loaded and return its connection.
+
+    Detaches before ending the transaction, so objects still referenced keep
+    their loaded values instead of being expired first.
+    """
+    if _has_work(db):
+        return
+    db.expunge_all()
+    if db.in_transaction():
+        db.rollback()
+
+
+class OpenSession(NamedTuple):
+    owner: str
+    age: float  # seconds since its transaction began
+    identities: int  # objects in its identity map
+    pending: int  # new + dirty + deleted, not yet flushed
+    flushed: bool  # has written rows it has not committed
+
+
+class SessionTracker:
+    """Sessions currently inside a transaction (i.e. holding a connection)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: dict[int, tuple[weakref.ref, str, float]] = {}
+        self.leaked = 0  # garbage collected while still open
+
+    def began(self, session: Session):
+        key = id(session)
+        with self._lock:
+            if key in self._open:
+                return
+            owner = session.info.get(OWNER) or _caller()
+            ref = weakref.ref(session, lambda _ref, key=key: self._collected(key))
+            self._open[key] = (ref, owner, time.monotonic())
+        hook = session.info.get("release")
+        if hook is not None:
+            hook()
+
+    def ended(self, session: Session):
+        with self._lock:
+            self._open.pop(id(session), None)
+
+    def _collected(self, key: int):
+        with self._lock:
+            entry = self._open.pop(key, None)
+            if entry is None:
+                return
+            self.leaked += 1
+        warnings.warn(f"session from {entry[1]} was never closed", ResourceWarning)
+
+    def open_sessions(self) -> list[OpenSession]:
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._open.values())
+        sessions = []
+        for ref, owner, since in entries:
+            session = ref()
+            if session is not None:
+                pending = len(session.new) + len(session.dirty) + len(session.deleted)
+                flushed = bool(session.info.get(_FLUSHED))
+                sessions.append(
+                    OpenSession(owner, now - since, len(session.identity_map), pending, flushed)
+                )
+        return sorted(sessions, key=lambda s: s.age, reverse=True)
+
+
+def _caller() -> str:
+    """file:line of the first frame outside SQLAlchemy (and its generated code) and this module."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if "sqlalchemy" not in filename and filename != __file__ and filename[:1] != "<":
+            return f"{os.path.basename(filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+_tracker = SessionTracker()
+
+
+def get_session_tracker() -> SessionTracker:
+    return _tracker
+
+
+def open_sessions() -> list[OpenSession]:
+    return _tracker.open_sessions()
+
+
+def report_open_sessions(older_than: float = LEAK_AGE, stream=None) -> list[OpenSession]:
+    """Print sessions that have held a connection for older_than seconds or more."""
+    stale = [s for s in _tracker.open_sessions() if s.age >= older_than]
+    for s in stale:
+        print(
+            f"[sessions] open {s.age:.0f}s: {s.owner} "
+            f"({s.identities} objects, {s.pending} pending{', flushed' if s.flushed else ''})",
+            file=stream or sys.stderr,
+        )
+    return stale
+
+
+@event.listens_for(Session, "after_begin")
+def _track_begin(session, _transaction, _connection):
+    _tracker.began(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, _flush_context):
+    session.info[_FLUSHED] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _track_end(session, transaction):
+    if transaction.parent is None:  # the root transaction, not a savepoint
+        session.info.pop(_FLUSHED, None)
+        _tracker.ended(session)
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base, create_engine_for_profile
+from src.models.duty_point import DutyPoint
+from src.models.user import User
+from src.models.weapon import Weapon
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A throwaway file-backed database with the full schema."""
+    test_engine = create_engine_for_profile("test", url=f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(test_engine)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def armory(db):
+    """The rows every booking needs: armorer A1, officer O1, duty point Gate, rifle W1."""
+    armorer = User(
+        service_number="A1", name="Armorer", telephone="0", role="armorer", hashed_password="x"
+    )
+    officer = User(
+        service_number="O1", name="Officer", telephone="0", role="officer", hashed_password="x"
+    )
+    duty_point = DutyPoint(location="Gate")
+    weapon = Weapon(serial_number="W1", type="Rifle", condition="Good", status="AVAILABLE")
+    db.add_all([armorer, officer, duty_point, weapon])
+    db.commit()
+    return SimpleNamespace(armorer=armorer, officer=officer, duty_point=duty_point, weapon=weapon)
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.crud import crud_ammo_ledger, crud_ammunition, crud_booking
+from src.models.ammo_movement import AmmoBalanceSnapshot, AmmoMovement
+from src.models.ammunition import Ammunition
+from src.models.enums import MovementKind
+from src.services.ammo_service import AmmoService
+
+
+@pytest.fixture
+def ammo(db, armory):
+    ammo = Ammunition(weapon_id=armory.weapon.id, platform="Glock", caliber="9mm", count=0)
+    db.add(ammo)
+    db.commit()
+    return ammo
+
+
+def test_every_stock_change_is_in_the_ledger(db, armory, ammo):
+    AmmoService(db).add_stock("Glock", "9mm", 100)
+    booking = crud_booking.create_booking(
+        db,
+        officer_id=armory.officer.id,
+        weapon_id=ammo.weapon_id,
+        duty_point_id=armory.duty_point.id,
+        armorer_id=armory.armorer.id,
+        ammunition_id=ammo.id,
+        ammunition_count=30,
+    )
+    crud_booking.return_booking(db, booking_id=booking.id, ammunition_returned=28, remarks=None)
+    crud_ammunition.adjust_stock(db, ammo.id, -500, remarks="stock take")
+
+    entries = [
+        (m.kind, m.quantity, m.booking_id)
+        for m in reversed(crud_ammo_ledger.list_movements(db, ammo.id))
+    ]
+    assert entries == [
+        (MovementKind.REORDER, 100, None),
+        (MovementKind.ISSUE, -30, booking.id),
+        (MovementKind.RETURN, 28, booking.id),
+        (MovementKind.ADJUSTMENT, -98, None),
+    ]
+    db.refresh(ammo)
+    assert ammo.count == sum(q for _, q, _ in entries) == 0
+
+
+def test_balance_at_uses_snapshots(db, ammo, monkeypatch):
+    monkeypatch.setattr(crud_ammo_ledger, "SNAPSHOT_EVERY", 5)
+
+    checkpoints = []
+    for i in range(23):
+        if i % 2:
+            crud_ammunition.consume_stock(db, ammo.id, 1)
+        else:
+            crud_ammunition.add_stock(db, ammo.id, 3, MovementKind.REORDER)
+        db.commit()
+        db.refresh(ammo)
+        checkpoints.append((datetime.utcnow(), ammo.count))
+
+    assert db.query(AmmoBalanceSnapshot).count() == 4
+    assert db.query(AmmoMovement).count() == 23
+    for at, expected in checkpoints:
+        assert crud_ammo_ledger.balance_at(db, ammo.id, at) == expected
+    assert crud_ammo_ledger.balance_at(db, ammo.id, datetime(2000, 1, 1)) == 0
+
+
+def test_lines_with_ledger_history_cannot_be_deleted(db, ammo):
+    assert crud_ammunition.adjust_stock(db, ammo.id, 50) is not None
+    ledger = db.query(AmmoMovement).filter_by(ammunition_id=ammo.id).count()
+
+    assert not crud_ammunition.delete_ammunition(db, ammo.id)
+    assert db.get(Ammunition, ammo.id) is not None
+    assert db.query(AmmoMovement).filter_by(ammunition_id=ammo.id).count() == ledger
+
+    # Deleting through the ORM leaves the ledger alone rather than cascading to it
+    db.delete(ammo)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()  # RESTRICT, on connections that enforce foreign keys
+    assert db.query(AmmoMovement).filter_by(ammunition_id=ammo.id).count() == ledger
+
+
+def test_lines_that_never_moved_stock_can_be_deleted(db, ammo):
+    assert crud_ammunition.delete_ammunition(db, ammo.id)
+    assert db.get(Ammunition, ammo.id) is None
@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.crud import crud_ammunition, crud_booking
+from src.models.ammunition import Ammunition
+from src.models.weapon import Weapon
+from src.services.ammo_service import AmmoService
+
+
+@pytest.fixture
+def ammo(db, armory):
+    ammo = Ammunition(weapon_id=armory.weapon.id, platform="AK-47", caliber="7.62x39mm", count=10)
+    db.add(ammo)
+    db.commit()
+    return ammo
+
+
+def test_consume_stock_refuses_shortfall(db, ammo):
+    assert crud_ammunition.consume_stock(db, ammo.id, 10)
+    assert not crud_ammunition.consume_stock(db, ammo.id, 1)
+    db.commit()
+    db.refresh(ammo)
+    assert ammo.count == 0
+
+
+def test_adjust_stock_clamps_at_zero(db, ammo):
+    assert crud_ammunition.adjust_stock(db, ammo.id, -25).count == 0
+    assert crud_ammunition.adjust_stock(db, ammo.id, 7).count == 7
+    assert crud_ammunition.adjust_stock(db, 999, 1) is None
+
+
+def test_ammo_service_consume(db, ammo):
+    service = AmmoService(db)
+    assert service.consume_stock("AK-47", "7.62x39mm", 4) == 6
+    with pytest.raises(ValueError, match="Insufficient"):
+        service.consume_stock("AK-47", "7.62x39mm", 7)
+    assert service.add_stock("AK-47", "7.62x39mm", 4) == 10
+
+
+def test_create_booking_deducts_once_and_refuses_oversell(db, armory, ammo):
+    spare = Weapon(serial_number="W2", type="Rifle", condition="Good", status="AVAILABLE")
+    db.add(spare)
+    db.commit()
+    ids = dict(
+        officer_id=armory.officer.id,
+        duty_point_id=armory.duty_point.id,
+        armorer_id=armory.armorer.id,
+    )
+
+    crud_booking.create_booking(
+        db, weapon_id=ammo.weapon_id, ammunition_id=ammo.id, ammunition_count=6, **ids
+    )
+    db.refresh(ammo)
+    assert ammo.count == 4
+
+    with pytest.raises(ValueError, match="have 4, need 5"):
+        crud_booking.create_booking(
+            db, weapon_id=spare.id, ammunition_id=ammo.id, ammunition_count=5, **ids
+        )
+    db.refresh(spare)
+    assert spare.status == "AVAILABLE"
+
+
+def test_concurrent_consumers_never_oversell(engine, ammo):
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    taken = []
+
+    def worker():
+        session = Session()
+        try:
+            for _ in range(10):
+                if crud_ammunition.consume_stock(session, ammo.id, 1):
+                    taken.append(1)
+                session.commit()
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    session = Session()
+    assert session.get(Ammunition, ammo.id).count == 0
+    assert len(taken) == 10
+    session.close()
@@ -0,0 +1,186 @@
+import threading
+from concurrent.futures import wait
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src import config
+from src.crud import crud_user
+from src.models.user import User
+from src.services.auth_worker import (
+    AuthWorker,
+    calibrate_rounds,
+    check_password,
+    deliver,
+    hash_password,
+    hash_rounds,
+    needs_rehash,
+)
+
+
+class FakeWidget:
+    """Stands in for a Tk widget: after() queues callbacks, pump() runs them."""
+
+    def __init__(self):
+        self.alive = True
+        self.thread = threading.current_thread()
+        self.queue = []
+
+    def winfo_exists(self):
+        return self.alive
+
+    def after(self, _ms, fn):
+        self.queue.append(fn)
+
+    def pump(self, future):
+        wait([future], timeout=10)
+        while self.queue:
+            self.queue.pop(0)()
+
+
+@pytest.fixture
+def worker():
+    worker = AuthWorker(max_workers=2)
+    yield worker
+    worker.shutdown()
+
+
+def test_hash_and_verify_run_on_the_pool(worker):
+    hashed = worker.hash("s3cret").result(timeout=10)
+    assert hashed.startswith("$2")
+    assert worker.verify("s3cret", hashed).result(timeout=10) is True
+    assert worker.verify("wrong", hashed).result(timeout=10) is False
+
+
+def test_check_password_rejects_missing_or_malformed_hashes():
+    assert check_password("x", None) is False
+    assert check_password("x", "not-a-bcrypt-hash") is False
+    assert check_password("", hash_password("x")) is False
+
+
+def test_deliver_calls_back_on_the_calling_thread(worker):
+    widget = FakeWidget()
+    results = []
+    future = worker.verify("pw", hash_password("pw"))
+    deliver(widget, future, lambda ok: results.append((ok, threading.current_thread())))
+    widget.pump(future)
+    assert results == [(True, widget.thread)]
+
+
+def test_deliver_reports_errors_and_skips_destroyed_widgets(worker):
+    widget = FakeWidget()
+    errors = []
+    future = worker.submit(lambda: 1 / 0)
+    deliver(widget, future, lambda _: None, errors.append)
+    widget.pump(future)
+    assert isinstance(errors[0], ZeroDivisionError)
+
+    results = []
+    future = worker.verify("pw", hash_password("pw"))
+    deliver(widget, future, results.append)
+    widget.alive = False
+    widget.pump(future)
+    assert results == []
+
+
+def test_create_user_accepts_a_precomputed_hash(db):
+    hashed = hash_password("changeme")
+    assert crud_user.create_user(db, "A1", "Armorer", "0", "HQ", "armorer", hashed_password=hashed)
+    user = db.query(User).filter_by(service_number="A1").one()
+    assert user.hashed_password == hashed
+    assert user.verify_password("changeme")
+
+    with pytest.raises(ValueError):
+        crud_user.create_user(db, "A2", "Armorer", "0", "HQ", "armorer")
+
+
+def test_settings_file_and_environment_override(tmp_path, monkeypatch):
+    path = str(tmp_path / "settings.json")
+    monkeypatch.delenv("ARMORY_BCRYPT_ROUNDS", raising=False)
+    assert config.get_bcrypt_rounds(path) == config.DEFAULT_BCRYPT_ROUNDS
+
+    config.save_settings({"bcrypt_rounds": 11}, path)
+    assert config.load_settings(path) == {"bcrypt_rounds": 11}
+    assert config.get_bcrypt_rounds(path) == 11
+
+    monkeypatch.setenv("ARMORY_BCRYPT_ROUNDS", "13")
+    assert config.get_bcrypt_rounds(path) == 13
+
+
+def test_settings_are_read_once_and_bad_values_fall_back(tmp_path, monkeypatch):
+    path = str(tmp_path / "settings.json")
+    monkeypatch.delenv("ARMORY_BCRYPT_ROUNDS", raising=False)
+    config.save_settings({"bcrypt_rounds": 11}, path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"bcrypt_rounds": 13}')
+    assert config.get_bcrypt_rounds(path) == 11  # cached until the next save_settings
+
+    bad = str(tmp_path / "bad.json")
+    with open(bad, "w", encoding="utf-8") as f:
+        f.write('{"bcrypt_rounds": 11,')
+    with pytest.warns(RuntimeWarning, match="malformed"):
+        assert config.get_bcrypt_rounds(bad) == config.DEFAULT_BCRYPT_ROUNDS
+
+    monkeypatch.setenv("ARMORY_BCRYPT_ROUNDS", "twelve")
+    with pytest.warns(RuntimeWarning, match="ARMORY_BCRYPT_ROUNDS"):
+        assert config.get_bcrypt_rounds(path) == config.DEFAULT_BCRYPT_ROUNDS
+
+
+def test_calibration_doubles_until_the_target():
+    # 20 ms at cost 10 -> 40 ms at 11 -> 80 ms at 12 -> 160 ms at 13 -> 320 ms at 14
+    assert calibrate_rounds(250, measure=lambda rounds: 0.020) == 13
+    assert calibrate_rounds(250, max_rounds=12, measure=lambda rounds: 0.020) == 12
+    # A slow host never drops below the floor
+    assert calibrate_rounds(250, measure=lambda rounds: 1.0) == 10
+
+
+def test_hash_rounds_and_needs_rehash():
+    hashed = hash_password("pw", rounds=4)
+    assert hash_rounds(hashed) == 4
+    assert hash_rounds("plain-text") is None
+    assert needs_rehash(hashed, rounds=5)
+    assert not needs_rehash(hashed, rounds=4)
+    assert not needs_rehash("plain-text", rounds=5)
+
+
+def test_successful_login_rehashes_at_the_configured_cost(engine, db, monkeypatch):
+    monkeypatch.setenv("ARMORY_BCRYPT_ROUNDS", "5")
+    old_hash = hash_password("pw", rounds=4)
+    user = User(
+        service_number="R1",
+        name="Rehash",
+        telephone="0",
+        role="armorer",
+        hashed_password=old_hash,
+    )
+    db.add(user)
+    db.commit()
+
+    worker = AuthWorker(session_factory=sessionmaker(bind=engine))
+    try:
+        assert worker.verify("wrong", old_hash, user_id=user.id).result(timeout=10) is False
+        assert worker.rehashed is None
+
+        assert worker.verify("pw", old_hash, user_id=user.id).result(timeout=10) is True
+        assert worker.rehashed.result(timeout=10) is True
+    finally:
+        worker.shutdown()
+
+    db.expire_all()
+    assert hash_rounds(user.hashed_password) == 5
+    assert user.verify_password("pw")
+
+
+def test_replace_password_hash_does_not_clobber_a_newer_password(db):
+    user = User(
+        service_number="R2",
+        name="Race",
+        telephone="0",
+        role="officer",
+        hashed_password="changed-meanwhile",
+    )
+    db.add(user)
+    db.commit()
+    assert not crud_user.replace_password_hash(db, user.id, "stale", "rehashed")
+    db.expire_all()
+    assert user.hashed_password == "changed-meanwhile"
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.crud import crud_booking
+from src.models.booking import Booking
+from src.models.duty_point import DutyPoint
+from src.models.user import User
+from src.models.weapon import Weapon
+
+
+@pytest.fixture
+def booking_history(db, armory):
+    """25 bookings; five share each issued_at so the id tie-breaker matters."""
+    base = datetime(2026, 1, 1, 8, 0)
+    for i in range(25):
+        db.add(
+            Booking(
+                officer_id=armory.officer.id,
+                armorer_id=armory.armorer.id,
+                weapon_id=armory.weapon.id,
+                duty_point_id=armory.duty_point.id,
+                status="RETURNED",
+                issued_at=base + timedelta(hours=i // 5),
+            )
+        )
+    db.commit()
+    return db
+
+
+def test_keyset_pages_cover_history_in_order(booking_history):
+    db = booking_history
+    expected = [
+        b.id for b in db.query(Booking).order_by(Booking.issued_at.desc(), Booking.id.desc())
+    ]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = crud_booking.list_bookings_page(db, limit=7, cursor=cursor)
+        seen.extend(b.id for b in rows)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert pages == 4
+
+
+def test_exact_page_boundary_has_no_empty_trailing_page(booking_history):
+    rows, cursor = crud_booking.list_bookings_page(booking_history, limit=25)
+    assert len(rows) == 25
+    assert cursor is None
+
+
+def test_search_bookings_filters_in_sql(booking_history):
+    db = booking_history
+    other = User(
+        service_number="GP-777",
+        name="Ama Mensah",
+        telephone="0",
+        role="officer",
+        hashed_password="x",
+    )
+    pistol = Weapon(serial_number="P1", type="Pistol", condition="Good", status="ISSUED")
+    db.add_all([other, pistol])
+    db.flush()
+    dp_id = db.query(DutyPoint.id).scalar()
+    armorer_id = db.query(User.id).filter_by(role="armorer").scalar()
+    db.add(
+        Booking(
+            officer_id=other.id,
+            armorer_id=armorer_id,
+            weapon_id=pistol.id,
+            duty_point_id=dp_id,
+            status="ISSUED",
+            issued_at=datetime(2026, 2, 1, 9, 0),
+        )
+    )
+    db.commit()
+
+    rows, cursor = crud_booking.search_bookings(db, "mensah")
+    assert [(r.officer_name, r.weapon_type) for r in rows] == [("Ama Mensah", "Pistol")]
+    assert cursor is None
+
+    assert len(crud_booking.search_bookings(db, "gp-7")[0]) == 1
+    assert len(crud_booking.search_bookings(db, "RIFLE")[0]) == 25
+    assert len(crud_booking.search_bookings(db, status="ISSUED")[0]) == 1
+
+    first_two_hours = (datetime(2026, 1, 1, 8, 0), datetime(2026, 1, 1, 10, 0))
+    assert len(crud_booking.search_bookings(db, "rifle", date_range=first_two_hours)[0]) == 10
+
+
+def test_search_bookings_pages_with_cursor(booking_history):
+    first, cursor = crud_booking.search_bookings(booking_history, "officer", limit=20)
+    rest, end = crud_booking.search_bookings(booking_history, "officer", limit=20, cursor=cursor)
+    assert len(first) == 20 and len(rest) == 5 and end is None
+    assert {r.id for r in first}.isdisjoint(r.id for r in rest)
+
+
+def test_create_booking_refuses_weapon_with_open_booking(booking_history):
+    db = booking_history
+    open_booking = db.query(Booking).first()
+    open_booking.status = "ISSUED"
+    open_booking.returned_at = None
+    db.commit()
+
+    # The weapon row still says AVAILABLE; the open booking must win
+    with pytest.raises(ValueError, match="still out on booking"):
+        crud_booking.create_booking(
+            db,
+            officer_id=open_booking.officer_id,
+            weapon_id=open_booking.weapon_id,
+            duty_point_id=open_booking.duty_point_id,
+            armorer_id=open_booking.armorer_id,
+        )
@@ -0,0 +1,208 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import update
+
+from src.crud import crud_ammunition, crud_booking
+from src.gui.live_updates import ChangeFollower, update_table
+from src.models.ammunition import Ammunition
+from src.models.booking import Booking
+from src.models.duty_point import DutyPoint
+from src.models.user import User
+from src.models.weapon import Weapon
+from src.services.change_events import Change, ChangeBus, ChangeOp, get_change_bus
+
+INSERT, UPDATE, DELETE = ChangeOp.INSERT, ChangeOp.UPDATE, ChangeOp.DELETE
+ENTITIES = ("users", "weapons", "ammunitions", "bookings", "duty_points", "ammo_movements")
+
+
+class FakeWidget:
+    """Stands in for a screen: packed or hidden, alive or destroyed."""
+
+    def __init__(self, shown=True):
+        self.shown = shown
+        self.alive = True
+
+    def winfo_exists(self):
+        return self.alive
+
+    def winfo_manager(self):
+        return "pack" if self.shown else ""
+
+
+class FakeTable:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.calls = []
+
+    def refresh(self):
+        self.calls.append("refresh")
+
+    def reload_rows(self, matches):
+        self.calls.append([row.id for row in self.rows if matches(row)])
+
+
+@pytest.fixture
+def published():
+    changes = []
+    bus = get_change_bus()
+    subscription = bus.subscribe(ENTITIES, changes.extend)
+    yield changes
+    bus.unsubscribe(subscription)
+
+
+@pytest.fixture
+def armory(armory, db):
+    armory.ammo = Ammunition(weapon_id=armory.weapon.id, platform="Glock", caliber="9mm", count=100)
+    db.add(armory.ammo)
+    db.commit()
+    return armory
+
+
+def test_committed_writes_are_published_with_their_ids(db, published):
+    point = DutyPoint(location="Gate")
+    db.add(point)
+    db.flush()
+    assert published == []  # nothing before the commit
+    db.commit()
+    assert published == [Change("duty_points", point.id, INSERT)]
+
+    point.description = "North"
+    db.commit()
+    db.delete(point)
+    db.commit()
+    assert published[1:] == [
+        Change("duty_points", point.id, UPDATE),
+        Change("duty_points", point.id, DELETE),
+    ]
+
+
+def test_rolled_back_writes_are_not_published(db, published):
+    db.add(DutyPoint(location="Gate"))
+    db.flush()
+    db.rollback()
+    db.add(DutyPoint(location="Armory"))
+    db.commit()
+    assert [c.op for c in published] == [INSERT]
+
+
+def test_update_statements_report_the_ids_they_target(db, armory, published):
+    assert crud_ammunition.consume_stock(db, armory.ammo.id, 10) is not None
+    db.execute(update(Weapon).where(Weapon.id.in_([armory.weapon.id, 99])).values(condition="Fair"))
+    db.execute(update(Weapon).where(Weapon.status == "AVAILABLE").values(condition="Good"))
+    db.commit()
+    assert Change("ammunitions", armory.ammo.id, UPDATE) in published
+    assert [c for c in published if c.entity == "weapons"] == [
+        Change("weapons", armory.weapon.id, UPDATE),
+        Change("weapons", 99, UPDATE),
+        Change("weapons", None, UPDATE),  # no id condition: any row
+    ]
+
+
+def test_a_booking_and_its_return_publish_every_row_they_touch(db, armory, published):
+    booking = crud_booking.create_booking(
+        db,
+        officer_id=armory.officer.id,
+        armorer_id=armory.armorer.id,
+        weapon_id=armory.weapon.id,
+        duty_point_id=armory.duty_point.id,
+        ammunition_id=armory.ammo.id,
+        ammunition_count=30,
+    )
+    booked = set(published)
+    assert {
+        Change("bookings", booking.id, INSERT),
+        Change("weapons", armory.weapon.id, UPDATE),
+        Change("ammunitions", armory.ammo.id, UPDATE),
+    } <= booked
+    assert {c.op for c in booked if c.entity == "ammo_movements"} >= {INSERT}
+
+    published.clear()
+    crud_booking.return_booking(db, booking_id=booking.id, ammunition_returned=30, remarks=None)
+    assert {
+        Change("bookings", booking.id, UPDATE),
+        Change("ammunitions", armory.ammo.id, UPDATE),
+    } <= set(published)
+
+
+def test_widget_subscribers_get_batches_on_pump_until_destroyed():
+    bus = ChangeBus()
+    widget, batches = FakeWidget(), []
+    bus.subscribe_widget(widget, (Booking,), batches.append)
+    bus.publish([Change("bookings", 1, INSERT), Change("weapons", 1, UPDATE)])
+    bus.publish([Change("bookings", 1, INSERT), Change("bookings", 2, UPDATE)])
+    assert batches == []
+
+    assert bus.pump() == 1
+    assert batches == [[Change("bookings", 1, INSERT), Change("bookings", 2, UPDATE)]]
+    assert bus.pump() == 0
+
+    widget.alive = False
+    bus.publish([Change("bookings", 3, INSERT)])
+    assert bus.pump() == 0 and len(batches) == 1
+    assert bus._subscriptions == []
+
+
+def test_commits_from_another_terminal_are_noticed(engine, db, published):
+    bus = get_change_bus()
+    bus.watch(engine)
+    other = sqlite3.connect(engine.url.database)
+    try:
+        assert bus.poll_external() is False
+        db.add(DutyPoint(location="Gate"))
+        db.commit()  # this process's own commit is already published
+        assert bus.poll_external() is False
+
+        published.clear()
+        other.execute("INSERT INTO duty_points (location) VALUES ('Armory')")
+        other.commit()
+        assert bus.poll_external() is True
+        assert set(published) == {Change(e, None, UPDATE) for e in ENTITIES}
+        assert bus.poll_external() is False
+    finally:
+        other.close()
+        bus.stop_watching()
+
+
+def test_follower_applies_changes_while_shown_and_catches_up_when_shown_again():
+    bus, widget, applied = ChangeBus(), FakeWidget(), []
+    follower = ChangeFollower(widget, (Weapon,), applied.append, bus=bus)
+    bus.publish([Change("weapons", 1, UPDATE)])
+    bus.pump()
+    assert applied == [[Change("weapons", 1, UPDATE)]]
+
+    widget.shown = False
+    bus.publish([Change("weapons", 2, UPDATE)])
+    bus.publish([Change("weapons", 3, UPDATE)])
+    bus.pump()
+    assert len(applied) == 1 and follower.stale
+
+    widget.shown = True
+    assert follower.activate() is True
+    assert applied[-1] is None  # one re-read
+    assert follower.activate() is False
+
+
+def test_update_table_refetches_only_rows_that_show_the_changed_entities():
+    rows = [
+        SimpleNamespace(id=1, weapon_id=10, officer_id=20),
+        SimpleNamespace(id=2, weapon_id=11, officer_id=20),
+        SimpleNamespace(id=3, weapon_id=12, officer_id=21),
+    ]
+    table = FakeTable(rows)
+    related = {Weapon: "weapon_id", User: "officer_id"}
+
+    update_table(
+        table, [Change("bookings", 3, UPDATE), Change("weapons", 11, UPDATE)], Booking, related
+    )
+    update_table(
+        table, [Change("users", 20, DELETE), Change("weapons", 13, INSERT)], Booking, related
+    )
+    update_table(table, [Change("duty_points", 1, UPDATE)], Booking, related)
+    assert table.calls == [[2, 3], [1, 2]]
+
+    update_table(table, [Change("bookings", 4, INSERT)], Booking, related)
+    update_table(table, [Change("weapons", None, UPDATE)], Booking, related)
+    update_table(table, None, Booking, related)
+    assert table.calls[2:] == ["refresh"] * 3
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import text
+
+from src.database import ENGINE_PROFILES, create_engine_for_profile
+
+
+@pytest.mark.parametrize("profile_name", sorted(ENGINE_PROFILES))
+def test_profile_pragmas_applied_on_connect(tmp_path, profile_name):
+    profile = ENGINE_PROFILES[profile_name]
+    engine = create_engine_for_profile(profile_name, url=f"sqlite:///{tmp_path / 'p.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == (
+                profile.journal_mode.lower()
+            )
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == profile.busy_timeout
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == profile.cache_size
+    finally:
+        engine.dispose()
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError, match="Unknown engine profile"):
+        create_engine_for_profile("turbo")
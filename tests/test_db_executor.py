@@ -0,0 +1,117 @@
+import sqlite3
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.models.duty_point import DutyPoint
+from src.services.db_executor import DbExecutor
+from src.session_scope import write_scope
+
+
+@pytest.fixture
+def executor(engine):
+    executor = DbExecutor(engine)
+    yield executor
+    executor.shutdown(wait=False)
+
+
+def add_point(db, location):
+    db.add(DutyPoint(location=location))
+    db.flush()
+    return threading.current_thread().name
+
+
+def count_points(db):
+    return db.query(DutyPoint).count()
+
+
+def blocked_writer(executor):
+    """Occupy the writer thread until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def hold(db):
+        started.set()
+        release.wait(10)
+
+    future = executor.write(hold)
+    assert started.wait(10)
+    return release, future
+
+
+def test_writes_commit_on_the_writer_thread(executor):
+    names = [executor.write(add_point, f"Gate {i}").result(10) for i in range(3)]
+    assert names == ["db-writer"] * 3
+    assert executor.read(count_points).result(10) == 3
+    metrics = executor.metrics()
+    assert (metrics.writes, metrics.failed, metrics.reads, metrics.queue_depth) == (3, 0, 1, 0)
+
+
+def test_a_failing_write_rolls_back_alone(executor):
+    def fail(db):
+        add_point(db, "Gate 1")
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        executor.write(fail).result(10)
+    executor.write(add_point, "Gate 2").result(10)
+    assert executor.read(count_points).result(10) == 1
+    assert executor.metrics().failed == 1
+
+
+def test_queued_writes_with_one_key_are_coalesced(executor):
+    release, held = blocked_writer(executor)
+    futures = [executor.write(add_point, f"Gate {i}", coalesce_key="gate") for i in range(3)]
+    other = executor.write(add_point, "Armory")
+    assert futures[0] is futures[1] is futures[2]
+    metrics = executor.metrics()
+    assert (metrics.queue_depth, metrics.peak_queue_depth, metrics.coalesced) == (2, 2, 2)
+
+    release.set()
+    for future in (futures[0], other, held):
+        future.result(10)
+    locations = executor.read(lambda db: [dp.location for dp in db.query(DutyPoint)]).result(10)
+    assert sorted(locations) == ["Armory", "Gate 2"]
+
+
+def test_writes_from_many_threads_never_collide(executor, engine):
+    factory = sessionmaker(bind=engine)
+
+    def submit(thread):
+        futures = [executor.write(add_point, f"T{thread}-{i}") for i in range(20)]
+        # Tk-thread style writes interleave with the writer thread's
+        with write_scope("test", factory) as db:
+            db.query(DutyPoint).count()
+            db.add(DutyPoint(location=f"T{thread}-scope"))
+        return [f.result(10) for f in futures]
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(submit, range(6)))
+    assert executor.read(count_points).result(10) == 6 * 21
+    assert executor.metrics().failed == 0
+
+
+def test_write_scope_takes_the_sqlite_write_lock_up_front(engine):
+    factory = sessionmaker(bind=engine)
+    other = sqlite3.connect(engine.url.database, timeout=0)
+    try:
+        with write_scope("test", factory):
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+    finally:
+        other.close()
+
+
+def test_shutdown_without_waiting_cancels_queued_writes(executor):
+    release, held = blocked_writer(executor)
+    queued = executor.write(add_point, "Gate 1")
+    executor.shutdown(wait=False)
+    release.set()
+    held.result(10)
+    with pytest.raises(CancelledError):
+        queued.result(10)
+    with pytest.raises(RuntimeError):
+        executor.write(add_point, "Gate 2")
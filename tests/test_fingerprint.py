@@ -0,0 +1,219 @@
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import event
+
+from src.crud import crud_fingerprint, crud_user
+from src.models.fingerprint import Fingerprint, template_digest
+from src.models.user import User
+from src.services import fingerprint_matcher
+from src.services.change_events import get_change_bus
+from src.services.fingerprint_gallery import FingerprintGallery, get_gallery
+
+
+@pytest.fixture(autouse=True)
+def fresh_gallery():
+    # The gallery is process-wide; every test gets its own database
+    get_gallery().invalidate()
+    yield
+    get_gallery().invalidate()
+
+
+@pytest.fixture
+def enrolled(db):
+    users = [
+        User(
+            service_number=f"S{i}",
+            name=f"User {i}",
+            telephone="0",
+            role="officer",
+            hashed_password="x",
+        )
+        for i in range(3)
+    ]
+    db.add_all(users)
+    db.commit()
+    for i, user in enumerate(users):
+        crud_fingerprint.enroll_fingerprint(db, user.id, f"template-{i}".encode())
+    return db, users
+
+
+def test_digest_follows_template(enrolled):
+    db, users = enrolled
+    fp = crud_fingerprint.get_fingerprint_by_user(db, users[0].id)
+    assert fp.template_digest == template_digest(b"template-0")
+
+    fp.template = b"re-enrolled"
+    db.commit()
+    assert crud_fingerprint.verify_fingerprint(db, b"re-enrolled") == users[0].id
+    assert crud_fingerprint.verify_fingerprint(db, b"template-0") is None
+
+
+def test_exact_lookup_seeks_the_digest_index(engine, enrolled):
+    db, users = enrolled
+    assert crud_fingerprint.verify_fingerprint(db, b"template-2") == users[2].id
+    assert crud_fingerprint.verify_fingerprint(db, b"unknown") is None
+
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT user_id FROM fingerprints WHERE template_digest = ?",
+            (template_digest(b"template-2"),),
+        ).all()
+    assert "ix_fingerprints_template_digest" in plan[0][-1]
+
+
+def test_pluggable_matcher(enrolled):
+    db, users = enrolled
+    fuzzy = fingerprint_matcher.ScanningMatcher(
+        lambda stored, probe: stored.rstrip(b"0123456789") == probe, batch_size=2
+    )
+    previous = fingerprint_matcher.set_matcher(fuzzy)
+    try:
+        assert crud_fingerprint.verify_fingerprint(db, b"template-") == users[0].id
+    finally:
+        fingerprint_matcher.set_matcher(previous)
+    assert db.query(Fingerprint).count() == 3
+
+
+def test_matchers_must_implement_identify():
+    with pytest.raises(TypeError):
+        fingerprint_matcher.FingerprintMatcher()
+
+
+def test_scanning_matcher_scans_memory_after_the_first_load(engine, enrolled):
+    db, users = enrolled
+    fuzzy = fingerprint_matcher.ScanningMatcher(
+        lambda stored, probe: stored.rstrip(b"0123456789") == probe.rstrip(b"!")
+    )
+    previous = fingerprint_matcher.set_matcher(fuzzy)
+    try:
+        assert crud_fingerprint.verify_fingerprint(db, b"template-!") == users[0].id  # loads
+
+        statements = []
+
+        def _capture(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            assert crud_fingerprint.verify_fingerprint(db, b"template-2") == users[2].id
+            assert crud_fingerprint.verify_fingerprint(db, b"template-!!") == users[0].id
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+        # Only the digest seeks: templates come from memory
+        assert not [s for s in statements if "fingerprints.template AS" in s]
+
+        crud_fingerprint.enroll_fingerprint(db, users[0].id, b"rescanned")
+        assert crud_fingerprint.verify_fingerprint(db, b"rescanned!") == users[0].id
+    finally:
+        fingerprint_matcher.set_matcher(previous)
+
+
+def test_a_template_enrolled_for_another_user_is_refused(enrolled):
+    db, users = enrolled
+    with pytest.raises(ValueError, match="already enrolled"):
+        crud_fingerprint.enroll_fingerprint(db, users[1].id, b"template-0")
+    assert crud_fingerprint.get_fingerprint_by_user(db, users[1].id).template == b"template-1"
+    assert crud_fingerprint.verify_fingerprint(db, b"template-1") == users[1].id
+
+    # Re-enrolling the same template for its own user is fine
+    crud_fingerprint.enroll_fingerprint(db, users[0].id, b"template-0")
+
+
+def test_gallery_identifies_without_the_database(engine, enrolled):
+    db, users = enrolled
+    ids = [u.id for u in users]
+    assert crud_fingerprint.verify_fingerprint(db, b"template-1") == ids[1]  # loads
+
+    statements = []
+
+    def _capture(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        assert crud_fingerprint.verify_fingerprint(db, b"template-0") == ids[0]
+        assert crud_fingerprint.verify_fingerprint(db, b"template-2") == ids[2]
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+    assert statements == []
+
+
+def test_gallery_write_through(enrolled):
+    db, users = enrolled
+    gallery = get_gallery()
+    gallery.load(db)
+
+    crud_fingerprint.enroll_fingerprint(db, users[0].id, b"new-scan")
+    assert gallery.identify(b"new-scan") == users[0].id
+    assert gallery.identify(b"template-0") is None
+
+    assert crud_user.delete_user(db, users[1].id)
+    assert gallery.identify(b"template-1") is None
+    assert len(gallery) == 2
+    assert db.query(Fingerprint).count() == 2
+
+
+def test_gallery_follows_templates_changed_by_another_process(engine, enrolled):
+    db, users = enrolled
+    ids = [u.id for u in users]
+    assert crud_fingerprint.verify_fingerprint(db, b"template-0") == ids[0]  # loads
+
+    bus = get_change_bus()
+    bus.watch(engine)
+    other = sqlite3.connect(engine.url.database)
+    try:
+        other.execute(
+            "UPDATE fingerprints SET template = ?, template_digest = ? WHERE user_id = ?",
+            (b"re-enrolled", template_digest(b"re-enrolled"), ids[0]),
+        )
+        other.execute("DELETE FROM fingerprints WHERE user_id = ?", (ids[1],))
+        other.commit()
+        assert bus.poll_external() is True
+    finally:
+        other.close()
+        bus.stop_watching()
+
+    assert get_gallery().stale
+    assert crud_fingerprint.verify_fingerprint(db, b"template-0") is None
+    assert crud_fingerprint.verify_fingerprint(db, b"template-1") is None
+    assert crud_fingerprint.verify_fingerprint(db, b"re-enrolled") == ids[0]
+    assert crud_fingerprint.verify_fingerprint(db, b"template-2") == ids[2]
+    assert len(get_gallery()) == 2 and not get_gallery().stale
+
+
+def test_gallery_fuzzy_scan_and_compaction():
+    gallery = FingerprintGallery(compare=lambda stored, probe: bytes(stored[:4]) == probe[:4])
+    gallery.loaded = True
+    for user_id in range(1, 101):
+        gallery.upsert(user_id, b"%04d" % user_id + b"x" * 60)
+    for user_id in range(1, 80):
+        gallery.remove(user_id)
+
+    assert len(gallery) == 21
+    assert len(gallery._buffer) < 64 * 50  # compacted
+    assert gallery.identify(b"0090-probe") == 90
+    assert gallery.identify(b"0010-probe") is None
+
+    results = []
+    workers = [
+        threading.Thread(target=lambda: results.append(gallery.identify(b"0100"))) for _ in range(8)
+    ]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    assert results == [100] * 8
+
+
+def test_compaction_keeps_a_pending_resync(enrolled):
+    db, users = enrolled
+    gallery = get_gallery()
+    gallery.load(db)
+    for i in range(20):
+        gallery.upsert(users[0].id, b"x" * 64 + bytes([i]))  # grows garbage
+    gallery.mark_stale()  # e.g. another terminal replaced a template
+    gallery.upsert(users[0].id, b"y" * 64)  # compacts
+    assert gallery._garbage == 0
+    assert gallery.stale
@@ -0,0 +1,210 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from sqlalchemy import event
+
+from src.crud import crud_fingerprint, crud_user
+from src.models.fingerprint import Fingerprint
+from src.models.user import User
+from src.services import fingerprint_matcher, gallery_file
+from src.services.fingerprint_gallery import GalleryMatcher, get_gallery
+from src.services.fingerprint_matcher import ExactDigestMatcher
+from src.services.gallery_file import (
+    GalleryFile,
+    GalleryFileError,
+    MappedGallery,
+    MappedGalleryMatcher,
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "fingerprints.gallery")
+
+
+@pytest.fixture
+def users(db):
+    get_gallery().invalidate()
+    rows = [
+        User(
+            service_number=f"S{i}",
+            name=f"User {i}",
+            telephone="0",
+            role="officer",
+            hashed_password="x",
+        )
+        for i in range(4)
+    ]
+    db.add_all(rows)
+    db.commit()
+    for i, user in enumerate(rows):
+        crud_fingerprint.enroll_fingerprint(db, user.id, f"template-{i}".encode())
+    yield rows
+    get_gallery().invalidate()
+
+
+def test_create_and_identify(path):
+    GalleryFile(path).create([(1, b"alpha"), (2, b"beta")])
+    gallery = MappedGallery(path)
+    try:
+        assert len(gallery) == 2
+        assert gallery.identify(b"beta") == 2
+        assert gallery.identify(b"gamma") is None
+    finally:
+        gallery.close()
+
+
+def test_missing_file_raises(path):
+    with pytest.raises(GalleryFileError):
+        MappedGallery(path)
+
+
+def test_in_place_patches_are_seen_by_open_readers(path):
+    writer = GalleryFile(path)
+    writer.create([(1, b"alpha"), (2, b"beta"), (3, b"gamma")])
+    inode = os.stat(path).st_ino
+    gallery = MappedGallery(path)
+    try:
+        assert writer.apply({2: b"beta-2", 4: b"delta"}, [1])
+        # Removing slot 0 moved the last live slot into it
+        assert gallery.identify(b"alpha") is None
+        assert gallery.identify(b"beta") is None
+        assert gallery.identify(b"beta-2") == 2
+        assert gallery.identify(b"gamma") == 3
+        assert gallery.identify(b"delta") == 4
+        assert len(gallery) == 3
+        assert os.stat(path).st_ino == inode
+    finally:
+        gallery.close()
+
+
+def test_outgrowing_the_file_rewrites_it(path):
+    writer = GalleryFile(path, stride=8)
+    writer.create([(1, b"short")])
+    gallery = MappedGallery(path)
+    try:
+        assert not writer.apply({2: b"much longer than eight bytes"}, ())
+        assert gallery.identify(b"much longer than eight bytes") == 2
+        assert gallery.identify(b"short") == 1
+        assert writer.stride >= len(b"much longer than eight bytes")
+    finally:
+        gallery.close()
+
+
+def test_scan_compares_slots_in_place(path):
+    GalleryFile(path).create([(1, b"alpha"), (2, b"beta")])
+    gallery = MappedGallery(path)
+    try:
+        assert gallery.scan(b"BETA", lambda stored, probe: bytes(stored).upper() == probe) == 2
+        assert gallery.scan(b"none", lambda stored, probe: False) is None
+    finally:
+        gallery.close()
+
+
+def test_sync_reads_only_changed_templates(engine, db, users, path):
+    writer = GalleryFile(path)
+    assert writer.sync(db) == {"rebuilt": True, "changed": 4, "removed": 0}
+
+    db.query(Fingerprint).filter_by(user_id=users[1].id).one().template = b"re-enrolled"
+    db.query(Fingerprint).filter_by(user_id=users[3].id).delete()
+    db.commit()
+
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        result = writer.sync(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    assert result == {"rebuilt": False, "changed": 1, "removed": 1}
+    template_reads = [p for s, p in statements if "fingerprints.template AS" in s]
+    assert template_reads == [(users[1].id,)]
+
+    gallery = MappedGallery(path)
+    try:
+        assert gallery.identify(b"re-enrolled") == users[1].id
+        assert gallery.identify(b"template-3") is None
+        assert gallery.identify(b"template-0") == users[0].id
+    finally:
+        gallery.close()
+    assert writer.sync(db) == {"rebuilt": False, "changed": 0, "removed": 0}
+
+
+def test_matcher_writes_through(db, users, path):
+    matcher = MappedGalleryMatcher(path)
+    previous = fingerprint_matcher.set_matcher(matcher)
+    try:
+        assert crud_fingerprint.verify_fingerprint(db, b"template-2") == users[2].id
+        assert os.path.exists(path)
+
+        crud_fingerprint.enroll_fingerprint(db, users[0].id, b"new-template")
+        assert matcher.gallery.identify(b"new-template") == users[0].id
+
+        crud_user.delete_user(db, users[2].id)
+        assert matcher.gallery.identify(b"template-2") is None
+        assert crud_fingerprint.verify_fingerprint(db, b"template-2") is None
+    finally:
+        fingerprint_matcher.set_matcher(previous)
+        if matcher.gallery is not None:
+            matcher.gallery.close()
+
+
+def test_shared_file_is_patched_whichever_matcher_is_active(db, users, path, monkeypatch):
+    monkeypatch.setattr(gallery_file, "GALLERY_PATH", path)
+    GalleryFile(path).export(db)
+    assert isinstance(fingerprint_matcher.get_matcher(), GalleryMatcher)
+
+    crud_fingerprint.enroll_fingerprint(db, users[0].id, b"new-template")
+    crud_user.delete_user(db, users[1].id)
+    gallery = MappedGallery(path)
+    try:
+        assert gallery.identify(b"new-template") == users[0].id
+        assert gallery.identify(b"template-1") is None
+        assert gallery.identify(b"template-2") == users[2].id
+    finally:
+        gallery.close()
+
+
+@pytest.mark.parametrize(
+    "setting, kind",
+    [
+        ("gallery", GalleryMatcher),
+        ("mapped-gallery", MappedGalleryMatcher),
+        ("exact-digest", ExactDigestMatcher),
+        ("no-such-matcher", GalleryMatcher),
+    ],
+)
+def test_the_setting_chooses_the_matcher(setting, kind, monkeypatch):
+    monkeypatch.setenv("ARMORY_FINGERPRINT_MATCHER", setting)
+    previous = fingerprint_matcher.set_matcher(None)
+    try:
+        assert isinstance(fingerprint_matcher.get_matcher(), kind)
+    finally:
+        fingerprint_matcher.set_matcher(previous)
+
+
+def test_a_live_writer_keeps_the_lock_however_long_it_takes(path):
+    with open(path + ".lock", "w") as f:
+        f.write(str(os.getpid()))
+    old = time.time() - 3600
+    os.utime(path + ".lock", (old, old))
+    with pytest.raises(TimeoutError):
+        with gallery_file._writer_lock(path, timeout=0.1):
+            pass
+
+
+def test_the_lock_of_an_exited_writer_is_broken(path):
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    with open(path + ".lock", "w") as f:
+        f.write(str(child.pid))
+    with gallery_file._writer_lock(path, timeout=0.1):
+        assert gallery_file._lock_owner(path + ".lock") == os.getpid()
+    assert not os.path.exists(path + ".lock")
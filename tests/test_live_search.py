@@ -0,0 +1,161 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.crud.crud_user import count_users, search_users
+from src.gui.live_search import LiveSearch
+from src.models.user import User
+
+
+class FakeWidget:
+    """Stands in for a Tk widget: after() queues callbacks, pump() runs them."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def winfo_exists(self):
+        return True
+
+    def after(self, _ms, fn, *args):
+        self.next_id += 1
+        self.jobs[self.next_id] = (fn, args)
+        return self.next_id
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def fire_timers(self):
+        jobs, self.jobs = self.jobs, {}
+        return [fn(*args) for fn, args in jobs.values()]
+
+    def pump(self, *futures):
+        wait(futures, timeout=10)
+        while self.jobs:
+            self.fire_timers()
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+def make_search(engine, executor, query, results, errors=None):
+    return LiveSearch(
+        FakeWidget(),
+        query=query,
+        on_results=lambda text, result: results.append((text, result)),
+        on_error=None if errors is None else errors.append,
+        session_factory=sessionmaker(bind=engine),
+        executor=executor,
+    )
+
+
+def test_keystrokes_are_debounced_into_one_query(engine, executor, db):
+    db.add_all(
+        User(
+            name=f"Officer {i}",
+            service_number=f"SN-{i:03d}",
+            telephone="000",
+            role="officer",
+            hashed_password="x",
+        )
+        for i in range(30)
+    )
+    db.commit()
+    queries, results = [], []
+
+    def query(session, term):
+        queries.append(term)
+        return count_users(session, term), search_users(session, term, 0, 5)
+
+    search = make_search(engine, executor, query, results)
+    for typed in ("S", "SN", "SN-", "SN-01"):
+        search.schedule(typed)
+    assert len(search.widget.jobs) == 1  # earlier timers were cancelled
+
+    (future,) = search.widget.fire_timers()
+    search.widget.pump(future)
+
+    assert queries == ["SN-01"]
+    ((term, (count, rows)),) = results
+    assert term == "SN-01" and count == 10 and len(rows) == 5
+
+
+def test_results_of_a_superseded_query_are_dropped(engine, executor):
+    release = threading.Event()
+    results = []
+
+    def query(_session, term):
+        if term == "slow":
+            release.wait(10)
+        return term.upper()
+
+    search = make_search(engine, executor, query, results)
+    slow = search.run_now("slow")
+    fast = search.run_now("fast")
+    threading.Timer(0.2, release.set).start()  # slow finishes well after fast
+    search.widget.pump(fast, slow)
+
+    assert results == [("fast", "FAST")]
+    assert search.generation == 2
+
+
+def test_newer_search_interrupts_the_running_sqlite_query(engine, executor):
+    started = threading.Event()
+    results, errors = [], []
+
+    def query(session, term):
+        if term == "endless":
+            started.set()
+            return session.execute(
+                text(
+                    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+                    "SELECT count(*) FROM n"
+                )
+            ).scalar()
+        return "done"
+
+    search = make_search(engine, executor, query, results, errors)
+    endless = search.run_now("endless")
+    assert started.wait(10)
+    time.sleep(0.05)
+    latest = search.run_now("x")
+    search.widget.pump(endless, latest)
+
+    with pytest.raises(OperationalError, match="interrupt"):
+        endless.result()
+    assert results == [("x", "done")]
+    assert errors == []  # the interrupted query was superseded, not a failure
+
+
+def test_errors_of_the_latest_query_are_reported(engine, executor):
+    results, errors = [], []
+
+    def query(_session, _text):
+        raise RuntimeError("boom")
+
+    search = make_search(engine, executor, query, results, errors)
+    search.widget.pump(search.run_now("a"))
+
+    assert results == []
+    assert [str(e) for e in errors] == ["boom"]
+
+
+def test_cancel_drops_pending_and_running_searches(engine, executor):
+    results = []
+    search = make_search(engine, executor, lambda _session, t: t, results)
+
+    search.schedule("typed")
+    future = search.run_now("now")
+    search.cancel()
+    search.widget.pump(future)
+
+    assert results == []
@@ -0,0 +1,175 @@
+import pytest
+
+from src.crud import crud_booking
+from src.models.duty_point import DutyPoint
+from src.models.user import User
+from src.models.weapon import Weapon
+from src.services.change_events import Change, ChangeOp, get_change_bus
+from src.services.lookup_index import NgramIndex, get_booking_lookups
+
+
+@pytest.fixture
+def index():
+    index = NgramIndex()
+    index.load(
+        [
+            (1, "SN-100 — John Smith", ["SN-100", "John Smith"]),
+            (2, "SN-200 — Mary Otieno", ["SN-200", "Mary Otieno"]),
+            (3, "SN-300 — Joseph Kamau", ["SN-300", "Joseph Kamau"]),
+            (4, "SN-110 — Ruth Smithers", ["SN-110", "Ruth Smithers"]),
+        ]
+    )
+    return index
+
+
+def test_ranks_exact_then_prefix_then_substring(index):
+    assert index.search("smith") == ["SN-100 — John Smith", "SN-110 — Ruth Smithers"]
+    assert index.search("jo") == ["SN-100 — John Smith", "SN-300 — Joseph Kamau"]
+    # "n-1" is inside SN-100/SN-110 only, never a prefix
+    assert index.search("n-1") == ["SN-100 — John Smith", "SN-110 — Ruth Smithers"]
+    assert index.search("SN-1") == ["SN-100 — John Smith", "SN-110 — Ruth Smithers"]
+    assert index.search("TIEN") == ["SN-200 — Mary Otieno"]
+    assert index.search("x") == [] and index.search("smithx") == []
+
+
+def test_empty_query_lists_in_display_order_up_to_limit(index):
+    assert index.search("", limit=2) == ["SN-100 — John Smith", "SN-110 — Ruth Smithers"]
+    assert len(index.search("")) == 4
+    assert index.search("s", limit=1) == ["SN-100 — John Smith"]
+
+
+def test_add_replace_and_remove(index):
+    index.add(5, "SN-500 — Grace Smith", ["SN-500", "Grace Smith"])
+    assert "SN-500 — Grace Smith" in index.search("smith")
+
+    index.add(5, "SN-500 — Grace Wanjiru", ["SN-500", "Grace Wanjiru"])
+    assert "SN-500 — Grace Smith" not in index.search("smith")
+    assert index.search("wanj") == ["SN-500 — Grace Wanjiru"]
+    assert index.key_for("SN-500 — Grace Wanjiru") == 5
+
+    index.remove(5)
+    index.remove(5)  # already gone
+    assert index.search("wanj") == [] and index.key_for("SN-500 — Grace Wanjiru") is None
+    assert len(index) == 4
+
+
+def test_bulk_load_matches_incremental_adds(index):
+    incremental = NgramIndex()
+    for key in (3, 1, 4, 2):
+        display = index.display_for(key)
+        incremental.add(key, display, display.split(" — "))
+    for query in ("", "s", "sn", "jo", "mi", "n-1", "kamau", "smithers"):
+        assert incremental.search(query) == index.search(query)
+
+
+def test_order_key_and_unlimited_listing():
+    index = NgramIndex()
+    index.load(
+        (n, f"SN-{n:03d} — Officer {99 - n:02d}", [], f"Officer {99 - n:02d}") for n in range(60)
+    )
+    listed = index.search("", limit=None)
+    assert len(listed) == 60 and len(index.search("")) == 50
+    assert listed[0] == "SN-059 — Officer 40" and listed[-1] == "SN-000 — Officer 99"
+    index.add(60, "SN-060 — Officer 00", [], "Officer 00")
+    assert index.search("", limit=1) == ["SN-060 — Officer 00"]
+    index.remove(60)
+    assert index.search("", limit=None) == listed
+
+
+@pytest.fixture
+def lookups(db):
+    db.add_all(
+        [
+            User(
+                service_number="SN-1",
+                name="Officer One",
+                telephone="0",
+                role="officer",
+                hashed_password="x",
+            ),
+            DutyPoint(location="Main Gate"),
+            Weapon(serial_number="W-1", type="Rifle", condition="Good", status="AVAILABLE"),
+            Weapon(serial_number="W-2", type="Rifle", condition="Good", status="DAMAGED"),
+        ]
+    )
+    db.commit()
+    lookups = get_booking_lookups()
+    lookups.load(db)
+    yield lookups
+    lookups.invalidate()
+
+
+def test_loads_available_weapons_only(lookups):
+    assert lookups.officers.search("one") == ["SN-1 — Officer One"]
+    assert lookups.duty_points.search("gate") == ["Main Gate"]
+    assert lookups.weapons.search("w-") == ["W-1"]
+
+
+def test_follows_commits_but_not_rollbacks(db, lookups):
+    db.add(
+        User(
+            service_number="SN-2",
+            name="Officer Two",
+            telephone="0",
+            role="officer",
+            hashed_password="x",
+        )
+    )
+    db.flush()
+    assert lookups.officers.search("two") == []  # not committed yet
+    db.rollback()
+    assert lookups.officers.search("two") == []
+
+    user = User(
+        service_number="SN-3",
+        name="Officer Three",
+        telephone="0",
+        role="officer",
+        hashed_password="x",
+    )
+    db.add(user)
+    db.commit()
+    assert lookups.officers.search("three") == ["SN-3 — Officer Three"]
+
+    user.name = "Officer Tres"
+    db.commit()
+    assert lookups.officers.search("three") == []
+    assert lookups.officers.key_for("SN-3 — Officer Tres") == user.id
+
+    db.delete(user)
+    db.commit()
+    assert lookups.officers.search("tres") == []
+
+
+def test_issuing_and_returning_a_weapon_updates_availability(db, lookups):
+    officer = db.query(User).one()
+    weapon = db.query(Weapon).filter_by(serial_number="W-1").one()
+    dp = db.query(DutyPoint).one()
+
+    booking = crud_booking.create_booking(
+        db, officer_id=officer.id, weapon_id=weapon.id, duty_point_id=dp.id, armorer_id=officer.id
+    )
+    assert lookups.weapons.search("w-") == []
+
+    crud_booking.return_booking(db, booking_id=booking.id, ammunition_returned=0, remarks=None)
+    assert lookups.weapons.search("w-") == ["W-1"]
+
+
+def test_officers_are_listed_by_name(db, lookups):
+    db.add(
+        User(
+            service_number="SN-9",
+            name="Adam Zulu",
+            telephone="0",
+            role="officer",
+            hashed_password="x",
+        )
+    )
+    db.commit()
+    assert lookups.officers.search("", limit=None) == ["SN-9 — Adam Zulu", "SN-1 — Officer One"]
+
+
+def test_changes_without_an_id_reload_on_next_use(db, lookups):
+    get_change_bus().publish([Change("users", None, ChangeOp.UPDATE)], local=False)
+    assert not lookups.loaded
+    assert get_booking_lookups(db).officers.search("one") == ["SN-1 — Officer One"]
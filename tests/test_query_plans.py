@@ -0,0 +1,171 @@
+"""
+EXPLAIN QUERY PLAN regression suite for the booking hot paths.
+
+Each test runs the real CRUD call, captures the SQL it sends, and asks SQLite how it
+would execute it. A plain "SCAN bookings" means a full table scan; an index scan
+("SCAN bookings USING INDEX ...") is only accepted where the query reads the table
+in index order to satisfy ORDER BY ... LIMIT.
+"""
+
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.crud import crud_booking
+from src.models.booking import Booking
+from src.models.enums import BookingStatus
+from src.models.user import User
+from src.models.weapon import Weapon
+
+FULL_SCAN = re.compile(r"^SCAN bookings(?! USING (COVERING )?INDEX)")
+
+
+@contextmanager
+def captured_selects(engine):
+    statements = []
+
+    def _capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+
+def query_plans(engine, statements):
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append([row[-1] for row in rows])
+    return plans
+
+
+def assert_no_full_scan(engine, statements, uses=None):
+    assert statements, "the call did not issue any SELECT"
+    plans = query_plans(engine, statements)
+    for (statement, _), plan in zip(statements, plans):
+        scans = [line for line in plan if FULL_SCAN.match(line)]
+        assert not scans, f"full scan of bookings:\n{statement}\n" + "\n".join(plan)
+    if uses:
+        details = "\n".join(line for plan in plans for line in plan)
+        assert uses in details, details
+
+
+@pytest.fixture
+def history(db, armory):
+    weapons = [armory.weapon] + [
+        Weapon(serial_number=f"W{i}", type="Rifle", condition="Good", status="AVAILABLE")
+        for i in range(2, 6)
+    ]
+    db.add_all(weapons)
+    db.flush()
+    officer, armorer, dp = armory.officer, armory.armorer, armory.duty_point
+
+    base = datetime(2026, 1, 1, 8, 0)
+    for i in range(200):
+        returned = i < 195
+        db.add(
+            Booking(
+                officer_id=officer.id,
+                armorer_id=armorer.id,
+                weapon_id=weapons[i % 5].id,
+                duty_point_id=dp.id,
+                status="RETURNED" if returned else "ISSUED",
+                issued_at=base + timedelta(minutes=i),
+                returned_at=base + timedelta(minutes=i + 30) if returned else None,
+            )
+        )
+    db.commit()
+    return db, {
+        "officer_id": officer.id,
+        "armorer_id": armorer.id,
+        "duty_point_id": dp.id,
+        "weapon_id": weapons[0].id,
+    }
+
+
+def test_history_pages_seek_the_keyset_index(engine, history):
+    db, _ = history
+    with captured_selects(engine) as statements:
+        _, cursor = crud_booking.list_bookings_page(db, limit=20)
+        crud_booking.list_bookings_page(db, limit=20, cursor=cursor)
+    assert_no_full_scan(engine, statements, uses="ix_bookings_issued_at_id")
+
+
+@pytest.mark.parametrize("status", [BookingStatus.ISSUED, "RETURNED", "OVERDUE"])
+def test_dashboard_status_counts(engine, history, status):
+    db, _ = history
+    with captured_selects(engine) as statements:
+        crud_booking.count_bookings(db, status)
+    assert_no_full_scan(engine, statements, uses="ix_bookings_status_issued")
+
+
+def test_open_booking_lookup(engine, history):
+    db, ids = history
+    with captured_selects(engine) as statements:
+        crud_booking.get_open_booking_for_weapon(db, ids["weapon_id"])
+    assert_no_full_scan(engine, statements, uses="ix_bookings_weapon_returned")
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"text": "Officer"},
+        {"status": "ISSUED"},
+        {"date_range": (datetime(2026, 1, 1, 9, 0), datetime(2026, 1, 1, 10, 0))},
+    ],
+)
+def test_booking_search(engine, history, kwargs):
+    db, _ = history
+    with captured_selects(engine) as statements:
+        crud_booking.search_bookings(db, limit=20, **kwargs)
+    assert_no_full_scan(engine, statements)
+
+
+def test_text_search_plan_follows_selectivity(engine, history):
+    db, _ = history
+    db.add_all(
+        User(
+            service_number=f"X{i}",
+            name=f"Extra {i}",
+            telephone="0",
+            role="officer",
+            hashed_password="x",
+        )
+        for i in range(40)
+    )
+    db.commit()
+
+    # "Officer" matches 1 of 42 users: seek that officer's bookings
+    with captured_selects(engine) as statements:
+        crud_booking.search_bookings(db, "Officer", limit=20)
+    assert_no_full_scan(engine, statements[-1:], uses="ix_bookings_officer_issued")
+
+    # "Rifle" matches every weapon: walk newest-first and stop at the limit
+    with captured_selects(engine) as statements:
+        crud_booking.search_bookings(db, "Rifle", limit=20)
+    assert_no_full_scan(engine, statements[-1:], uses="ix_bookings_issued_at_id")
+
+
+@pytest.mark.parametrize(
+    "fk, index",
+    [
+        ("officer_id", "ix_bookings_officer_issued"),
+        ("armorer_id", "ix_bookings_armorer_issued"),
+        # either weapon index serves a plain weapon_id lookup
+        ("weapon_id", "ix_bookings_weapon_"),
+        ("duty_point_id", "ix_bookings_duty_point_issued"),
+    ],
+)
+def test_relationship_loads_by_foreign_key(engine, history, fk, index):
+    db, ids = history
+    with captured_selects(engine) as statements:
+        db.query(Booking).filter(getattr(Booking, fk) == ids[fk]).all()
+    assert_no_full_scan(engine, statements, uses=index)
@@ -0,0 +1,126 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from src.crud import crud_ammunition, crud_weapon
+from src.models.ammunition import Ammunition
+from src.models.duty_point import DutyPoint
+from src.models.weapon import Weapon
+from src.services import reference_data
+from src.services.change_events import Change, ChangeOp, get_change_bus
+from src.services.db_executor import DbExecutor
+from src.services.reference_data import get_reference_data
+
+
+@pytest.fixture
+def reference(db):
+    weapon = Weapon(serial_number="W-1", type="Rifle", condition="Good", status="AVAILABLE")
+    db.add_all([weapon, DutyPoint(location="Main Gate")])
+    db.flush()
+    db.add(
+        Ammunition(
+            weapon_id=weapon.id, category="Rifle", platform="AK-47", caliber="7.62x39", count=100
+        )
+    )
+    db.commit()
+    reference = get_reference_data()
+    reference.load(db)
+    yield reference
+    reference.refresh(db.get_bind()).result()  # let queued reloads finish first
+    reference.invalidate()
+
+
+@pytest.fixture
+def queries(engine):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_loaded_data_is_served_without_queries(db, reference, queries):
+    assert [a.platform for a in reference.ammunition(db)] == ["AK-47"]
+    count, rows = reference.weapon_page(db)
+    assert count == 1 and rows[0].serial_number == "W-1"
+    assert reference.lookups.duty_points.search("gate") == ["Main Gate"]
+    assert queries == []
+
+
+def test_stock_update_statement_reloads_ammunition_after_commit(db, engine, reference, queries):
+    ammo_id = reference.ammunition(db)[0].id
+    assert crud_ammunition.consume_stock(db, ammo_id, 30) is not None
+    db.commit()
+
+    reference.refresh(engine).result()  # queued behind the commit's own reload
+    assert reference.is_fresh("ammunition") and reference.is_fresh("weapons")
+    queries.clear()
+    assert reference.ammunition(db)[0].count == 70
+    assert queries == []
+
+
+def test_stale_data_is_reloaded_inline_by_readers(db, reference):
+    crud_weapon.create_weapon(db, "Pistol", "W-2", "AVAILABLE", "Good")
+    # Whether or not the background reload got there first, readers see the write
+    count, rows = reference.weapon_page(db)
+    assert count == 2 and [r.serial_number for r in rows] == ["W-1", "W-2"]
+
+
+def test_rolled_back_writes_change_nothing(db, reference):
+    db.add(Weapon(serial_number="W-9", type="Rifle", condition="Good", status="AVAILABLE"))
+    db.flush()
+    db.rollback()
+    assert reference.is_fresh("weapons")
+    assert reference.weapon_page(db)[0] == 1
+
+
+def test_executor_writes_reload_with_the_engine_not_the_writer_connection(
+    engine, reference, monkeypatch
+):
+    binds = []
+    monkeypatch.setattr(reference, "_refresh", binds.append)
+    executor = DbExecutor(engine)
+    try:
+        executor.write(crud_weapon.create_weapon, "Pistol", "W-2", "AVAILABLE", "Good").result(10)
+    finally:
+        executor.shutdown()
+    reference.refresh(engine).result()
+    assert binds and all(bind is engine for bind in binds)
+
+
+def test_commits_from_another_terminal_reload_the_affected_dataset(db, reference, monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(reference, "refresh", lambda: refreshed.append(True))
+    get_change_bus().publish([Change("ammunitions", None, ChangeOp.UPDATE)], local=False)
+    assert refreshed and not reference.is_fresh("ammunition")
+    assert reference.is_fresh("weapons")
+
+
+def test_a_write_during_a_load_keeps_the_dataset_stale(db, reference, monkeypatch):
+    reference.mark_stale(["weapons"])
+    load = reference_data.LOADERS["weapons"]
+
+    def racing_load(session):
+        value = load(session)
+        reference.mark_stale(["weapons"])  # committed while we were reading
+        return value
+
+    monkeypatch.setitem(reference_data.LOADERS, "weapons", racing_load)
+    assert reference.weapon_page(db)[0] == 1
+    assert not reference.is_fresh("weapons")
+
+
+def test_warm_loads_once_on_the_worker(db, engine):
+    reference = get_reference_data()
+    reference.invalidate()
+    try:
+        factory = sessionmaker(bind=engine)
+        first = reference.warm(factory)
+        assert reference.warm(factory) is first
+        first.result()
+        assert reference.is_fresh("ammunition") and reference.lookups.loaded
+    finally:
+        reference.invalidate()
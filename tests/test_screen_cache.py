@@ -0,0 +1,113 @@
+import pytest
+
+from src.gui.screen_cache import ITEM_BYTES, WIDGET_BYTES, ScreenCache, estimate_bytes
+
+
+class FakeScreen:
+    """Just enough of a packed Tk frame for the cache."""
+
+    def __init__(self, children=(), rows=None):
+        self.children = list(children)
+        self.rows = rows
+        self.packed = {"fill": "both", "expand": 1, "padx": 20}
+        self.alive = True
+        self.activations = 0
+
+    def winfo_children(self):
+        return self.children
+
+    def winfo_exists(self):
+        return self.alive
+
+    def pack_info(self):
+        return dict(self.packed)
+
+    def pack_forget(self):
+        self.packed = None
+
+    def pack_configure(self, **options):
+        self.packed = options
+
+    def destroy(self):
+        self.alive = False
+
+    def on_activate(self):
+        self.activations += 1
+
+
+class FakeTree(FakeScreen):
+    def get_children(self):
+        return list(range(self.rows))
+
+
+@pytest.fixture
+def built():
+    return []
+
+
+def builder(built, screen=None):
+    def build():
+        built.append(screen or FakeScreen())
+        return built[-1]
+
+    return build
+
+
+def test_screens_are_built_once_then_hidden_and_reactivated(built):
+    cache = ScreenCache()
+    users = cache.show("users", builder(built))
+    weapons = cache.show("weapons", builder(built))
+    assert users.packed is None and weapons.packed is not None
+
+    assert cache.show("users", builder(built)) is users
+    assert len(built) == 2
+    assert users.packed == {"fill": "both", "expand": 1, "padx": 20}
+    assert users.activations == 1 and weapons.activations == 0
+    assert weapons.packed is None and cache.active == "users"
+
+
+def test_showing_the_active_screen_refreshes_it_in_place(built):
+    cache = ScreenCache()
+    users = cache.show("users", builder(built))
+    calls = []
+    cache.show("users", builder(built), on_activate=calls.append)
+    assert calls == [users] and users.activations == 0
+    assert users.packed is not None and len(built) == 1
+
+
+def test_least_recently_used_hidden_screen_is_evicted(built):
+    cache = ScreenCache(max_screens=2)
+    users = cache.show("users", builder(built))
+    weapons = cache.show("weapons", builder(built))
+    cache.show("users", builder(built))  # weapons is now least recent
+    cache.show("booking", builder(built))
+    assert "weapons" not in cache and not weapons.alive
+    assert users.alive and len(cache) == 2
+
+
+def test_memory_budget_evicts_heavy_hidden_screens(built):
+    heavy = FakeScreen([FakeScreen() for _ in range(99)])
+    light = FakeScreen()
+    cache = ScreenCache(budget_bytes=10 * WIDGET_BYTES)
+    cache.show("duty_points", builder(built, heavy))
+    assert heavy.alive  # the active screen is never evicted
+    cache.show("users", builder(built, light))
+    assert not heavy.alive and "duty_points" not in cache
+    cache.show("weapons", builder(built))
+    assert light.alive and cache.hidden_bytes == WIDGET_BYTES
+
+
+def test_destroyed_screens_are_rebuilt(built):
+    cache = ScreenCache()
+    users = cache.show("users", builder(built))
+    cache.show("weapons", builder(built))
+    users.destroy()
+    assert cache.show("users", builder(built)) is not users
+    cache.clear()
+    assert len(cache) == 0 and cache.active is None
+    assert not any(screen.alive for screen in built)
+
+
+def test_estimate_counts_widgets_and_tree_rows():
+    screen = FakeScreen([FakeScreen(), FakeTree(rows=40)])
+    assert estimate_bytes(screen) == 3 * WIDGET_BYTES + 40 * ITEM_BYTES
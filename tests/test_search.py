@@ -0,0 +1,98 @@
+import pytest
+
+from src.crud import crud_ammunition, crud_search
+from src.models.ammunition import Ammunition
+from src.models.duty_point import DutyPoint
+from src.models.user import User
+from src.models.weapon import Weapon
+
+
+@pytest.fixture
+def search_rows(db):
+    db.add_all(
+        [
+            User(
+                service_number="GP-1024",
+                name="Jane Kamau",
+                telephone="0",
+                role="officer",
+                unit="Rapid Response",
+                hashed_password="x",
+            ),
+            User(
+                service_number="GP-2048",
+                name="Peter Otieno",
+                telephone="0",
+                role="armorer",
+                hashed_password="x",
+            ),
+            DutyPoint(location="North Gate", description="Vehicle checkpoint"),
+            Weapon(serial_number="AK-7731", type="Rifle", condition="Good", status="AVAILABLE"),
+        ]
+    )
+    db.flush()
+    weapon_id = db.query(Weapon.id).scalar()
+    db.add(
+        Ammunition(
+            weapon_id=weapon_id,
+            category="Rifle",
+            platform="AK-47",
+            caliber="7.62x39mm",
+            count=500,
+            bin_location="Rack B",
+        )
+    )
+    db.commit()
+    return db
+
+
+def test_global_search_returns_typed_hits(search_rows):
+    hits = crud_search.global_search(search_rows, "gate")
+    assert [(h.kind, h.title) for h in hits] == [("duty_point", "North Gate")]
+
+    kinds = {h.kind for h in crud_search.global_search(search_rows, "rifle")}
+    assert kinds == {"weapon", "ammunition"}
+
+
+def test_title_hits_rank_above_detail_hits(search_rows):
+    search_rows.add(
+        Weapon(serial_number="SN-9", type="Kamau pattern", condition="Good", status="AVAILABLE")
+    )
+    search_rows.commit()
+
+    hits = crud_search.global_search(search_rows, "kamau")
+    assert [h.kind for h in hits] == ["user", "weapon"]
+
+
+def test_triggers_keep_index_in_sync(search_rows):
+    user = search_rows.query(User).filter_by(service_number="GP-2048").one()
+
+    user.name = "Peter Mwangi"
+    search_rows.commit()
+    assert crud_search.global_search(search_rows, "otieno") == []
+    assert [h.ref_id for h in crud_search.global_search(search_rows, "mwangi")] == [user.id]
+
+    search_rows.delete(user)
+    search_rows.commit()
+    assert crud_search.global_search(search_rows, "mwangi") == []
+
+
+def test_all_terms_must_match_and_short_terms_fall_back(search_rows):
+    assert len(crud_search.global_search(search_rows, "GP", kinds=["user"])) == 2
+    assert [h.title for h in crud_search.global_search(search_rows, "jane GP")] == ["Jane Kamau"]
+    assert crud_search.global_search(search_rows, "jane otieno") == []
+
+
+def test_like_wildcards_in_short_terms_match_literally(search_rows):
+    assert crud_search.global_search(search_rows, "_") == []
+    assert crud_search.global_search(search_rows, "%") == []
+    search_rows.add(DutyPoint(location="Gate_2%"))
+    search_rows.commit()
+    assert [h.title for h in crud_search.global_search(search_rows, "_2")] == ["Gate_2%"]
+    assert [h.title for h in crud_search.global_search(search_rows, "2%")] == ["Gate_2%"]
+
+
+def test_list_ammunition_uses_search_index(search_rows):
+    rows = crud_ammunition.list_ammunition(search_rows, "rack b")
+    assert [a.caliber for a in rows] == ["7.62x39mm"]
+    assert crud_ammunition.list_ammunition(search_rows, "5.56") == []
@@ -0,0 +1,148 @@
+import gc
+import io
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.models.duty_point import DutyPoint
+from src.session_scope import (
+    OWNER,
+    expunge,
+    get_session_tracker,
+    open_sessions,
+    read_scope,
+    release,
+    report_open_sessions,
+    screen_session,
+    write_scope,
+)
+
+
+class FakeWidget:
+    """after_idle() queues callbacks, idle() runs them; bind() keeps handlers."""
+
+    def __init__(self):
+        self.idle_jobs = []
+        self.handlers = {}
+
+    def after_idle(self, fn, *args):
+        self.idle_jobs.append((fn, args))
+
+    def idle(self):
+        jobs, self.idle_jobs = self.idle_jobs, []
+        for fn, args in jobs:
+            fn(*args)
+
+    def bind(self, sequence, handler, add=None):
+        self.handlers.setdefault(sequence, []).append(handler)
+
+    def destroy(self):
+        event = type("Event", (), {"widget": self})()
+        for handler in self.handlers.get("<Destroy>", []):
+            handler(event)
+
+
+@pytest.fixture
+def factory(engine):
+    return sessionmaker(bind=engine)
+
+
+def owned(owner):
+    return [s for s in open_sessions() if s.owner == owner]
+
+
+def test_write_scope_commits_and_read_scope_sees_it(factory):
+    with write_scope("test-write", factory) as db:
+        assert db.query(DutyPoint).count() == 0
+        db.add(DutyPoint(location="North Gate"))
+        assert owned("test-write")[0].pending == 1
+    with read_scope("test-read", factory) as db:
+        rows = db.query(DutyPoint).all()
+        assert [dp.location for dp in rows] == ["North Gate"]
+        assert owned("test-read")[0].identities == 1
+    assert owned("test-write") == [] and owned("test-read") == []
+
+
+def test_write_scope_rolls_back_when_the_block_raises(factory):
+    with pytest.raises(ValueError):
+        with write_scope("test-write", factory) as db:
+            db.add(DutyPoint(location="North Gate"))
+            db.flush()
+            raise ValueError("boom")
+    with read_scope("test-read", factory) as db:
+        assert db.query(DutyPoint).count() == 0
+    assert owned("test-write") == []
+
+
+def test_loaded_rows_stay_readable_after_the_scope(factory):
+    with write_scope("test-write", factory) as db:
+        db.add(DutyPoint(location="North Gate", description="Checkpoint"))
+    with read_scope("test-read", factory) as db:
+        dp = db.query(DutyPoint).one()
+    assert (dp.location, dp.description) == ("North Gate", "Checkpoint")
+
+
+def test_open_sessions_are_reported_until_closed(factory):
+    db = factory()
+    db.info[OWNER] = "test-leak"
+    db.query(DutyPoint).all()
+    stream = io.StringIO()
+    stale = [s for s in report_open_sessions(0, stream) if s.owner == "test-leak"]
+    assert len(stale) == 1 and "test-leak" in stream.getvalue()
+    db.close()
+    assert owned("test-leak") == []
+
+
+def test_sessions_without_an_owner_are_named_after_their_caller(factory):
+    db = factory()
+    db.query(DutyPoint).all()
+    try:
+        assert any(s.owner.startswith("test_session_scope.py:") for s in open_sessions())
+    finally:
+        db.close()
+
+
+def test_a_session_collected_while_open_counts_as_leaked(factory):
+    tracker = get_session_tracker()
+    leaked = tracker.leaked
+    db = factory()
+    db.info[OWNER] = "test-leak"
+    db.query(DutyPoint).all()
+    with pytest.warns(ResourceWarning, match="test-leak"):
+        del db
+        gc.collect()
+    assert tracker.leaked == leaked + 1 and owned("test-leak") == []
+
+
+def test_screen_session_returns_its_connection_when_idle(factory, engine):
+    widget = FakeWidget()
+    db = screen_session(widget, "test-screen", factory)
+    db.add(DutyPoint(location="North Gate"))
+    db.commit()
+
+    dp = db.query(DutyPoint).one()
+    assert owned("test-screen") and engine.pool.checkedout() == 1
+    widget.idle()
+    assert owned("test-screen") == [] and engine.pool.checkedout() == 0
+    assert dp.location == "North Gate"  # reloads on the next transaction
+
+    expunge(db)
+    assert len(db.identity_map) == 0 and owned("test-screen") == []
+    widget.destroy()
+    assert engine.pool.checkedout() == 0
+
+
+def test_release_and_expunge_leave_pending_work_alone(factory):
+    db = factory()
+    db.info[OWNER] = "test-pending"
+    try:
+        dp = DutyPoint(location="North Gate")
+        db.add(dp)
+        db.flush()
+        release(db)
+        expunge(db)
+        assert db.in_transaction() and len(db.identity_map) == 1
+        assert db.get(DutyPoint, dp.id) is dp
+        assert [(s.pending, s.flushed) for s in owned("test-pending")] == [(0, True)]
+    finally:
+        db.close()
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.crud import crud_shift
+from src.models.shift import Shift
+from src.models.user import User
+from src.services.auth_service import AuthService
+from src.session_scope import write_scope
+
+
+@pytest.fixture
+def armorer(db):
+    user = User(
+        service_number="ARM1",
+        name="Armorer",
+        telephone="0",
+        role="armorer",
+        hashed_password="x",
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_ticket_starts_and_is_tied_to_the_shift(db, armorer):
+    auth = AuthService(db)
+    ticket = auth.issue_shift_ticket(armorer.id)
+    shift = crud_shift.get_active_shift(db, armorer.id)
+    assert ticket.startswith(f"{shift.id}.{armorer.id}.")
+    assert auth.verify_shift_ticket(ticket, armorer.id)
+
+    # A second ticket reuses the active shift
+    auth.issue_shift_ticket(armorer.id)
+    assert db.query(Shift).count() == 1
+
+
+def test_ticket_rejects_other_users_tampering_and_expiry(db, armorer):
+    auth = AuthService(db)
+    ticket = auth.issue_shift_ticket(armorer.id)
+    assert not auth.verify_shift_ticket(ticket, armorer.id + 1)
+    assert not auth.verify_shift_ticket(None, armorer.id)
+    assert not auth.verify_shift_ticket("garbage", armorer.id)
+    assert not auth.verify_shift_ticket("é" + ticket, armorer.id)
+
+    shift_id, armorer_id, expires, nonce, signature = ticket.split(".")
+    forged = f"{shift_id}.{armorer_id}.{int(expires) + 3600}.{nonce}.{signature}"
+    assert not auth.verify_shift_ticket(forged, armorer.id)
+
+    expired = auth.issue_shift_ticket(armorer.id, ttl=-1)
+    assert not auth.verify_shift_ticket(expired, armorer.id)
+
+
+def test_revoking_on_sign_out(db, armorer):
+    auth = AuthService(db)
+    ticket = auth.issue_shift_ticket(armorer.id)
+    other = auth.issue_shift_ticket(armorer.id)
+    auth.revoke_shift_ticket(ticket)
+    assert not auth.verify_shift_ticket(ticket, armorer.id)
+    assert auth.verify_shift_ticket(other, armorer.id)
+
+
+def test_sign_out_revokes_without_a_session_and_ends_the_shift(engine, db, armorer):
+    ticket = AuthService(db).issue_shift_ticket(armorer.id)
+    AuthService.revoke_shift_ticket(ticket)
+    with write_scope("sign_out", sessionmaker(bind=engine)) as other:
+        assert AuthService(other).end_shift(armorer.id)
+    assert crud_shift.get_active_shift(db, armorer.id) is None
+
+
+def test_ending_the_shift_invalidates_its_tickets(db, armorer):
+    auth = AuthService(db)
+    ticket = auth.issue_shift_ticket(armorer.id)
+    assert auth.end_shift(armorer.id)
+    assert not auth.verify_shift_ticket(ticket, armorer.id)
+    assert not auth.end_shift(armorer.id)
+
+    # The next login opens a new shift with a fresh ticket
+    ticket = auth.issue_shift_ticket(armorer.id)
+    assert auth.verify_shift_ticket(ticket, armorer.id)
+    assert db.query(Shift).filter(Shift.active.is_(True)).count() == 1
+
+
+def test_ticket_check_is_far_cheaper_than_bcrypt(db, armorer):
+    auth = AuthService(db)
+    ticket = auth.issue_shift_ticket(armorer.id)
+    start = time.perf_counter()
+    for _ in range(50):
+        assert auth.verify_shift_ticket(ticket, armorer.id)
+    assert (time.perf_counter() - start) / 50 < 0.02  # bcrypt at cost 10+ is ~50 ms or more
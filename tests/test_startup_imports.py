@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import pytest
+
+# Heavy modules the login window must not wait for (see src/gui/login.py)
+DEFERRED = [
+    "sqlalchemy",
+    "src.database",
+    "jwt",
+    "cryptography",
+    "numpy",
+    "src.gui.booking_management",
+    "src.gui.user_management",
+]
+
+
+def loaded_after(statement: str, modules: list[str]) -> list[str]:
+    code = f"{statement}; import sys; print(' '.join(m for m in {modules!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return proc.stdout.split()
+
+
+def test_login_window_imports_only_its_own_dependencies():
+    assert loaded_after("import src.gui.login", DEFERRED) == []
+
+
+@pytest.mark.parametrize("statement", ["import src.main", "import src.gui.booking_management"])
+def test_crypto_and_screens_load_on_first_use(statement):
+    deferred = ["jwt", "cryptography", "numpy", "src.gui.weapon_management"]
+    assert loaded_after(statement, deferred) == []
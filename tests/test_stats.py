@@ -0,0 +1,54 @@
+from sqlalchemy import text
+
+from src.crud import crud_ammunition, crud_booking, crud_stats
+from src.models.ammunition import Ammunition
+from src.models.weapon import Weapon
+
+
+def _counters(db):
+    stats = crud_stats.get_dashboard_stats(db)
+    db.refresh(stats)
+    return (
+        stats.weapons_total,
+        stats.bookings_total,
+        stats.bookings_issued,
+        stats.bookings_overdue,
+        stats.ammo_rounds,
+    )
+
+
+def test_counters_follow_booking_lifecycle(db, armory):
+    ammo = Ammunition(weapon_id=armory.weapon.id, platform="AK-47", caliber="7.62x39mm", count=100)
+    db.add(ammo)
+    db.commit()
+    assert _counters(db) == (1, 0, 0, 0, 100)
+
+    booking = crud_booking.create_booking(
+        db,
+        officer_id=armory.officer.id,
+        weapon_id=armory.weapon.id,
+        duty_point_id=armory.duty_point.id,
+        armorer_id=armory.armorer.id,
+        ammunition_id=ammo.id,
+        ammunition_count=30,
+    )
+    assert _counters(db) == (1, 1, 1, 0, 70)
+
+    crud_booking.return_booking(
+        db, booking_id=booking.id, ammunition_returned=25, remarks="5 fired"
+    )
+    assert _counters(db) == (1, 1, 0, 0, 95)
+
+    crud_ammunition.adjust_stock(db, ammo.id, 5)
+    assert _counters(db) == (1, 1, 0, 0, 100)
+
+
+def test_rebuild_repairs_drift(db):
+    db.add(Weapon(serial_number="W1", type="Rifle", condition="Good", status="AVAILABLE"))
+    db.commit()
+    db.execute(text("UPDATE stats SET weapons_total = 42"))
+    db.commit()
+    assert _counters(db)[0] == 42
+
+    crud_stats.rebuild_stats(db)
+    assert _counters(db)[0] == 1
@@ -0,0 +1,116 @@
+from src.gui.table_sync import SyncResult, TableSync
+
+
+class FakeTree:
+    """The slice of the ttk.Treeview API TableSync uses, recording every call."""
+
+    def __init__(self):
+        self.order = []
+        self.items = {}
+        self.calls = []
+
+    def get_children(self, _parent=""):
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid, values, tags):
+        self.calls.append(("insert", iid))
+        self.order.insert(index, iid)
+        self.items[iid] = (tuple(values), tuple(tags))
+        return iid
+
+    def item(self, iid, values, tags):
+        self.calls.append(("item", iid))
+        self.items[iid] = (tuple(values), tuple(tags))
+
+    def move(self, iid, parent, index):
+        self.calls.append(("move", iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def delete(self, *iids):
+        self.calls.append(("delete",) + iids)
+        for iid in iids:
+            self.order.remove(iid)
+            del self.items[iid]
+
+
+def rows(*keys, count=10):
+    return [(key, (key, f"row {key}", count), ["low"] if count < 5 else []) for key in keys]
+
+
+def test_first_sync_inserts_everything_keyed_by_id():
+    tree = FakeTree()
+    sync = TableSync(tree)
+
+    result = sync.apply(rows(3, 2, 1))
+
+    assert result == SyncResult(inserted=3, updated=0, deleted=0, moved=0)
+    assert tree.order == ["3", "2", "1"]
+    assert tree.items["2"] == ((2, "row 2", 10), ())
+    assert 2 in sync and 4 not in sync
+
+
+def test_unchanged_rows_cost_no_calls():
+    tree = FakeTree()
+    sync = TableSync(tree)
+    sync.apply(rows(*range(500, 0, -1)))
+    tree.calls.clear()
+
+    result = sync.apply(rows(*range(500, 0, -1)))
+
+    assert result.changed == 0
+    assert tree.calls == []
+
+
+def test_single_change_touches_only_that_row():
+    tree = FakeTree()
+    sync = TableSync(tree)
+    sync.apply(rows(*range(1, 501)))
+    tree.calls.clear()
+
+    changed = rows(*range(1, 501))
+    changed[41] = (42, (42, "row 42", 3), ["low"])  # stock dropped below reorder level
+    result = sync.apply(changed)
+
+    assert result == SyncResult(inserted=0, updated=1, deleted=0, moved=0)
+    assert tree.calls == [("item", "42")]
+    assert tree.items["42"] == ((42, "row 42", 3), ("low",))
+
+
+def test_new_booking_on_top_and_deleted_row_are_applied_in_place():
+    tree = FakeTree()
+    sync = TableSync(tree)
+    sync.apply(rows(5, 4, 3, 2, 1))
+    tree.calls.clear()
+
+    result = sync.apply(rows(6, 5, 4, 2, 1))
+
+    assert result == SyncResult(inserted=1, updated=0, deleted=1, moved=0)
+    assert tree.calls == [("delete", "3"), ("insert", "6")]
+    assert tree.order == ["6", "5", "4", "2", "1"]
+
+
+def test_reordered_rows_are_moved_not_recreated():
+    tree = FakeTree()
+    sync = TableSync(tree)
+    sync.apply(rows(1, 2, 3, 4))
+    tree.calls.clear()
+
+    result = sync.apply(rows(1, 4, 2, 3))
+
+    assert result.inserted == result.deleted == 0
+    assert result.moved == 1
+    assert tree.order == ["1", "4", "2", "3"]
+
+
+def test_duplicate_keys_keep_the_first_row_and_reset_clears():
+    tree = FakeTree()
+    sync = TableSync(tree)
+
+    sync.apply(rows(1, 2) + [(1, ("dup",), [])])
+    assert tree.order == ["1", "2"]
+    assert tree.items["1"][0] == (1, "row 1", 10)
+
+    sync.reset()
+    assert tree.order == [] and 1 not in sync
+    assert sync.apply(rows(1)).inserted == 1
@@ -0,0 +1,166 @@
+import os
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.crud import crud_fingerprint, crud_user  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.services import fingerprint_matcher  # noqa: E402
+from src.services.auth_service import AuthService  # noqa: E402
+from src.services.vector_matcher import (  # noqa: E402
+    VectorMatcher,
+    compare_templates,
+    default_features,
+)
+
+
+def _noisy(template: bytes, flips: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    data = bytearray(template)
+    for i in rng.sample(range(len(data)), flips):
+        data[i] = rng.randrange(256)
+    return bytes(data)
+
+
+@pytest.fixture
+def templates():
+    rng = random.Random(42)
+    return [bytes(rng.randrange(256) for _ in range(256)) for _ in range(50)]
+
+
+def _attacks(template: bytes) -> list[bytes]:
+    """Templates that must never pass for `template` without an SDK extractor."""
+    return [
+        template[:256] + os.urandom(256),  # same first 256 bytes, random tail
+        bytes(b ^ 1 for b in template),  # every byte XOR 1
+        _noisy(template, 5),
+    ]
+
+
+def test_top_k_and_threshold(templates):
+    # The byte features stand in for an SDK extractor here
+    matcher = VectorMatcher(top_k=3, extract=default_features)
+    matcher.loaded = True
+    for user_id, template in enumerate(templates, start=1):
+        matcher.add(user_id, template)
+
+    result = matcher.search(_noisy(templates[9], flips=10))
+    assert result.user_id == 10
+    assert len(result.candidates) == 3
+    assert result.candidates[0].score > 0.9 > result.candidates[1].score
+    assert [c.score for c in result.candidates] == sorted(
+        (c.score for c in result.candidates), reverse=True
+    )
+
+    assert matcher.search(os.urandom(256)).user_id is None
+
+
+def test_without_an_extractor_only_exact_templates_match():
+    long_templates = [os.urandom(512) for _ in range(3)]
+    matcher = VectorMatcher()
+    matcher.loaded = True
+    for user_id, template in enumerate(long_templates, start=1):
+        matcher.add(user_id, template)
+
+    assert matcher.search(long_templates[1]).user_id == 2
+    for attack in _attacks(long_templates[1]):
+        result = matcher.search(attack)
+        assert result.user_id is None
+        assert result.candidates  # still ranked, just never accepted
+        assert not matcher.compare(long_templates[1], attack)
+
+    matcher.remove(2)
+    assert matcher.search(long_templates[1]).user_id is None
+
+
+def test_default_features_use_the_whole_template():
+    template = os.urandom(512)
+    tail_changed = template[:256] + os.urandom(256)
+    assert float(default_features(template) @ default_features(tail_changed)) < 0.9
+
+
+def test_remove_keeps_rows_contiguous(templates):
+    matcher = VectorMatcher()
+    matcher.loaded = True
+    for user_id, template in enumerate(templates[:5], start=1):
+        matcher.add(user_id, template)
+    matcher.remove(2)
+
+    assert len(matcher) == 4
+    assert matcher.search(templates[1]).user_id is None
+    assert matcher.search(templates[4]).user_id == 5
+
+
+def test_process_pool_matches_serial(templates):
+    serial = VectorMatcher(top_k=4)
+    parallel = VectorMatcher(top_k=4, workers=2, parallel_rows=10)
+    for matcher in (serial, parallel):
+        matcher.loaded = True
+        for user_id, template in enumerate(templates, start=1):
+            matcher.add(user_id, template)
+    try:
+        probe = _noisy(templates[30], flips=20)
+        assert parallel.search(probe) == serial.search(probe)
+    finally:
+        parallel.close()
+
+
+def test_vector_matcher_behind_verify_fingerprint(db, templates):
+    users = [
+        User(service_number=f"S{i}", name="x", telephone="0", role="officer", hashed_password="x")
+        for i in range(3)
+    ]
+    db.add_all(users)
+    db.commit()
+    ids = [u.id for u in users]
+    previous = fingerprint_matcher.set_matcher(VectorMatcher(extract=default_features))
+    try:
+        for user_id, template in zip(ids, templates):
+            crud_fingerprint.enroll_fingerprint(db, user_id, template)
+        assert crud_fingerprint.verify_fingerprint(db, _noisy(templates[1], 8)) == ids[1]
+
+        crud_user.delete_user(db, ids[1])  # write-through removal
+        assert crud_fingerprint.verify_fingerprint(db, templates[1]) is None
+    finally:
+        fingerprint_matcher.set_matcher(previous)
+
+
+def test_the_vector_setting_installs_the_vector_matcher(db, templates, monkeypatch):
+    user = User(service_number="S1", name="x", telephone="0", role="officer", hashed_password="x")
+    db.add(user)
+    db.commit()
+    crud_fingerprint.enroll_fingerprint(db, user.id, templates[0])
+
+    monkeypatch.setenv("ARMORY_FINGERPRINT_MATCHER", "vector")
+    previous = fingerprint_matcher.set_matcher(None)
+    try:
+        assert isinstance(fingerprint_matcher.get_matcher(), VectorMatcher)
+        assert crud_fingerprint.verify_fingerprint(db, templates[0]) == user.id
+        assert crud_fingerprint.verify_fingerprint(db, _noisy(templates[0], 5)) is None
+    finally:
+        fingerprint_matcher.set_matcher(previous)
+
+
+def test_compare_templates(templates):
+    assert compare_templates(templates[0], bytes(templates[0]))
+    for attack in _attacks(templates[0]):
+        assert not compare_templates(templates[0], attack)
+    assert not compare_templates(b"", templates[1])
+
+    assert compare_templates(templates[0], _noisy(templates[0], 5), extract=default_features)
+    assert not compare_templates(templates[0], templates[1], extract=default_features)
+
+
+def test_auth_service_one_to_one_check_is_exact(db, templates):
+    user = User(service_number="S1", name="x", telephone="0", role="officer", hashed_password="x")
+    db.add(user)
+    db.commit()
+    template = templates[0] + os.urandom(256)
+    crud_fingerprint.enroll_fingerprint(db, user.id, template)
+
+    auth = AuthService(db)
+    assert auth.verify_fingerprint(user.id, template)
+    for attack in _attacks(template):
+        assert not auth.verify_fingerprint(user.id, attack)
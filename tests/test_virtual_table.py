@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta
+
+from src.crud import crud_booking, crud_user, crud_weapon
+from src.gui.virtual_table import KeysetPages, RowSource
+from src.models.booking import Booking
+from src.models.user import User
+from src.models.weapon import Weapon
+
+
+class Recorder:
+    def __init__(self, total: int):
+        self.total = total
+        self.calls = []
+
+    def fetch(self, offset, limit):
+        self.calls.append((offset, limit))
+        return list(range(offset, min(offset + limit, self.total)))
+
+    def count(self):
+        return self.total
+
+
+def test_rows_are_fetched_in_aligned_pages_and_cached():
+    rec = Recorder(1000)
+    source = RowSource(rec.fetch, rec.count, page_size=100, cache_pages=3)
+
+    assert source.rows(95, 110) == list(range(95, 110))
+    assert rec.calls == [(0, 100), (100, 100)]
+
+    source.rows(100, 115)  # already cached
+    assert rec.calls == [(0, 100), (100, 100)]
+
+    source.rows(990, 1200)  # clamped to the row count
+    assert rec.calls[-1] == (900, 100)
+    assert source.rows(2000, 2010) == []
+
+
+def test_least_recently_used_pages_are_dropped():
+    rec = Recorder(1000)
+    source = RowSource(rec.fetch, rec.count, page_size=10, cache_pages=2)
+    source.rows(0, 1)
+    source.rows(10, 11)
+    source.rows(0, 1)  # page 0 becomes most recent
+    source.rows(20, 21)  # evicts page 1
+    assert source.is_cached(0) and source.is_cached(20) and not source.is_cached(10)
+
+
+def test_invalidate_recounts_and_refetches():
+    rec = Recorder(50)
+    source = RowSource(rec.fetch, rec.count, page_size=100)
+    assert source.count() == 50
+    rec.total = 60
+    assert source.count() == 50
+    source.invalidate()
+    assert source.count() == 60
+    assert len(source.rows(0, 100)) == 60
+
+
+def test_seeded_rows_are_served_without_fetching():
+    rec = Recorder(1000)
+    source = RowSource(rec.fetch, rec.count, page_size=10)
+    source.rows(500, 510)
+
+    source.seed(25, list(range(15)))  # e.g. the first page of a live search
+    assert source.count() == 25
+    assert source.rows(0, 10) == list(range(10))
+    assert rec.calls == [(500, 10)]
+    assert not source.is_cached(10)  # partial page is fetched normally
+    source.rows(10, 12)
+    assert rec.calls[-1] == (10, 10)
+
+
+def test_drop_pages_forgets_only_pages_holding_matching_rows():
+    rec = Recorder(1000)
+    source = RowSource(rec.fetch, rec.count, page_size=10)
+    source.rows(0, 30)
+    assert source.drop_pages(lambda row: row in (12, 15)) == 1
+    assert source.is_cached(0) and not source.is_cached(10) and source.is_cached(20)
+    assert source.drop_pages(lambda row: row == 999) == 0
+    source.rows(0, 30)
+    assert rec.calls[-1] == (10, 10)
+    assert source.count() == 1000 and len(rec.calls) == 4
+
+
+def _bookings(db, armory, n=250):
+    base = datetime(2026, 1, 1)
+    db.add_all(
+        Booking(
+            officer_id=armory.officer.id,
+            armorer_id=armory.armorer.id,
+            weapon_id=armory.weapon.id,
+            duty_point_id=armory.duty_point.id,
+            status="RETURNED",
+            issued_at=base + timedelta(minutes=i // 3),
+        )
+        for i in range(n)
+    )
+    db.commit()
+    return [b.id for b in db.query(Booking).order_by(Booking.issued_at.desc(), Booking.id.desc())]
+
+
+def test_keyset_pages_match_offsets_for_sequential_and_random_access(db, armory):
+    expected = _bookings(db, armory)
+    calls = []
+
+    def fetch_page(cursor, offset, limit):
+        calls.append("seek" if cursor is not None else f"offset {offset}")
+        return crud_booking.search_bookings(db, limit=limit, cursor=cursor, offset=offset)
+
+    source = RowSource(
+        KeysetPages(fetch_page), lambda: crud_booking.count_search_bookings(db), page_size=40
+    )
+    assert source.count() == 250
+    assert [r.id for r in source.rows(0, 250)] == expected
+    assert calls == ["offset 0"] + ["seek"] * 6
+
+    # A scrollbar jump lands on an unseen page: one OFFSET, then seeks again
+    calls.clear()
+    source.fetch_rows.reset()
+    source.invalidate()
+    assert [r.id for r in source.rows(200, 250)] == expected[200:250]
+    assert calls == ["offset 200", "seek"]
+
+
+def test_count_search_bookings_uses_the_same_filters(db, armory):
+    _bookings(db, armory, 10)
+    assert crud_booking.count_search_bookings(db, "Officer") == 10
+    assert crud_booking.count_search_bookings(db, "nobody") == 0
+    assert crud_booking.count_search_bookings(db, status="ISSUED") == 0
+
+
+def test_like_wildcards_in_search_text_match_literally(db, armory):
+    _bookings(db, armory, 10)
+    for text in ("_", "%", "O_ficer", "\\"):
+        assert crud_booking.count_search_bookings(db, text) == 0
+        assert crud_booking.search_bookings(db, text, limit=5)[0] == []
+        assert crud_user.count_users(db, text) == 0
+        assert crud_weapon.count_weapons(db, text) == 0
+    db.add(Weapon(serial_number="AK_47%", type="Rifle", condition="Good", status="AVAILABLE"))
+    db.commit()
+    assert crud_weapon.count_weapons(db, "K_4") == 1
+    assert crud_weapon.count_weapons(db, "7%") == 1
+
+
+def test_ordered_scan_and_index_seek_return_the_same_rows(db, armory, monkeypatch):
+    _bookings(db, armory, 30)
+    results = []
+    for threshold in (0.0, 2.0):  # always / never walk issued_at order
+        monkeypatch.setattr(crud_booking, "ORDERED_SCAN_SELECTIVITY", threshold)
+        monkeypatch.setattr(crud_booking, "COUNT_SCAN_SELECTIVITY", threshold)
+        rows, cursor = crud_booking.search_bookings(db, "Rifle", limit=10)
+        more, _ = crud_booking.search_bookings(db, "Rifle", limit=10, cursor=cursor)
+        count = crud_booking.count_search_bookings(db, "Rifle")
+        results.append(([r.id for r in rows + more], count))
+    assert results[0] == results[1]
+    assert results[0][1] == 30 and len(results[0][0]) == 20
+
+
+def test_user_and_weapon_windows(db):
+    db.add_all(
+        User(
+            service_number=f"S{i:03d}",
+            name=f"User {i}",
+            telephone="0",
+            role="officer",
+            hashed_password="x",
+        )
+        for i in range(30)
+    )
+    db.add_all(
+        Weapon(serial_number=f"SN-{i:03d}", type="Rifle", condition="Good", status="AVAILABLE")
+        for i in range(30)
+    )
+    db.commit()
+
+    assert crud_user.count_users(db) == 30
+    window = crud_user.search_users(db, offset=10, limit=5)
+    assert [u.id for u in window] == [u.id for u in crud_user.get_all_users(db)][10:15]
+    assert crud_user.count_users(db, "S01") == 10
+    assert {u.service_number for u in crud_user.search_users(db, "S01")} == {
+        f"S01{i}" for i in range(10)
+    }
+
+    assert crud_weapon.count_weapons(db, "sn-02") == 10
+    rows = crud_weapon.search_weapons(db, offset=28, limit=5)
+    assert [w.serial_number for w in rows] == ["SN-028", "SN-029"]